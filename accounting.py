@@ -0,0 +1,317 @@
+"""
+Call Accounting
+Records the minutes and estimated cost of every Bland AI call per call, job
+and API key, keeps daily and monthly rollups, and enforces spend budgets
+before new calls are admitted (counting calls admitted but not yet finished)
+"""
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import ACCOUNTING_CONFIG
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS call_charges (
+    call_id TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL DEFAULT '',
+    key_id TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    cost REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_charges_job ON call_charges (job_id);
+CREATE INDEX IF NOT EXISTS idx_charges_recorded ON call_charges (recorded_at);
+
+CREATE TABLE IF NOT EXISTS spend_rollups (
+    period TEXT NOT NULL,
+    key_id TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    cost REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, key_id)
+);
+
+CREATE TABLE IF NOT EXISTS call_reservations (
+    reservation_id TEXT PRIMARY KEY,
+    key_id TEXT NOT NULL,
+    cost REAL NOT NULL,
+    reserved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_key ON call_reservations (key_id);
+"""
+
+# Rollup period of each budget: "2026-01-14" (daily) or "2026-01" (monthly), in UTC
+PERIOD_FORMATS = {"daily": "%Y-%m-%d", "monthly": "%Y-%m"}
+
+
+def key_id(api_key: Optional[str]) -> str:
+    """Fingerprint of an API key (the key itself is never stored)"""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:12]
+
+
+@dataclass
+class Admission:
+    """Outcome of CallLedger.admit()"""
+    requested: int
+    allowed: int  # Calls that fit under every hard budget
+    warnings: List[str] = field(default_factory=list)  # Soft budgets the calls would pass
+    reason: str = ""  # Why calls were cut (empty when all are allowed)
+
+    @property
+    def ok(self) -> bool:
+        return self.allowed >= self.requested
+
+
+class CallLedger:
+    """
+    SQLite ledger of call charges with per-key daily and monthly rollups.
+
+    Each charge is keyed by its Bland AI call ID, so recording the same call
+    twice (a duplicate webhook, a fallback poll) only counts it once. The
+    charge and its rollup rows are written in one transaction, so budget
+    checks read two rows instead of scanning the charges.
+
+    Admitted calls hold a reservation of ``estimated_minutes_per_call``
+    (keyed by job or call) until record() settles it or release() drops it,
+    so concurrent admissions see each other's calls. Reservations older than
+    ``reservation_ttl_seconds`` (left by a crashed process) stop counting.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, config: Optional[Dict] = None,
+                 clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            db_path: SQLite file (defaults to ACCOUNTING_CONFIG['db_path'])
+            config: Prices and budgets (defaults to ACCOUNTING_CONFIG)
+            clock: Returns the current epoch time (for tests)
+        """
+        self.config = config or ACCOUNTING_CONFIG
+        self.db_path = db_path or self.config["db_path"]
+        self.clock = clock or time.time
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection, commit on success, always close"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _periods(self, at: float) -> Dict[str, str]:
+        moment = datetime.fromtimestamp(at, timezone.utc)
+        return {name: moment.strftime(fmt) for name, fmt in PERIOD_FORMATS.items()}
+
+    def cost(self, seconds: Optional[float]) -> float:
+        """Estimated cost of a call that lasted ``seconds``"""
+        return round((seconds or 0) / 60 * self.config["cost_per_minute"], 4)
+
+    # ── Writing ──
+
+    def record(self, call_id: str, api_key: Optional[str], seconds: Optional[float], job_id: str = "",
+               reservation_id: Optional[str] = None) -> bool:
+        """
+        Record one finished call, update its rollups and settle its reservation
+
+        Args:
+            call_id: Bland AI call ID (calls that never connected have none and cost nothing)
+            api_key: Key the call was billed to
+            seconds: Call duration in seconds
+            job_id: API job or CLI run that placed the call
+            reservation_id: Reservation the call was admitted under (defaults to job_id)
+
+        Returns:
+            True if the call was recorded, False if it had no ID or was already recorded
+        """
+        reservation_id = reservation_id or job_id
+        if not call_id:
+            if reservation_id:
+                self.release(reservation_id)
+            return False
+        now = self.clock()
+        seconds = seconds or 0
+        cost = self.cost(seconds)
+        key = key_id(api_key)
+        with self._connect() as conn:
+            if reservation_id:
+                conn.execute("DELETE FROM call_reservations WHERE reservation_id = ?", (reservation_id,))
+            inserted = conn.execute(
+                """INSERT OR IGNORE INTO call_charges (call_id, job_id, key_id, seconds, cost, recorded_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (call_id, job_id or "", key, seconds, cost, now)
+            ).rowcount
+            if not inserted:
+                return False
+            for period in self._periods(now).values():
+                conn.execute(
+                    """INSERT INTO spend_rollups (period, key_id, calls, seconds, cost) VALUES (?, ?, 1, ?, ?)
+                       ON CONFLICT (period, key_id)
+                       DO UPDATE SET calls = calls + 1, seconds = seconds + excluded.seconds, cost = cost + excluded.cost""",
+                    (period, key, seconds, cost)
+                )
+        return True
+
+    def release(self, *reservation_ids: str):
+        """Drop the reservations of admitted calls that will not be placed (failed, cancelled or skipped)"""
+        ids = [(reservation_id,) for reservation_id in reservation_ids if reservation_id]
+        if not ids:
+            return
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM call_reservations WHERE reservation_id = ?", ids)
+
+    # ── Reading ──
+
+    def spend(self, api_key: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Current daily and monthly spend, for one API key or all of them
+
+        Returns:
+            {"daily": {...}, "monthly": {...}}, each with period, calls, minutes and cost
+        """
+        with self._connect() as conn:
+            return self._spend(conn, api_key)
+
+    def _spend(self, conn: sqlite3.Connection, api_key: Optional[str]) -> Dict[str, Dict]:
+        where, params = "", []
+        if api_key is not None:
+            where, params = " AND key_id = ?", [key_id(api_key)]
+        totals = {}
+        for name, period in self._periods(self.clock()).items():
+            row = conn.execute(
+                f"""SELECT COALESCE(SUM(calls), 0) AS calls, COALESCE(SUM(seconds), 0) AS seconds,
+                           COALESCE(SUM(cost), 0) AS cost
+                    FROM spend_rollups WHERE period = ?{where}""",
+                [period] + params
+            ).fetchone()
+            totals[name] = {
+                "period": period,
+                "calls": row["calls"],
+                "minutes": round(row["seconds"] / 60, 1),
+                "cost": round(row["cost"], 2),
+            }
+        return totals
+
+    def reserved(self, api_key: Optional[str] = None) -> Dict:
+        """Calls admitted but not yet recorded or released, and their estimated cost"""
+        with self._connect() as conn:
+            return self._reserved(conn, api_key)
+
+    def _reserved(self, conn: sqlite3.Connection, api_key: Optional[str], exclude: Iterable[str] = ()) -> Dict:
+        exclude = list(exclude)
+        where, params = ["reserved_at >= ?"], [self.clock() - self.config["reservation_ttl_seconds"]]
+        if api_key is not None:
+            where.append("key_id = ?")
+            params.append(key_id(api_key))
+        if exclude:
+            where.append(f"reservation_id NOT IN ({', '.join('?' * len(exclude))})")
+            params.extend(exclude)
+        row = conn.execute(
+            f"SELECT COUNT(*) AS calls, COALESCE(SUM(cost), 0) AS cost FROM call_reservations WHERE {' AND '.join(where)}",
+            params
+        ).fetchone()
+        return {"calls": row["calls"], "cost": round(row["cost"], 2)}
+
+    def job_spend(self, job_id: str) -> Dict:
+        """Calls, minutes and cost charged to one job or run"""
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT COUNT(*) AS calls, COALESCE(SUM(seconds), 0) AS seconds, COALESCE(SUM(cost), 0) AS cost
+                   FROM call_charges WHERE job_id = ?""",
+                (job_id,)
+            ).fetchone()
+        return {"calls": row["calls"], "minutes": round(row["seconds"] / 60, 1), "cost": round(row["cost"], 2)}
+
+    def burn_rate(self) -> Dict:
+        """Spend per hour over the last ``burn_rate_window_seconds``, across all keys"""
+        window = self.config["burn_rate_window_seconds"]
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT COUNT(*) AS calls, COALESCE(SUM(seconds), 0) AS seconds, COALESCE(SUM(cost), 0) AS cost
+                   FROM call_charges WHERE recorded_at >= ?""",
+                (self.clock() - window,)
+            ).fetchone()
+        per_hour = 3600 / window
+        return {
+            "window_seconds": window,
+            "calls_per_hour": round(row["calls"] * per_hour, 1),
+            "minutes_per_hour": round(row["seconds"] / 60 * per_hour, 1),
+            "cost_per_hour": round(row["cost"] * per_hour, 2),
+        }
+
+    # ── Budgets ──
+
+    def admit(self, api_key: Optional[str], calls: int = 1, reservations: Optional[List[str]] = None) -> Admission:
+        """
+        How many of ``calls`` new calls the key's budgets allow
+
+        Each call is assumed to cost ``estimated_minutes_per_call``, and so
+        is every call already admitted but not yet recorded. Calls that would
+        pass a hard budget are cut; passing a soft budget only adds a warning.
+        With ``reservations``, the allowed calls are reserved under the first
+        of those IDs in the same transaction, so concurrent admissions (other
+        threads or processes) cannot spend the same headroom.
+
+        Args:
+            api_key: Key the calls would be billed to
+            calls: Calls about to be placed
+            reservations: One job or call ID per call, to hold each allowed
+                call's estimate until record() or release() (an ID already
+                reserved, e.g. a retry's, is replaced rather than counted twice)
+
+        Returns:
+            Admission with the number of calls allowed
+        """
+        estimate = self.cost(self.config["estimated_minutes_per_call"] * 60)
+        reservations = list(reservations or [])
+        admission = Admission(requested=calls, allowed=calls)
+        with self._connect() as conn:
+            # Write lock first: the check and the reservation are one step
+            conn.execute("BEGIN IMMEDIATE")
+            spend = self._spend(conn, api_key)
+            held = self._reserved(conn, api_key, exclude=reservations)["cost"]
+            for name, limits in self.config["budgets"].items():
+                spent = spend[name]["cost"] + held
+                hard, soft = limits.get("hard"), limits.get("soft")
+                if hard is not None:
+                    affordable = max(0, math.floor(round((hard - spent) / estimate, 6))) if estimate else calls
+                    if affordable < admission.allowed:
+                        admission.allowed = affordable
+                        admission.reason = (f"{name} budget of ${hard:.2f} reached "
+                                            f"(${spend[name]['cost']:.2f} spent, ${held:.2f} reserved)")
+                if soft is not None and spent + admission.allowed * estimate > soft:
+                    admission.warnings.append(f"{name} spend (${spent:.2f} so far) would pass the ${soft:.2f} soft budget")
+
+            now, key = self.clock(), key_id(api_key)
+            conn.execute("DELETE FROM call_reservations WHERE reserved_at < ?",
+                         (now - self.config["reservation_ttl_seconds"],))
+            conn.executemany(
+                "INSERT OR REPLACE INTO call_reservations (reservation_id, key_id, cost, reserved_at) VALUES (?, ?, ?, ?)",
+                [(reservation_id, key, estimate, now) for reservation_id in reservations[:admission.allowed]]
+            )
+        return admission
+
+    def metrics(self) -> Dict:
+        """Spend, burn rate and budgets for /api/metrics"""
+        return {
+            "spend": self.spend(),
+            "reserved": self.reserved(),
+            "burn_rate": self.burn_rate(),
+            "cost_per_minute": self.config["cost_per_minute"],
+            "budgets": self.config["budgets"],
+        }
@@ -6,21 +6,45 @@ FastAPI backend for the web interface
 import os
 import json
 import asyncio
-from datetime import datetime
-from typing import Optional, List
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import dataclasses
+import concurrent.futures
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Tuple
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import threading
+import time
+import uuid
 
-from config import WATCH_CONFIG, WATCHES, DEFAULT_WATCH, SEARCH_CONFIG
+from config import (
+    WATCH_CONFIG, WATCHES, DEFAULT_WATCH, SEARCH_CONFIG, HISTORY_CONFIG, RETAILER_CONFIG, SSE_CONFIG,
+    WEBHOOK_CONFIG, BATCH_CONFIG, RANKING_CONFIG
+)
 from scraper import TudorScraper, Retailer
-from filter import RetailerFilter
-from phone_caller import InventoryChecker, InventoryStatus, BlandAICaller
+from filter import RetailerFilter, RetailerGridIndex, ZipCodeGeocoder
+from phone_caller import (
+    InventoryChecker, InventoryStatus, BlandAICaller, BlandAICallerBase,
+    normalize_phone, FINAL_CALL_STATUSES
+)
 from website_scraper import WebsiteStockChecker, WebsiteStockStatus
 from summarizer import summarize_transcript
+from summary_cache import get_summary_cache
+from history import StockHistory
+from job_store import create_job_store
+from call_cache import create_call_cache, CACHED, CLAIMED, JOINED
+from call_poller import get_call_poller
+from call_scheduler import CallScheduler, retailer_timezone
+from call_retry import RetryPolicy, attempt_record
+from accounting import CallLedger
+from blob_store import create_blob_store
+from sweep import SweepStrategy, SweepTracker, ALL
+from ranking import RankedRetailer, RetailerRanker
+from tiered_sweep import TieredSweep, WEBSITE
+from bland_webhooks import callback_url, public_base_url, verify_delivery, webhook_secret, webhooks_enabled
 
 # Import BLAND_CONFIG safely (note: config.py uses BLAND_CONFIG, not BLAND_AI_CONFIG)
 try:
@@ -63,33 +87,105 @@ print("=" * 60)
 # ============================================================
 # GLOBAL IN-MEMORY CACHE
 # ============================================================
+@dataclass(frozen=True)
+class RetailerSnapshot:
+    """One immutable generation of retailer data plus its derived tables"""
+    generation: int
+    retailers: Tuple[Retailer, ...]
+    spatial_index: RetailerGridIndex
+    by_phone: Dict[str, Retailer]
+    with_phone_count: int
+    source_mtime: Optional[float]
+    loaded_at: datetime
+
+
+def build_retailer_snapshot(retailers: List[Retailer], source_mtime: Optional[float] = None) -> RetailerSnapshot:
+    """
+    Build a new generation (list, spatial index, lookup tables) off the request path
+
+    Retailers missing coordinates are geocoded here, once per generation, so
+    the spatial index holds every locatable retailer and searches never
+    geocode them. The generation number is assigned when the snapshot is published.
+    """
+    frozen = tuple(zip_geocoder.locate(retailers, RETAILER_CONFIG["geocode_workers"]))
+    by_phone = {}
+    for retailer in frozen:
+        if retailer.phone:
+            by_phone.setdefault(normalize_phone(retailer.phone), retailer)
+    return RetailerSnapshot(
+        generation=0,
+        retailers=frozen,
+        spatial_index=RetailerGridIndex(list(frozen), cell_degrees=RETAILER_CONFIG["grid_cell_degrees"]),
+        by_phone=by_phone,
+        with_phone_count=len(by_phone),
+        source_mtime=source_mtime,
+        loaded_at=datetime.now()
+    )
+
+
 class RetailerCache:
-    """Thread-safe in-memory cache for retailers"""
+    """
+    Thread-safe holder of the current retailer generation.
+
+    Readers grab ``snapshot()`` once and keep using it for the whole request,
+    so a reload swapping in a new generation never affects in-flight searches.
+    Async code waits for the first generation with ``wait_until_loaded()``,
+    which yields to the event loop instead of sleeping.
+    """
     def __init__(self):
-        self._retailers: List[Retailer] = []
-        self._loaded: bool = False
+        self._snapshot: Optional[RetailerSnapshot] = None
         self._loading: bool = False
         self._lock = threading.Lock()
-        self._load_time: Optional[datetime] = None
+        # Resolved (from any thread) when the first generation is published
+        self._ready: concurrent.futures.Future = concurrent.futures.Future()
 
     @property
     def is_loaded(self) -> bool:
-        return self._loaded and len(self._retailers) > 0
+        snapshot = self._snapshot
+        return snapshot is not None and len(snapshot.retailers) > 0
 
     @property
     def is_loading(self) -> bool:
         return self._loading
 
+    @property
+    def generation(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.generation if snapshot else 0
+
+    def snapshot(self) -> Optional[RetailerSnapshot]:
+        return self._snapshot
+
     def get_retailers(self) -> List[Retailer]:
-        return self._retailers
+        snapshot = self._snapshot
+        return list(snapshot.retailers) if snapshot else []
 
-    def set_retailers(self, retailers: List[Retailer]):
+    def publish(self, snapshot: RetailerSnapshot, expected_generation: Optional[int] = None) -> Optional[RetailerSnapshot]:
+        """
+        Atomically swap in a new generation
+
+        Args:
+            snapshot: The new generation (its generation number is assigned here)
+            expected_generation: Only swap if the current generation is still
+                this one (used by background jobs derived from an older generation)
+
+        Returns:
+            The published snapshot, or None if it was stale
+        """
         with self._lock:
-            self._retailers = retailers
-            self._loaded = True
+            current_generation = self._snapshot.generation if self._snapshot else 0
+            if expected_generation is not None and current_generation != expected_generation:
+                return None
+            snapshot = dataclasses.replace(snapshot, generation=current_generation + 1)
+            self._snapshot = snapshot
             self._loading = False
-            self._load_time = datetime.now()
-            print(f"Cache updated: {len(retailers)} retailers loaded at {self._load_time}")
+            if not self._ready.done():
+                self._ready.set_result(True)
+        print(f"Cache updated: generation {snapshot.generation}, {len(snapshot.retailers)} retailers loaded at {snapshot.loaded_at}")
+        return snapshot
+
+    def set_retailers(self, retailers: List[Retailer], source_mtime: Optional[float] = None) -> RetailerSnapshot:
+        return self.publish(build_retailer_snapshot(retailers, source_mtime))
 
     def start_loading(self) -> bool:
         with self._lock:
@@ -102,16 +198,67 @@ class RetailerCache:
         with self._lock:
             self._loading = False
 
+    def fail_loading(self, error: Exception):
+        """Wake current waiters with the load error; later loads get a fresh readiness future"""
+        with self._lock:
+            self._loading = False
+            if not self._ready.done():
+                self._ready.set_exception(error)
+                self._ready = concurrent.futures.Future()
+
+    async def wait_until_loaded(self, timeout: float) -> RetailerSnapshot:
+        """
+        Wait for the first generation without blocking the event loop
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            The current snapshot
+
+        Raises:
+            asyncio.TimeoutError: If nothing was published within the timeout
+            Exception: The load error, if loading failed
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        # shield() keeps a timed-out waiter from cancelling the shared future
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self._ready)), timeout)
+        return self._snapshot
+
 
 # Global cache instance
 retailer_cache = RetailerCache()
 
-# In-memory storage for call jobs (for both single and batch calls)
-call_jobs = {}
+# Zip code lookups for retailers without coordinates (cached across generations)
+zip_geocoder = ZipCodeGeocoder()
+
+# Persistent, bounded storage for call jobs (shared across worker processes)
+job_store = create_job_store()
+
+# Recent outcomes and in-flight calls per (phone, reference), so concurrent
+# requests for the same store and watch share a single call
+call_cache = create_call_cache()
+
+# Releases queued calls by priority, only while each store is likely open
+call_scheduler = CallScheduler()
+
+# Calls nobody answered (or that failed) are queued again with backoff
+retry_policy = RetryPolicy()
 
 # Website stock checker instance
 website_stock_checker = WebsiteStockChecker()
 
+# Time series of every phone/website outcome (backs /api/history)
+stock_history = StockHistory()
+
+# Minutes and cost of every call, with the spend budgets checked before new calls
+call_ledger = CallLedger()
+
+# Compressed transcripts and raw Bland payloads; job records only keep their key
+call_blobs = create_blob_store()
+
 
 # ============================================================
 # Request Models
@@ -126,8 +273,15 @@ class CallRequest(BaseModel):
     """For batch calls to multiple retailers"""
     zip_code: str
     radius_miles: float = 50
-    api_key: str
+    api_key: Optional[str] = None  # Defaults to the server's Bland AI key
     max_calls: int = 5
+    watch_reference: Optional[str] = None  # Which watch to ask about
+    session_id: Optional[str] = None  # Browser session, for the multiplexed event stream
+    exclude_phones: List[str] = []  # Retailers already called (skipped)
+    strategy: Optional[str] = None  # When to stop calling (see sweep.py; default SWEEP_CONFIG)
+    hits: Optional[int] = None  # In-stock stores that end a "first_n" sweep
+    band_miles: Optional[float] = None  # Band width of a "radius_band" sweep
+    website_first: bool = False  # Check store websites first; only call stores without a clear answer
 
 
 class SingleCallRequest(BaseModel):
@@ -135,14 +289,21 @@ class SingleCallRequest(BaseModel):
     retailer_name: str
     phone: str
     watch_reference: Optional[str] = None  # Which watch to ask about
+    session_id: Optional[str] = None  # Browser session, for the multiplexed event stream
+    distance: Optional[float] = None  # Miles from the searcher (orders calls queued after hours)
 
 
 # ============================================================
 # Helper Functions
 # ============================================================
+def retailers_json_path() -> str:
+    """Path of the retailer snapshot file"""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), RETAILER_CONFIG["data_file"])
+
+
 def load_retailers_sync() -> List[Retailer]:
     """Load retailers from bundled JSON file (pre-scraped data)"""
-    json_path = os.path.join(os.path.dirname(__file__), "retailers.json")
+    json_path = retailers_json_path()
     print(f"Loading retailers from {json_path}...")
 
     if os.path.exists(json_path):
@@ -162,57 +323,118 @@ def load_retailers_sync() -> List[Retailer]:
         return retailers
 
 
-def geocode_retailers_background(retailers: List[Retailer]):
-    """Geocode retailers missing coordinates in a background thread."""
-    from filter import ZipCodeGeocoder
-    missing = [r for r in retailers if not r.latitude and r.zip_code]
-    if not missing:
-        return
-    print(f"[GEOCODE] Background geocoding {len(missing)} retailers...")
-    success = 0
-    for r in missing:
-        try:
-            geocoder = ZipCodeGeocoder()
-            location = geocoder.geocode(r.zip_code)
-            if location:
-                r.latitude = location.latitude
-                r.longitude = location.longitude
-                success += 1
-        except Exception:
-            pass
-    print(f"[GEOCODE] Done: {success}/{len(missing)} geocoded")
-
-
-def get_retailers() -> List[Retailer]:
-    """Get retailers from cache or trigger a scrape"""
-    if retailer_cache.is_loaded:
-        print(f"Returning {len(retailer_cache.get_retailers())} retailers from cache")
-        return retailer_cache.get_retailers()
+def retailers_file_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(retailers_json_path())
+    except OSError:
+        return None
+
+
+def reload_retailers() -> Optional[RetailerSnapshot]:
+    """
+    Build a new retailer generation from the snapshot file and swap it in
+
+    Runs off the request path (startup, file watcher or reload endpoint).
+    On failure the current generation stays in place.
+
+    Returns:
+        The published snapshot, or None if the reload failed
+    """
+    try:
+        mtime = retailers_file_mtime()
+        retailers = load_retailers_sync()
+        snapshot = retailer_cache.publish(build_retailer_snapshot(retailers, mtime))
+    except Exception as e:
+        print(f"[RELOAD] Failed to load retailers, keeping generation {retailer_cache.generation}: {e}")
+        return None
+    return snapshot
+
+
+def watch_retailers_file():
+    """Reload retailers whenever the snapshot file changes on disk"""
+    interval = RETAILER_CONFIG["watch_interval_seconds"]
+    print(f"[RELOAD] Watching {retailers_json_path()} every {interval}s")
+    while True:
+        time.sleep(interval)
+        snapshot = retailer_cache.snapshot()
+        mtime = retailers_file_mtime()
+        if snapshot is None or mtime is None or mtime == snapshot.source_mtime:
+            continue
+        print("[RELOAD] Retailer file changed, building new generation...")
+        reload_retailers()
+
+
+def load_retailers_into_cache():
+    """Load retailers and publish them (runs in a worker thread)"""
+    try:
+        retailers = load_retailers_sync()
+        retailer_cache.set_retailers(retailers, retailers_file_mtime())
+    except Exception as e:
+        print(f"Failed to load retailers: {e}")
+        retailer_cache.fail_loading(e)
 
-    if retailer_cache.is_loading:
-        print("Retailers are being loaded by another request, waiting...")
-        for _ in range(300):
-            if retailer_cache.is_loaded:
-                return retailer_cache.get_retailers()
-            import time
-            time.sleep(1)
-        raise HTTPException(status_code=503, detail="Timeout waiting for retailers to load")
+
+async def get_retailer_snapshot() -> RetailerSnapshot:
+    """
+    Get the current retailer generation, loading it if needed
+
+    Waiting requests yield to the event loop. If nothing is ready within
+    RETAILER_CONFIG['ready_timeout_seconds'] a 503 with Retry-After is returned.
+    """
+    snapshot = retailer_cache.snapshot()
+    if retailer_cache.is_loaded:
+        print(f"Returning {len(snapshot.retailers)} retailers from cache (generation {snapshot.generation})")
+        return snapshot
 
     if retailer_cache.start_loading():
-        try:
-            retailers = load_retailers_sync()
-            retailer_cache.set_retailers(retailers)
-            return retailers
-        except Exception as e:
-            retailer_cache.stop_loading()
-            raise HTTPException(status_code=500, detail=f"Failed to load retailers: {str(e)}")
+        # Load off the event loop; publish() wakes every waiter
+        asyncio.get_running_loop().run_in_executor(None, load_retailers_into_cache)
     else:
-        for _ in range(300):
-            if retailer_cache.is_loaded:
-                return retailer_cache.get_retailers()
-            import time
-            time.sleep(1)
-        raise HTTPException(status_code=503, detail="Timeout waiting for retailers to load")
+        print("Retailers are being loaded by another request, waiting...")
+
+    try:
+        return await retailer_cache.wait_until_loaded(RETAILER_CONFIG["ready_timeout_seconds"])
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Retailers are still loading, please retry shortly",
+            headers={"Retry-After": str(RETAILER_CONFIG["retry_after_seconds"])}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load retailers: {str(e)}")
+
+
+def find_retailer_by_phone(phone: str) -> Optional[Retailer]:
+    """Look up a cached retailer by (normalized) phone number"""
+    snapshot = retailer_cache.snapshot()
+    if not phone or snapshot is None:
+        return None
+    return snapshot.by_phone.get(normalize_phone(phone))
+
+
+def retailer_call_zone(phone: str):
+    """Time zone of the store at this number (None if unknown: no hours restriction)"""
+    retailer = find_retailer_by_phone(phone)
+    if retailer is None:
+        return None
+    return retailer_timezone(retailer.state, retailer.latitude, retailer.longitude)
+
+
+def resolve_watch(watch_reference: Optional[str]) -> Tuple[str, Dict]:
+    """Get watch config - use specified reference or default"""
+    print(f"[API] Received watch_reference: {watch_reference}")
+    watch_ref = watch_reference or DEFAULT_WATCH
+    if watch_ref not in WATCHES:
+        print(f"[API] Watch ref '{watch_ref}' not in WATCHES, using default")
+        watch_ref = DEFAULT_WATCH
+    watch_config = WATCHES[watch_ref]
+    print(f"[API] Using watch: {watch_config['dial']} ({watch_ref})")
+    return watch_ref, watch_config
+
+
+def new_job_id(prefix: str) -> str:
+    """Job ID that is unique across worker processes, not just within this one"""
+    return f"{prefix}_{datetime.now().timestamp()}_{uuid.uuid4().hex[:8]}"
 
 
 def get_bland_api_key() -> str:
@@ -231,17 +453,23 @@ async def startup_event():
     print("Tudor Watch Finder API Starting")
     print("=" * 60)
     # Pre-load retailers from bundled JSON on startup (instant — no network calls)
-    try:
-        retailers = load_retailers_sync()
-        retailer_cache.set_retailers(retailers)
-        print(f"Pre-loaded {len(retailers)} retailers on startup")
-        # Geocode missing coordinates in background thread (doesn't block healthcheck)
-        geo_thread = threading.Thread(target=geocode_retailers_background, args=(retailers,), daemon=True)
-        geo_thread.start()
-    except Exception as e:
-        print(f"WARNING: Failed to pre-load retailers: {e}")
+    snapshot = reload_retailers()
+    if snapshot:
+        print(f"Pre-loaded {len(snapshot.retailers)} retailers on startup")
+    else:
         print("Retailers will be loaded on first search request")
 
+    if RETAILER_CONFIG["hot_reload"]:
+        threading.Thread(target=watch_retailers_file, daemon=True).start()
+
+    resume_batches()
+    resume_scheduled_calls()
+
+    if webhooks_enabled():
+        print(f"Call completion via webhooks at {public_base_url()}{WEBHOOK_CONFIG['path']}")
+    else:
+        print("Call completion via polling (set PUBLIC_BASE_URL and BLAND_WEBHOOK_SECRET for webhooks)")
+
 
 @app.get("/", response_class=HTMLResponse)
 async def root():
@@ -274,10 +502,24 @@ async def get_watch_info(reference: Optional[str] = None):
 @app.get("/api/cache-status")
 async def cache_status():
     """Check the status of the retailer cache"""
+    snapshot = retailer_cache.snapshot()
     return {
         "loaded": retailer_cache.is_loaded,
         "loading": retailer_cache.is_loading,
-        "count": len(retailer_cache.get_retailers()) if retailer_cache.is_loaded else 0
+        "count": len(snapshot.retailers) if retailer_cache.is_loaded else 0,
+        "generation": retailer_cache.generation,
+        "loaded_at": snapshot.loaded_at.isoformat() if snapshot else None
+    }
+
+
+@app.post("/api/admin/reload-retailers", status_code=202)
+async def reload_retailers_endpoint():
+    """Rebuild retailer data from the snapshot file in the background and swap it in"""
+    current = retailer_cache.generation
+    threading.Thread(target=reload_retailers, daemon=True).start()
+    return {
+        "status": "reloading",
+        "current_generation": current
     }
 
 
@@ -286,10 +528,10 @@ async def search_retailers(zip_code: str, radius: float = 50):
     """Search for retailers near a zip code (GET version)"""
     print(f"[SEARCH] Request: zip_code={zip_code}, radius={radius}")
     try:
-        retailers = get_retailers()
-        print(f"[SEARCH] Got {len(retailers)} total retailers from cache")
+        snapshot = await get_retailer_snapshot()
+        print(f"[SEARCH] Got {len(snapshot.retailers)} total retailers from cache")
         filter = RetailerFilter()
-        filtered = filter.filter_by_zip_code(retailers, zip_code, radius)
+        filtered = filter.filter_by_zip_code(list(snapshot.retailers), zip_code, radius, index=snapshot.spatial_index)
         print(f"[SEARCH] Filtered to {len(filtered)} retailers within {radius} miles of {zip_code}")
 
         results = []
@@ -316,6 +558,8 @@ async def search_retailers(zip_code: str, radius: float = 50):
             "retailers": results
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         print(f"[SEARCH] ValueError: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -330,9 +574,11 @@ async def search_retailers(zip_code: str, radius: float = 50):
 async def search_retailers_post(request: SearchRequest):
     """Search for retailers near a zip code (POST version)"""
     try:
-        retailers = get_retailers()
+        snapshot = await get_retailer_snapshot()
         filter = RetailerFilter()
-        filtered = filter.filter_by_zip_code(retailers, request.zip_code, request.radius_miles)
+        filtered = filter.filter_by_zip_code(
+            list(snapshot.retailers), request.zip_code, request.radius_miles, index=snapshot.spatial_index
+        )
 
         results = []
         for retailer, distance in filtered:
@@ -359,6 +605,8 @@ async def search_retailers_post(request: SearchRequest):
             "cache_status": "loaded" if retailer_cache.is_loaded else "loading"
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -366,47 +614,33 @@ async def search_retailers_post(request: SearchRequest):
 
 
 @app.post("/api/call")
-async def make_single_call(request: SingleCallRequest, background_tasks: BackgroundTasks):
+async def make_single_call(request: SingleCallRequest):
     """Start a phone call to check inventory at a SINGLE retailer"""
     api_key = get_bland_api_key()
     if not api_key:
         raise HTTPException(status_code=400, detail="Bland AI API key not configured")
 
-    # Get watch config - use specified reference or default
-    print(f"[API] Received watch_reference: {request.watch_reference}")
-    watch_ref = request.watch_reference or DEFAULT_WATCH
-    if watch_ref not in WATCHES:
-        print(f"[API] Watch ref '{watch_ref}' not in WATCHES, using default")
-        watch_ref = DEFAULT_WATCH
-    watch_config = WATCHES[watch_ref]
-    print(f"[API] Using watch: {watch_config['dial']} ({watch_ref})")
+    watch_ref, watch_config = resolve_watch(request.watch_reference)
 
     try:
-        # Create a unique job ID for this call
-        job_id = f"call_{datetime.now().timestamp()}"
+        job_id = new_job_id("call")
+        opens_at = call_scheduler.next_call_time(retailer_call_zone(request.phone))
+        cached = call_cache.lookup(normalize_phone(request.phone), watch_ref) if opens_at else None
 
         # Initialize job status
-        call_jobs[job_id] = {
-            "status": "starting",
+        job_store.create(job_id, {
+            "status": "queued" if opens_at and not cached else "starting",
             "retailer_name": request.retailer_name,
             "phone": request.phone,
             "watch_reference": watch_ref,
+            "session_id": request.session_id,
+            "distance": request.distance,
             "result": None,
             "error": None,
             "started_at": datetime.now().isoformat()
-        }
+        })
 
-        # Start the call in background
-        background_tasks.add_task(
-            run_single_call_background,
-            job_id,
-            request.retailer_name,
-            request.phone,
-            api_key,
-            watch_config
-        )
-
-        return {
+        response = {
             "call_id": job_id,
             "retailer_name": request.retailer_name,
             "phone": request.phone,
@@ -414,95 +648,812 @@ async def make_single_call(request: SingleCallRequest, background_tasks: Backgro
             "status": "started"
         }
 
+        if opens_at and not cached:
+            # Store is closed: queue the call for when it opens instead of ringing an empty shop
+            admit_call(job_id, api_key, response)
+            job = job_store.update(job_id, scheduled_for=opens_at.isoformat())
+            schedule_call(job_id, job, api_key, watch_config)
+            response.update(status="queued", scheduled_for=opens_at.isoformat())
+            return response
+
+        claim = claim_call(job_id, request.phone, watch_ref)
+        if claim.decision == CACHED:
+            # Same fields as GET /api/call/{id} (no transcript)
+            response.update(job_status_payload(job_id, job_store.get(job_id)))
+            return response
+        if claim.decision == JOINED:
+            response.update(status="joined", joined_call_id=claim.job_id)
+            return response
+
+        # This job owns the call: it waits for a slot in the scheduler's global call budget
+        admit_call(job_id, api_key, response)
+        job = job_store.transition(job_id, {"starting"}, status="queued")
+        schedule_call(job_id, job, api_key, watch_config)
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start call: {str(e)}")
 
 
+def admit_call(job_id: str, api_key: str, response: Dict):
+    """
+    Check the spend budgets before a call job places its call
+
+    The call's estimated cost is reserved under the job ID until the call is
+    recorded or the job ends without one. Soft-budget warnings are added to
+    the response; past a hard budget the job fails and the request is
+    answered with a 402.
+    """
+    admission = call_ledger.admit(api_key, reservations=[job_id])
+    if admission.warnings:
+        print(f"[{job_id}] Budget: {'; '.join(admission.warnings)}")
+        response["budget_warnings"] = admission.warnings
+    if not admission.ok:
+        fail_call_job(job_id, f"Over budget: {admission.reason}")
+        raise HTTPException(status_code=402, detail=f"Call budget exceeded: {admission.reason}")
+
+
+def claim_call(job_id: str, phone: str, watch_ref: str):
+    """
+    Check the call cache before placing a call for a new (still "starting") job
+
+    If the same store is already being called about the same watch, the job
+    joins that call and is completed along with it. If a fresh outcome is
+    cached, the job completes at once from it. Otherwise the job owns the call.
+
+    Returns:
+        The call_cache Claim
+    """
+    claim = call_cache.claim(normalize_phone(phone), watch_ref, job_id)
+    if claim.decision == JOINED:
+        print(f"[{job_id}] Joining in-flight call {claim.job_id}")
+        # The leader may already have finished and completed this job
+        job_store.transition(job_id, {"starting"}, status="in_progress", joined_call_id=claim.job_id)
+    elif claim.decision == CACHED:
+        print(f"[{job_id}] Using cached outcome of {claim.job_id}")
+        job_store.update(
+            job_id,
+            status="completed",
+            result=claim.result,
+            cached=True,
+            cached_from=claim.job_id,
+            cached_at=datetime.fromtimestamp(claim.completed_at).isoformat(),
+            completed_at=datetime.now().isoformat()
+        )
+    return claim
+
+
+def fail_call_job(job_id: str, error: str):
+    """Mark a call job failed, along with any jobs that joined its call"""
+    job_store.update(job_id, status="failed", error=error)
+    call_ledger.release(job_id)
+    for follower in call_cache.release(job_id).followers:
+        job_store.update(follower, status="failed", error=error)
+
+
 def run_single_call_background(job_id: str, retailer_name: str, phone: str, api_key: str, watch_config: dict = None):
-    """Background task to make a single phone call (runs synchronously in thread pool)"""
+    """
+    Background task to make a single phone call (runs synchronously in thread pool)
+
+    With webhooks configured the task returns as soon as the call is placed and
+    /api/webhooks/bland finishes the job; otherwise it polls until the call ends.
+    """
     try:
         watch = watch_config or WATCH_CONFIG
         print(f"[{job_id}] Starting background call to {retailer_name} at {phone}")
         print(f"[{job_id}] Watch config received: {watch.get('dial', 'unknown')} ({watch.get('reference', 'unknown')})")
         print(f"[{job_id}] Watch full_name: {watch['full_name']}")
-        call_jobs[job_id]["status"] = "in_progress"
+        job_store.update(job_id, status="in_progress")
 
-        # Create caller and make the call (this is synchronous and waits for completion)
         print(f"[{job_id}] Creating BlandAICaller...")
-        caller = BlandAICaller(api_key, watch_config=watch)
-        print(f"[{job_id}] Making call...")
-        result = caller.make_call(phone, retailer_name)
-        print(f"[{job_id}] Call completed with status: {result.status.value}")
-
-        # Generate summary using Claude if we have a transcript
-        summary = ""
-        if result.transcript and result.transcript.strip():
-            print(f"[{job_id}] Generating summary with Claude for {retailer_name}...")
-            try:
-                # Pass the watch name so Claude knows which watch was being asked about
-                watch_name = f"Tudor {watch['model']} {watch['case_size']} with {watch['dial'].lower()}"
-                print(f"[{job_id}] Watch name for summary: {watch_name}")
-                summary = summarize_transcript(result.transcript, retailer_name, watch_name)
-                print(f"[{job_id}] Summary generated: {summary[:100]}...")
-            except Exception as sum_err:
-                print(f"[{job_id}] Error generating summary: {sum_err}")
-                summary = ""
-
-        # Re-analyze inventory status using BOTH transcript AND Claude summary
-        # This catches cases where the summary has clearer language than the transcript
-        if summary:
-            print(f"[{job_id}] Re-analyzing inventory status with Claude summary...")
-            final_status = caller._analyze_inventory_status(result.transcript or "", summary)
-            print(f"[{job_id}] Final status after re-analysis: {final_status.value}")
+        caller = BlandAICaller(api_key, watch_config=watch, poller=get_call_poller())
+
+        webhook_url = callback_url(job_id)
+        if webhook_url:
+            # Place the call and return; the webhook completes the job
+            print(f"[{job_id}] Placing call (completion via webhook)...")
+            bland_call_id, failure = caller.start_call(phone, retailer_name, webhook_url=webhook_url)
+            if failure is None:
+                job_store.update(job_id, bland_call_id=bland_call_id, completion="webhook")
+                watch_for_lost_webhook(job_id, bland_call_id, api_key, watch)
+                print(f"[{job_id}] Call placed ({bland_call_id}), waiting for webhook")
+                return
+            result = failure
         else:
-            final_status = result.status
-
-        # Fallback if Claude summarization failed or no transcript
-        if not summary or summary.strip() == "":
-            status_val = final_status.value
-            if status_val == "in_stock":
-                summary = "The retailer confirmed they have the watch in stock."
-            elif status_val == "out_of_stock":
-                summary = "The retailer confirmed they do not have the watch in stock."
-            elif status_val == "waitlist":
-                summary = "The watch is not in stock, but you can join a waitlist or client book."
-            elif status_val == "can_order":
-                summary = "The watch is not in stock, but the retailer can special order it."
-            elif status_val == "no_answer":
-                summary = "Unable to reach the store - no answer or went to voicemail."
-            elif status_val == "call_failed":
-                summary = "The call could not be completed due to a technical issue."
-            else:
-                summary = "Could not determine stock status - may have reached an automated system or the call ended before getting an answer."
-
-        call_jobs[job_id]["status"] = "completed"
-        call_jobs[job_id]["result"] = {
-            "retailer_name": result.retailer_name,
-            "phone": result.retailer_phone,
-            "inventory_status": final_status.value,
-            "summary": summary,
-            "transcript": result.transcript,
-            "call_duration": result.call_duration
-        }
-        call_jobs[job_id]["completed_at"] = datetime.now().isoformat()
-        print(f"[{job_id}] Job completed successfully")
+            # No public URL: make the call and poll until it completes
+            print(f"[{job_id}] Making call...")
+            result = caller.make_call(phone, retailer_name)
+
+        finish_call_job(job_id, result, caller, watch)
 
     except Exception as e:
         import traceback
         print(f"[{job_id}] ERROR in background task: {e}")
         print(f"[{job_id}] Traceback: {traceback.format_exc()}")
-        call_jobs[job_id]["status"] = "failed"
-        call_jobs[job_id]["error"] = str(e)
+        fail_call_job(job_id, str(e))
+
+
+def finish_call_job(job_id: str, result, caller: BlandAICallerBase, watch: dict):
+    """
+    Summarize and classify a finished call, record it in history and complete its job
+
+    Shared by the polling path and the webhook receiver.
+    """
+    retailer_name = result.retailer_name
+    print(f"[{job_id}] Call completed with status: {result.status.value}")
+
+    # Generate summary using Claude if we have a transcript
+    summary = ""
+    if result.transcript and result.transcript.strip():
+        print(f"[{job_id}] Generating summary with Claude for {retailer_name}...")
+        try:
+            # Pass the watch name so Claude knows which watch was being asked about
+            watch_name = f"Tudor {watch['model']} {watch['case_size']} with {watch['dial'].lower()}"
+            print(f"[{job_id}] Watch name for summary: {watch_name}")
+            summary = summarize_transcript(result.transcript, retailer_name, watch_name)
+            print(f"[{job_id}] Summary generated: {summary[:100]}...")
+        except Exception as sum_err:
+            print(f"[{job_id}] Error generating summary: {sum_err}")
+            summary = ""
+
+    # Re-analyze inventory status using BOTH transcript AND Claude summary
+    # This catches cases where the summary has clearer language than the transcript
+    if summary:
+        print(f"[{job_id}] Re-analyzing inventory status with Claude summary...")
+        final_status = caller._analyze_inventory_status(result.transcript or "", summary)
+        print(f"[{job_id}] Final status after re-analysis: {final_status.value}")
+    else:
+        final_status = result.status
+
+    # Fallback if Claude summarization failed or no transcript
+    if not summary or summary.strip() == "":
+        status_val = final_status.value
+        if status_val == "in_stock":
+            summary = "The retailer confirmed they have the watch in stock."
+        elif status_val == "out_of_stock":
+            summary = "The retailer confirmed they do not have the watch in stock."
+        elif status_val == "waitlist":
+            summary = "The watch is not in stock, but you can join a waitlist or client book."
+        elif status_val == "can_order":
+            summary = "The watch is not in stock, but the retailer can special order it."
+        elif status_val == "no_answer":
+            summary = "Unable to reach the store - no answer or went to voicemail."
+        elif status_val == "call_failed":
+            summary = "The call could not be completed due to a technical issue."
+        else:
+            summary = "Could not determine stock status - may have reached an automated system or the call ended before getting an answer."
+
+    # Persist the outcome so /api/history can answer without a new call
+    try:
+        retailer = find_retailer_by_phone(result.retailer_phone)
+        result.status = final_status
+        result.summary = summary
+        stock_history.record_call_result(
+            result,
+            watch['reference'],
+            state=retailer.state if retailer else ""
+        )
+    except Exception as hist_err:
+        print(f"[{job_id}] Error recording history: {hist_err}")
+
+    # The transcript and raw payload are served lazily by /api/call/{id}/transcript
+    try:
+        result.offload(call_blobs)
+    except Exception as blob_err:
+        print(f"[{job_id}] Error storing transcript: {blob_err}")
+
+    job_result = {
+        "retailer_name": result.retailer_name,
+        "phone": result.retailer_phone,
+        "inventory_status": final_status.value,
+        "summary": summary,
+        "blob_key": result.blob_key,
+        "call_duration": result.call_duration
+    }
+    call_ledger.record(result.call_id, caller.api_key, result.call_duration, job_id=job_id)
+
+    # Jobs that joined this call stay attached to it through any retry
+    if requeue_for_retry(job_id, final_status.value, summary, result.call_id, watch, caller.api_key):
+        return
+
+    job = job_store.get(job_id) or {}
+    attempts = job.get("attempts", [])
+    attempts = attempts + [attempt_record(len(attempts) + 1, final_status.value, summary, result.call_id)]
+    completed_at = datetime.now().isoformat()
+    job_store.update(job_id, status="completed", result=job_result, attempts=attempts, completed_at=completed_at)
+
+    # Jobs that joined this call get the same outcome
+    for follower in call_cache.complete(job_id, job_result).followers:
+        job_store.update(follower, status="completed", result=job_result, completed_at=completed_at)
+    print(f"[{job_id}] Job completed successfully")
+
+
+def requeue_for_retry(
+    job_id: str,
+    status: str,
+    summary: str,
+    bland_call_id: Optional[str],
+    watch: dict,
+    api_key: Optional[str] = None
+) -> bool:
+    """
+    Put a call job back in the queue if its outcome is worth another try
+
+    The attempt is added to the job's ``attempts`` history and the job is
+    queued with ``retry_at`` (backoff with jitter). Its call-cache entry stays
+    in flight, so jobs that joined the call wait for the retry's outcome.
+    Batch calls are re-run by their batch's scheduler entry; other jobs are
+    scheduled here. No retry is made past the hard budget of ``api_key``.
+
+    Returns:
+        True if the job was re-queued
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return False
+    attempts = job.get("attempts", [])
+    if not retry_policy.should_retry(status, len(attempts) + 1):
+        return False
+    if not call_ledger.admit(api_key or get_bland_api_key(), reservations=[job_id]).ok:
+        print(f"[{job_id}] {status}: not retrying (over budget)")
+        return False
+
+    delay = retry_policy.delay(len(attempts) + 1)
+    retry_at = call_scheduler.clock() + timedelta(seconds=delay)
+    attempts = attempts + [attempt_record(len(attempts) + 1, status, summary, bland_call_id, delay)]
+    call_cache.hold(job_id, delay)
+    job = job_store.update(
+        job_id,
+        status="queued",
+        attempts=attempts,
+        retry_at=retry_at.isoformat(),
+        scheduled_for=None,
+        bland_call_id=None,
+        completion=None
+    )
+    print(f"[{job_id}] {status}: retrying in {delay:.0f}s (attempt {len(attempts) + 1} of {retry_policy.max_attempts})")
+    if not job.get("batch_id"):
+        # Retry under the key the call was made with, not the server's
+        api_key = api_key or get_bland_api_key()
+        if api_key:
+            schedule_call(job_id, job, api_key, watch)
+        else:
+            fail_call_job(job_id, "Bland AI API key not configured")
+    return True
+
+
+def watch_for_lost_webhook(job_id: str, bland_call_id: str, api_key: str, watch: dict):
+    """
+    Start a deadline for a call that completes by webhook
+
+    If the job is still waiting on that call when WEBHOOK_CONFIG's deadline
+    passes, the call is polled through the shared CallStatusPoller instead; a
+    webhook arriving meanwhile still wins. If polling doesn't resolve it
+    either, the job (and any jobs that joined it) fails, freeing its call-cache key.
+    """
+    def check():
+        job = job_store.get(job_id)
+        if job is None or job["status"] != "in_progress" or job.get("bland_call_id") != bland_call_id:
+            return
+        print(f"[{job_id}] No webhook for {bland_call_id} yet, polling it")
+        caller = BlandAICaller(api_key, watch_config=watch)
+        data = get_call_poller().track(
+            bland_call_id, caller.fetch_call_status, WEBHOOK_CONFIG["fallback_max_wait_seconds"]
+        ).result()
+
+        # Only finish the job if the webhook hasn't in the meantime
+        claimed = job_store.transition(job_id, {"in_progress"}, status="finishing")
+        if claimed is None or claimed.get("bland_call_id") != bland_call_id:
+            return
+        if data is None:
+            fail_call_job(job_id, "No completion webhook received and the call could not be polled")
+            return
+        try:
+            result = caller.result_from_payload(data, claimed["retailer_name"], claimed["phone"], claimed.get("started_at"))
+            finish_call_job(job_id, result, caller, watch)
+        except Exception as e:
+            print(f"[{job_id}] ERROR completing call from poll fallback: {e}")
+            fail_call_job(job_id, str(e))
+
+    timer = threading.Timer(WEBHOOK_CONFIG["completion_deadline_seconds"], check)
+    timer.daemon = True
+    timer.start()
+
+
+def complete_call_from_webhook(job_id: str, job: Dict, data: Dict):
+    """Finish a call job from a verified webhook payload (runs in the thread pool)"""
+    try:
+        watch = WATCHES.get(job.get("watch_reference"), WATCH_CONFIG)
+        caller = BlandAICaller(get_bland_api_key(), watch_config=watch)
+        result = caller.result_from_payload(data, job["retailer_name"], job["phone"], job.get("started_at"))
+        finish_call_job(job_id, result, caller, watch)
+    except Exception as e:
+        print(f"[{job_id}] ERROR completing call from webhook: {e}")
+        fail_call_job(job_id, str(e))
+
+
+@app.post("/api/webhooks/bland")
+async def bland_webhook(request: Request, background_tasks: BackgroundTasks, job_id: str = "", token: str = ""):
+    """Receive a completed call from Bland AI and finish its job"""
+    body = await request.body()
+    signature = request.headers.get(WEBHOOK_CONFIG["signature_header"])
+    if not verify_delivery(webhook_secret(), job_id, token, body, signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body is not valid JSON")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Webhook body must be a JSON object")
+
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Call job not found")
+    if job.get("bland_call_id") and data.get("call_id") and data["call_id"] != job["bland_call_id"]:
+        raise HTTPException(status_code=409, detail="Webhook call_id does not match the job")
+
+    if data.get("status") not in FINAL_CALL_STATUSES and not data.get("completed"):
+        return {"status": "ignored", "reason": "call not finished"}
+
+    # Bland AI may retry deliveries; only the first one finishes the job
+    claimed = job_store.transition(job_id, {"starting", "in_progress"}, status="finishing")
+    if claimed is None:
+        return {"status": "duplicate"}
+
+    background_tasks.add_task(complete_call_from_webhook, job_id, claimed, data)
+    return {"status": "accepted"}
+
+
+# ============================================================
+# Batch Calls
+# ============================================================
+# Serializes progress recomputation within this process
+batch_progress_lock = threading.Lock()
+
+
+def nearest_callable_retailers(
+    snapshot: RetailerSnapshot,
+    zip_code: str,
+    radius_miles: float,
+    max_calls: int,
+    exclude_phones: List[str] = ()
+) -> List[Tuple[Retailer, float]]:
+    """Nearest retailers with a phone number, one per number, skipping excluded numbers"""
+    filtered = RetailerFilter().filter_by_zip_code(
+        list(snapshot.retailers), zip_code, radius_miles, index=snapshot.spatial_index
+    )
+    seen = {normalize_phone(p) for p in exclude_phones if p}
+    picked = []
+    for retailer, distance in filtered:
+        if not retailer.phone:
+            continue
+        phone = normalize_phone(retailer.phone)
+        if phone in seen:
+            continue
+        seen.add(phone)
+        picked.append((retailer, distance))
+        if len(picked) >= max_calls:
+            break
+    return picked
+
+
+def batch_progress(call_ids: List[str]) -> Dict:
+    """Aggregate the statuses of a batch's call jobs"""
+    progress = {"total": len(call_ids), "queued": 0, "in_progress": 0, "completed": 0, "failed": 0, "cancelled": 0}
+    inventory: Dict[str, int] = {}
+    for call_id in call_ids:
+        job = job_store.get(call_id)
+        status = job["status"] if job else "failed"
+        if status in ("queued", "completed", "failed", "cancelled"):
+            progress[status] += 1
+        else:
+            progress["in_progress"] += 1
+        if status == "completed" and job.get("result"):
+            key = job["result"]["inventory_status"]
+            inventory[key] = inventory.get(key, 0) + 1
+    progress["inventory"] = inventory
+    return progress
+
+
+def refresh_batch_progress(batch_id: str) -> Optional[Dict]:
+    """Recompute a batch's progress and mark it completed once every call is done"""
+    with batch_progress_lock:
+        batch = job_store.get(batch_id)
+        if batch is None:
+            return None
+        progress = batch_progress(batch["call_ids"])
+        fields = {"progress": progress}
+        finished = progress["completed"] + progress["failed"] + progress["cancelled"]
+        if finished == progress["total"] and batch["status"] != "completed":
+            fields.update(status="completed", completed_at=datetime.now().isoformat())
+        return job_store.update(batch_id, **fields)
+
+
+def wait_for_job_completion(job_id: str):
+    """
+    Block until a call job finishes
+
+    Calls completed by webhook return from run_single_call_background as soon
+    as they are placed; this re-reads the local job store (not Bland AI) so the
+    scheduler's call budget still covers them.
+    """
+    deadline = time.monotonic() + BATCH_CONFIG["completion_timeout_seconds"]
+    while time.monotonic() < deadline:
+        job = job_store.get(job_id)
+        # "queued" again means the call was re-queued for a retry
+        if job is None or job["status"] in TERMINAL_JOB_STATUSES or job["status"] == "queued":
+            return
+        time.sleep(BATCH_CONFIG["completion_poll_seconds"])
+    error = "Timed out waiting for the call to complete"
+    if job_store.transition(job_id, {"starting", "in_progress", "finishing"}, status="failed", error=error):
+        call_ledger.release(job_id)
+        for follower in call_cache.release(job_id).followers:
+            job_store.update(follower, status="failed", error=error)
+
+
+def run_batch_call(batch_id: Optional[str], call_id: str, api_key: str, watch_config: dict) -> Optional[datetime]:
+    """
+    Run one queued call, of a batch or on its own (skipped if another worker already took it)
+
+    Returns:
+        When a batch call was re-queued for a retry, the time to run it again
+    """
+    job = job_store.transition(call_id, {"queued"}, status="starting")
+    if job is None:
+        return None
+    try:
+        claim = claim_call(call_id, job["phone"], job.get("watch_reference") or watch_config.get("reference", ""))
+        if claim.decision == CLAIMED:
+            run_single_call_background(call_id, job["retailer_name"], job["phone"], api_key, watch_config)
+        wait_for_job_completion(call_id)
+    finally:
+        if batch_id:
+            apply_sweep_strategy(batch_id)
+            refresh_batch_progress(batch_id)
+
+    job = job_store.get(call_id)
+    if job and job["status"] == "queued":
+        # Re-queued for a retry, which holds its own budget reservation
+        return datetime.fromisoformat(job["retry_at"]) if batch_id and job.get("retry_at") else None
+    # Finished, failed or answered without a call (joined or cached): nothing more will be charged
+    call_ledger.release(call_id)
+    return None
+
+
+def apply_sweep_strategy(batch_id: str) -> int:
+    """
+    Cancel a batch's queued calls once its sweep strategy no longer wants them
+
+    Calls already ringing are left to finish. A call waiting to retry also
+    gives up its in-flight call-cache entry; jobs that had joined it fail.
+
+    Returns:
+        Number of calls cancelled
+    """
+    batch = job_store.get(batch_id)
+    if not batch or not batch.get("strategy"):
+        return 0
+    strategy = SweepStrategy(**batch["strategy"])
+    if strategy.mode == ALL:
+        return 0
+
+    tracker = SweepTracker(strategy)
+    for entry in batch.get("website") or []:
+        tracker.observe(normalize_phone(entry["phone"]), entry["status"] == InventoryStatus.IN_STOCK.value,
+                        entry["distance"])
+    jobs = {call_id: job_store.get(call_id) for call_id in batch["call_ids"]}
+    for job in jobs.values():
+        if job and job["status"] == "completed" and job.get("result"):
+            in_stock = job["result"]["inventory_status"] == InventoryStatus.IN_STOCK.value
+            tracker.observe(normalize_phone(job["phone"]), in_stock, job.get("distance"))
+
+    cancelled = []
+    completed_at = datetime.now().isoformat()
+    for call_id, job in jobs.items():
+        if not job or job["status"] != "queued" or tracker.wanted(job.get("distance")):
+            continue
+        if job_store.transition(call_id, {"queued"}, status="cancelled", completed_at=completed_at):
+            cancelled.append(call_id)
+            if job.get("attempts"):
+                for follower in call_cache.release(call_id).followers:
+                    job_store.update(follower, status="failed", error="The call it joined was cancelled")
+    if cancelled:
+        call_scheduler.cancel(cancelled)
+        call_ledger.release(*cancelled)
+        print(f"[{batch_id}] Sweep goal met ({strategy.mode}): cancelled {len(cancelled)} queued calls")
+    return len(cancelled)
+
+
+def schedule_call(
+    call_id: str,
+    job: Dict,
+    api_key: str,
+    watch_config: dict,
+    batch_id: Optional[str] = None,
+    group_limit: Optional[int] = None
+) -> concurrent.futures.Future:
+    """
+    Queue a call job with the scheduler, which runs it once the store is likely
+    open (and not before the job's ``retry_at``, if it is a retry)
+
+    Returns:
+        Future resolved when the call has finished (or was skipped)
+    """
+    retailer = find_retailer_by_phone(job["phone"])
+    tz = retailer_timezone(retailer.state, retailer.latitude, retailer.longitude) if retailer else None
+    scheduled = call_scheduler.submit(
+        call_id,
+        lambda: run_batch_call(batch_id, call_id, api_key, watch_config),
+        tz=tz,
+        distance=job.get("distance"),
+        retailer_type=retailer.retailer_type if retailer else None,
+        group=batch_id,
+        group_limit=group_limit,
+        not_before=datetime.fromisoformat(job["retry_at"]) if job.get("retry_at") else None,
+        score=job.get("score")
+    )
+    return scheduled.future
+
+
+def run_batch(batch_id: str, api_key: str, watch_config: dict):
+    """
+    Run a batch's queued calls through the call scheduler (own thread, independent of the request)
+
+    At most BATCH_CONFIG['max_concurrency'] of the batch's calls run at once,
+    within the scheduler's global budget; calls to closed stores wait for
+    their opening hours and carry the time in ``scheduled_for``.
+    """
+    batch = job_store.get(batch_id)
+    if batch is None:
+        return
+    print(f"[{batch_id}] Running {len(batch['call_ids'])} calls, {BATCH_CONFIG['max_concurrency']} at a time")
+    futures = []
+    for call_id in batch["call_ids"]:
+        job = job_store.get(call_id)
+        if job is None or job["status"] != "queued":
+            continue
+        opens_at = call_scheduler.next_call_time(retailer_call_zone(job["phone"]))
+        if opens_at:
+            job = job_store.update(call_id, scheduled_for=opens_at.isoformat())
+        futures.append(schedule_call(
+            call_id, job, api_key, watch_config, batch_id=batch_id, group_limit=BATCH_CONFIG["max_concurrency"]
+        ))
+    concurrent.futures.wait(futures)
+    batch = refresh_batch_progress(batch_id)
+    print(f"[{batch_id}] Batch finished: {batch['progress'] if batch else 'expired'}")
+
+
+def start_batch(batch_id: str, api_key: str, watch_config: dict):
+    threading.Thread(target=run_batch, args=(batch_id, api_key, watch_config), daemon=True).start()
+
+
+def resume_batches():
+    """
+    Restart the queued calls of batches left running by an earlier server process
+
+    Calls already in flight when that process stopped are not restarted.
+    """
+    for batch_id in job_store.list_jobs_by_status({"running"}):
+        batch = job_store.get(batch_id)
+        if not batch or batch.get("type") != "batch":
+            continue
+        api_key = get_bland_api_key()
+        if not api_key or not batch.get("uses_server_key"):
+            # The caller's own key was never stored, so its queued calls cannot run
+            for call_id in batch["call_ids"]:
+                if job_store.transition(call_id, {"queued"}, status="failed", error="Batch interrupted by a server restart"):
+                    call_ledger.release(call_id)
+            refresh_batch_progress(batch_id)
+            continue
+        print(f"[{batch_id}] Resuming batch")
+        start_batch(batch_id, api_key, WATCHES.get(batch["watch_reference"], WATCH_CONFIG))
+
+
+def resume_scheduled_calls():
+    """Re-queue single calls that were waiting for store hours or a retry when an earlier server process stopped"""
+    api_key = get_bland_api_key()
+    for call_id in job_store.list_jobs_by_status({"queued"}):
+        job = job_store.get(call_id)
+        if not job or job.get("batch_id") or not (job.get("scheduled_for") or job.get("retry_at")):
+            continue
+        if not api_key:
+            if job_store.transition(call_id, {"queued"}, status="failed", error="Bland AI API key not configured"):
+                call_ledger.release(call_id)
+            continue
+        print(f"[{call_id}] Re-queuing call scheduled for {job.get('retry_at') or job['scheduled_for']}")
+        schedule_call(call_id, job, api_key, WATCHES.get(job.get("watch_reference"), WATCH_CONFIG))
+
+
+@app.post("/api/call/batch", status_code=202)
+async def start_batch_call(request: CallRequest):
+    """Call the nearest retailers with phones as one server-side batch job"""
+    api_key = request.api_key or get_bland_api_key()
+    if not api_key:
+        raise HTTPException(status_code=400, detail="Bland AI API key not configured")
+
+    watch_ref, watch_config = resolve_watch(request.watch_reference)
+    max_calls = max(1, min(request.max_calls, BATCH_CONFIG["max_calls"]))
+    try:
+        strategy = SweepStrategy.from_options(request.strategy, request.hits, request.band_miles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        snapshot = await get_retailer_snapshot()
+        ranking = RANKING_CONFIG["enabled"]
+        candidates = nearest_callable_retailers(
+            snapshot, request.zip_code, request.radius_miles,
+            max_calls * RANKING_CONFIG["candidate_factor"] if ranking else max_calls, request.exclude_phones
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not candidates:
+        raise HTTPException(status_code=404, detail="No retailers with phone numbers found")
+
+    # Call the stores most likely to have the watch, from a pool of the nearest
+    pool = RetailerRanker(stock_history).rank(candidates, watch_ref) if ranking else [
+        RankedRetailer(retailer, distance, 0.0, 0.0, 0.0) for retailer, distance in candidates
+    ]
+    picked, website = pool[:max_calls], []
+    if request.website_first:
+        # Stores whose website answers are settled for free; the rest are called
+        stocks, to_call, _ = await asyncio.get_running_loop().run_in_executor(
+            None, TieredSweep(website_stock_checker, stock_history).plan,
+            [(r.retailer, r.distance) for r in pool], watch_ref, strategy, max_calls
+        )
+        website = [stock.to_dict() for stock in stocks if stock.source == WEBSITE]
+        calling = {id(retailer) for retailer, _ in to_call}
+        picked = [r for r in pool if id(r.retailer) in calling]
+
+    # Only call as many retailers as the spend budgets allow, reserving each call's estimate
+    budget_warnings = []
+    call_ids = [new_job_id("call") for _ in picked]
+    if picked:
+        admission = call_ledger.admit(api_key, len(picked), reservations=call_ids)
+        if not admission.allowed:
+            raise HTTPException(status_code=402, detail=f"Call budget exceeded: {admission.reason}")
+        picked, call_ids = picked[:admission.allowed], call_ids[:admission.allowed]
+        budget_warnings = admission.warnings + ([f"Limited to {admission.allowed} calls: {admission.reason}"]
+                                                if not admission.ok else [])
+
+    batch_id = new_job_id("batch")
+    started_at = datetime.now().isoformat()
+    calls = []
+    for ranked, call_id in zip(picked, call_ids):
+        retailer, distance = ranked.retailer, ranked.distance
+        job_store.create(call_id, {
+            "status": "queued",
+            "retailer_name": retailer.name,
+            "phone": retailer.phone,
+            "watch_reference": watch_ref,
+            "session_id": request.session_id,
+            "batch_id": batch_id,
+            "distance": round(distance, 1),
+            "score": ranked.score,
+            "result": None,
+            "error": None,
+            "started_at": started_at
+        })
+        calls.append({
+            "call_id": call_id,
+            "retailer_name": retailer.name,
+            "phone": retailer.phone,
+            "distance": round(distance, 1),
+            "hit_rate": round(ranked.hit_rate, 3) if ranking else None
+        })
+
+    status = "running" if call_ids else "completed"
+    job_store.create(batch_id, {
+        "type": "batch",
+        "status": status,
+        "zip_code": request.zip_code,
+        "radius_miles": request.radius_miles,
+        "watch_reference": watch_ref,
+        "call_ids": call_ids,
+        "uses_server_key": request.api_key is None,
+        "strategy": strategy.to_dict(),
+        "website_first": request.website_first,
+        "website": website,
+        "progress": batch_progress(call_ids),
+        "started_at": started_at,
+        "completed_at": None if call_ids else started_at
+    })
+    if call_ids:
+        start_batch(batch_id, api_key, watch_config)
+
+    return {
+        "batch_id": batch_id,
+        "status": status,
+        "watch_reference": watch_ref,
+        "max_concurrency": BATCH_CONFIG["max_concurrency"],
+        "strategy": strategy.to_dict(),
+        "budget_warnings": budget_warnings,
+        "website": website,
+        "calls": calls
+    }
+
+
+@app.get("/api/call/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Aggregated progress and per-call status of a batch"""
+    batch = job_store.get(batch_id)
+    if batch is None or batch.get("type") != "batch":
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    calls = []
+    for call_id in batch["call_ids"]:
+        job = job_store.get(call_id)
+        if job is not None:
+            calls.append(job_status_payload(call_id, job))
+
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "zip_code": batch["zip_code"],
+        "radius_miles": batch["radius_miles"],
+        "watch_reference": batch["watch_reference"],
+        "strategy": batch.get("strategy"),
+        "started_at": batch["started_at"],
+        "completed_at": batch.get("completed_at"),
+        "progress": batch_progress(batch["call_ids"]),
+        "website": batch.get("website") or [],
+        "calls": calls,
+        "retailers": merged_batch_statuses(batch.get("website") or [], calls)
+    }
+
+
+def merged_batch_statuses(website: List[Dict], calls: List[Dict]) -> List[Dict]:
+    """One stock status per retailer of a batch: its website's answer, or its call's once completed"""
+    merged = [
+        {"retailer_name": entry["retailer_name"], "phone": entry["phone"], "source": WEBSITE,
+         "status": entry["status"]}
+        for entry in website
+    ]
+    for call in calls:
+        merged.append({
+            "retailer_name": call["retailer_name"],
+            "phone": call["phone"],
+            "source": "phone",
+            "status": call.get("inventory_status") or call["status"]
+        })
+    return merged
 
 
 @app.get("/api/call/{call_id}")
 async def get_call_status(call_id: str):
     """Get the status of a phone call"""
-    if call_id not in call_jobs:
+    job = job_store.get(call_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Call job not found")
+
+    return job_status_payload(call_id, job)
+
+
+@app.get("/api/call/{call_id}/transcript")
+async def get_call_transcript(call_id: str):
+    """Transcript and raw Bland AI payload of a completed call, loaded from the blob store"""
+    job = job_store.get(call_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Call job not found")
+    result = job.get("result") or {}
+    if job["status"] != "completed" or not result:
+        raise HTTPException(status_code=409, detail="Call has not completed yet")
+
+    blob = call_blobs.get(result.get("blob_key"))
+    if blob is None:
+        # Jobs completed before transcripts were offloaded keep them inline
+        blob = {"transcript": result.get("transcript"), "raw_response": None}
+    return {"call_id": call_id, **blob}
 
-    job = call_jobs[call_id]
 
+def job_status_payload(call_id: str, job: Dict) -> Dict:
+    """Public view of a call job (used by polling and by the event streams)"""
     response = {
         "call_id": call_id,
         "status": job["status"],
@@ -514,12 +1465,116 @@ async def get_call_status(call_id: str):
         response["inventory_status"] = job["result"]["inventory_status"]
         response["summary"] = job["result"]["summary"]
 
+    if job.get("cached"):
+        response["cached"] = True
+        response["cached_at"] = job.get("cached_at")
+
+    if job.get("joined_call_id"):
+        response["joined_call_id"] = job["joined_call_id"]
+
+    if job["status"] == "queued" and job.get("scheduled_for"):
+        response["scheduled_for"] = job["scheduled_for"]
+
+    if job.get("attempts"):
+        response["attempts"] = job["attempts"]
+        if job["status"] == "queued":
+            response["retry_at"] = job.get("retry_at")
+
     if job["status"] == "failed":
         response["error"] = job.get("error")
 
     return response
 
 
+# Job statuses after which nothing else will happen
+TERMINAL_JOB_STATUSES = {"completed", "failed", "cancelled"}
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """Encode one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_job_events(request: Request, job_ids_for_stream, close_when_done: bool):
+    """
+    Push job status transitions as Server-Sent Events
+
+    Wakes immediately on updates made in this process and re-reads the store
+    every SSE_CONFIG['poll_interval_seconds'] to pick up other workers' updates.
+
+    Args:
+        request: The streaming request (to stop when the client disconnects)
+        job_ids_for_stream: Callable returning the job IDs to watch right now
+        close_when_done: End the stream once every watched job is terminal
+    """
+    notifier = job_store.notifier
+    wakeup = notifier.subscribe()
+    last_sent: Dict[str, Dict] = {}
+    started = time.monotonic()
+    last_write = started
+    try:
+        while time.monotonic() - started < SSE_CONFIG["max_stream_seconds"]:
+            if await request.is_disconnected():
+                return
+            wakeup.clear()
+
+            all_done = True
+            for job_id in job_ids_for_stream():
+                job = job_store.get(job_id)
+                if job is None:
+                    if job_id not in last_sent:
+                        last_sent[job_id] = {}
+                        yield format_sse("missing", {"call_id": job_id})
+                    continue
+                payload = job_status_payload(job_id, job)
+                if payload != last_sent.get(job_id):
+                    last_sent[job_id] = payload
+                    last_write = time.monotonic()
+                    yield format_sse("status", payload)
+                if payload["status"] not in TERMINAL_JOB_STATUSES:
+                    all_done = False
+
+            if close_when_done and all_done:
+                break
+
+            if time.monotonic() - last_write >= SSE_CONFIG["heartbeat_seconds"]:
+                last_write = time.monotonic()
+                yield ": keepalive\n\n"
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), SSE_CONFIG["poll_interval_seconds"])
+            except asyncio.TimeoutError:
+                pass
+
+        yield format_sse("end", {})
+    finally:
+        notifier.unsubscribe(wakeup)
+
+
+def sse_response(generator) -> StreamingResponse:
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/call/{call_id}/events")
+async def call_events(call_id: str, request: Request):
+    """Stream status transitions and the final summary for one call"""
+    if job_store.get(call_id) is None:
+        raise HTTPException(status_code=404, detail="Call job not found")
+    return sse_response(stream_job_events(request, lambda: [call_id], close_when_done=True))
+
+
+@app.get("/api/sessions/{session_id}/events")
+async def session_events(session_id: str, request: Request):
+    """One multiplexed stream for every call started by a browser session (including later ones)"""
+    return sse_response(
+        stream_job_events(request, lambda: job_store.list_session_jobs(session_id), close_when_done=False)
+    )
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
@@ -527,7 +1582,23 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "retailers_cached": retailer_cache.is_loaded,
-        "retailers_count": len(retailer_cache.get_retailers()) if retailer_cache.is_loaded else 0
+        "retailers_count": len(retailer_cache.get_retailers()) if retailer_cache.is_loaded else 0,
+        "retailers_generation": retailer_cache.generation,
+        "call_completion": "webhook" if webhooks_enabled() else "polling"
+    }
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Call-status poller counters (including polls saved versus fixed 5s polling), the call queue, call spend
+    and the summary cache's hit rate"""
+    summaries = get_summary_cache()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "poller": get_call_poller().stats(),
+        "scheduler": call_scheduler.stats(),
+        "accounting": call_ledger.metrics(),
+        "summary_cache": summaries.stats() if summaries else None
     }
 
 
@@ -547,6 +1618,10 @@ async def check_website_stock(retailer_name: str):
 
     try:
         result = website_stock_checker.check_stock(retailer_name, reference)
+        try:
+            stock_history.record_website_result(result, reference, retailer_name=retailer_name)
+        except Exception as hist_err:
+            print(f"[WEBSITE] Error recording history: {hist_err}")
         return {
             "retailer_name": result.retailer_name,
             "has_scraper": True,
@@ -564,6 +1639,72 @@ async def check_website_stock(retailer_name: str):
         }
 
 
+@app.get("/api/history")
+async def get_stock_history(
+    reference: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    radius: float = 50,
+    days: int = HISTORY_CONFIG["default_max_age_days"]
+):
+    """Recent known stock status for a watch, optionally near a zip code (no new calls)"""
+    watch_ref = reference or DEFAULT_WATCH
+    if watch_ref not in WATCHES:
+        raise HTTPException(status_code=400, detail=f"Unknown watch reference: {watch_ref}")
+
+    if not zip_code:
+        return {
+            "reference": watch_ref,
+            "days": days,
+            "observations": stock_history.latest(watch_ref, max_age_days=days),
+            "rollups": stock_history.rollups(watch_ref, days=days)
+        }
+
+    try:
+        snapshot = await get_retailer_snapshot()
+        filtered = RetailerFilter().filter_by_zip_code(
+            list(snapshot.retailers), zip_code, radius, index=snapshot.spatial_index
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    phones = [normalize_phone(r.phone) for r, _ in filtered if r.phone]
+    names = list({r.name for r, _ in filtered})
+    by_phone = {
+        obs["retailer_phone"]: obs
+        for obs in stock_history.latest(watch_ref, StockHistory.SOURCE_PHONE, retailer_phones=phones, max_age_days=days)
+    }
+    by_name = {
+        obs["retailer_name"]: obs
+        for obs in stock_history.latest(watch_ref, StockHistory.SOURCE_WEBSITE, retailer_names=names, max_age_days=days)
+    }
+
+    results = []
+    for retailer, distance in filtered:
+        phone_obs = by_phone.get(normalize_phone(retailer.phone)) if retailer.phone else None
+        website_obs = by_name.get(retailer.name)
+        if not phone_obs and not website_obs:
+            continue
+        results.append({
+            "name": retailer.name,
+            "city": retailer.city,
+            "state": retailer.state,
+            "phone": retailer.phone,
+            "distance": round(distance, 1),
+            "phone_status": phone_obs,
+            "website_status": website_obs
+        })
+
+    return {
+        "reference": watch_ref,
+        "zip_code": zip_code,
+        "radius": radius,
+        "days": days,
+        "total": len(results),
+        "retailers": results,
+        "rollups": stock_history.rollups(watch_ref, states={r.state for r, _ in filtered}, days=days)
+    }
+
+
 @app.get("/api/supported-retailers")
 async def get_supported_retailers():
     """Get list of retailers with website scrapers"""
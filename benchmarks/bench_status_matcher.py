@@ -0,0 +1,111 @@
+"""
+Status Matcher Benchmark
+Times the compiled StatusMatcher against the legacy classifier over a
+labeled transcript corpus, and fails if any classification differs
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status_matcher import (
+    StatusMatcher, AUTOMATED_PHRASES, NO_ANSWER_PHRASES, OUT_OF_STOCK_PHRASES,
+    OUT_OF_STOCK_WAITLIST_PATTERNS, OUT_OF_STOCK_ORDER_PATTERNS, IN_STOCK_PHRASES
+)
+from benchmarks.legacy_status import legacy_analyze_inventory_status
+
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts.jsonl")
+
+FILLER = [
+    "store:", "agent:", "let me check", "one moment", "thank you", "the ranger 36",
+    "beige dial", "m79930-0007", "tudor", "yes", "no", "sorry", "we", "it", "that",
+    "information", "store", "shipment", "interest", "available", "in stock",
+]
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    """Labeled transcripts: {"transcript", "summary", "label"} per line"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> List[Dict]:
+    """Random mixes of phrases from every tier, to probe tier interactions"""
+    rng = random.Random(seed)
+    phrases = (AUTOMATED_PHRASES + NO_ANSWER_PHRASES + OUT_OF_STOCK_PHRASES + IN_STOCK_PHRASES
+               + [p.replace(".*", " we will ") for p in OUT_OF_STOCK_WAITLIST_PATTERNS + OUT_OF_STOCK_ORDER_PATTERNS])
+    corpus = []
+    for _ in range(count):
+        words = rng.sample(FILLER, 6) + rng.sample(phrases, rng.randint(0, 3))
+        rng.shuffle(words)
+        split = rng.randint(0, len(words))
+        corpus.append({
+            "transcript": " ".join(words[:split]).capitalize(),
+            "summary": " ".join(words[split:]),
+            "label": None,
+        })
+    return corpus
+
+
+def compiled_classify(matcher: StatusMatcher, item: Dict) -> str:
+    text = f"{item['transcript']} {item['summary']}".lower()
+    return matcher.classify(text)[0]
+
+
+def legacy_classify(item: Dict) -> str:
+    return legacy_analyze_inventory_status(item["transcript"], item["summary"]).value
+
+
+def time_per_item(fn, corpus: List[Dict], repeat: int) -> float:
+    """Best-of-repeat microseconds per classification"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in corpus:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StatusMatcher against the legacy classifier")
+    parser.add_argument("--synthetic", type=int, default=5000, help="Extra random transcripts to check")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    labeled = load_corpus()
+    corpus = labeled + synthetic_corpus(args.synthetic)
+    matcher = StatusMatcher()
+
+    mismatches = [
+        (item, legacy_classify(item), compiled_classify(matcher, item))
+        for item in corpus
+        if legacy_classify(item) != compiled_classify(matcher, item)
+    ]
+    agree = sum(1 for item in labeled if legacy_classify(item) == item["label"])
+
+    legacy_us = time_per_item(legacy_classify, corpus, args.repeat)
+    compiled_us = time_per_item(lambda item: compiled_classify(matcher, item), corpus, args.repeat)
+
+    print(f"Corpus: {len(labeled)} labeled + {args.synthetic} synthetic transcripts")
+    print(f"Labels matched by the classifier: {agree}/{len(labeled)}")
+    print(f"Legacy:   {legacy_us:8.1f} us/transcript")
+    print(f"Compiled: {compiled_us:8.1f} us/transcript ({legacy_us / compiled_us:.1f}x)")
+
+    if mismatches:
+        print(f"\nFAIL: {len(mismatches)} classifications differ")
+        for item, old, new in mismatches[:10]:
+            print(f"  legacy={old} compiled={new}: {item['transcript'][:60]!r} / {item['summary'][:40]!r}")
+        sys.exit(1)
+    print("\nOK: every classification matches the legacy classifier")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Legacy Status Classifier
+Verbatim copy of BlandAICallerBase._analyze_inventory_status before the
+phrase lists moved to status_matcher, kept as the parity reference
+"""
+
+import re
+
+from phone_caller import InventoryStatus
+
+
+def legacy_analyze_inventory_status(transcript: str, summary: str) -> InventoryStatus:
+    """
+    Classifier as it was before status_matcher (console output removed)
+
+    Args:
+        transcript: Full call transcript
+        summary: AI-generated summary
+
+    Returns:
+        InventoryStatus enum value
+    """
+    text = f"{transcript} {summary}".lower()
+
+    # First check for automated systems / IVR / hold messages
+    # These mean we didn't actually talk to anyone
+    automated_phrases = [
+        "press zero", "press 0", "press one", "press 1",
+        "press two", "press 2", "all our associates",
+        "all of our associates", "currently assisting",
+        "please hold", "your call is important",
+        "leave a message", "after the beep", "after the tone",
+        "office hours", "business hours", "currently closed",
+        "call back", "try again later", "menu options",
+        "for sales press", "for service press",
+        "thanks, goodbye", "thanks goodbye",  # Agent hung up without info
+        "ended call"  # Agent ended without getting info
+    ]
+    for phrase in automated_phrases:
+        if phrase in text:
+            return InventoryStatus.UNKNOWN
+
+    # Check for no answer / voicemail first
+    no_answer_phrases = [
+        "no answer", "voicemail", "didn't pick up",
+        "couldn't reach", "busy signal", "not available",
+        "leave a message", "after the tone", "mailbox"
+    ]
+    for phrase in no_answer_phrases:
+        if phrase in text:
+            return InventoryStatus.NO_ANSWER
+
+    # Check for NEGATIVE indicators FIRST (before positive ones)
+    # This prevents "not in stock" from matching "in stock"
+    out_of_stock_phrases = [
+        "not in stock", "out of stock", "don't have", "do not have",
+        "don't carry", "do not carry", "sold out", "not available",
+        "currently out", "wasn't in stock", "was not in stock",
+        "weren't in stock", "were not in stock", "isn't in stock",
+        "is not in stock", "aren't in stock", "are not in stock",
+        "doesn't have", "does not have", "didn't have", "did not have",
+        "unavailable", "no longer", "discontinued", "can't get",
+        "cannot get", "unable to", "don't currently have",
+        "do not currently have", "not currently in stock",
+        "currently not in stock", "currently unavailable",
+        # From Claude summaries
+        "did not have the tudor", "did not have the watch",
+        "do not have the tudor", "do not have the watch"
+    ]
+
+    for phrase in out_of_stock_phrases:
+        if phrase in text:
+            # Found a negative indicator - now check for waitlist/order options
+
+            # Check for waitlist
+            waitlist_phrases = [
+                "waitlist", "waiting list", "wait list", "interest list",
+                "put you on a list", "add you to a list", "notify you",
+                "call you when", "contact you when", "let you know when",
+                "call them when", "contact them when",  # Third person from summaries
+                "register.*interest", "take your information",
+                "client book", "client list", "come into the store",
+                "stop by", "visit.*store", "in-store visit", "in store visit",
+                "happy to add you", "add you if you",
+                # From Claude summaries
+                "offered to add", "add the customer", "add the caller",
+                "add their name", "waitlist is available",
+                "visit the store in person", "register their interest",
+                "reach out to add", "get added to",
+                "for a callback", "callback when", "call back when",
+                "take.*information", "caller's information",
+                "when the watch becomes available", "when it becomes available",
+                "when available", "becomes available"
+            ]
+            for wp in waitlist_phrases:
+                if re.search(wp, text):
+                    return InventoryStatus.WAITLIST
+
+            # Check for can order
+            can_order_phrases = [
+                "can order", "could order", "special order", "order it for you",
+                "order one for you", "place an order", "get it in",
+                "expect.*shipment", "expecting.*shipment", "more coming"
+            ]
+            for cop in can_order_phrases:
+                if re.search(cop, text):
+                    return InventoryStatus.CAN_ORDER
+
+            return InventoryStatus.OUT_OF_STOCK
+
+    # Now check for POSITIVE indicators (only if no negative indicators found)
+    # IMPORTANT: These must be specific enough to not match the agent's own questions
+    # Avoid phrases like "have that" which appear in "Do you have that in stock?"
+    in_stock_phrases = [
+        "we have it", "we do have", "yes we have", "have it in stock",
+        "have one in stock", "have them in stock",
+        "it's available", "it is available", "is available",
+        "watch is available", "that is available", "that's available",
+        "they're available", "they are available",
+        "yes we do", "we do have that", "we have that one",
+        "we currently have", "do have it", "in stock now",
+        "available now", "ready for pickup", "can come in today",
+        "come pick it up", "have it here", "we have one",
+        "got one here", "got it here", "have that model",
+        "have the ranger", "have that watch",
+        "confirmed that the watch is available",  # From Bland summary
+        "watch is in stock", "model is available",
+        "dial in stock",  # From Claude summary (works for any dial color)
+        "they had the", "had the tudor", "had it in stock",
+        "have the tudor", "has the tudor"
+    ]
+
+    for phrase in in_stock_phrases:
+        if phrase in text:
+            return InventoryStatus.IN_STOCK
+
+    # Check for waitlist mentions without explicit out of stock
+    waitlist_phrases = [
+        "waitlist", "waiting list", "wait list", "interest list"
+    ]
+    for phrase in waitlist_phrases:
+        if phrase in text:
+            return InventoryStatus.WAITLIST
+
+    # Check for order mentions without explicit out of stock
+    order_phrases = [
+        "can order", "special order"
+    ]
+    for phrase in order_phrases:
+        if phrase in text:
+            return InventoryStatus.CAN_ORDER
+
+    return InventoryStatus.UNKNOWN
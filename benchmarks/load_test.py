@@ -0,0 +1,258 @@
+"""
+Call Pipeline Load Test
+Drives hundreds of concurrent /api/call jobs through the real API against
+the local Bland AI simulator, and reports throughput, job latency
+percentiles, thread count and memory use
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+
+import config
+from bland_simulator import BlandSimulator, create_app
+
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(app, port: int) -> uvicorn.Server:
+    """Run an ASGI app on a background thread; returns once it accepts connections"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def rss_mb() -> float:
+    """Resident memory of this process (API and simulator included) in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def configure(workdir: str, args):
+    """
+    Point the API's stores at a scratch directory and scale its timers
+
+    Must run before api is imported: the API builds its stores, scheduler
+    and poller from these config dicts at import time.
+    """
+    config.JOB_STORE_CONFIG["db_path"] = os.path.join(workdir, "call_jobs.db")
+    config.CALL_CACHE_CONFIG["db_path"] = os.path.join(workdir, "call_cache.db")
+    config.HISTORY_CONFIG["db_path"] = os.path.join(workdir, "stock_history.db")
+    config.ACCOUNTING_CONFIG.update(db_path=os.path.join(workdir, "call_ledger.db"), budgets={})
+    config.BLOB_STORE_CONFIG["db_path"] = os.path.join(workdir, "call_blobs.db")
+    config.CALL_SCHEDULE_CONFIG["max_concurrent_calls"] = args.max_concurrent_calls
+
+    # Simulated calls run time_scale times as long as real ones; so do the API's waits
+    scale = args.time_scale
+    for key in ("ringing_interval_seconds", "min_interval_seconds", "max_interval_seconds",
+                "default_duration_seconds", "baseline_interval_seconds"):
+        config.POLLER_CONFIG[key] = max(config.POLLER_CONFIG[key] * scale, 0.01)
+    config.POLLER_CONFIG["fetch_workers"] = args.poll_workers
+    for key in ("base_delay_seconds", "max_delay_seconds"):
+        config.RETRY_CONFIG[key] = config.RETRY_CONFIG[key] * scale
+    config.WEBHOOK_CONFIG["completion_deadline_seconds"] *= max(scale, 0.01)
+    config.BATCH_CONFIG["completion_poll_seconds"] = min(config.BATCH_CONFIG["completion_poll_seconds"], 0.05)
+
+
+class Sampler:
+    """Samples thread count and memory while the load runs"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.threads: List[int] = []
+        self.rss: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.threads.append(threading.active_count())
+            self.rss.append(rss_mb())
+            self._stop.wait(self.interval)
+
+
+async def run_job(client: httpx.AsyncClient, index: int, poll_interval: float, timeout: float) -> Dict:
+    """One /api/call job from request to terminal status"""
+    start = time.perf_counter()
+    response = await client.post("/api/call", json={
+        "retailer_name": f"Load Test Store {index}",
+        "phone": f"+1555{index:07d}",  # Unique, so no job joins another's call
+    })
+    if response.status_code != 200:
+        return {"status": f"http_{response.status_code}", "latency": time.perf_counter() - start}
+    job_id = response.json()["call_id"]
+
+    job = {}
+    deadline = start + timeout
+    while time.perf_counter() < deadline:
+        job = (await client.get(f"/api/call/{job_id}")).json()
+        if job.get("status") in TERMINAL_STATUSES:
+            break
+        await asyncio.sleep(poll_interval)
+    return {
+        "status": job.get("status", "timeout") if job.get("status") in TERMINAL_STATUSES else "timeout",
+        "inventory_status": job.get("inventory_status"),
+        "latency": time.perf_counter() - start,
+    }
+
+
+async def drive(api_url: str, args) -> List[Dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=60) as client:
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def limited(index):
+            async with gate:
+                return await run_job(client, index, args.poll_interval, args.timeout)
+
+        return await asyncio.gather(*(limited(i) for i in range(args.jobs)))
+
+
+def report(outcomes: List[Dict], elapsed: float, sampler: Sampler, rss_before: float, simulator: BlandSimulator) -> Dict:
+    latencies = [o["latency"] for o in outcomes if o["status"] in TERMINAL_STATUSES]
+    statuses: Dict[str, int] = {}
+    inventory: Dict[str, int] = {}
+    for o in outcomes:
+        statuses[o["status"]] = statuses.get(o["status"], 0) + 1
+        if o.get("inventory_status"):
+            inventory[o["inventory_status"]] = inventory.get(o["inventory_status"], 0) + 1
+    return {
+        "jobs": len(outcomes),
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_jobs_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "latency_seconds": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3) if latencies else 0,
+        },
+        "job_statuses": statuses,
+        "inventory_statuses": inventory,
+        "threads": {"peak": max(sampler.threads, default=0), "end": threading.active_count()},
+        "rss_mb": {"before": round(rss_before, 1), "peak": round(max(sampler.rss, default=rss_before), 1)},
+        "simulator": dict(simulator.stats),
+    }
+
+
+def print_report(result: Dict):
+    latency = result["latency_seconds"]
+    print(f"\nJobs: {result['jobs']} in {result['elapsed_seconds']}s "
+          f"({result['throughput_jobs_per_second']} jobs/s)")
+    print(f"Latency: p50 {latency['p50']}s  p95 {latency['p95']}s  p99 {latency['p99']}s  max {latency['max']}s")
+    print(f"Job statuses: {result['job_statuses']}")
+    print(f"Inventory: {result['inventory_statuses']}")
+    print(f"Threads: peak {result['threads']['peak']}, end {result['threads']['end']}")
+    print(f"Memory: {result['rss_mb']['before']} MB before, {result['rss_mb']['peak']} MB peak")
+    print(f"Simulator: {result['simulator']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the /api/call pipeline against the Bland AI simulator")
+    parser.add_argument("--jobs", type=int, default=300, help="Call jobs to run")
+    parser.add_argument("--concurrency", type=int, default=100, help="Jobs requested and tracked at once")
+    parser.add_argument("--max-concurrent-calls", type=int, default=50,
+                        help="Scheduler budget of calls in flight (CALL_SCHEDULE_CONFIG)")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Simulated call durations and API waits are multiplied by this")
+    parser.add_argument("--latency-ms", type=float, default=config.BLAND_SIMULATOR_CONFIG["latency_ms"],
+                        help="Simulated Bland API latency per request")
+    parser.add_argument("--webhooks", action="store_true", help="Complete calls by webhook instead of polling")
+    parser.add_argument("--summaries", action="store_true", help="Keep Claude summaries on (needs ANTHROPIC_API_KEY)")
+    parser.add_argument("--poll-workers", type=int, default=16, help="Status fetch threads of the call poller")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Client polling of /api/call/{id}")
+    parser.add_argument("--timeout", type=float, default=120, help="Give up on a job after this many seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="tudor_load_")
+    configure(workdir, args)
+
+    simulator = BlandSimulator(
+        {**config.BLAND_SIMULATOR_CONFIG, "time_scale": args.time_scale, "latency_ms": args.latency_ms},
+        seed=args.seed
+    )
+    sim_port, api_port = free_port(), free_port()
+    api_url = f"http://127.0.0.1:{api_port}"
+    os.environ["BLAND_BASE_URL"] = f"http://127.0.0.1:{sim_port}/v1"
+    os.environ["BLAND_API_KEY"] = "simulator-key"
+    if args.webhooks:
+        os.environ["PUBLIC_BASE_URL"] = api_url
+        os.environ.setdefault("BLAND_WEBHOOK_SECRET", "load-test-secret")
+    else:
+        os.environ.pop("PUBLIC_BASE_URL", None)
+
+    import api
+    if not args.summaries:
+        # Measure the call pipeline, not Claude
+        api.summarize_transcript = lambda *a, **k: ""
+
+    serve(create_app(simulator), sim_port)
+    servers = [serve(api.app, api_port)]
+    print(f"Simulator on :{sim_port}, API on :{api_port}, scratch data in {workdir}")
+    print(f"Running {args.jobs} jobs, {args.concurrency} at a time, "
+          f"{args.max_concurrent_calls} calls in flight at most ({'webhooks' if args.webhooks else 'polling'})")
+
+    sampler = Sampler()
+    rss_before = rss_mb()
+    sampler.start()
+    start = time.perf_counter()
+    outcomes = asyncio.run(drive(api_url, args))
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    result = report(outcomes, elapsed, sampler, rss_before, simulator)
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    for server in servers:
+        server.should_exit = True
+    api.call_scheduler.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Bland AI Simulator
+Local stand-in for the Bland AI calls API (POST /v1/calls, GET /v1/calls/{id})
+with configurable latency, call durations, outcome mix and canned transcripts,
+so the call pipeline can be load-tested without real phone calls
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+
+from config import BLAND_SIMULATOR_CONFIG
+from bland_webhooks import build_completion_payload, deliver_webhook, webhook_secret
+
+
+# Outcomes that are a Bland call status rather than a transcript label
+CALL_STATUS_OUTCOMES = ("no-answer", "voicemail", "busy")
+
+# Used when the corpus has no transcript for a label
+FALLBACK_TRANSCRIPTS = {
+    "in_stock": "Store: Yes, we have it in stock right now.",
+    "out_of_stock": "Store: Sorry, we don't have that one in stock.",
+    "waitlist": "Store: It's not in stock, but we can add you to our waitlist.",
+    "can_order": "Store: We don't have it, but we can order it for you.",
+    "unknown": "Store: Could you call back later? We're with a customer.",
+}
+
+
+def load_transcripts(path: str) -> Dict[str, List[str]]:
+    """Canned transcripts by label from a labeled corpus (empty if the file is missing)"""
+    by_label: Dict[str, List[str]] = {}
+    if not os.path.exists(path):
+        return by_label
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                by_label.setdefault(item["label"], []).append(item["transcript"])
+    return by_label
+
+
+@dataclass
+class SimulatedCall:
+    """One placed call and the outcome decided for it up front"""
+    call_id: str
+    phone_number: str
+    placed_at: float
+    connects_at: float
+    ends_at: float
+    outcome: str
+    transcript: str
+    metadata: Dict = field(default_factory=dict)
+    webhook: Optional[str] = None
+
+
+class BlandSimulator:
+    """
+    In-memory model of Bland AI calls.
+
+    Each call's outcome, ring time and length are drawn when it is placed.
+    It reports "queued" until it connects, "in-progress" until it ends, then
+    its final payload. Calls placed with a webhook get it delivered when they
+    end, signed with BLAND_WEBHOOK_SECRET.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, clock: Optional[Callable[[], float]] = None,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            config: Simulator settings (defaults to BLAND_SIMULATOR_CONFIG)
+            clock: Returns the current time in seconds (for tests)
+            seed: Random seed for reproducible runs
+        """
+        self.config = config or BLAND_SIMULATOR_CONFIG
+        self.clock = clock or time.monotonic
+        self.rng = random.Random(seed)
+        path = self.config["transcripts"]
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.transcripts = load_transcripts(path)
+        self.calls: Dict[str, SimulatedCall] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls_placed": 0, "start_errors": 0, "status_requests": 0, "webhooks_sent": 0}
+
+    # ── Calls ──
+
+    def place(self, payload: Dict) -> Optional[SimulatedCall]:
+        """Place a call (None means the start request failed)"""
+        with self._lock:
+            if self.rng.random() < self.config["start_error_rate"]:
+                self.stats["start_errors"] += 1
+                return None
+            outcomes = self.config["outcomes"]
+            outcome = self.rng.choices(list(outcomes), weights=list(outcomes.values()))[0]
+            scale = self.config["time_scale"]
+            ring = self.config["ring_seconds"] * scale
+            if outcome in CALL_STATUS_OUTCOMES:
+                length = 0.0
+                transcript = ""
+            else:
+                length = self.rng.lognormvariate(0, self.config["duration_sigma"]) * self.config["duration_median_seconds"]
+                canned = self.transcripts.get(outcome) or [FALLBACK_TRANSCRIPTS.get(outcome, "")]
+                transcript = self.rng.choice(canned)
+            now = self.clock()
+            call = SimulatedCall(
+                call_id=f"sim-{uuid.uuid4().hex[:12]}",
+                phone_number=payload.get("phone_number", ""),
+                placed_at=now,
+                connects_at=now + ring,
+                ends_at=now + ring + length * scale,
+                outcome=outcome,
+                transcript=transcript,
+                metadata=payload.get("metadata") or {},
+                webhook=payload.get("webhook")
+            )
+            self.calls[call.call_id] = call
+            self.stats["calls_placed"] += 1
+        if call.webhook:
+            timer = threading.Timer(max(call.ends_at - now, 0), self._deliver, args=(call,))
+            timer.daemon = True
+            timer.start()
+        return call
+
+    def status(self, call_id: str) -> Optional[Dict]:
+        """GET /calls/{id} payload for a call at the current time (None if unknown)"""
+        with self._lock:
+            self.stats["status_requests"] += 1
+            call = self.calls.get(call_id)
+        if call is None:
+            return None
+        now = self.clock()
+        if now < call.connects_at:
+            return {"call_id": call_id, "status": "queued", "completed": False}
+        if now < call.ends_at:
+            return {"call_id": call_id, "status": "in-progress", "completed": False}
+        return self.final_payload(call)
+
+    def final_payload(self, call: SimulatedCall) -> Dict:
+        """Completed-call payload; call_length is in minutes like Bland's"""
+        status = call.outcome if call.outcome in CALL_STATUS_OUTCOMES else "completed"
+        connected_seconds = (call.ends_at - call.connects_at) / self.config["time_scale"]
+        return build_completion_payload(
+            call.call_id,
+            status=status,
+            transcript=call.transcript,
+            call_length=round(connected_seconds / 60, 3),
+            metadata=call.metadata
+        )
+
+    def _deliver(self, call: SimulatedCall):
+        try:
+            deliver_webhook(call.webhook, self.final_payload(call), webhook_secret())
+            with self._lock:
+                self.stats["webhooks_sent"] += 1
+        except Exception as e:
+            print(f"[simulator] Webhook for {call.call_id} failed: {e}")
+
+
+def create_app(simulator: Optional[BlandSimulator] = None) -> FastAPI:
+    """FastAPI app serving the simulated Bland AI endpoints under /v1"""
+    simulator = simulator or BlandSimulator()
+    app = FastAPI(title="Bland AI simulator")
+    app.state.simulator = simulator
+
+    async def latency():
+        config = simulator.config
+        delay = config["latency_ms"] + simulator.rng.uniform(-1, 1) * config["latency_jitter_ms"]
+        await asyncio.sleep(max(delay, 0) / 1000)
+
+    @app.post("/v1/calls")
+    async def place_call(request: Request):
+        await latency()
+        call = simulator.place(await request.json())
+        if call is None:
+            raise HTTPException(status_code=500, detail="Simulated start failure")
+        return {"status": "success", "call_id": call.call_id}
+
+    @app.get("/v1/calls/{call_id}")
+    async def get_call(call_id: str):
+        await latency()
+        payload = simulator.status(call_id)
+        if payload is None:
+            raise HTTPException(status_code=404, detail="Call not found")
+        return payload
+
+    @app.get("/v1/simulator/stats")
+    async def stats():
+        return {**simulator.stats, "calls_tracked": len(simulator.calls)}
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local Bland AI stand-in (point BLAND_BASE_URL at <url>/v1)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--time-scale", type=float, default=BLAND_SIMULATOR_CONFIG["time_scale"],
+                        help="Multiply simulated call durations (0.01 = 100x faster)")
+    parser.add_argument("--latency-ms", type=float, default=BLAND_SIMULATOR_CONFIG["latency_ms"])
+    parser.add_argument("--start-error-rate", type=float, default=BLAND_SIMULATOR_CONFIG["start_error_rate"])
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = {**BLAND_SIMULATOR_CONFIG, "time_scale": args.time_scale, "latency_ms": args.latency_ms,
+              "start_error_rate": args.start_error_rate}
+    print(f"Bland AI simulator on http://{args.host}:{args.port}/v1 (time scale {args.time_scale})")
+    uvicorn.run(create_app(BlandSimulator(config, seed=args.seed)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Bland AI Webhooks
+Signing and verification for call-completion webhooks, plus a local
+stand-in that delivers a completion payload the way Bland AI would
+"""
+
+import os
+import hmac
+import json
+import hashlib
+import argparse
+import requests
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+from config import WEBHOOK_CONFIG
+
+
+def webhook_secret() -> str:
+    """Shared secret used to sign callback URLs and payloads"""
+    return os.environ.get('BLAND_WEBHOOK_SECRET') or WEBHOOK_CONFIG.get('secret', '')
+
+
+def public_base_url() -> str:
+    """Public URL this API is reachable at (empty when running privately)"""
+    return (os.environ.get('PUBLIC_BASE_URL') or WEBHOOK_CONFIG.get('public_base_url', '')).rstrip('/')
+
+
+def webhooks_enabled() -> bool:
+    """Webhook mode needs both a public URL and a secret to verify deliveries"""
+    return bool(public_base_url() and webhook_secret())
+
+
+def _hmac_hex(secret: str, message: bytes) -> str:
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def callback_token(secret: str, job_id: str) -> str:
+    """Per-job token embedded in the callback URL"""
+    return _hmac_hex(secret, f"job:{job_id}".encode())
+
+
+def callback_url(job_id: str, base_url: Optional[str] = None, secret: Optional[str] = None) -> Optional[str]:
+    """
+    Build the webhook URL for a call job
+
+    Args:
+        job_id: Call job the completion belongs to
+        base_url: Public base URL (defaults to public_base_url())
+        secret: Signing secret (defaults to webhook_secret())
+
+    Returns:
+        Callback URL, or None when webhooks are not configured
+    """
+    base_url = base_url if base_url is not None else public_base_url()
+    secret = secret if secret is not None else webhook_secret()
+    if not base_url or not secret:
+        return None
+    query = urlencode({"job_id": job_id, "token": callback_token(secret, job_id)})
+    return f"{base_url.rstrip('/')}{WEBHOOK_CONFIG['path']}?{query}"
+
+
+def sign_body(secret: str, body: bytes) -> str:
+    """HMAC-SHA256 signature of a raw webhook body"""
+    return _hmac_hex(secret, body)
+
+
+def verify_delivery(
+    secret: str,
+    job_id: str,
+    token: str,
+    body: bytes,
+    signature: Optional[str] = None
+) -> bool:
+    """
+    Check that a webhook delivery really belongs to a job we started
+
+    The callback URL token is always required. A body signature is checked
+    too whenever the sender includes one.
+
+    Args:
+        secret: Signing secret
+        job_id: Job ID from the callback URL
+        token: Token from the callback URL
+        body: Raw request body
+        signature: Value of the signature header, if sent
+
+    Returns:
+        True if the delivery is authentic
+    """
+    if not secret or not job_id or not token:
+        return False
+    if not hmac.compare_digest(callback_token(secret, job_id), token):
+        return False
+    if signature is not None and not hmac.compare_digest(sign_body(secret, body), signature):
+        return False
+    return True
+
+
+def build_completion_payload(
+    call_id: str,
+    status: str = "completed",
+    transcript: str = "",
+    summary: str = "",
+    call_length: Optional[float] = None,
+    metadata: Optional[Dict] = None
+) -> Dict:
+    """Completed-call payload in the shape Bland AI posts to webhooks"""
+    return {
+        "call_id": call_id,
+        "status": status,
+        "completed": True,
+        "concatenated_transcript": transcript,
+        "summary": summary,
+        "call_length": call_length,
+        "metadata": metadata or {},
+        "end_at": datetime.now().isoformat()
+    }
+
+
+def deliver_webhook(url: str, payload: Dict, secret: str, timeout: int = 30) -> requests.Response:
+    """
+    Post a signed completion payload to a callback URL (local stand-in for Bland AI)
+
+    Args:
+        url: Callback URL from callback_url()
+        payload: Payload from build_completion_payload()
+        secret: Signing secret shared with the API
+        timeout: Request timeout in seconds
+
+    Returns:
+        The API's response
+    """
+    body = json.dumps(payload).encode()
+    return requests.post(
+        url,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            WEBHOOK_CONFIG['signature_header']: sign_body(secret, body)
+        },
+        timeout=timeout
+    )
+
+
+def main():
+    """Deliver a fake completion to a locally running API"""
+    parser = argparse.ArgumentParser(description="Send a Bland AI style completion webhook to the API")
+    parser.add_argument('--api', default='http://localhost:8000', help='Base URL of the running API')
+    parser.add_argument('--job-id', required=True, help='Call job ID returned by POST /api/call')
+    parser.add_argument('--call-id', required=True, help='Bland call ID stored on the job')
+    parser.add_argument('--status', default='completed', help='Bland call status (completed, no-answer, busy, ...)')
+    parser.add_argument('--transcript', default='', help='Transcript text')
+    parser.add_argument('--summary', default='', help='Summary text')
+    args = parser.parse_args()
+
+    secret = webhook_secret()
+    if not secret:
+        print("ERROR: BLAND_WEBHOOK_SECRET environment variable not set")
+        return
+
+    url = callback_url(args.job_id, base_url=args.api, secret=secret)
+    payload = build_completion_payload(args.call_id, args.status, args.transcript, args.summary)
+    response = deliver_webhook(url, payload, secret)
+    print(f"{response.status_code}: {response.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Call Blob Store
+Compressed transcripts and raw Bland AI payloads keyed by call ID, kept out
+of in-memory results, job records and the results log, and loaded on demand
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+from config import BLOB_STORE_CONFIG
+
+
+class BlobStore:
+    """
+    SQLite table of zlib-compressed JSON documents.
+
+    Shared by API worker processes and the CLI (WAL mode, one connection per
+    thread). Writing a key again replaces its document.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        blob_key TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, db_path: str, compression_level: int = 6):
+        """
+        Args:
+            db_path: SQLite file (created if missing)
+            compression_level: zlib level (1 fastest, 9 smallest)
+        """
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread, opened in autocommit mode"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, key: str, document: Dict) -> str:
+        """Store a JSON-serializable document under ``key``; returns the key"""
+        raw = json.dumps(document).encode("utf-8")
+        self._conn().execute(
+            "INSERT OR REPLACE INTO blobs (blob_key, data, size, created_at) VALUES (?, ?, ?, ?)",
+            (key, zlib.compress(raw, self.compression_level), len(raw), time.time())
+        )
+        return key
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """The document stored under ``key`` (None if there is none)"""
+        if not key:
+            return None
+        row = self._conn().execute("SELECT data FROM blobs WHERE blob_key = ?", (key,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Documents for several keys at once (missing keys are left out)"""
+        keys = list({key for key in keys if key})
+        found = {}
+        # SQLite limits bound parameters per statement
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT blob_key, data FROM blobs WHERE blob_key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for key, data in rows:
+                found[key] = json.loads(zlib.decompress(data))
+        return found
+
+    def delete(self, key: str) -> bool:
+        return self._conn().execute("DELETE FROM blobs WHERE blob_key = ?", (key,)).rowcount > 0
+
+    def stats(self) -> Dict:
+        count, raw, stored = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()
+        return {"blobs": count, "raw_bytes": raw, "stored_bytes": stored}
+
+
+def create_blob_store(config: Optional[Dict] = None) -> BlobStore:
+    """Build the blob store described by BLOB_STORE_CONFIG"""
+    config = config or BLOB_STORE_CONFIG
+    return BlobStore(config["db_path"], compression_level=config["compression_level"])
@@ -0,0 +1,238 @@
+"""
+Call Result Cache
+Recent call outcomes and in-flight calls keyed by (normalized phone, watch
+reference), so two requests for the same store and watch share one call
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config import CALL_CACHE_CONFIG
+
+
+# What claim() decided for a new call job
+CLAIMED = "claimed"  # No fresh result and nothing in flight: place the call
+JOINED = "joined"  # Another job is already calling this store about this watch
+CACHED = "cached"  # A fresh outcome exists: answer with it, no call
+
+
+@dataclass
+class Claim:
+    """Outcome of CallResultCache.claim()"""
+    decision: str
+    job_id: Optional[str] = None  # Leader job for JOINED, source job for CACHED
+    result: Optional[Dict] = None  # Cached job result for CACHED
+    completed_at: Optional[float] = None
+
+
+@dataclass
+class Settlement:
+    """Jobs that joined a call, returned when the call completes or fails"""
+    followers: List[str] = field(default_factory=list)
+
+
+class CallResultCache:
+    """
+    SQLite-backed cache of call outcomes with in-flight deduplication.
+
+    One row per (phone, reference) key. A row is either in flight (a job is
+    calling, other jobs may have joined it) or completed (its result is
+    served until ``ttl_seconds`` have passed). Claims run in ``BEGIN
+    IMMEDIATE`` transactions, so API worker processes sharing the file never
+    both place the same call.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS call_cache (
+        cache_key TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        state TEXT NOT NULL,
+        followers TEXT NOT NULL DEFAULT '[]',
+        result TEXT,
+        started_at REAL NOT NULL,
+        completed_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_call_cache_job ON call_cache (job_id);
+    """
+
+    # Delete expired outcomes every this many new calls
+    EVICT_EVERY = 100
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 6 * 60 * 60,
+        in_flight_timeout_seconds: float = 15 * 60,
+        cacheable_statuses=("in_stock", "out_of_stock", "waitlist", "can_order")
+    ):
+        """
+        Args:
+            db_path: SQLite file (created if missing)
+            ttl_seconds: How long a completed outcome is served instead of calling again
+            in_flight_timeout_seconds: After this, an unfinished call no longer
+                blocks new ones (its process probably died)
+            cacheable_statuses: Inventory statuses worth serving from cache;
+                other outcomes are shared with joined jobs but not kept
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_timeout_seconds = in_flight_timeout_seconds
+        self.cacheable_statuses = set(cacheable_statuses)
+        self._local = threading.local()
+        self._claims = 0
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread, opened in autocommit mode"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def key(phone: str, watch_reference: str) -> str:
+        return f"{phone}|{watch_reference}"
+
+    def claim(self, phone: str, watch_reference: str, job_id: str) -> Claim:
+        """
+        Decide whether a new call job should call, join another job, or use a cached result
+
+        Args:
+            phone: Normalized retailer phone number
+            watch_reference: Watch the call asks about
+            job_id: The new call job
+
+        Returns:
+            Claim with the decision (CLAIMED, JOINED or CACHED)
+        """
+        cache_key = self.key(phone, watch_reference)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id, state, followers, result, started_at, completed_at FROM call_cache WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            if row:
+                leader, state, followers, result, started_at, completed_at = row
+                if state == "in_flight" and leader == job_id:
+                    # A retry of the same job: it still owns the call and its followers
+                    conn.execute("UPDATE call_cache SET started_at = ? WHERE cache_key = ?", (now, cache_key))
+                    conn.execute("COMMIT")
+                    return Claim(CLAIMED, job_id=job_id)
+                if state == "in_flight" and now - started_at < self.in_flight_timeout_seconds:
+                    conn.execute(
+                        "UPDATE call_cache SET followers = ? WHERE cache_key = ?",
+                        (json.dumps(json.loads(followers) + [job_id]), cache_key)
+                    )
+                    conn.execute("COMMIT")
+                    return Claim(JOINED, job_id=leader)
+                if state == "completed" and now - completed_at < self.ttl_seconds:
+                    conn.execute("COMMIT")
+                    return Claim(CACHED, job_id=leader, result=json.loads(result), completed_at=completed_at)
+
+            # A stale in-flight call's followers are taken over by the new call
+            inherited = followers if row and state == "in_flight" else "[]"
+            conn.execute(
+                """INSERT OR REPLACE INTO call_cache (cache_key, job_id, state, followers, result, started_at, completed_at)
+                   VALUES (?, ?, 'in_flight', ?, NULL, ?, NULL)""",
+                (cache_key, job_id, inherited, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._claims += 1
+        if self._claims % self.EVICT_EVERY == 0:
+            self.evict_expired()
+        return Claim(CLAIMED, job_id=job_id)
+
+    def lookup(self, phone: str, watch_reference: str) -> Optional[Claim]:
+        """Fresh cached outcome for a key, without claiming it (None if there is none)"""
+        row = self._conn().execute(
+            "SELECT job_id, result, completed_at FROM call_cache WHERE cache_key = ? AND state = 'completed'",
+            (self.key(phone, watch_reference),)
+        ).fetchone()
+        if row is None or time.time() - row[2] >= self.ttl_seconds:
+            return None
+        return Claim(CACHED, job_id=row[0], result=json.loads(row[1]), completed_at=row[2])
+
+    def complete(self, job_id: str, result: Dict) -> Settlement:
+        """
+        Record a finished call; returns the jobs that joined it
+
+        The outcome is kept for ``ttl_seconds`` if its inventory status is
+        cacheable, otherwise the key is freed for the next request.
+        """
+        cacheable = result.get("inventory_status") in self.cacheable_statuses
+        return self._settle(job_id, result if cacheable else None)
+
+    def hold(self, job_id: str, seconds: float):
+        """Keep a job's in-flight call from going stale while it waits ``seconds`` to retry"""
+        self._conn().execute(
+            "UPDATE call_cache SET started_at = ? WHERE job_id = ? AND state = 'in_flight'",
+            (time.time() + seconds, job_id)
+        )
+
+    def release(self, job_id: str) -> Settlement:
+        """Forget a failed call's key; returns the jobs that joined it"""
+        return self._settle(job_id, None)
+
+    def _settle(self, job_id: str, result: Optional[Dict]) -> Settlement:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT cache_key, followers FROM call_cache WHERE job_id = ? AND state = 'in_flight'",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return Settlement()
+            cache_key, followers = row
+            if result is None:
+                conn.execute("DELETE FROM call_cache WHERE cache_key = ?", (cache_key,))
+            else:
+                conn.execute(
+                    """UPDATE call_cache SET state = 'completed', followers = '[]', result = ?, completed_at = ?
+                       WHERE cache_key = ?""",
+                    (json.dumps(result), time.time(), cache_key)
+                )
+            conn.execute("COMMIT")
+            return Settlement(followers=json.loads(followers))
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def evict_expired(self) -> int:
+        """Delete completed outcomes past their TTL; returns how many were removed"""
+        cursor = self._conn().execute(
+            "DELETE FROM call_cache WHERE state = 'completed' AND completed_at < ?",
+            (time.time() - self.ttl_seconds,)
+        )
+        return cursor.rowcount
+
+
+def create_call_cache(config: Optional[Dict] = None) -> CallResultCache:
+    """Build the call cache described by CALL_CACHE_CONFIG"""
+    config = config or CALL_CACHE_CONFIG
+    return CallResultCache(
+        config["db_path"],
+        ttl_seconds=config["ttl_seconds"],
+        in_flight_timeout_seconds=config["in_flight_timeout_seconds"],
+        cacheable_statuses=config["cacheable_statuses"]
+    )
@@ -0,0 +1,247 @@
+"""
+Call Status Poller
+One background service that polls every in-flight Bland AI call on an
+adaptive schedule and hands each final payload to whoever is waiting on it
+"""
+
+import os
+import math
+import heapq
+import itertools
+import threading
+import statistics
+import concurrent.futures
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, Dict, Iterable, Optional
+
+from config import POLLER_CONFIG, OUTPUT_CONFIG
+from phone_caller import FINAL_CALL_STATUSES, call_duration_seconds
+
+
+# Bland AI statuses for a call that has not been answered yet
+WAITING_STATUSES = ("", "new", "queued", "allocated", "ringing")
+
+
+class DurationModel:
+    """Expected talk time of a call (Bland AI's call length, in seconds), from recently finished calls"""
+
+    def __init__(self, default_seconds: float, window: int = 200):
+        self.default_seconds = default_seconds
+        self._durations = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        if seconds and seconds > 0:
+            with self._lock:
+                self._durations.append(float(seconds))
+
+    def seed(self, durations: Iterable[float]):
+        for seconds in durations:
+            self.observe(seconds)
+
+    def expected(self) -> float:
+        with self._lock:
+            if not self._durations:
+                return self.default_seconds
+            return statistics.median(self._durations)
+
+
+@dataclass
+class TrackedCall:
+    """A call being polled and the future its waiters block on"""
+    call_id: str
+    fetch: Callable[[str], Optional[Dict]]
+    started_at: float  # When tracking began; only the deadline and baseline stats count from it
+    deadline: float
+    future: concurrent.futures.Future = field(default_factory=concurrent.futures.Future)
+    polls: int = 0
+    last_status: str = ""
+    answered_at: Optional[float] = None  # First poll that saw the call past ringing
+
+
+class CallStatusPoller:
+    """
+    Polls all in-flight calls from one scheduler thread.
+
+    Intervals adapt per call: sparse while a call is queued or ringing,
+    halving toward the expected end once answered (the median of recent call lengths),
+    and dense once that point has passed. Every call's waiters share one
+    future, resolved with the final payload (or None on timeout).
+    """
+
+    def __init__(self, config: Optional[Dict] = None, durations: Optional[DurationModel] = None):
+        self.config = config or POLLER_CONFIG
+        self.durations = durations or DurationModel(self.config["default_duration_seconds"])
+
+        self._calls: Dict[str, TrackedCall] = {}
+        self._schedule = []  # heap of (due, seq, call_id)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._fetchers = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.config["fetch_workers"], thread_name_prefix="call-poller"
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        self._stats = {"tracked": 0, "completed": 0, "timed_out": 0, "polls": 0, "baseline_polls": 0}
+
+    # ── Public API ──
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="call-poller", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._fetchers.shutdown(wait=False)
+
+    def track(
+        self,
+        call_id: str,
+        fetch: Callable[[str], Optional[Dict]],
+        max_wait: Optional[float] = None
+    ) -> concurrent.futures.Future:
+        """
+        Start polling a call (or join an existing poll of it)
+
+        Args:
+            call_id: Bland AI call ID
+            fetch: Does one GET /calls/{id}; returns the payload, or None on error
+            max_wait: Seconds before giving up (defaults to POLLER_CONFIG['max_wait_seconds'])
+
+        Returns:
+            Future resolved with the final call payload, or None on timeout
+        """
+        self.start()
+        with self._cond:
+            call = self._calls.get(call_id)
+            if call is not None:
+                return call.future
+
+            now = monotonic()
+            call = TrackedCall(
+                call_id=call_id,
+                fetch=fetch,
+                started_at=now,
+                deadline=now + (max_wait or self.config["max_wait_seconds"])
+            )
+            self._calls[call_id] = call
+            self._stats["tracked"] += 1
+            self._schedule_locked(call, now + self._next_interval(call, now))
+            self._cond.notify_all()
+            return call.future
+
+    def stats(self) -> Dict:
+        """Poll counts, including how many a fixed-interval loop would have made"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["polls_saved"] = stats["baseline_polls"] - stats["polls"]
+        stats["baseline_interval_seconds"] = self.config["baseline_interval_seconds"]
+        stats["expected_duration_seconds"] = round(self.durations.expected(), 1)
+        return stats
+
+    # ── Scheduling ──
+
+    def _next_interval(self, call: TrackedCall, now: float) -> float:
+        """Seconds until this call's next poll"""
+        cfg = self.config
+        if call.last_status in WAITING_STATUSES:
+            interval = cfg["ringing_interval_seconds"]
+        else:
+            talking = now - call.answered_at if call.answered_at is not None else 0
+            remaining = self.durations.expected() - talking
+            interval = remaining / 2 if remaining > 0 else cfg["min_interval_seconds"]
+        return min(max(interval, cfg["min_interval_seconds"]), cfg["max_interval_seconds"])
+
+    def _schedule_locked(self, call: TrackedCall, due: float):
+        heapq.heappush(self._schedule, (min(due, call.deadline), next(self._seq), call.call_id))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._schedule or self._schedule[0][0] > monotonic()):
+                    timeout = self._schedule[0][0] - monotonic() if self._schedule else None
+                    self._cond.wait(timeout=timeout)
+                if self._stopped:
+                    return
+                _, _, call_id = heapq.heappop(self._schedule)
+                call = self._calls.get(call_id)
+            if call is not None:
+                self._fetchers.submit(self._poll, call)
+
+    def _poll(self, call: TrackedCall):
+        try:
+            data = call.fetch(call.call_id)
+        except Exception as e:
+            print(f"    [poller] Error polling {call.call_id}: {e}")
+            data = None
+
+        now = monotonic()
+        with self._cond:
+            call.polls += 1
+            self._stats["polls"] += 1
+            status = data.get("status", "") if isinstance(data, dict) else ""
+            if data is not None:
+                call.last_status = status
+                if status not in WAITING_STATUSES and call.answered_at is None:
+                    call.answered_at = now
+
+            if status in FINAL_CALL_STATUSES:
+                self._finish_locked(call, data, now)
+                self._stats["completed"] += 1
+                # The same unit as the seeded history: talk time, not time since tracking began
+                self.durations.observe(call_duration_seconds(data))
+            elif now >= call.deadline:
+                self._finish_locked(call, None, now)
+                self._stats["timed_out"] += 1
+            else:
+                self._schedule_locked(call, now + self._next_interval(call, now))
+                self._cond.notify_all()
+
+    def _finish_locked(self, call: TrackedCall, data: Optional[Dict], now: float):
+        del self._calls[call.call_id]
+        # A fixed-interval loop polls immediately and then every interval until done
+        baseline = self.config["baseline_interval_seconds"]
+        self._stats["baseline_polls"] += math.floor((now - call.started_at) / baseline) + 1
+        call.future.set_result(data)
+
+
+def _historical_durations(limit: int = 200) -> Iterable[float]:
+    """Recent call lengths from the results log (CallResult.call_duration, in seconds)"""
+    path = OUTPUT_CONFIG["results_log"]
+    if not os.path.exists(path):
+        return []
+    from results_log import ResultsLog
+    log = ResultsLog(path)
+    entries = log.query()[-limit:]
+    durations = []
+    for record in log.iter_records(entries):
+        seconds = record.get("call_duration")
+        if isinstance(seconds, (int, float)) and seconds > 0:
+            durations.append(seconds)
+    return durations
+
+
+_poller_lock = threading.Lock()
+_poller: Optional[CallStatusPoller] = None
+
+
+def get_call_poller() -> CallStatusPoller:
+    """Process-wide poller, seeded with historical call durations on first use"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            durations = DurationModel(POLLER_CONFIG["default_duration_seconds"])
+            try:
+                durations.seed(_historical_durations())
+            except Exception as e:
+                print(f"[poller] Could not read historical durations: {e}")
+            _poller = CallStatusPoller(POLLER_CONFIG, durations)
+        return _poller
@@ -0,0 +1,59 @@
+"""
+Call Retries
+When a call that nobody answered (or that failed to go through) is tried
+again, and how long to wait first
+"""
+
+import random
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import RETRY_CONFIG
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter and a cap on attempts per retailer.
+
+    The wait before retry n (n = 1 after the first call) is
+    ``base_delay_seconds * backoff_multiplier ** (n - 1)``, capped at
+    ``max_delay_seconds``, then shortened by a random fraction of up to
+    ``jitter`` so retries from one batch don't all ring at the same moment.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, rng: Optional[random.Random] = None):
+        self.config = config or RETRY_CONFIG
+        self.retry_statuses = set(self.config["retry_statuses"])
+        self.max_attempts = self.config["max_attempts"]
+        self.rng = rng or random.Random()
+
+    def should_retry(self, status: str, attempts: int) -> bool:
+        """
+        Whether to call again
+
+        Args:
+            status: InventoryStatus value of the latest attempt
+            attempts: Calls made so far (including the latest)
+        """
+        return status in self.retry_statuses and attempts < self.max_attempts
+
+    def delay(self, attempts: int) -> float:
+        """Seconds to wait before the next call, after ``attempts`` calls so far"""
+        delay = self.config["base_delay_seconds"] * self.config["backoff_multiplier"] ** max(attempts - 1, 0)
+        delay = min(delay, self.config["max_delay_seconds"])
+        return delay * (1 - self.config["jitter"] * self.rng.random())
+
+
+def attempt_record(attempt: int, status: str, summary: Optional[str] = None,
+                   call_id: Optional[str] = None, retry_in_seconds: Optional[float] = None) -> Dict:
+    """One entry of a job's attempt history"""
+    record = {
+        "attempt": attempt,
+        "status": status,
+        "summary": summary,
+        "call_id": call_id,
+        "at": datetime.now().isoformat(),
+    }
+    if retry_in_seconds is not None:
+        record["retry_in_seconds"] = round(retry_in_seconds)
+    return record
@@ -0,0 +1,321 @@
+"""
+Call Scheduler
+Releases queued calls in priority order, only while each store is likely
+open, within a global budget of simultaneous calls
+"""
+
+import math
+import heapq
+import itertools
+import threading
+import concurrent.futures
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from config import CALL_SCHEDULE_CONFIG
+
+
+# Main time zone of each state (plus DC)
+STATE_TIMEZONES = {
+    "AL": "America/Chicago", "AK": "America/Anchorage", "AZ": "America/Phoenix", "AR": "America/Chicago",
+    "CA": "America/Los_Angeles", "CO": "America/Denver", "CT": "America/New_York", "DC": "America/New_York",
+    "DE": "America/New_York", "FL": "America/New_York", "GA": "America/New_York", "HI": "Pacific/Honolulu",
+    "ID": "America/Boise", "IL": "America/Chicago", "IN": "America/Indiana/Indianapolis", "IA": "America/Chicago",
+    "KS": "America/Chicago", "KY": "America/New_York", "LA": "America/Chicago", "ME": "America/New_York",
+    "MD": "America/New_York", "MA": "America/New_York", "MI": "America/Detroit", "MN": "America/Chicago",
+    "MS": "America/Chicago", "MO": "America/Chicago", "MT": "America/Denver", "NE": "America/Chicago",
+    "NV": "America/Los_Angeles", "NH": "America/New_York", "NJ": "America/New_York", "NM": "America/Denver",
+    "NY": "America/New_York", "NC": "America/New_York", "ND": "America/Chicago", "OH": "America/New_York",
+    "OK": "America/Chicago", "OR": "America/Los_Angeles", "PA": "America/New_York", "RI": "America/New_York",
+    "SC": "America/New_York", "SD": "America/Chicago", "TN": "America/Chicago", "TX": "America/Chicago",
+    "UT": "America/Denver", "VT": "America/New_York", "VA": "America/New_York", "WA": "America/Los_Angeles",
+    "WV": "America/New_York", "WI": "America/Chicago", "WY": "America/Denver", "PR": "America/Puerto_Rico",
+}
+
+# States split between zones: (zone for the part west of the longitude, longitude)
+WESTERN_PART_TIMEZONES = {
+    "FL": ("America/Chicago", -85.0),  # Panhandle
+    "TX": ("America/Denver", -104.9),  # El Paso
+    "KY": ("America/Chicago", -86.0),
+    "IN": ("America/Chicago", -87.0),  # Chicago suburbs and Evansville
+    "MI": ("America/Menominee", -87.6),  # Western Upper Peninsula
+    "NE": ("America/Denver", -101.5),
+    "KS": ("America/Denver", -101.5),
+    "ND": ("America/Denver", -101.0),
+    "SD": ("America/Denver", -100.5),
+}
+# Tennessee is split the other way: east of this longitude is Eastern time
+EASTERN_TENNESSEE = ("America/New_York", -85.3)
+# North Idaho (the panhandle) is on Pacific time
+NORTH_IDAHO = ("America/Los_Angeles", 45.5)
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def retailer_timezone(state: Optional[str], latitude: Optional[float] = None,
+                      longitude: Optional[float] = None) -> Optional[ZoneInfo]:
+    """
+    Time zone of a store from its state, refined by coordinates in split states
+
+    Returns:
+        ZoneInfo, or None if the state is unknown
+    """
+    state = (state or "").upper()
+    name = STATE_TIMEZONES.get(state)
+    if name is None:
+        return None
+    if longitude is not None:
+        if state in WESTERN_PART_TIMEZONES:
+            western, boundary = WESTERN_PART_TIMEZONES[state]
+            if longitude < boundary:
+                name = western
+        elif state == "TN" and longitude > EASTERN_TENNESSEE[1]:
+            name = EASTERN_TENNESSEE[0]
+    if state == "ID" and latitude is not None and latitude > NORTH_IDAHO[1]:
+        name = NORTH_IDAHO[0]
+    return ZoneInfo(name)
+
+
+def _call_windows(local_day: datetime, config: Dict) -> Optional[Tuple[datetime, datetime]]:
+    """Start and end of the calling window on a local date (None when closed)"""
+    hours = config["hours"].get(WEEKDAYS[local_day.weekday()])
+    if not hours:
+        return None
+    open_h, open_m = (int(x) for x in hours[0].split(":"))
+    close_h, close_m = (int(x) for x in hours[1].split(":"))
+    day = local_day.replace(hour=0, minute=0, second=0, microsecond=0)
+    start = day + timedelta(hours=open_h, minutes=open_m + config["open_margin_minutes"])
+    end = day + timedelta(hours=close_h, minutes=close_m - config["close_margin_minutes"])
+    return (start, end) if start < end else None
+
+
+def next_call_time(tz: Optional[ZoneInfo], now: datetime, config: Optional[Dict] = None) -> Optional[datetime]:
+    """
+    When a store can next be called
+
+    Args:
+        tz: Store time zone (None means unknown: call any time)
+        now: Current time (timezone-aware)
+        config: Hours config (defaults to CALL_SCHEDULE_CONFIG)
+
+    Returns:
+        None if the store is likely open now, else the (aware) start of its next calling window
+    """
+    if tz is None:
+        return None
+    config = config or CALL_SCHEDULE_CONFIG
+    local_now = now.astimezone(tz)
+    for days_ahead in range(8):
+        window = _call_windows(local_now + timedelta(days=days_ahead), config)
+        if window is None:
+            continue
+        start, end = window
+        if days_ahead == 0 and start <= local_now < end:
+            return None
+        if local_now < start:
+            return start
+    return None  # No hours configured at all: don't hold calls forever
+
+
+@dataclass(order=True)
+class ScheduledCall:
+    """A queued call and the future resolved when it has run"""
+    priority: Tuple
+    seq: int
+    key: str = field(compare=False)
+    run: Callable[[], Optional[datetime]] = field(compare=False)
+    tz: Optional[ZoneInfo] = field(compare=False, default=None)
+    group: Optional[str] = field(compare=False, default=None)
+    group_limit: Optional[int] = field(compare=False, default=None)
+    not_before: Optional[datetime] = field(compare=False, default=None)
+    future: concurrent.futures.Future = field(compare=False, default_factory=concurrent.futures.Future)
+
+
+class CallScheduler:
+    """
+    Priority queue of calls released only during likely store hours.
+
+    Calls are ordered by distance band, then learned score (ranking.py), then
+    retailer type (boutiques first), then exact distance. The dispatcher thread starts the best call whose store
+    is open, as long as fewer than ``max_concurrent_calls`` are running (and
+    its group, e.g. a batch, is under its own limit). Calls for closed stores
+    wait in the queue until their window opens.
+
+    If ``run`` returns a datetime, the call goes back into the queue (same
+    priority) and is not released before then: retries wait their backoff
+    while fresh calls go ahead.
+    """
+
+    def __init__(self, config: Optional[Dict] = None, clock: Optional[Callable[[], datetime]] = None):
+        self.config = config or CALL_SCHEDULE_CONFIG
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._queue: List[ScheduledCall] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._group_in_flight: Dict[str, int] = {}
+        self._workers = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.config["max_concurrent_calls"], thread_name_prefix="call-scheduler"
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    # ── Public API ──
+
+    def priority(self, distance: Optional[float], retailer_type: Optional[str], score: Optional[float] = None) -> Tuple:
+        distance = distance if distance is not None else math.inf
+        band = math.floor(distance / self.config["distance_band_miles"]) if distance != math.inf else math.inf
+        type_rank = self.config["retailer_type_priority"].get(retailer_type or "", len(self.config["retailer_type_priority"]))
+        return (band, -(score or 0), type_rank, distance)
+
+    def next_call_time(self, tz: Optional[ZoneInfo]) -> Optional[datetime]:
+        """None if a store in this zone can be called now, else when it can"""
+        return next_call_time(tz, self.clock(), self.config)
+
+    def submit(
+        self,
+        key: str,
+        run: Callable[[], None],
+        tz: Optional[ZoneInfo] = None,
+        distance: Optional[float] = None,
+        retailer_type: Optional[str] = None,
+        group: Optional[str] = None,
+        group_limit: Optional[int] = None,
+        not_before: Optional[datetime] = None,
+        score: Optional[float] = None
+    ) -> ScheduledCall:
+        """
+        Queue a call
+
+        Args:
+            key: Identifier for logs (e.g. the call job ID)
+            run: Places the call and blocks until it is done; returns a
+                datetime to be run again then (a retry), else None
+            tz: Store time zone (None: no hours restriction)
+            distance: Miles from the searcher (nearer first)
+            retailer_type: Retailer type (see CALL_SCHEDULE_CONFIG['retailer_type_priority'])
+            group: Calls sharing a group (a batch) share group_limit
+            group_limit: Maximum simultaneous calls in the group
+            not_before: Don't release the call before this (aware) time
+            score: Learned call priority (ranking.py); within a distance band,
+                higher scores go first
+
+        Returns:
+            The ScheduledCall; its future resolves once run() returns None
+        """
+        call = ScheduledCall(
+            priority=self.priority(distance, retailer_type, score),
+            seq=next(self._seq),
+            key=key,
+            run=run,
+            tz=tz,
+            group=group,
+            group_limit=group_limit,
+            not_before=not_before
+        )
+        with self._cond:
+            heapq.heappush(self._queue, call)
+            self._ensure_started_locked()
+            self._cond.notify_all()
+        return call
+
+    def cancel(self, keys) -> int:
+        """
+        Drop queued calls (not ones already running); their futures resolve to False
+
+        Returns:
+            Number of calls dropped
+        """
+        keys = set(keys)
+        with self._cond:
+            dropped = [call for call in self._queue if call.key in keys]
+            if dropped:
+                self._queue = [call for call in self._queue if call.key not in keys]
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+        for call in dropped:
+            call.future.set_result(False)
+        return len(dropped)
+
+    def stats(self) -> Dict:
+        now = self.clock()
+        with self._cond:
+            waiting = [c for c in self._queue if next_call_time(c.tz, now, self.config) is not None]
+            backing_off = [c for c in self._queue if c.not_before and c.not_before > now]
+            return {
+                "queued": len(self._queue),
+                "waiting_for_hours": len(waiting),
+                "waiting_to_retry": len(backing_off),
+                "in_flight": self._in_flight,
+                "max_concurrent_calls": self.config["max_concurrent_calls"],
+            }
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._workers.shutdown(wait=False)
+
+    # ── Dispatching ──
+
+    def _ensure_started_locked(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="call-scheduler", daemon=True)
+            self._thread.start()
+
+    def _pick_locked(self, now: datetime) -> Tuple[Optional[ScheduledCall], float]:
+        """Best runnable call, or None plus how long to sleep before looking again"""
+        if self._in_flight >= self.config["max_concurrent_calls"]:
+            return None, self.config["max_sleep_seconds"]
+        sleep = self.config["max_sleep_seconds"]
+        for call in sorted(self._queue):
+            if call.group and call.group_limit and self._group_in_flight.get(call.group, 0) >= call.group_limit:
+                continue
+            if call.not_before and call.not_before > now:
+                sleep = min(sleep, max((call.not_before - now).total_seconds(), 0.01))
+                continue
+            opens_at = next_call_time(call.tz, now, self.config)
+            if opens_at is None:
+                return call, 0
+            sleep = min(sleep, max((opens_at - now).total_seconds(), 0.01))
+        return None, sleep
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                call, sleep = self._pick_locked(self.clock())
+                if call is None:
+                    self._cond.wait(timeout=sleep)
+                    continue
+                self._queue.remove(call)
+                heapq.heapify(self._queue)
+                self._in_flight += 1
+                if call.group:
+                    self._group_in_flight[call.group] = self._group_in_flight.get(call.group, 0) + 1
+            self._workers.submit(self._execute, call)
+
+    def _execute(self, call: ScheduledCall):
+        retry_at = None
+        try:
+            retry_at = call.run()
+            if not isinstance(retry_at, datetime):
+                retry_at = None
+                call.future.set_result(True)
+        except Exception as e:
+            print(f"[scheduler] Call {call.key} raised: {e}")
+            call.future.set_exception(e)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                if call.group:
+                    self._group_in_flight[call.group] -= 1
+                    if not self._group_in_flight[call.group]:
+                        del self._group_in_flight[call.group]
+                if retry_at is not None:
+                    call.not_before = retry_at
+                    heapq.heappush(self._queue, call)
+                self._cond.notify_all()
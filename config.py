@@ -2483,11 +2483,14 @@ TUDOR_URLS = {
 # Bland AI Configuration
 BLAND_CONFIG = {
     "api_key": "",  # Set via environment variable BLAND_API_KEY
-    "base_url": "https://api.bland.ai/v1",
+    "base_url": "https://api.bland.ai/v1",  # Override with BLAND_BASE_URL (e.g. the local simulator)
     "voice": "nat",  # Natural sounding voice
     "max_duration": 120,  # Max call duration in seconds
     "wait_for_greeting": True,
-    "record": True
+    "record": True,
+    "request_timeout": 30,  # Seconds per HTTP request to the Bland API
+    "max_connections": 100,  # Pooled connections per process (sync session and async client)
+    "max_keepalive_connections": 20,  # Idle connections kept open by the async client
 }
 
 # Phone call script
@@ -2500,6 +2503,218 @@ CALL_SCRIPT = {
 
 # Output settings
 OUTPUT_CONFIG = {
-    "results_file": "inventory_results.json",
+    "results_file": "inventory_results.json",  # Legacy whole-run JSON (read-only)
+    "results_log": "inventory_results.jsonl",  # Append-only log, one result per line
     "log_file": "search_log.txt"
 }
+
+# Stock status history (time series of every phone/website outcome)
+HISTORY_CONFIG = {
+    "db_path": "stock_history.db",
+    "default_max_age_days": 30,  # How far back /api/history looks by default
+}
+
+# Retailer data snapshot (hot-reloaded by the API when the file changes)
+RETAILER_CONFIG = {
+    "data_file": "retailers.json",
+    "hot_reload": True,
+    "watch_interval_seconds": 30,  # How often the API checks the file's mtime
+    "grid_cell_degrees": 1.0,  # Spatial index cell size
+    "geocode_workers": 8,  # Simultaneous zip code lookups for retailers missing coordinates, once per generation
+    "ready_timeout_seconds": 10,  # How long a request waits for the first load
+    "retry_after_seconds": 5,  # Retry-After sent with the 503 when that wait times out
+}
+
+# Call job storage (shared by all API worker processes)
+JOB_STORE_CONFIG = {
+    "backend": "sqlite",  # "sqlite" (multi-worker safe) or "memory" (single process)
+    "db_path": "call_jobs.db",
+    "ttl_seconds": 24 * 60 * 60,  # Jobs expire a day after their last update
+    "max_jobs": 10000,  # Oldest jobs are evicted beyond this
+}
+
+# Server-Sent Events for call progress
+SSE_CONFIG = {
+    "poll_interval_seconds": 1.0,  # Re-read the job store this often (catches other workers' updates)
+    "heartbeat_seconds": 15,  # Keep-alive comment so proxies don't drop idle streams
+    "max_stream_seconds": 15 * 60,  # Clients reconnect after this
+}
+
+# Bland AI completion webhooks (replace status polling when the API has a public URL)
+WEBHOOK_CONFIG = {
+    "public_base_url": "",  # Set via PUBLIC_BASE_URL, e.g. https://tudor-finder.up.railway.app
+    "secret": "",  # Set via BLAND_WEBHOOK_SECRET; webhooks stay off without one
+    "path": "/api/webhooks/bland",
+    "signature_header": "X-Webhook-Signature",  # HMAC-SHA256 of the raw body, checked when present
+    "completion_deadline_seconds": 300,  # No webhook by then: fall back to polling the call
+    "fallback_max_wait_seconds": 120,  # Then give up and fail the job
+}
+
+# Server-side batch calls (POST /api/call/batch)
+BATCH_CONFIG = {
+    "max_concurrency": 3,  # Calls in flight at once per batch
+    "max_calls": 25,  # Upper bound on one batch
+    "completion_timeout_seconds": 600,  # Give up on a webhook-completed call after this
+    "completion_poll_seconds": 2,  # How often a batch worker re-reads that call's job
+}
+
+# Call order learned from past outcomes (ranking.py)
+RANKING_CONFIG = {
+    "enabled": True,  # False: call nearest first
+    # Prior hit rate by retailer type, worth prior_strength past answers
+    "type_prior_hit_rates": {"Tudor Boutique Edition": 0.25, "Official Retailer": 0.12, "default": 0.1},
+    "prior_strength": 4,
+    "hit_statuses": ["in_stock"],
+    "miss_statuses": ["out_of_stock", "waitlist", "can_order"],  # No answer/unknown say nothing about stock
+    "family_weight": 0.3,  # Weight of an answer about another reference of the same model
+    "half_life_days": 30,  # An answer this old counts half
+    "max_age_days": 365,
+    "distance_scale_miles": 25,  # A store this far away scores half as high at the same hit rate
+    "candidate_factor": 3,  # Batches rank this many times max_calls of the nearest stores
+}
+
+# When a sweep of nearby stores stops calling (sweep.py)
+SWEEP_CONFIG = {
+    "strategy": "all",  # "all", "first_hit", "first_n" or "radius_band"
+    "hits": 1,  # In-stock stores that end a "first_n" sweep
+    "band_miles": 5,  # "radius_band": finish the band of the nearest hit, skip farther ones
+}
+
+# Concurrent calling from the CLI (InventoryChecker)
+CALL_CONCURRENCY_CONFIG = {
+    "max_concurrent_calls": 1,  # 1 keeps the original one-call-at-a-time behaviour
+    "max_per_chain": 1,  # Never ring two stores of the same chain at once
+    # Name fragments identifying multi-store chains (lowercase, first match wins);
+    # any other retailer is its own chain
+    "chains": [
+        "ben bridge", "watches of switzerland", "reeds", "fink's", "mayors",
+        "lee michaels", "1916 company", "long's", "london jewelers", "bucherer",
+        "diamond cellar", "hamilton jewelers", "westime", "deutsch", "hing wa lee",
+        "betteridge", "bachendorf", "tourneau",
+    ],
+}
+
+# Shared call-status poller (one background service for every in-flight call)
+POLLER_CONFIG = {
+    "ringing_interval_seconds": 15,  # While a call is queued or ringing
+    "min_interval_seconds": 2,  # Densest polling, once a call passes its expected end
+    "max_interval_seconds": 30,
+    "default_duration_seconds": 90,  # Expected call length until real durations are seen
+    "max_wait_seconds": 300,  # Give up on a call after this
+    "fetch_workers": 4,  # Concurrent status requests
+    "baseline_interval_seconds": 5,  # The fixed interval "polls saved" is measured against
+}
+
+# Recent call outcomes per (phone, watch reference), and in-flight call sharing
+CALL_CACHE_CONFIG = {
+    "db_path": "call_cache.db",
+    "ttl_seconds": 6 * 60 * 60,  # Serve a store's answer for this long before calling again
+    "in_flight_timeout_seconds": 15 * 60,  # An unfinished call stops blocking new ones after this
+    "cacheable_statuses": ["in_stock", "out_of_stock", "waitlist", "can_order"],
+}
+
+# Business-hours call scheduler (server-side calls)
+CALL_SCHEDULE_CONFIG = {
+    "max_concurrent_calls": 6,  # Global budget of calls in flight across all batches
+    # Likely opening hours in each store's local time (None: closed all day)
+    "hours": {
+        "mon": ("10:00", "18:00"),
+        "tue": ("10:00", "18:00"),
+        "wed": ("10:00", "18:00"),
+        "thu": ("10:00", "18:00"),
+        "fri": ("10:00", "18:00"),
+        "sat": ("10:00", "17:00"),
+        "sun": ("12:00", "17:00"),
+    },
+    "open_margin_minutes": 30,  # Let staff settle in before calling
+    "close_margin_minutes": 30,  # Don't ring while they're closing up
+    "distance_band_miles": 5,  # Stores within the same band are ordered by retailer type first
+    "retailer_type_priority": {"Tudor Boutique Edition": 0, "Official Retailer": 1},
+    "max_sleep_seconds": 60,  # Longest the dispatcher sleeps before re-checking the queue
+}
+
+# Automatic retries of calls nobody answered or that failed to go through
+RETRY_CONFIG = {
+    "retry_statuses": ["no_answer", "call_failed"],
+    "max_attempts": 3,  # Calls per retailer, including the first
+    "base_delay_seconds": 5 * 60,  # Wait before the first retry
+    "backoff_multiplier": 2,  # Each further retry waits this much longer
+    "max_delay_seconds": 60 * 60,
+    "jitter": 0.5,  # Up to this fraction of each delay is randomized away
+}
+
+# Bland AI spend accounting and budgets (per API key)
+ACCOUNTING_CONFIG = {
+    "db_path": "call_ledger.db",
+    "cost_per_minute": 0.09,  # Bland AI price in USD per connected minute
+    "estimated_minutes_per_call": 2.0,  # What admission assumes a call not yet made will cost
+    # USD limits per API key: past "soft" calls are still placed (with a warning), past "hard" they are refused
+    "budgets": {
+        "daily": {"soft": 20.0, "hard": 40.0},
+        "monthly": {"soft": 300.0, "hard": 500.0},
+    },
+    "burn_rate_window_seconds": 60 * 60,  # Spend over this window is reported as the burn rate
+    # Admitted calls hold their estimate until recorded or released; older reservations (a crashed process) stop counting
+    "reservation_ttl_seconds": 2 * 24 * 60 * 60,
+}
+
+# Local Bland AI stand-in for load tests (bland_simulator.py)
+BLAND_SIMULATOR_CONFIG = {
+    "latency_ms": 40,  # Added to every request
+    "latency_jitter_ms": 20,
+    "start_error_rate": 0.0,  # Share of POST /calls answered with a 500
+    "ring_seconds": 8,  # Time "queued" before the call connects
+    "duration_median_seconds": 75,  # Connected call length (log-normal)
+    "duration_sigma": 0.4,
+    "time_scale": 1.0,  # Multiplies every simulated duration (0.01 runs calls 100x faster)
+    # Outcome mix: transcript labels from benchmarks/transcripts.jsonl, or a Bland call status
+    "outcomes": {
+        "in_stock": 0.15,
+        "out_of_stock": 0.40,
+        "waitlist": 0.20,
+        "can_order": 0.05,
+        "unknown": 0.05,
+        "no-answer": 0.10,
+        "voicemail": 0.03,
+        "busy": 0.02,
+    },
+    "transcripts": "benchmarks/transcripts.jsonl",
+}
+
+# Compressed transcripts and raw Bland AI payloads, keyed by call ID (blob_store.py)
+BLOB_STORE_CONFIG = {
+    "db_path": "call_blobs.db",
+    "compression_level": 6,  # zlib level: 1 fastest, 9 smallest
+}
+
+# Website-first, phone-second stock sweep (tiered_sweep.py)
+TIERED_SWEEP_CONFIG = {
+    "website_workers": 6,  # Concurrent website checks
+    # Website answers that settle a store without calling it (WebsiteStockStatus values)
+    "clear_website_statuses": ["in_stock", "out_of_stock"],
+}
+
+# Claude transcript summaries (summarizer.py)
+SUMMARIZER_CONFIG = {
+    "model": "claude-3-haiku-20240307",
+    "max_tokens": 150,
+    "max_concurrent_requests": 4,  # Summaries in flight at once (per process, and per event loop when async)
+    "request_timeout": 30,
+    # Backoff for rate limits, overload and transient errors (same shape as RETRY_CONFIG)
+    "retry": {
+        "retry_statuses": ["rate_limited", "overloaded", "server_error", "connection_error"],
+        "max_attempts": 4,  # Requests per summary, including the first
+        "base_delay_seconds": 1,
+        "backoff_multiplier": 2,
+        "max_delay_seconds": 20,
+        "jitter": 0.5,
+    },
+}
+
+# Cache of Claude summaries by transcript content (summary_cache.py)
+SUMMARY_CACHE_CONFIG = {
+    "enabled": True,
+    "db_path": "summary_cache.db",
+    "max_entries": 5000,  # Least recently used summaries are evicted past either limit
+    "max_bytes": 5 * 1024 * 1024,  # Summary text, in bytes
+}
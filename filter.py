@@ -5,7 +5,9 @@ Filters Tudor retailers based on distance from a given zip code
 
 import math
 import json
+import dataclasses
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
@@ -103,6 +105,44 @@ class ZipCodeGeocoder:
 
         return None
 
+    def locate(self, retailers: List[Retailer], workers: int = 8) -> List[Retailer]:
+        """
+        Fill in missing retailer coordinates from their zip codes
+
+        Each distinct zip code is geocoded once, ``workers`` at a time.
+        Retailers are copied rather than mutated; those that already have
+        coordinates, or whose zip code can't be geocoded, are returned as is.
+
+        Args:
+            retailers: Retailers, some possibly without coordinates
+            workers: Simultaneous geocoding requests
+
+        Returns:
+            The retailers in the same order, located where possible
+        """
+        zip_codes = sorted({r.zip_code for r in retailers if r.zip_code and (r.latitude is None or r.longitude is None)})
+        if not zip_codes:
+            return list(retailers)
+
+        def geocode(zip_code: str) -> Optional[ZipCodeLocation]:
+            try:
+                return self.geocode(zip_code)
+            except Exception as e:
+                print(f"Geocoding error for {zip_code}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(zip_codes))) as pool:
+            locations = dict(zip(zip_codes, pool.map(geocode, zip_codes)))
+
+        located = []
+        for retailer in retailers:
+            location = locations.get(retailer.zip_code) if retailer.latitude is None or retailer.longitude is None else None
+            if location:
+                retailer = dataclasses.replace(retailer, latitude=location.latitude, longitude=location.longitude)
+            located.append(retailer)
+        print(f"Geocoded {sum(1 for loc in locations.values() if loc)}/{len(zip_codes)} retailer zip codes")
+        return located
+
 
 class DistanceCalculator:
     """Calculates distances between geographic coordinates"""
@@ -135,6 +175,71 @@ class DistanceCalculator:
         return DistanceCalculator.EARTH_RADIUS_MILES * c
 
 
+class RetailerGridIndex:
+    """
+    Immutable spatial index over retailers.
+
+    Buckets retailers into a lat/lon grid so a radius query only measures
+    distances to retailers in nearby cells instead of the whole list.
+    Retailers without coordinates are kept aside in ``unlocated`` and never
+    match a query; geocode them before building (ZipCodeGeocoder.locate).
+    """
+
+    MILES_PER_DEGREE_LAT = 69.0
+
+    def __init__(self, retailers: List[Retailer], cell_degrees: float = 1.0):
+        """
+        Args:
+            retailers: Retailers to index (the index never mutates them)
+            cell_degrees: Grid cell size in degrees
+        """
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], List[Retailer]] = {}
+        unlocated = []
+        for retailer in retailers:
+            if retailer.latitude is None or retailer.longitude is None:
+                unlocated.append(retailer)
+                continue
+            self._cells.setdefault(self._cell(retailer.latitude, retailer.longitude), []).append(retailer)
+        self.unlocated: Tuple[Retailer, ...] = tuple(unlocated)
+        self.size = len(retailers) - len(unlocated)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees))
+
+    def query(self, latitude: float, longitude: float, radius_miles: float) -> List[Tuple[Retailer, float]]:
+        """
+        Find indexed retailers within a radius of a point
+
+        Args:
+            latitude, longitude: Center coordinates
+            radius_miles: Maximum distance in miles
+
+        Returns:
+            List of (Retailer, distance) tuples, sorted by distance
+        """
+        lat_span = radius_miles / self.MILES_PER_DEGREE_LAT
+        # Longitude degrees shrink toward the poles; clamp to avoid blowing up
+        cos_lat = max(math.cos(math.radians(min(abs(latitude) + lat_span, 89.0))), 0.01)
+        lon_span = radius_miles / (self.MILES_PER_DEGREE_LAT * cos_lat)
+
+        min_row, min_col = self._cell(latitude - lat_span, longitude - lon_span)
+        max_row, max_col = self._cell(latitude + lat_span, longitude + lon_span)
+
+        results = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for retailer in self._cells.get((row, col), ()):
+                    distance = DistanceCalculator.haversine_distance(
+                        latitude, longitude, retailer.latitude, retailer.longitude
+                    )
+                    if distance <= radius_miles:
+                        results.append((retailer, distance))
+
+        results.sort(key=lambda x: x[1])
+        return results
+
+
 class RetailerFilter:
     """Filters retailers by distance from a zip code"""
 
@@ -146,7 +251,8 @@ class RetailerFilter:
         self,
         retailers: List[Retailer],
         zip_code: str,
-        radius_miles: float = 50
+        radius_miles: float = 50,
+        index: Optional[RetailerGridIndex] = None
     ) -> List[Tuple[Retailer, float]]:
         """
         Filter retailers within a radius of a zip code
@@ -155,6 +261,7 @@ class RetailerFilter:
             retailers: List of Retailer objects to filter
             zip_code: Center zip code for the search
             radius_miles: Maximum distance in miles
+            index: Prebuilt spatial index over ``retailers`` (optional)
 
         Returns:
             List of (Retailer, distance) tuples, sorted by distance
@@ -167,6 +274,9 @@ class RetailerFilter:
         print(f"Searching within {radius_miles} miles of {location.city}, {location.state} ({zip_code})")
         print(f"Center coordinates: {location.latitude}, {location.longitude}")
 
+        if index is not None:
+            return self._filter_with_index(index, location, radius_miles)
+
         results = []
 
         for retailer in retailers:
@@ -196,6 +306,15 @@ class RetailerFilter:
 
         return results
 
+    def _filter_with_index(
+        self,
+        index: RetailerGridIndex,
+        location: ZipCodeLocation,
+        radius_miles: float
+    ) -> List[Tuple[Retailer, float]]:
+        """Radius query against a spatial index (its retailers were geocoded when it was built, not per search)"""
+        return index.query(location.latitude, location.longitude, radius_miles)
+
     def filter_by_coordinates(
         self,
         retailers: List[Retailer],
@@ -0,0 +1,283 @@
+"""
+Stock Status History
+Persists every phone and website stock outcome in a SQLite time series,
+with precomputed daily rollups by state
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable
+
+from config import HISTORY_CONFIG
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    retailer_name TEXT NOT NULL,
+    retailer_phone TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT '',
+    reference TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_obs_key
+    ON observations (retailer_name, reference, source, observed_at);
+CREATE INDEX IF NOT EXISTS idx_obs_phone
+    ON observations (retailer_phone, reference, observed_at);
+CREATE INDEX IF NOT EXISTS idx_obs_reference
+    ON observations (reference, observed_at);
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day TEXT NOT NULL,
+    state TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, state, reference, source, status)
+);
+"""
+
+
+class StockHistory:
+    """
+    Time series of stock observations keyed by
+    (retailer, reference, source, timestamp).
+
+    Each observation also bumps a row in ``daily_rollups`` inside the same
+    transaction, so per-day/per-state counts never need a table scan.
+    """
+
+    SOURCE_PHONE = "phone"
+    SOURCE_WEBSITE = "website"
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite file to use (defaults to HISTORY_CONFIG['db_path'])
+        """
+        self.db_path = db_path or HISTORY_CONFIG["db_path"]
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection, commit on success, always close"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ── Writing ──
+
+    def record(
+        self,
+        retailer_name: str,
+        reference: str,
+        source: str,
+        status: str,
+        observed_at: Optional[str] = None,
+        retailer_phone: str = "",
+        state: str = "",
+        detail: Optional[Dict] = None
+    ):
+        """
+        Record one stock observation and update its daily rollup
+
+        Args:
+            retailer_name: Name of the retailer
+            reference: Watch reference that was checked
+            source: "phone" or "website"
+            status: Status value (InventoryStatus / WebsiteStockStatus value)
+            observed_at: ISO timestamp (defaults to now)
+            retailer_phone: Normalized phone number, if known
+            state: Retailer's state, used for rollups
+            detail: Small extra fields (summary, product URL, ...)
+        """
+        observed_at = observed_at or datetime.now().isoformat()
+        day = observed_at[:10]
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO observations
+                   (retailer_name, retailer_phone, state, reference, source, status, observed_at, detail)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (retailer_name, retailer_phone or "", state or "", reference, source, status,
+                 observed_at, json.dumps(detail) if detail else None)
+            )
+            conn.execute(
+                """INSERT INTO daily_rollups (day, state, reference, source, status, count)
+                   VALUES (?, ?, ?, ?, ?, 1)
+                   ON CONFLICT (day, state, reference, source, status)
+                   DO UPDATE SET count = count + 1""",
+                (day, state or "", reference, source, status)
+            )
+
+    def record_call_result(self, result, reference: str, state: str = ""):
+        """Record a phone CallResult"""
+        self.record(
+            retailer_name=result.retailer_name,
+            reference=reference,
+            source=self.SOURCE_PHONE,
+            status=result.status.value,
+            observed_at=result.timestamp or None,
+            retailer_phone=result.retailer_phone,
+            state=state,
+            detail={"summary": result.summary, "call_id": result.call_id}
+        )
+
+    def record_website_result(self, result, reference: str, state: str = "", retailer_name: Optional[str] = None):
+        """Record a WebsiteStockResult (optionally under the store name that was checked)"""
+        self.record(
+            retailer_name=retailer_name or result.retailer_name,
+            reference=reference,
+            source=self.SOURCE_WEBSITE,
+            status=result.status.value,
+            state=state,
+            detail={"message": result.message, "product_url": result.product_url, "price": result.price}
+        )
+
+    # ── Reading ──
+
+    def latest(
+        self,
+        reference: str,
+        source: Optional[str] = None,
+        retailer_names: Optional[Iterable[str]] = None,
+        retailer_phones: Optional[Iterable[str]] = None,
+        max_age_days: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Most recent observation per (retailer, source) for a reference
+
+        Args:
+            reference: Watch reference
+            source: Limit to "phone" or "website" observations
+            retailer_names: Limit to these retailer names
+            retailer_phones: Limit to these (normalized) phone numbers
+            max_age_days: Ignore observations older than this
+
+        Returns:
+            List of observation dicts, newest first
+        """
+        since = (datetime.now() - timedelta(days=max_age_days)).isoformat() if max_age_days is not None else ""
+
+        where = "reference = ? AND observed_at >= ?"
+        params: List = [reference, since]
+        if source:
+            where += " AND source = ?"
+            params.append(source)
+        for column, values in (("retailer_name", retailer_names), ("retailer_phone", retailer_phones)):
+            if values is None:
+                continue
+            values = [v for v in values if v]
+            if not values:
+                return []
+            where += f" AND {column} IN ({','.join('?' * len(values))})"
+            params.extend(values)
+
+        query = f"""
+            SELECT o.* FROM observations o
+            JOIN (
+                SELECT retailer_name, retailer_phone, source, MAX(observed_at) AS latest_at
+                FROM observations
+                WHERE {where}
+                GROUP BY retailer_name, retailer_phone, source
+            ) l ON o.retailer_name = l.retailer_name
+               AND o.retailer_phone = l.retailer_phone
+               AND o.source = l.source
+               AND o.observed_at = l.latest_at
+            WHERE o.reference = ?
+            ORDER BY o.observed_at DESC
+        """
+        params.append(reference)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def outcomes(
+        self,
+        references: Iterable[str],
+        source: Optional[str] = None,
+        max_age_days: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Every observation of some references (no detail), e.g. to learn hit rates
+
+        Args:
+            references: Watch references to include
+            source: Limit to "phone" or "website" observations
+            max_age_days: Ignore observations older than this
+
+        Returns:
+            List of {retailer_name, retailer_phone, reference, status, observed_at} dicts
+        """
+        references = [r for r in references if r]
+        if not references:
+            return []
+        since = (datetime.now() - timedelta(days=max_age_days)).isoformat() if max_age_days is not None else ""
+        query = f"""
+            SELECT retailer_name, retailer_phone, reference, status, observed_at FROM observations
+            WHERE reference IN ({','.join('?' * len(references))}) AND observed_at >= ?
+        """
+        params: List = references + [since]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def rollups(
+        self,
+        reference: Optional[str] = None,
+        states: Optional[Iterable[str]] = None,
+        days: int = 30
+    ) -> List[Dict]:
+        """
+        Precomputed daily counts by state and status
+
+        Args:
+            reference: Limit to one watch reference
+            states: Limit to these states
+            days: How many days back to include
+
+        Returns:
+            List of {day, state, reference, source, status, count} dicts
+        """
+        since_day = (datetime.now() - timedelta(days=days)).date().isoformat()
+        query = "SELECT * FROM daily_rollups WHERE day >= ?"
+        params: List = [since_day]
+        if reference:
+            query += " AND reference = ?"
+            params.append(reference)
+        state_list = list(states or [])
+        if state_list:
+            query += f" AND state IN ({','.join('?' * len(state_list))})"
+            params.extend(state_list)
+        query += " ORDER BY day DESC, state, status"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict:
+        data = dict(row)
+        data.pop("id", None)
+        data["detail"] = json.loads(data["detail"]) if data.get("detail") else {}
+        return data
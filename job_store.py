@@ -0,0 +1,332 @@
+"""
+Call Job Store
+Persistent, bounded storage for call jobs, shared by every API worker process
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import JOB_STORE_CONFIG
+
+
+class JobUpdateNotifier:
+    """
+    Wakes async listeners (SSE streams) when a job changes in this process.
+
+    Updates made by other worker processes are not seen here, so listeners
+    should also re-read the store on a timeout.
+    """
+
+    def __init__(self):
+        self._listeners = set()  # (loop, asyncio.Event)
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Event:
+        """Register an event that is set on every job update (call from the event loop)"""
+        event = asyncio.Event()
+        with self._lock:
+            self._listeners.add((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        with self._lock:
+            self._listeners = {(loop, e) for loop, e in self._listeners if e is not event}
+
+    def notify(self):
+        """Wake every listener (safe to call from any thread)"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for loop, event in listeners:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+
+class JobStore(ABC):
+    """
+    Base class for call job storage.
+
+    Jobs are plain dicts keyed by job ID. Every job expires ``ttl_seconds``
+    after its last update and the store never holds more than ``max_jobs``
+    (the least recently updated jobs are evicted first). A job created with
+    a ``session_id`` field can be found again by session.
+    """
+
+    def __init__(self, ttl_seconds: int, max_jobs: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self.notifier = JobUpdateNotifier()
+
+    @abstractmethod
+    def create(self, job_id: str, record: Dict):
+        """Store a new job"""
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by ID (None if missing or expired)"""
+        pass
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> Optional[Dict]:
+        """Merge fields into a job and return the updated record (None if missing)"""
+        pass
+
+    @abstractmethod
+    def transition(self, job_id: str, from_statuses, **fields) -> Optional[Dict]:
+        """
+        Like update(), but only if the job's status is one of ``from_statuses``.
+
+        Returns the updated record, or None if the job is missing or in
+        another status (so exactly one of several racing callers wins).
+        """
+        pass
+
+    @abstractmethod
+    def list_jobs_by_status(self, statuses) -> List[str]:
+        """IDs of the live jobs whose status is one of ``statuses``, oldest first"""
+        pass
+
+    @abstractmethod
+    def list_session_jobs(self, session_id: str) -> List[str]:
+        """IDs of the live jobs created for a browser session, oldest first"""
+        pass
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        """Remove expired jobs and enforce the size bound; returns how many were removed"""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored jobs"""
+        pass
+
+
+class MemoryJobStore(JobStore):
+    """In-process job store (single worker only; used for tests and local runs)"""
+
+    def __init__(self, ttl_seconds: int = 86400, max_jobs: int = 10000):
+        super().__init__(ttl_seconds, max_jobs)
+        self._jobs: "OrderedDict[str, tuple]" = OrderedDict()  # job_id -> (expires_at, record)
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, record: Dict):
+        with self._lock:
+            self._jobs[job_id] = (time.time() + self.ttl_seconds, dict(record))
+            self._jobs.move_to_end(job_id)
+            self._evict_locked()
+        self.notifier.notify()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if not entry or entry[0] < time.time():
+                return None
+            return dict(entry[1])
+
+    def update(self, job_id: str, **fields) -> Optional[Dict]:
+        return self.transition(job_id, None, **fields)
+
+    def transition(self, job_id: str, from_statuses, **fields) -> Optional[Dict]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if not entry or entry[0] < time.time():
+                return None
+            if from_statuses is not None and entry[1].get("status") not in from_statuses:
+                return None
+            record = dict(entry[1])
+            record.update(fields)
+            self._jobs[job_id] = (time.time() + self.ttl_seconds, record)
+            self._jobs.move_to_end(job_id)
+        self.notifier.notify()
+        return dict(record)
+
+    def list_jobs_by_status(self, statuses) -> List[str]:
+        return self._list_matching(lambda record: record.get("status") in statuses)
+
+    def list_session_jobs(self, session_id: str) -> List[str]:
+        return self._list_matching(lambda record: record.get("session_id") == session_id)
+
+    def _list_matching(self, predicate) -> List[str]:
+        with self._lock:
+            now = time.time()
+            matches = [
+                (record.get("started_at", ""), job_id)
+                for job_id, (expires_at, record) in self._jobs.items()
+                if expires_at >= now and predicate(record)
+            ]
+        return [job_id for _, job_id in sorted(matches)]
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        now = time.time()
+        expired = [job_id for job_id, (expires_at, _) in self._jobs.items() if expires_at < now]
+        for job_id in expired:
+            del self._jobs[job_id]
+        removed = len(expired)
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+            removed += 1
+        return removed
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Job store backed by a SQLite file in WAL mode.
+
+    Safe for several uvicorn worker processes: each lookup is a primary-key
+    read, and updates run in ``BEGIN IMMEDIATE`` transactions so concurrent
+    read-modify-writes from different processes never lose fields.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        record TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs (expires_at);
+    CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (updated_at);
+    """
+
+    # Columns added after the first release, applied to existing files on open
+    MIGRATIONS = [
+        ("session_id", "ALTER TABLE jobs ADD COLUMN session_id TEXT"),
+        ("status", "ALTER TABLE jobs ADD COLUMN status TEXT"),
+    ]
+
+    # Run eviction every N creates instead of on every write
+    EVICT_EVERY = 50
+
+    def __init__(self, db_path: str, ttl_seconds: int = 86400, max_jobs: int = 10000):
+        super().__init__(ttl_seconds, max_jobs)
+        self.db_path = db_path
+        self._local = threading.local()
+        self._creates = 0
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, statement in self.MIGRATIONS:
+            if column not in columns:
+                conn.execute(statement)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs (session_id, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread, opened in autocommit mode"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job_id: str, record: Dict):
+        now = time.time()
+        self._conn().execute(
+            """INSERT OR REPLACE INTO jobs (job_id, record, created_at, updated_at, expires_at, session_id, status)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (job_id, json.dumps(record), now, now, now + self.ttl_seconds,
+             record.get("session_id"), record.get("status"))
+        )
+        self._creates += 1
+        if self._creates % self.EVICT_EVERY == 0:
+            self.evict_expired()
+        self.notifier.notify()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT record FROM jobs WHERE job_id = ? AND expires_at >= ?",
+            (job_id, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, job_id: str, **fields) -> Optional[Dict]:
+        return self.transition(job_id, None, **fields)
+
+    def transition(self, job_id: str, from_statuses, **fields) -> Optional[Dict]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT record FROM jobs WHERE job_id = ? AND expires_at >= ?", (job_id, time.time())
+            ).fetchone()
+            record = json.loads(row[0]) if row else None
+            if record is None or (from_statuses is not None and record.get("status") not in from_statuses):
+                conn.execute("COMMIT")
+                return None
+            record.update(fields)
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET record = ?, updated_at = ?, expires_at = ?, status = ? WHERE job_id = ?",
+                (json.dumps(record), now, now + self.ttl_seconds, record.get("status"), job_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.notifier.notify()
+        return record
+
+    def list_jobs_by_status(self, statuses) -> List[str]:
+        statuses = list(statuses)
+        if not statuses:
+            return []
+        rows = self._conn().execute(
+            f"""SELECT job_id FROM jobs WHERE status IN ({','.join('?' * len(statuses))})
+                AND expires_at >= ? ORDER BY created_at""",
+            (*statuses, time.time())
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_session_jobs(self, session_id: str) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT job_id FROM jobs WHERE session_id = ? AND expires_at >= ? ORDER BY created_at",
+            (session_id, time.time())
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def evict_expired(self) -> int:
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM jobs WHERE expires_at < ?", (time.time(),)).rowcount
+        overflow = self.count() - self.max_jobs
+        if overflow > 0:
+            removed += conn.execute(
+                "DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs ORDER BY updated_at LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        return removed
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+
+def create_job_store(config: Optional[Dict] = None) -> JobStore:
+    """Build the job store described by JOB_STORE_CONFIG"""
+    config = config or JOB_STORE_CONFIG
+    if config.get("backend", "sqlite") == "memory":
+        return MemoryJobStore(config["ttl_seconds"], config["max_jobs"])
+    return SQLiteJobStore(config["db_path"], config["ttl_seconds"], config["max_jobs"])
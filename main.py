@@ -11,12 +11,22 @@ import os
 import sys
 import json
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from config import SEARCH_CONFIG, WATCH_CONFIG, OUTPUT_CONFIG
+from config import (
+    SEARCH_CONFIG, WATCH_CONFIG, WATCHES, OUTPUT_CONFIG, CALL_CONCURRENCY_CONFIG, SWEEP_CONFIG, RANKING_CONFIG
+)
 from scraper import TudorScraper, Retailer
 from filter import RetailerFilter
 from phone_caller import InventoryChecker, InventoryStatus
+from results_log import ResultsLog
+from history import StockHistory
+from accounting import CallLedger
+from blob_store import create_blob_store
+from call_poller import get_call_poller
+from sweep import SweepStrategy, STRATEGIES
+from ranking import RetailerRanker, describe
+from tiered_sweep import TieredSweep, print_statuses
 
 
 def load_or_scrape_retailers(force_refresh: bool = False) -> list:
@@ -58,9 +68,16 @@ def run_inventory_check(
     filtered: list,
     api_key: str,
     max_calls: Optional[int] = None,
-    delay: int = 30
+    delay: int = 30,
+    concurrency: int = 1,
+    references: Optional[List[str]] = None,
+    strategy: Optional[SweepStrategy] = None,
+    rank: bool = True,
+    website_first: bool = False
 ):
-    """Run the inventory check process"""
+    """Run the inventory check process (references: ask about several watches per call;
+    rank: call the stores most likely to have the watch first, not the nearest;
+    website_first: only call the stores whose website gave no clear answer)"""
     # Filter to retailers with phone numbers
     with_phones = [(r, d) for r, d in filtered if r.phone]
 
@@ -70,28 +87,71 @@ def run_inventory_check(
 
     print(f"\n📞 Found {len(with_phones)} retailers with phone numbers")
 
+    history = StockHistory()
+    if rank:
+        ranked = RetailerRanker(history).rank(with_phones, references or [WATCH_CONFIG['reference']])
+        with_phones = [(r.retailer, r.distance) for r in ranked]
+        print("   Calling in order of expected stock (learned from past calls):")
+        for i, r in enumerate(ranked[:5], 1):
+            print(f"   {i}. {r.retailer.name}: {describe(r)}")
+
+    stocks, tracker = None, None
+    if website_first:
+        sweep = TieredSweep(history=history)
+        stocks, with_phones, tracker = sweep.plan(
+            with_phones, references or [WATCH_CONFIG['reference']], strategy, max_calls
+        )
+        if not with_phones:
+            print_statuses(stocks)
+            return stocks
+
     if max_calls:
         print(f"   Will call up to {max_calls} retailers")
         with_phones = with_phones[:max_calls]
 
     # Confirm before making calls
     print(f"\n⚠️  About to make {len(with_phones)} phone calls using Bland AI")
-    print(f"   Watch: {WATCH_CONFIG['full_name']}")
-    print(f"   Reference: {WATCH_CONFIG['reference']}")
+    if references:
+        print(f"   Asking about {len(references)} references per call: {', '.join(references)}")
+    else:
+        print(f"   Watch: {WATCH_CONFIG['full_name']}")
+        print(f"   Reference: {WATCH_CONFIG['reference']}")
 
     confirm = input("\nProceed with calls? (yes/no): ").strip().lower()
     if confirm not in ['yes', 'y']:
         print("Cancelled.")
         return None
 
-    # Make the calls
-    checker = InventoryChecker(api_key)
-    results = checker.check_retailers(with_phones, delay_between_calls=delay, max_calls=max_calls)
+    # Make the calls (each result is appended to the log as it completes)
+    checker = InventoryChecker(
+        api_key,
+        results_log=ResultsLog(OUTPUT_CONFIG['results_log']),
+        history=history,
+        poller=get_call_poller(),
+        watch_configs=[WATCHES[ref] for ref in references] if references else None,
+        ledger=CallLedger(),
+        blob_store=create_blob_store()
+    )
+    results = checker.check_retailers(
+        with_phones, delay_between_calls=delay, max_calls=max_calls, concurrency=concurrency, strategy=strategy,
+        tracker=tracker
+    )
 
-    # Save and display results
-    checker.save_results(OUTPUT_CONFIG['results_file'])
+    # Display results
+    print(f"\nResults logged to {OUTPUT_CONFIG['results_log']} (run {checker.run_id})")
     checker.print_summary()
 
+    spend = checker.ledger.job_spend(checker.run_id)
+    print(f"Bland AI usage: {spend['calls']} calls, {spend['minutes']} min, ~${spend['cost']:.2f}")
+
+    stats = get_call_poller().stats()
+    print(f"Status polls: {stats['polls']} made, {stats['polls_saved']} saved vs. polling every "
+          f"{stats['baseline_interval_seconds']}s")
+
+    if stocks is not None:
+        stocks = TieredSweep.merge(stocks, results, references or [WATCH_CONFIG['reference']])
+        print_statuses(stocks)
+        return stocks
     return results
 
 
@@ -111,6 +171,18 @@ Examples:
   # Call only the nearest 5 retailers
   python main.py --zip 94117 --max-calls 5
 
+  # Call 4 retailers at a time
+  python main.py --zip 94117 --max-calls 20 --concurrency 4
+
+  # Ask about three Ranger references in each call
+  python main.py --zip 94117 --references M79930-0007,M79930-0001,M79950-0001
+
+  # Stop calling as soon as one store has it
+  python main.py --zip 94117 --strategy first_hit
+
+  # Check store websites first, then call only the stores they leave open
+  python main.py --zip 94117 --website-first
+
   # Refresh retailer data from Tudor website
   python main.py --zip 94117 --refresh
         """
@@ -157,6 +229,58 @@ Examples:
         help="Delay between calls in seconds (default: 30)"
     )
 
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=CALL_CONCURRENCY_CONFIG['max_concurrent_calls'],
+        help="Simultaneous calls; with more than 1, --delay is the gap between calls "
+             f"to the same chain (default: {CALL_CONCURRENCY_CONFIG['max_concurrent_calls']})"
+    )
+
+    parser.add_argument(
+        '--references',
+        type=str,
+        default=None,
+        help="Comma-separated watch references to ask about in each call "
+             "(one result per reference; default: just the configured watch)"
+    )
+
+    parser.add_argument(
+        '--strategy', '-s',
+        choices=STRATEGIES,
+        default=SWEEP_CONFIG['strategy'],
+        help="When to stop calling: every store (all), the first in-stock store (first_hit), "
+             "--hits in-stock stores (first_n), or once the distance band of the nearest "
+             f"in-stock store is covered (radius_band) (default: {SWEEP_CONFIG['strategy']})"
+    )
+
+    parser.add_argument(
+        '--hits',
+        type=int,
+        default=SWEEP_CONFIG['hits'],
+        help=f"In-stock stores that end a first_n sweep (default: {SWEEP_CONFIG['hits']})"
+    )
+
+    parser.add_argument(
+        '--band-miles',
+        type=float,
+        default=SWEEP_CONFIG['band_miles'],
+        help=f"Distance band width for radius_band (default: {SWEEP_CONFIG['band_miles']})"
+    )
+
+    parser.add_argument(
+        '--nearest-first',
+        action='store_true',
+        help="Call the nearest stores first instead of ranking them by past stock outcomes"
+    )
+
+    parser.add_argument(
+        '--website-first',
+        action='store_true',
+        help="Check retailer websites first and only call the stores whose website "
+             "doesn't clearly say in or out of stock"
+    )
+
     parser.add_argument(
         '--refresh',
         action='store_true',
@@ -171,6 +295,18 @@ Examples:
 
     args = parser.parse_args()
 
+    references = [ref.strip() for ref in args.references.split(',') if ref.strip()] if args.references else None
+    unknown = [ref for ref in references or [] if ref not in WATCHES]
+    if unknown:
+        print(f"❌ Unknown watch reference(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    try:
+        strategy = SweepStrategy(args.strategy, hits=args.hits, band_miles=args.band_miles)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
     # Header
     print("=" * 70)
     print("🔍 TUDOR WATCH FINDER")
@@ -214,7 +350,12 @@ Examples:
         filtered,
         args.api_key,
         max_calls=args.max_calls,
-        delay=args.delay
+        delay=args.delay,
+        concurrency=max(1, args.concurrency),
+        references=references,
+        strategy=strategy,
+        rank=RANKING_CONFIG['enabled'] and not args.nearest_first,
+        website_first=args.website_first
     )
 
 
@@ -0,0 +1,134 @@
+"""
+Multi-Reference Calls
+Builds one call task that asks about several watch references, and splits
+the resulting transcript into the parts that concern each reference
+"""
+
+import re
+from typing import Dict, List, Set
+
+
+# Words that appear in most watch descriptions and say nothing about which one is meant
+GENERIC_WORDS = {"dial", "domed", "with", "and", "the", "bezel", "case", "steel", "tudor"}
+
+# Sentences like "we don't have any of them" apply to every reference on the call
+ALL_REFERENCES = re.compile(
+    r"\b(any of (them|those|these)|none of (them|those|these)|all of (them|those|these)"
+    r"|all (three|four|five)|both|neither|either|any tudor|any rangers?)\b"
+)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def describe_watch(watch: Dict) -> str:
+    """Short spoken description, e.g. 'Tudor Ranger 36mm with beige domed dial (ref: M79930-0007)'"""
+    return f"Tudor {watch['model']} {watch['case_size']} with {watch['dial'].lower()} (ref: {watch['reference']})"
+
+
+def build_multi_reference_task(watches: List[Dict]) -> str:
+    """
+    Call task asking about several references in one call
+
+    Args:
+        watches: Watch configs from WATCHES
+
+    Returns:
+        Task text for the Bland AI agent
+    """
+    lines = "\n".join(f"{i}. {describe_watch(w)}" for i, w in enumerate(watches, 1))
+    return (
+        "Find out whether the store has any of these Tudor watches in stock. "
+        "Ask about each one separately and say its reference number when you ask:\n"
+        f"{lines}\n"
+        "For any they don't have, ask about availability timeline, waitlist or special order options. "
+        "Before ending the call, briefly repeat back what they said for each reference number."
+    )
+
+
+def _words(text: str) -> Set[str]:
+    return set(re.findall(r"[a-z0-9]+(?:-[a-z0-9]+)?", text.lower()))
+
+
+def reference_keywords(watches: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Words that identify each watch among the others on the same call
+
+    The reference number (with or without the leading M, dash or spaced) always
+    identifies a watch; descriptive words (model, case size, dial colour) only
+    count when no other watch on the call shares them.
+
+    Args:
+        watches: Watch configs on the call
+
+    Returns:
+        Dict of reference -> keywords (lowercase)
+    """
+    descriptions = {}
+    for watch in watches:
+        size = watch["case_size"].lower()
+        number = size.rstrip("m").strip()
+        words = _words(f"{watch['model']} {watch['dial']}") - GENERIC_WORDS
+        words |= {size, f"{number} mm", f"{number} millimeter"}
+        descriptions[watch["reference"]] = words
+
+    suffixes = [w["reference"].split("-")[-1].lower() for w in watches]
+    keywords = {}
+    for watch in watches:
+        reference = watch["reference"]
+        ref = reference.lower()
+        digits = ref.lstrip("m")
+        words = {ref, digits, digits.replace("-", " "), digits.replace("-", "")}
+        suffix = ref.split("-")[-1]
+        if suffixes.count(suffix) == 1:
+            words.add(suffix)
+        others = set().union(*(d for r, d in descriptions.items() if r != reference))
+        words |= descriptions[reference] - others
+        keywords[reference] = sorted(words, key=len, reverse=True)
+    return keywords
+
+
+def split_by_reference(text: str, watches: List[Dict]) -> Dict[str, str]:
+    """
+    Split call text into the parts that concern each reference
+
+    Sentences go to the reference(s) they name, and following sentences stay
+    with those until another reference is named. Text before any reference
+    is named (greeting, IVR, "we don't carry Tudor") and sentences about
+    "any/none of them" go to every reference.
+
+    Args:
+        text: Transcript or summary
+        watches: Watch configs on the call
+
+    Returns:
+        Dict of reference -> text (empty when the reference was never discussed)
+    """
+    patterns = {
+        reference: re.compile(r"(?<![a-z0-9])(" + "|".join(re.escape(w) for w in words) + r")(?![a-z0-9])")
+        for reference, words in reference_keywords(watches).items()
+    }
+    parts: Dict[str, List[str]] = {reference: [] for reference in patterns}
+    shared: List[str] = []
+    current: List[str] = []
+
+    for sentence in _SENTENCE_END.split(text or ""):
+        lowered = sentence.lower()
+        if not lowered.strip():
+            continue
+        named = [reference for reference, pattern in patterns.items() if pattern.search(lowered)]
+        if ALL_REFERENCES.search(lowered):
+            targets = list(patterns)
+        elif named:
+            current = named
+            targets = named
+        else:
+            targets = current
+        if not targets:
+            shared.append(sentence)
+        for reference in targets:
+            parts[reference].append(sentence)
+
+    return {
+        reference: " ".join(shared + sentences) if sentences else ""
+        for reference, sentences in parts.items()
+    }
@@ -5,16 +5,32 @@ Makes automated phone calls to Tudor retailers to check watch inventory
 
 import os
 import time
+import bisect
 import json
+import queue
+import asyncio
+import weakref
 import requests
-import re
-from typing import List, Dict, Optional, Tuple
+import requests.adapters
+import httpx
+import threading
+import concurrent.futures
+from typing import List, Dict, Optional, Tuple, Iterator, AsyncIterator
+import dataclasses
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from enum import Enum
 
 from scraper import Retailer
-from config import WATCH_CONFIG, BLAND_CONFIG, CALL_SCRIPT
+from config import WATCH_CONFIG, BLAND_CONFIG, CALL_SCRIPT, OUTPUT_CONFIG, CALL_CONCURRENCY_CONFIG
+from results_log import ResultsLog
+from history import StockHistory
+from status_matcher import get_status_matcher
+from multi_reference import build_multi_reference_task, split_by_reference
+from call_retry import RetryPolicy
+from accounting import CallLedger
+from sweep import SweepStrategy, SweepTracker, ALL
+from blob_store import BlobStore
 
 
 class InventoryStatus(Enum):
@@ -28,6 +44,138 @@ class InventoryStatus(Enum):
     NO_ANSWER = "no_answer"
 
 
+# Bland AI call statuses after which the call will not change again
+FINAL_CALL_STATUSES = ('completed', 'ended', 'failed', 'no-answer', 'busy', 'voicemail')
+
+
+def normalize_phone(phone: str) -> str:
+    """Clean and format a phone number as E.164 (+1XXXXXXXXXX for US numbers)"""
+    # Remove all non-digit characters except +
+    digits = ''.join(c for c in phone if c.isdigit() or c == '+')
+
+    # Ensure it starts with +1 for US numbers
+    if not digits.startswith('+'):
+        if digits.startswith('1') and len(digits) == 11:
+            digits = '+' + digits
+        elif len(digits) == 10:
+            digits = '+1' + digits
+
+    return digits
+
+
+def call_duration_seconds(data: Dict) -> Optional[int]:
+    """Call length in seconds from a Bland AI payload (its ``call_length`` is in minutes)"""
+    minutes = data.get('call_length')
+    if isinstance(minutes, (int, float)) and minutes > 0:
+        return round(minutes * 60)
+    seconds = data.get('duration')
+    return round(seconds) if isinstance(seconds, (int, float)) and seconds > 0 else None
+
+
+def chain_key(retailer_name: str) -> str:
+    """Chain a retailer belongs to (CALL_CONCURRENCY_CONFIG['chains']), else its own name"""
+    name = retailer_name.lower().strip()
+    for chain in CALL_CONCURRENCY_CONFIG['chains']:
+        if chain in name:
+            return chain
+    return name
+
+
+class PolitenessLocks:
+    """
+    Decides which pending call may start next when calls run concurrently.
+
+    A call holds exclusive locks on its store and phone number, and counts
+    against its chain, which may have at most ``max_per_chain`` calls in
+    flight and ``chain_gap_seconds`` between the starts of its calls.
+    """
+
+    def __init__(self, max_per_chain: int = 1, chain_gap_seconds: float = 0):
+        self.max_per_chain = max_per_chain
+        self.chain_gap_seconds = chain_gap_seconds
+        self._cond = threading.Condition()
+        self._busy_keys = set()
+        self._chain_active: Dict[str, int] = {}
+        self._chain_last_start: Dict[str, float] = {}
+
+    @staticmethod
+    def keys_for(retailer: Retailer) -> Tuple[Tuple[str, ...], str]:
+        """(exclusive keys, chain) for a retailer"""
+        store = f"store:{retailer.name.lower().strip()}|{(retailer.address or '').lower().strip()}"
+        phone = f"phone:{normalize_phone(retailer.phone or '')}"
+        return (store, phone), chain_key(retailer.name)
+
+    def acquire_next(self, pending: List) -> Optional[object]:
+        """
+        Block until one of the pending retailers may be called, then claim it
+
+        Args:
+            pending: Shared list of (Retailer, distance) still to call, nearest
+                first; the claimed entry is removed from it. Retries added by
+                requeue() carry a third element, the monotonic time they are due
+
+        Returns:
+            The claimed (Retailer, distance), or None once nothing is pending
+        """
+        with self._cond:
+            while True:
+                if not pending:
+                    return None
+                now = time.monotonic()
+                soonest = None
+                for i, item in enumerate(pending):
+                    if len(item) > 2 and item[2] > now:
+                        soonest = item[2] - now if soonest is None else min(soonest, item[2] - now)
+                        continue
+                    keys, chain = self.keys_for(item[0])
+                    if self._busy_keys.intersection(keys) or self._chain_active.get(chain, 0) >= self.max_per_chain:
+                        continue
+                    last_start = self._chain_last_start.get(chain)
+                    wait = 0 if last_start is None else last_start + self.chain_gap_seconds - now
+                    if wait > 0:
+                        soonest = wait if soonest is None else min(soonest, wait)
+                        continue
+                    pending.pop(i)
+                    self._busy_keys.update(keys)
+                    self._chain_active[chain] = self._chain_active.get(chain, 0) + 1
+                    self._chain_last_start[chain] = now
+                    return item
+                self._cond.wait(timeout=soonest)
+
+    def requeue(self, pending: List, retailer: Retailer, distance: float, delay: float):
+        """Put a retailer back into pending (by distance, among fresh calls), due after ``delay`` seconds"""
+        with self._cond:
+            index = bisect.bisect_right([item[1] for item in pending], distance)
+            pending.insert(index, (retailer, distance, time.monotonic() + delay))
+            self._cond.notify_all()
+
+    def cancel(self, pending: List, wanted) -> int:
+        """
+        Drop pending retailers (fresh calls and retries) that are no longer wanted
+
+        Args:
+            pending: Shared list of pending entries
+            wanted: Called with an entry's distance; False drops the entry
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._cond:
+            kept = [item for item in pending if wanted(item[1])]
+            dropped = len(pending) - len(kept)
+            pending[:] = kept
+            self._cond.notify_all()
+        return dropped
+
+    def release(self, retailer: Retailer):
+        """Free a finished call's locks and wake waiting workers"""
+        keys, chain = self.keys_for(retailer)
+        with self._cond:
+            self._busy_keys.difference_update(keys)
+            self._chain_active[chain] = max(0, self._chain_active.get(chain, 0) - 1)
+            self._cond.notify_all()
+
+
 @dataclass
 class CallResult:
     """Result of a phone call to a retailer"""
@@ -40,39 +188,116 @@ class CallResult:
     call_duration: Optional[int]  # in seconds
     timestamp: str
     raw_response: Optional[Dict]
+    watch_reference: Optional[str] = None  # Set on per-reference results of multi-reference calls
+    attempts: int = 1  # Calls made to the retailer for this result (retries included)
+    blob_key: Optional[str] = None  # Blob store key of the offloaded transcript and raw_response
 
     def to_dict(self) -> Dict:
         result = asdict(self)
         result['status'] = self.status.value
         return result
 
+    def offload(self, store: BlobStore) -> Optional[str]:
+        """
+        Move the transcript and raw Bland payload into a blob store
+
+        Both fields are cleared; ``load_blob`` brings them back. Results of
+        calls that never started (no call ID) have nothing to offload.
 
-class BlandAICaller:
+        Returns:
+            The blob key (None if nothing was offloaded)
+        """
+        if not self.call_id or self.blob_key:
+            return self.blob_key
+        key = self.call_id if not self.watch_reference else f"{self.call_id}#{self.watch_reference}"
+        self.blob_key = store.put(key, {"transcript": self.transcript, "raw_response": self.raw_response})
+        self.transcript = None
+        self.raw_response = None
+        return self.blob_key
+
+    def load_blob(self, store: BlobStore) -> Dict:
+        """Offloaded transcript and raw_response (the in-memory fields if never offloaded)"""
+        return store.get(self.blob_key) or {"transcript": self.transcript, "raw_response": self.raw_response}
+
+
+_session_lock = threading.Lock()
+_shared_session: Optional[requests.Session] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def bland_base_url() -> str:
+    """Bland AI API base URL (BLAND_BASE_URL points callers at e.g. the local simulator)"""
+    return (os.environ.get('BLAND_BASE_URL') or BLAND_CONFIG['base_url']).rstrip('/')
+
+
+def shared_session() -> requests.Session:
+    """Process-wide keep-alive session for the synchronous caller"""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=BLAND_CONFIG.get('max_connections', 100)
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _shared_session = session
+        return _shared_session
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """Keep-alive HTTP client shared by every AsyncBlandAICaller on the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=BLAND_CONFIG.get('request_timeout', 30),
+            limits=httpx.Limits(
+                max_connections=BLAND_CONFIG.get('max_connections', 100),
+                max_keepalive_connections=BLAND_CONFIG.get('max_keepalive_connections', 20)
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+class BlandAICallerBase:
     """
-    Makes phone calls using Bland AI to check watch inventory
+    Request building and result parsing shared by the sync and async callers
 
     Bland AI Documentation: https://docs.bland.ai/
     """
 
-    def __init__(self, api_key: Optional[str] = None, watch_config: Optional[Dict] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        watch_config: Optional[Dict] = None,
+        watch_configs: Optional[List[Dict]] = None
+    ):
         """
         Initialize the Bland AI caller
 
         Args:
             api_key: Bland AI API key (or set BLAND_API_KEY env var)
             watch_config: Watch configuration dict (uses default if not provided)
+            watch_configs: Several watch configs to ask about in each call
+                (multi-reference mode; see make_multi_reference_call)
         """
         self.api_key = api_key or os.environ.get('BLAND_API_KEY') or BLAND_CONFIG.get('api_key')
         if not self.api_key:
             raise ValueError("Bland AI API key is required. Set BLAND_API_KEY environment variable.")
 
-        self.base_url = BLAND_CONFIG['base_url']
+        self.base_url = bland_base_url()
         self.headers = {
             "Authorization": self.api_key,
             "Content-Type": "application/json"
         }
-        self.watch_config = watch_config or WATCH_CONFIG
-        print(f"  [BlandAICaller] Initialized with watch: {self.watch_config.get('dial', 'unknown')} ({self.watch_config.get('reference', 'unknown')})")
+        self.watch_configs = watch_configs if watch_configs and len(watch_configs) > 1 else None
+        self.watch_config = watch_config or (watch_configs[0] if watch_configs else WATCH_CONFIG)
+        self.session = shared_session()  # Used for status fetches made by a shared poller
+        self.poller = None  # Shared CallStatusPoller, if the caller was given one
+        print(f"  [{type(self).__name__}] Initialized with watch: {self.watch_config.get('dial', 'unknown')} ({self.watch_config.get('reference', 'unknown')})")
 
     def _build_call_prompt(self) -> str:
         """Build the AI prompt for the phone call"""
@@ -112,31 +337,27 @@ CONVERSATION STYLE:
 
     def _build_call_task(self) -> str:
         """Build the specific task/goal for the call"""
+        if self.watch_configs:
+            task = build_multi_reference_task(self.watch_configs)
+            print(f"  [TASK] Built multi-reference task for: {', '.join(self.references)}")
+            return task
+
         watch = self.watch_config
         task = f"Find out if the store has the Tudor {watch['model']} {watch['case_size']} with {watch['dial'].lower()} (ref: {watch['reference']}) in stock, and if not, ask about availability timeline or waitlist options."
         print(f"  [TASK] Built task for: {watch['dial']} ({watch['reference']})")
         print(f"  [TASK] Full task: {task}")
         return task
 
-    def make_call(self, phone_number: str, retailer_name: str) -> CallResult:
-        """
-        Make a phone call to check inventory
-
-        Args:
-            phone_number: Phone number to call (with country code)
-            retailer_name: Name of the retailer (for logging)
-
-        Returns:
-            CallResult with the call outcome
-        """
-        # Clean phone number - ensure it has country code
-        clean_phone = self._clean_phone_number(phone_number)
-
-        timestamp = datetime.now().isoformat()
-
-        # Build the API request
-        payload = {
-            "phone_number": clean_phone,
+    def _build_call_payload(
+        self,
+        phone_number: str,
+        retailer_name: str,
+        timestamp: str,
+        webhook_url: Optional[str] = None
+    ) -> Dict:
+        """Build the POST /calls request body"""
+        return {
+            "phone_number": phone_number,
             "task": self._build_call_task(),
             "model": "enhanced",  # Use enhanced model for better understanding
             "voice": BLAND_CONFIG.get('voice', 'nat'),
@@ -146,151 +367,87 @@ CONVERSATION STYLE:
             "max_duration": BLAND_CONFIG.get('max_duration', 120),
             "transfer_phone_number": None,  # Don't transfer
             "language": "en",
-            "webhook": None,  # We'll poll for results instead
+            "webhook": webhook_url,  # None means we poll for results instead
             "metadata": {
                 "retailer_name": retailer_name,
                 "watch_reference": self.watch_config['reference'],
+                "watch_references": self.references,
                 "timestamp": timestamp
             }
         }
 
-        try:
-            print(f"  Calling {retailer_name} at {clean_phone}...")
-            print(f"  API URL: {self.base_url}/calls")
+    @property
+    def references(self) -> List[str]:
+        """References each call asks about"""
+        return [w['reference'] for w in (self.watch_configs or [self.watch_config])]
 
-            response = requests.post(
-                f"{self.base_url}/calls",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+    def results_by_reference(self, result: CallResult) -> List[CallResult]:
+        """
+        Split a multi-reference call's result into one CallResult per reference
 
-            print(f"  Response status: {response.status_code}")
-            print(f"  Response text: {response.text[:500] if response.text else 'empty'}")
+        Each reference is classified from, and keeps, the parts of the
+        transcript and summary that discuss it (the full transcript stays in
+        raw_response). Call-level outcomes (no answer, failed) apply to every
+        reference.
 
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"  Parsed response: {data}")
-                except Exception as json_err:
-                    print(f"  JSON parse error: {json_err}")
-                    data = None
-
-                call_id = data.get('call_id') if data and isinstance(data, dict) else None
-                print(f"  Call ID: {call_id}")
-
-                if call_id:
-                    # Wait for call to complete and get results
-                    result = self._wait_for_call_completion(call_id)
-                    result.retailer_name = retailer_name
-                    result.retailer_phone = clean_phone
-                    result.timestamp = timestamp
-                    return result
-                else:
-                    return CallResult(
-                        retailer_name=retailer_name,
-                        retailer_phone=clean_phone,
-                        call_id="",
-                        status=InventoryStatus.CALL_FAILED,
-                        transcript=None,
-                        summary=f"API returned no call_id: {data}",
-                        call_duration=None,
-                        timestamp=timestamp,
-                        raw_response=data
-                    )
-            else:
-                return CallResult(
-                    retailer_name=retailer_name,
-                    retailer_phone=clean_phone,
-                    call_id="",
-                    status=InventoryStatus.CALL_FAILED,
-                    transcript=None,
-                    summary=f"API error: {response.status_code} - {response.text}",
-                    call_duration=None,
-                    timestamp=timestamp,
-                    raw_response=None
-                )
+        Args:
+            result: Result of a call made in multi-reference mode
 
-        except Exception as e:
-            return CallResult(
-                retailer_name=retailer_name,
-                retailer_phone=clean_phone,
-                call_id="",
-                status=InventoryStatus.CALL_FAILED,
-                transcript=None,
-                summary=f"Exception: {str(e)}",
-                call_duration=None,
-                timestamp=timestamp,
-                raw_response=None
-            )
+        Returns:
+            One CallResult per reference, in watch_configs order
+        """
+        watches = self.watch_configs or [self.watch_config]
+        call_level = result.status in (InventoryStatus.NO_ANSWER, InventoryStatus.CALL_FAILED)
+        transcripts = split_by_reference(result.transcript or "", watches)
+        summaries = split_by_reference(result.summary or "", watches)
+
+        results = []
+        for watch in watches:
+            reference = watch['reference']
+            transcript, summary = transcripts[reference], summaries[reference]
+            if call_level or len(watches) == 1:
+                status = result.status
+                transcript = result.transcript
+            elif transcript or summary:
+                print(f"  [{reference}]")
+                status = self._analyze_inventory_status(transcript, summary)
+            else:
+                status = InventoryStatus.UNKNOWN
+                summary = "Not discussed on the call"
+            results.append(dataclasses.replace(
+                result,
+                status=status,
+                transcript=transcript,
+                summary=summary or result.summary,
+                watch_reference=reference
+            ))
+        return results
 
-    def _wait_for_call_completion(
+    def result_from_payload(
         self,
-        call_id: str,
-        max_wait: int = 300,
-        poll_interval: int = 5
+        data: Dict,
+        retailer_name: str,
+        phone_number: str,
+        timestamp: Optional[str] = None
     ) -> CallResult:
         """
-        Wait for a call to complete and retrieve results
+        Build a CallResult from a completed call's payload (GET /calls/{id} or a webhook)
 
         Args:
-            call_id: The Bland AI call ID
-            max_wait: Maximum time to wait in seconds
-            poll_interval: How often to poll for status
+            data: Call payload from Bland AI
+            retailer_name: Name of the retailer that was called
+            phone_number: Phone number that was called
+            timestamp: When the call was placed (defaults to now)
 
         Returns:
             CallResult with the call outcome
         """
-        start_time = time.time()
-
-        while time.time() - start_time < max_wait:
-            try:
-                response = requests.get(
-                    f"{self.base_url}/calls/{call_id}",
-                    headers=self.headers,
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    # Safely parse JSON
-                    try:
-                        data = response.json()
-                    except Exception:
-                        data = None
-
-                    # Handle None or empty response gracefully
-                    if not data or not isinstance(data, dict):
-                        print(f"    Call status: waiting (empty response)...")
-                        time.sleep(poll_interval)
-                        continue
-
-                    status = data.get('status', '')
-
-                    # Check if call is complete - added 'busy' and 'voicemail' statuses
-                    if status in ['completed', 'ended', 'failed', 'no-answer', 'busy', 'voicemail']:
-                        return self._parse_call_result(call_id, data)
-
-                    print(f"    Call status: {status}...")
-                else:
-                    print(f"    Call status: API returned {response.status_code}...")
-
-            except Exception as e:
-                print(f"    Error polling call status: {e}")
-
-            time.sleep(poll_interval)
-
-        # Timeout
-        return CallResult(
-            retailer_name="",
-            retailer_phone="",
-            call_id=call_id,
-            status=InventoryStatus.CALL_FAILED,
-            transcript=None,
-            summary="Call timed out waiting for completion",
-            call_duration=None,
-            timestamp="",
-            raw_response=None
-        )
+        call_id = data.get('call_id', '') if isinstance(data, dict) else ''
+        result = self._parse_call_result(call_id, data)
+        result.retailer_name = retailer_name
+        result.retailer_phone = self._clean_phone_number(phone_number)
+        result.timestamp = timestamp or datetime.now().isoformat()
+        return result
 
     def _parse_call_result(self, call_id: str, data: Dict) -> CallResult:
         """Parse the call result data from Bland AI"""
@@ -322,7 +479,7 @@ CONVERSATION STYLE:
             ''
         )
 
-        duration = data.get('call_length') or data.get('duration')
+        duration = call_duration_seconds(data)
 
         # Handle busy/voicemail/no-answer statuses directly
         if status in ['busy', 'no-answer', 'voicemail']:
@@ -357,6 +514,10 @@ CONVERSATION STYLE:
         """
         Analyze the call transcript to determine inventory status
 
+        Phrase tiers are checked in priority order (automated/IVR, no answer,
+        out of stock with waitlist/order options, in stock, waitlist, order);
+        see status_matcher for the phrase lists.
+
         Args:
             transcript: Full call transcript
             summary: AI-generated summary
@@ -369,153 +530,408 @@ CONVERSATION STYLE:
         print(f"  Text length: {len(text)} chars")
         print(f"  First 200 chars: {text[:200]}...")
 
-        # First check for automated systems / IVR / hold messages
-        # These mean we didn't actually talk to anyone
-        automated_phrases = [
-            "press zero", "press 0", "press one", "press 1",
-            "press two", "press 2", "all our associates",
-            "all of our associates", "currently assisting",
-            "please hold", "your call is important",
-            "leave a message", "after the beep", "after the tone",
-            "office hours", "business hours", "currently closed",
-            "call back", "try again later", "menu options",
-            "for sales press", "for service press",
-            "thanks, goodbye", "thanks goodbye",  # Agent hung up without info
-            "ended call"  # Agent ended without getting info
-        ]
-        for phrase in automated_phrases:
-            if phrase in text:
-                return InventoryStatus.UNKNOWN
-
-        # Check for no answer / voicemail first
-        no_answer_phrases = [
-            "no answer", "voicemail", "didn't pick up",
-            "couldn't reach", "busy signal", "not available",
-            "leave a message", "after the tone", "mailbox"
-        ]
-        for phrase in no_answer_phrases:
-            if phrase in text:
-                return InventoryStatus.NO_ANSWER
-
-        # Check for NEGATIVE indicators FIRST (before positive ones)
-        # This prevents "not in stock" from matching "in stock"
-        out_of_stock_phrases = [
-            "not in stock", "out of stock", "don't have", "do not have",
-            "don't carry", "do not carry", "sold out", "not available",
-            "currently out", "wasn't in stock", "was not in stock",
-            "weren't in stock", "were not in stock", "isn't in stock",
-            "is not in stock", "aren't in stock", "are not in stock",
-            "doesn't have", "does not have", "didn't have", "did not have",
-            "unavailable", "no longer", "discontinued", "can't get",
-            "cannot get", "unable to", "don't currently have",
-            "do not currently have", "not currently in stock",
-            "currently not in stock", "currently unavailable",
-            # From Claude summaries
-            "did not have the tudor", "did not have the watch",
-            "do not have the tudor", "do not have the watch"
-        ]
+        status, matched = get_status_matcher().classify(text)
+        if matched:
+            print(f"  -> Matched {status.upper()} phrase: '{matched}'")
+        return InventoryStatus(status)
 
-        for phrase in out_of_stock_phrases:
-            if phrase in text:
-                # Found a negative indicator - now check for waitlist/order options
-
-                # Check for waitlist
-                waitlist_phrases = [
-                    "waitlist", "waiting list", "wait list", "interest list",
-                    "put you on a list", "add you to a list", "notify you",
-                    "call you when", "contact you when", "let you know when",
-                    "call them when", "contact them when",  # Third person from summaries
-                    "register.*interest", "take your information",
-                    "client book", "client list", "come into the store",
-                    "stop by", "visit.*store", "in-store visit", "in store visit",
-                    "happy to add you", "add you if you",
-                    # From Claude summaries
-                    "offered to add", "add the customer", "add the caller",
-                    "add their name", "waitlist is available",
-                    "visit the store in person", "register their interest",
-                    "reach out to add", "get added to",
-                    "for a callback", "callback when", "call back when",
-                    "take.*information", "caller's information",
-                    "when the watch becomes available", "when it becomes available",
-                    "when available", "becomes available"
-                ]
-                for wp in waitlist_phrases:
-                    if re.search(wp, text):
-                        print(f"  -> Matched WAITLIST phrase: '{wp}'")
-                        return InventoryStatus.WAITLIST
-
-                # Check for can order
-                can_order_phrases = [
-                    "can order", "could order", "special order", "order it for you",
-                    "order one for you", "place an order", "get it in",
-                    "expect.*shipment", "expecting.*shipment", "more coming"
-                ]
-                for cop in can_order_phrases:
-                    if re.search(cop, text):
-                        print(f"  -> Matched CAN_ORDER phrase: '{cop}'")
-                        return InventoryStatus.CAN_ORDER
-
-                print(f"  -> No waitlist/order phrases found, returning OUT_OF_STOCK")
-                return InventoryStatus.OUT_OF_STOCK
-
-        # Now check for POSITIVE indicators (only if no negative indicators found)
-        # IMPORTANT: These must be specific enough to not match the agent's own questions
-        # Avoid phrases like "have that" which appear in "Do you have that in stock?"
-        in_stock_phrases = [
-            "we have it", "we do have", "yes we have", "have it in stock",
-            "have one in stock", "have them in stock",
-            "it's available", "it is available", "is available",
-            "watch is available", "that is available", "that's available",
-            "they're available", "they are available",
-            "yes we do", "we do have that", "we have that one",
-            "we currently have", "do have it", "in stock now",
-            "available now", "ready for pickup", "can come in today",
-            "come pick it up", "have it here", "we have one",
-            "got one here", "got it here", "have that model",
-            "have the ranger", "have that watch",
-            "confirmed that the watch is available",  # From Bland summary
-            "watch is in stock", "model is available",
-            "dial in stock",  # From Claude summary (works for any dial color)
-            "they had the", "had the tudor", "had it in stock",
-            "have the tudor", "has the tudor"
-        ]
+    def _clean_phone_number(self, phone: str) -> str:
+        """Clean and format phone number for API"""
+        return normalize_phone(phone)
+
+    def _failed_result(
+        self,
+        retailer_name: str,
+        phone_number: str,
+        timestamp: str,
+        summary: str,
+        raw_response: Optional[Dict] = None
+    ) -> CallResult:
+        return CallResult(
+            retailer_name=retailer_name,
+            retailer_phone=phone_number,
+            call_id="",
+            status=InventoryStatus.CALL_FAILED,
+            transcript=None,
+            summary=summary,
+            call_duration=None,
+            timestamp=timestamp,
+            raw_response=raw_response
+        )
 
-        for phrase in in_stock_phrases:
-            if phrase in text:
-                print(f"  -> Matched IN_STOCK phrase: '{phrase}'")
-                return InventoryStatus.IN_STOCK
+    def _read_start_response(self, status_code: int, text: str, parse_json) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
+        """
+        Interpret a POST /calls response
 
-        # Check for waitlist mentions without explicit out of stock
-        waitlist_phrases = [
-            "waitlist", "waiting list", "wait list", "interest list"
-        ]
-        for phrase in waitlist_phrases:
-            if phrase in text:
-                return InventoryStatus.WAITLIST
+        Returns:
+            (call_id, error summary, parsed body); call_id is None on failure
+        """
+        print(f"  Response status: {status_code}")
+        print(f"  Response text: {text[:500] if text else 'empty'}")
 
-        # Check for order mentions without explicit out of stock
-        order_phrases = [
-            "can order", "special order"
-        ]
-        for phrase in order_phrases:
-            if phrase in text:
-                return InventoryStatus.CAN_ORDER
+        if status_code != 200:
+            return None, f"API error: {status_code} - {text}", None
 
-        return InventoryStatus.UNKNOWN
+        try:
+            data = parse_json()
+            print(f"  Parsed response: {data}")
+        except Exception as json_err:
+            print(f"  JSON parse error: {json_err}")
+            data = None
+
+        call_id = data.get('call_id') if data and isinstance(data, dict) else None
+        print(f"  Call ID: {call_id}")
+
+        if not call_id:
+            return None, f"API returned no call_id: {data}", data
+        return call_id, None, data
+
+    def _read_poll_response(self, status_code: int, parse_json) -> Optional[Dict]:
+        """Return the call payload from a GET /calls/{id} response once the call is final"""
+        if status_code != 200:
+            print(f"    Call status: API returned {status_code}...")
+            return None
+
+        # Safely parse JSON
+        try:
+            data = parse_json()
+        except Exception:
+            data = None
 
-    def _clean_phone_number(self, phone: str) -> str:
-        """Clean and format phone number for API"""
-        # Remove all non-digit characters except +
-        digits = ''.join(c for c in phone if c.isdigit() or c == '+')
+        # Handle None or empty response gracefully
+        if not data or not isinstance(data, dict):
+            print(f"    Call status: waiting (empty response)...")
+            return None
 
-        # Ensure it starts with +1 for US numbers
-        if not digits.startswith('+'):
-            if digits.startswith('1') and len(digits) == 11:
-                digits = '+' + digits
-            elif len(digits) == 10:
-                digits = '+1' + digits
+        status = data.get('status', '')
+
+        # Check if call is complete
+        if status in FINAL_CALL_STATUSES:
+            return data
 
-        return digits
+        print(f"    Call status: {status}...")
+        return None
+
+    def fetch_call_status(self, call_id: str) -> Optional[Dict]:
+        """One GET /calls/{id}; returns the payload (any status), or None on error"""
+        response = self.session.get(
+            f"{self.base_url}/calls/{call_id}",
+            headers=self.headers,
+            timeout=BLAND_CONFIG.get('request_timeout', 30)
+        )
+        if response.status_code != 200:
+            return None
+        try:
+            data = response.json()
+        except Exception:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _result_from_poller(self, call_id: str, data: Optional[Dict]) -> CallResult:
+        """CallResult for what the shared poller resolved (None means it timed out)"""
+        if data is None:
+            return self._timeout_result(call_id)
+        return self._parse_call_result(call_id, data)
+
+    def _timeout_result(self, call_id: str) -> CallResult:
+        return CallResult(
+            retailer_name="",
+            retailer_phone="",
+            call_id=call_id,
+            status=InventoryStatus.CALL_FAILED,
+            transcript=None,
+            summary="Call timed out waiting for completion",
+            call_duration=None,
+            timestamp="",
+            raw_response=None
+        )
+
+
+class BlandAICaller(BlandAICallerBase):
+    """
+    Makes phone calls using Bland AI to check watch inventory
+
+    Requests go through a shared keep-alive session; each call blocks its
+    thread until it completes (see AsyncBlandAICaller for the async version).
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        watch_config: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
+        poller=None,
+        watch_configs: Optional[List[Dict]] = None
+    ):
+        """
+        Initialize the Bland AI caller
+
+        Args:
+            api_key: Bland AI API key (or set BLAND_API_KEY env var)
+            watch_config: Watch configuration dict (uses default if not provided)
+            session: HTTP session to use (defaults to the shared keep-alive session)
+            poller: Shared CallStatusPoller to wait on instead of polling per call
+            watch_configs: Several watch configs to ask about in each call
+        """
+        super().__init__(api_key, watch_config, watch_configs)
+        self.session = session or shared_session()
+        self.poller = poller
+
+    def start_call(
+        self,
+        phone_number: str,
+        retailer_name: str,
+        webhook_url: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[CallResult]]:
+        """
+        Place a call without waiting for it to finish
+
+        Args:
+            phone_number: Phone number to call (with country code)
+            retailer_name: Name of the retailer (for logging)
+            webhook_url: URL Bland AI posts the completed call to (None to poll)
+
+        Returns:
+            (call_id, None) once the call is placed, or (None, failed CallResult)
+        """
+        clean_phone = self._clean_phone_number(phone_number)
+        timestamp = datetime.now().isoformat()
+        payload = self._build_call_payload(clean_phone, retailer_name, timestamp, webhook_url)
+
+        try:
+            print(f"  Calling {retailer_name} at {clean_phone}...")
+            print(f"  API URL: {self.base_url}/calls")
+
+            response = self.session.post(
+                f"{self.base_url}/calls",
+                headers=self.headers,
+                json=payload,
+                timeout=BLAND_CONFIG.get('request_timeout', 30)
+            )
+            call_id, error, data = self._read_start_response(response.status_code, response.text, response.json)
+
+        except Exception as e:
+            call_id, error, data = None, f"Exception: {str(e)}", None
+
+        if not call_id:
+            return None, self._failed_result(retailer_name, clean_phone, timestamp, error, data)
+        return call_id, None
+
+    def make_call(self, phone_number: str, retailer_name: str) -> CallResult:
+        """
+        Make a phone call to check inventory
+
+        Args:
+            phone_number: Phone number to call (with country code)
+            retailer_name: Name of the retailer (for logging)
+
+        Returns:
+            CallResult with the call outcome
+        """
+        timestamp = datetime.now().isoformat()
+        call_id, failure = self.start_call(phone_number, retailer_name)
+        if failure:
+            return failure
+
+        # Wait for call to complete and get results
+        result = self._wait_for_call_completion(call_id)
+        result.retailer_name = retailer_name
+        result.retailer_phone = self._clean_phone_number(phone_number)
+        result.timestamp = timestamp
+        return result
+
+    def make_multi_reference_call(self, phone_number: str, retailer_name: str) -> List[CallResult]:
+        """
+        Make one call asking about every reference in watch_configs
+
+        Args:
+            phone_number: Phone number to call (with country code)
+            retailer_name: Name of the retailer (for logging)
+
+        Returns:
+            One CallResult per reference (all sharing the call's ID and transcript)
+        """
+        return self.results_by_reference(self.make_call(phone_number, retailer_name))
+
+    def _wait_for_call_completion(
+        self,
+        call_id: str,
+        max_wait: int = 300,
+        poll_interval: int = 5
+    ) -> CallResult:
+        """
+        Wait for a call to complete and retrieve results
+
+        Args:
+            call_id: The Bland AI call ID
+            max_wait: Maximum time to wait in seconds
+            poll_interval: How often to poll for status
+
+        Returns:
+            CallResult with the call outcome
+        """
+        if self.poller is not None:
+            future = self.poller.track(call_id, self.fetch_call_status, max_wait)
+            return self._result_from_poller(call_id, future.result())
+
+        start_time = time.time()
+
+        while time.time() - start_time < max_wait:
+            try:
+                response = self.session.get(
+                    f"{self.base_url}/calls/{call_id}",
+                    headers=self.headers,
+                    timeout=BLAND_CONFIG.get('request_timeout', 30)
+                )
+                data = self._read_poll_response(response.status_code, response.json)
+                if data is not None:
+                    return self._parse_call_result(call_id, data)
+
+            except Exception as e:
+                print(f"    Error polling call status: {e}")
+
+            time.sleep(poll_interval)
+
+        return self._timeout_result(call_id)
+
+
+class AsyncBlandAICaller(BlandAICallerBase):
+    """
+    Async Bland AI caller on a shared keep-alive httpx client
+
+    Same CallResult semantics as BlandAICaller, but waiting on a call only
+    holds a coroutine, so one event loop can supervise hundreds of calls.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        watch_config: Optional[Dict] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        poll_interval: float = 5,
+        poller=None,
+        watch_configs: Optional[List[Dict]] = None
+    ):
+        """
+        Args:
+            api_key: Bland AI API key (or set BLAND_API_KEY env var)
+            watch_config: Watch configuration dict (uses default if not provided)
+            client: HTTP client to use (defaults to the running loop's shared client)
+            poll_interval: Seconds between status polls while a call is running
+            poller: Shared CallStatusPoller to await instead of polling per call
+            watch_configs: Several watch configs to ask about in each call
+        """
+        super().__init__(api_key, watch_config, watch_configs)
+        self._client = client
+        self.poll_interval = poll_interval
+        self.poller = poller
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or shared_async_client()
+
+    async def start_call(
+        self,
+        phone_number: str,
+        retailer_name: str,
+        webhook_url: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[CallResult]]:
+        """Async version of BlandAICaller.start_call"""
+        clean_phone = self._clean_phone_number(phone_number)
+        timestamp = datetime.now().isoformat()
+        payload = self._build_call_payload(clean_phone, retailer_name, timestamp, webhook_url)
+
+        try:
+            print(f"  Calling {retailer_name} at {clean_phone}...")
+            response = await self.client.post(f"{self.base_url}/calls", headers=self.headers, json=payload)
+            call_id, error, data = self._read_start_response(response.status_code, response.text, response.json)
+
+        except Exception as e:
+            call_id, error, data = None, f"Exception: {str(e)}", None
+
+        if not call_id:
+            return None, self._failed_result(retailer_name, clean_phone, timestamp, error, data)
+        return call_id, None
+
+    async def make_call(self, phone_number: str, retailer_name: str) -> CallResult:
+        """Async version of BlandAICaller.make_call"""
+        timestamp = datetime.now().isoformat()
+        call_id, failure = await self.start_call(phone_number, retailer_name)
+        if failure:
+            return failure
+
+        result = await self._wait_for_call_completion(call_id, poll_interval=self.poll_interval)
+        result.retailer_name = retailer_name
+        result.retailer_phone = self._clean_phone_number(phone_number)
+        result.timestamp = timestamp
+        return result
+
+    async def make_multi_reference_call(self, phone_number: str, retailer_name: str) -> List[CallResult]:
+        """Async version of BlandAICaller.make_multi_reference_call"""
+        return self.results_by_reference(await self.make_call(phone_number, retailer_name))
+
+    async def _wait_for_call_completion(
+        self,
+        call_id: str,
+        max_wait: int = 300,
+        poll_interval: float = 5
+    ) -> CallResult:
+        """Async version of BlandAICaller._wait_for_call_completion"""
+        if self.poller is not None:
+            future = self.poller.track(call_id, self.fetch_call_status, max_wait)
+            return self._result_from_poller(call_id, await asyncio.wrap_future(future))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+
+        while loop.time() < deadline:
+            try:
+                response = await self.client.get(f"{self.base_url}/calls/{call_id}", headers=self.headers)
+                data = self._read_poll_response(response.status_code, response.json)
+                if data is not None:
+                    return self._parse_call_result(call_id, data)
+
+            except Exception as e:
+                print(f"    Error polling call status: {e}")
+
+            await asyncio.sleep(poll_interval)
+
+        return self._timeout_result(call_id)
+
+    async def make_calls(
+        self,
+        targets: List[Tuple[str, str]],
+        max_in_flight: int = 100
+    ) -> AsyncIterator[CallResult]:
+        """
+        Run many calls from one event loop, yielding results in completion order
+
+        Args:
+            targets: (phone_number, retailer_name) pairs
+            max_in_flight: Maximum calls in progress at once
+
+        Yields:
+            CallResult objects as their calls complete
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def run(phone_number: str, retailer_name: str) -> CallResult:
+            async with semaphore:
+                try:
+                    return await self.make_call(phone_number, retailer_name)
+                except Exception as e:
+                    return self._failed_result(
+                        retailer_name, self._clean_phone_number(phone_number),
+                        datetime.now().isoformat(), f"Exception: {str(e)}"
+                    )
+
+        tasks = [asyncio.ensure_future(run(phone, name)) for phone, name in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
 
 
 class InventoryChecker:
@@ -523,27 +939,87 @@ class InventoryChecker:
     Orchestrates inventory checking across multiple retailers
     """
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.caller = BlandAICaller(api_key)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        results_log: Optional[ResultsLog] = None,
+        history: Optional[StockHistory] = None,
+        poller=None,
+        watch_configs: Optional[List[Dict]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        ledger: Optional[CallLedger] = None,
+        blob_store: Optional[BlobStore] = None
+    ):
+        """
+        Args:
+            api_key: Bland AI API key (or set BLAND_API_KEY env var)
+            results_log: Append-only log that each result is written to as
+                soon as its call completes (None keeps results in memory only)
+            history: Stock history store that every outcome is recorded in
+            poller: Shared CallStatusPoller that waits on every call's status
+            watch_configs: Ask about all of these in each call, recording one
+                result per reference (default: just WATCH_CONFIG)
+            retry_policy: When to call again after no answer or a failed call
+                (defaults to RETRY_CONFIG)
+            ledger: Spend ledger every call is charged to; its budgets cap
+                how many calls a run makes (None: no accounting)
+            blob_store: Store that transcripts and raw payloads are moved to
+                once a result is recorded (None keeps them on the result)
+        """
+        self.caller = BlandAICaller(api_key, poller=poller, watch_configs=watch_configs)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.attempts: Dict[str, int] = {}  # Normalized phone -> calls made so far
         self.results: List[CallResult] = []
+        self.results_log = results_log
+        self.history = history
+        self.ledger = ledger
+        self.blob_store = blob_store
+        self.cancelled_calls = 0  # Calls a sweep strategy cancelled before they started
+        self.run_id = datetime.now().strftime("run_%Y%m%d_%H%M%S_%f")
+        self._logged_count = 0
+
+    # Console emoji for each status
+    STATUS_EMOJI = {
+        InventoryStatus.IN_STOCK: "✅",
+        InventoryStatus.OUT_OF_STOCK: "❌",
+        InventoryStatus.CAN_ORDER: "📦",
+        InventoryStatus.WAITLIST: "📋",
+        InventoryStatus.NO_ANSWER: "📵",
+        InventoryStatus.CALL_FAILED: "⚠️",
+        InventoryStatus.UNKNOWN: "❓"
+    }
 
     def check_retailers(
         self,
         retailers: List[Tuple[Retailer, float]],
         delay_between_calls: int = 30,
-        max_calls: Optional[int] = None
+        max_calls: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        strategy: Optional[SweepStrategy] = None,
+        tracker: Optional[SweepTracker] = None
     ) -> List[CallResult]:
         """
         Check inventory at multiple retailers
 
         Args:
             retailers: List of (Retailer, distance) tuples
-            delay_between_calls: Seconds to wait between calls
+            delay_between_calls: Seconds to wait between calls (with concurrency,
+                the minimum gap between calls to the same chain)
             max_calls: Maximum number of calls to make (None for all)
+            concurrency: Simultaneous calls (defaults to
+                CALL_CONCURRENCY_CONFIG['max_concurrent_calls'])
+            strategy: When to stop calling once stock is found; calls not yet
+                started are cancelled then (None calls every retailer)
+            tracker: Sweep progress to continue (e.g. with stores already
+                found in stock elsewhere); overrides strategy
 
         Returns:
             List of CallResult objects
         """
+        concurrency = concurrency or CALL_CONCURRENCY_CONFIG['max_concurrent_calls']
+        if tracker is None and strategy and strategy.mode != ALL:
+            tracker = SweepTracker(strategy)
+
         # Filter to only retailers with phone numbers
         retailers_with_phones = [
             (r, d) for r, d in retailers if r.phone
@@ -557,70 +1033,298 @@ class InventoryChecker:
         if max_calls:
             retailers_with_phones = retailers_with_phones[:max_calls]
 
+        # Only make the calls the spend budgets allow, reserving each one's estimate until it is recorded
+        if self.ledger:
+            admission = self.ledger.admit(self.caller.api_key, len(retailers_with_phones),
+                                          reservations=[self._reservation(r) for r, _ in retailers_with_phones])
+            for warning in admission.warnings:
+                print(f"⚠️  Budget: {warning}")
+            if not admission.ok:
+                print(f"⚠️  Budget: {admission.reason}, making {admission.allowed} of {admission.requested} calls")
+                retailers_with_phones = retailers_with_phones[:admission.allowed]
+            if not retailers_with_phones:
+                return []
+
+        try:
+            return self._check_retailers(retailers_with_phones, delay_between_calls, concurrency, tracker)
+        finally:
+            # Calls cancelled by the sweep, or cut short, were never charged
+            if self.ledger:
+                self.ledger.release(*(self._reservation(r) for r, _ in retailers_with_phones))
+
+    def _check_retailers(
+        self,
+        retailers_with_phones: List[Tuple[Retailer, float]],
+        delay_between_calls: int,
+        concurrency: int,
+        tracker: Optional[SweepTracker]
+    ) -> List[CallResult]:
+        """check_retailers() once the calls are admitted"""
         print(f"\nChecking inventory at {len(retailers_with_phones)} retailers...")
-        print(f"Watch: {WATCH_CONFIG['full_name']}")
-        print(f"Reference: {WATCH_CONFIG['reference']}")
+        print(f"Watch: {self.caller.watch_config['full_name']}")
+        print(f"Reference: {', '.join(self.caller.references)}")
+        if tracker:
+            print(f"Sweep: {tracker.strategy.mode}")
         print("-" * 60)
 
-        for i, (retailer, distance) in enumerate(retailers_with_phones):
-            print(f"\n[{i+1}/{len(retailers_with_phones)}] {retailer.name} ({distance:.1f} mi)")
-
-            result = self.caller.make_call(retailer.phone, retailer.name)
-            self.results.append(result)
-
-            # Print result
-            status_emoji = {
-                InventoryStatus.IN_STOCK: "✅",
-                InventoryStatus.OUT_OF_STOCK: "❌",
-                InventoryStatus.CAN_ORDER: "📦",
-                InventoryStatus.WAITLIST: "📋",
-                InventoryStatus.NO_ANSWER: "📵",
-                InventoryStatus.CALL_FAILED: "⚠️",
-                InventoryStatus.UNKNOWN: "❓"
-            }
-
-            emoji = status_emoji.get(result.status, "❓")
-            print(f"  {emoji} Status: {result.status.value}")
+        if concurrency > 1:
+            print(f"Calling up to {concurrency} retailers at once")
+            total = len(retailers_with_phones) * len(self.caller.references)
+            for i, result in enumerate(self.iter_check_retailers(
+                retailers_with_phones, concurrency, chain_gap_seconds=delay_between_calls, tracker=tracker
+            )):
+                reference = f" ({result.watch_reference})" if result.watch_reference else ""
+                print(f"\n[{i+1}/{total}] {result.retailer_name}{reference}")
+                self._print_result(result)
+            self._print_cancelled()
+            return self.results
+
+        # One call at a time; retries wait in pending until due, between fresh calls
+        locks = PolitenessLocks()
+        pending = list(retailers_with_phones)
+        done = 0
+        while pending:
+            retailer, distance = locks.acquire_next(pending)[:2]
+            attempt = self.attempts.get(normalize_phone(retailer.phone), 0) + 1
+            retry = f", attempt {attempt}" if attempt > 1 else ""
+            print(f"\n[{done+1}/{len(retailers_with_phones)}] {retailer.name} ({distance:.1f} mi{retry})")
 
-            if result.summary:
-                print(f"  Summary: {result.summary[:100]}...")
+            try:
+                results = self._call(retailer)
+            except Exception as e:
+                results = [self._failed_result(retailer, e)]
+            finally:
+                locks.release(retailer)
+            if not self._retry_later(retailer, distance, results, pending, locks):
+                done += 1
+                for result in results:
+                    self._record_result(result, retailer)
+                    self._print_result(result)
+                if tracker:
+                    self._observe(tracker, retailer, distance, results)
+                    self.cancelled_calls += locks.cancel(pending, tracker.wanted)
 
             # Wait between calls
-            if i < len(retailers_with_phones) - 1:
+            if pending:
                 print(f"  Waiting {delay_between_calls}s before next call...")
                 time.sleep(delay_between_calls)
 
+        self._print_cancelled()
         return self.results
 
-    def save_results(self, filepath: str = "inventory_results.json"):
-        """Save results to JSON file"""
-        data = {
-            "watch": WATCH_CONFIG,
-            "timestamp": datetime.now().isoformat(),
-            "results": [r.to_dict() for r in self.results],
-            "summary": self._generate_summary()
-        }
+    def iter_check_retailers(
+        self,
+        retailers: List[Tuple[Retailer, float]],
+        concurrency: int,
+        chain_gap_seconds: float = 0,
+        locks: Optional[PolitenessLocks] = None,
+        tracker: Optional[SweepTracker] = None
+    ) -> Iterator[CallResult]:
+        """
+        Call retailers concurrently, yielding each result as its call completes
 
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        Nearest retailers are started first, skipping any whose store, phone
+        number or chain is busy until it frees up. Calls nobody answered (or
+        that failed) go back into the queue with backoff, among the fresh
+        calls. Final results are recorded (log and history) in completion
+        order, on the consuming thread.
 
-        print(f"\nResults saved to {filepath}")
+        Args:
+            retailers: (Retailer, distance) tuples with phone numbers, nearest first
+            concurrency: Maximum simultaneous calls
+            chain_gap_seconds: Minimum gap between call starts to the same chain
+            locks: Politeness locks to share with other checkers (optional)
+            tracker: Sweep progress; once it no longer wants a pending call,
+                that call is cancelled instead of placed
+
+        Yields:
+            CallResult objects in completion order
+        """
+        locks = locks or PolitenessLocks(CALL_CONCURRENCY_CONFIG['max_per_chain'], chain_gap_seconds)
+        pending = list(retailers)
+        completed: "queue.Queue[Tuple[Retailer, Optional[List[CallResult]]]]" = queue.Queue()
+
+        def worker():
+            while True:
+                item = locks.acquire_next(pending)
+                if item is None:
+                    return
+                retailer = item[0]
+                if tracker and not tracker.wanted(item[1]):
+                    # Taken just before the sweep's goal was met
+                    locks.release(retailer)
+                    completed.put((retailer, None))
+                    continue
+                try:
+                    results = self._call(retailer)
+                except Exception as e:
+                    results = [self._failed_result(retailer, e)]
+                finally:
+                    locks.release(retailer)
+                if not self._retry_later(retailer, item[1], results, pending, locks):
+                    if tracker:
+                        self._observe(tracker, retailer, item[1], results)
+                    completed.put((retailer, results))
+
+        workers = min(concurrency, len(pending))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            for _ in range(workers):
+                pool.submit(worker)
+            remaining = len(retailers)
+            while remaining > 0:
+                retailer, results = completed.get()
+                remaining -= 1
+                if results is None:
+                    self.cancelled_calls += 1
+                    continue
+                for result in results:
+                    self._record_result(result, retailer)
+                    yield result
+                if tracker:
+                    cancelled = locks.cancel(pending, tracker.wanted)
+                    self.cancelled_calls += cancelled
+                    remaining -= cancelled
+
+    def _observe(self, tracker: SweepTracker, retailer: Retailer, distance: float, results: List[CallResult]):
+        """Tell the sweep whether this store has the watch"""
+        in_stock = any(result.status == InventoryStatus.IN_STOCK for result in results)
+        tracker.observe(normalize_phone(retailer.phone), in_stock, distance)
+
+    def _print_cancelled(self):
+        if self.cancelled_calls:
+            print(f"\n🛑 Sweep goal met: {self.cancelled_calls} pending call(s) cancelled")
+
+    def _call(self, retailer: Retailer) -> List[CallResult]:
+        """One call to a retailer: a single result, or one per reference in multi-reference mode"""
+        phone = normalize_phone(retailer.phone)
+        self.attempts[phone] = self.attempts.get(phone, 0) + 1
+        if self.caller.watch_configs:
+            results = self.caller.make_multi_reference_call(retailer.phone, retailer.name)
+        else:
+            results = [self.caller.make_call(retailer.phone, retailer.name)]
+        for result in results:
+            result.attempts = self.attempts[phone]
+        if self.ledger and results:
+            # Multi-reference results share one call
+            self.ledger.record(results[0].call_id, self.caller.api_key, results[0].call_duration,
+                               job_id=self.run_id, reservation_id=self._reservation(retailer))
+        return results
+
+    def _reservation(self, retailer: Retailer) -> str:
+        """Ledger reservation ID of this run's call to a retailer"""
+        return f"{self.run_id}:{normalize_phone(retailer.phone)}"
+
+    def _failed_result(self, retailer: Retailer, error: Exception) -> CallResult:
+        """CALL_FAILED result for a call that raised"""
+        return CallResult(
+            retailer_name=retailer.name,
+            retailer_phone=normalize_phone(retailer.phone),
+            call_id="",
+            status=InventoryStatus.CALL_FAILED,
+            transcript=None,
+            summary=f"Exception: {str(error)}",
+            call_duration=None,
+            timestamp=datetime.now().isoformat(),
+            raw_response=None,
+            attempts=self.attempts.get(normalize_phone(retailer.phone), 1)
+        )
+
+    def _retry_later(
+        self,
+        retailer: Retailer,
+        distance: float,
+        results: List[CallResult],
+        pending: List,
+        locks: PolitenessLocks
+    ) -> bool:
+        """
+        Re-queue a retailer whose call went unanswered or failed, if it has attempts left
+
+        Returns:
+            True if the call will be retried (its results are not final)
+        """
+        attempts = self.attempts.get(normalize_phone(retailer.phone), 1)
+        status = results[0].status.value if results else InventoryStatus.CALL_FAILED.value
+        if not all(r.status.value == status for r in results):
+            return False
+        if not self.retry_policy.should_retry(status, attempts):
+            return False
+        if self.ledger and not self.ledger.admit(self.caller.api_key, reservations=[self._reservation(retailer)]).ok:
+            print(f"  {retailer.name}: {status}, not retrying (over budget)")
+            return False
+        delay = self.retry_policy.delay(attempts)
+        print(f"  ↻ {retailer.name}: {status}, retrying in {delay:.0f}s "
+              f"(attempt {attempts + 1} of {self.retry_policy.max_attempts})")
+        locks.requeue(pending, retailer, distance, delay)
+        return True
+
+    def _print_result(self, result: CallResult):
+        emoji = self.STATUS_EMOJI.get(result.status, "❓")
+        print(f"  {emoji} Status: {result.status.value}")
+
+        if result.summary:
+            print(f"  Summary: {result.summary[:100]}...")
+
+    def _record_result(self, result: CallResult, retailer: Optional[Retailer] = None):
+        """Offload its payloads, keep a result, append it to the results log and record it in history"""
+        reference = result.watch_reference or self.caller.watch_config['reference']
+        if self.blob_store:
+            try:
+                result.offload(self.blob_store)
+            except Exception as e:
+                print(f"  Error storing transcript: {e}")
+        self.results.append(result)
+        if self.results_log:
+            self.results_log.append(result.to_dict(), reference, self.run_id)
+            self._logged_count = len(self.results)
+        if self.history:
+            try:
+                self.history.record_call_result(result, reference, state=retailer.state if retailer else "")
+            except Exception as e:
+                print(f"  Error recording history: {e}")
+
+    def save_results(self, filepath: Optional[str] = None):
+        """
+        Append any results not yet logged to the append-only results log
+
+        Results are normally logged as each call completes; this only writes
+        the ones recorded without a log attached. Nothing is ever rewritten.
+
+        Args:
+            filepath: Log path to use when no results log is attached
+                (defaults to OUTPUT_CONFIG['results_log'])
+        """
+        if not self.results_log:
+            self.results_log = ResultsLog(filepath or OUTPUT_CONFIG['results_log'])
+
+        for result in self.results[self._logged_count:]:
+            reference = result.watch_reference or self.caller.watch_config['reference']
+            self.results_log.append(result.to_dict(), reference, self.run_id)
+        self._logged_count = len(self.results)
+
+        print(f"\nResults logged to {self.results_log.path} (run {self.run_id})")
 
     def _generate_summary(self) -> Dict:
-        """Generate a summary of all results"""
+        """Generate a summary of all results (from the log index when available)"""
+        if self.results_log and self._logged_count == len(self.results):
+            rows = [
+                (e.status, e.retailer_name, e.retailer_phone)
+                for e in self.results_log.query(run_id=self.run_id)
+            ]
+        else:
+            rows = [(r.status.value, r.retailer_name, r.retailer_phone) for r in self.results]
+
         status_counts = {}
-        for result in self.results:
-            status = result.status.value
+        for status, _, _ in rows:
             status_counts[status] = status_counts.get(status, 0) + 1
 
-        in_stock = [r for r in self.results if r.status == InventoryStatus.IN_STOCK]
-
         return {
-            "total_calls": len(self.results),
+            "total_calls": len(rows),
             "status_breakdown": status_counts,
             "in_stock_retailers": [
-                {"name": r.retailer_name, "phone": r.retailer_phone}
-                for r in in_stock
+                {"name": name, "phone": phone}
+                for status, name, phone in rows
+                if status == InventoryStatus.IN_STOCK.value
             ]
         }
 
@@ -0,0 +1,134 @@
+"""
+Call Priority Ranking
+Orders retailers by the expected value of calling them: a Bayesian estimate
+of how often each one has the watch in stock, learned from past outcomes of
+the same reference and model family, discounted by distance
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import RANKING_CONFIG, WATCHES
+from scraper import Retailer
+from history import StockHistory
+from phone_caller import normalize_phone
+
+
+@dataclass
+class RankedRetailer:
+    """A retailer with its learned hit rate and call priority"""
+    retailer: Retailer
+    distance: float
+    hit_rate: float  # Posterior probability that a call finds the watch in stock
+    evidence: float  # Weighted informative outcomes behind hit_rate (0: prior only)
+    score: float  # hit_rate discounted by distance; calls go in descending score order
+
+
+def model_family(reference: str) -> str:
+    """The model a reference belongs to (the reference itself if unknown)"""
+    watch = WATCHES.get(reference)
+    return watch["model"] if watch else reference
+
+
+class RetailerRanker:
+    """
+    Scores retailers from their stock history.
+
+    Each retailer starts from a Beta prior whose mean is the hit rate of its
+    retailer type. Every past call to it that got a definite answer adds
+    evidence: outcomes for the same reference count fully, outcomes for other
+    references of the same model family count ``family_weight``, and older
+    outcomes fade with ``half_life_days``. Calls that never reached anyone
+    (no answer, failed, unknown) say nothing about stock and are ignored.
+    """
+
+    def __init__(self, history: Optional[StockHistory] = None, config: Optional[Dict] = None,
+                 now: Optional[datetime] = None):
+        """
+        Args:
+            history: Stock history to learn from (None ranks on priors and distance alone)
+            config: Ranking settings (defaults to RANKING_CONFIG)
+            now: Reference time for recency (for tests)
+        """
+        self.history = history
+        self.config = config or RANKING_CONFIG
+        self.now = now
+
+    def prior(self, retailer_type: Optional[str]) -> float:
+        priors = self.config["type_prior_hit_rates"]
+        return priors.get(retailer_type or "", priors["default"])
+
+    def _weight(self, observed_at: str) -> float:
+        """Recency weight of one outcome"""
+        try:
+            age_days = ((self.now or datetime.now()) - datetime.fromisoformat(observed_at)).total_seconds() / 86400
+        except ValueError:
+            return 0.0
+        return 0.5 ** (max(age_days, 0) / self.config["half_life_days"])
+
+    def evidence(self, references: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """
+        Weighted (hits, trials) per normalized phone number
+
+        Args:
+            references: References the calls will ask about
+        """
+        references = list(references)
+        if not self.history or not references:
+            return {}
+        asked = set(references)
+        families = {model_family(ref) for ref in references}
+        related = [ref for ref, watch in WATCHES.items() if watch["model"] in families]
+
+        hits_statuses = set(self.config["hit_statuses"])
+        informative = hits_statuses | set(self.config["miss_statuses"])
+        tallies: Dict[str, Tuple[float, float]] = {}
+        for row in self.history.outcomes(set(related) | asked, source=StockHistory.SOURCE_PHONE,
+                                         max_age_days=self.config["max_age_days"]):
+            if row["status"] not in informative or not row["retailer_phone"]:
+                continue
+            weight = self._weight(row["observed_at"])
+            if row["reference"] not in asked:
+                weight *= self.config["family_weight"]
+            phone = normalize_phone(row["retailer_phone"])
+            hits, trials = tallies.get(phone, (0.0, 0.0))
+            tallies[phone] = (hits + (weight if row["status"] in hits_statuses else 0.0), trials + weight)
+        return tallies
+
+    def rank(self, retailers: Iterable[Tuple[Retailer, float]], references) -> List[RankedRetailer]:
+        """
+        Retailers in the order they should be called (highest expected value first)
+
+        Args:
+            retailers: (Retailer, distance) tuples
+            references: Watch reference, or list of references asked about in each call
+
+        Returns:
+            RankedRetailer list; ties keep the given (nearest first) order
+        """
+        references = [references] if isinstance(references, str) else list(references)
+        tallies = self.evidence(references)
+        strength = self.config["prior_strength"]
+        scale = self.config["distance_scale_miles"]
+
+        ranked = []
+        for retailer, distance in retailers:
+            prior = self.prior(retailer.retailer_type)
+            hits, trials = tallies.get(normalize_phone(retailer.phone or ""), (0.0, 0.0))
+            hit_rate = (prior * strength + hits) / (strength + trials)
+            discount = 1 / (1 + distance / scale) if scale else 1.0
+            ranked.append(RankedRetailer(retailer, distance, hit_rate, trials, hit_rate * discount))
+        ranked.sort(key=lambda r: -r.score)
+        return ranked
+
+    def order(self, retailers: Iterable[Tuple[Retailer, float]], references) -> List[Tuple[Retailer, float]]:
+        """Same as rank(), as (Retailer, distance) tuples"""
+        return [(r.retailer, r.distance) for r in self.rank(retailers, references)]
+
+
+def describe(ranked: RankedRetailer) -> str:
+    """One-line explanation of a retailer's rank, for the CLI"""
+    basis = f"{ranked.evidence:.1f} past answers" if ranked.evidence else "no history yet"
+    return f"{ranked.hit_rate:.0%} hit rate ({basis}), {ranked.distance:.1f} mi"
+
@@ -0,0 +1,229 @@
+"""
+Bulk Re-classification
+Re-scores historical call results with the current phrase lists, in
+parallel across cores, and reports which statuses changed
+"""
+
+import os
+import sys
+import json
+import argparse
+import itertools
+import multiprocessing
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import OUTPUT_CONFIG
+from status_matcher import get_status_matcher
+from blob_store import BlobStore, create_blob_store
+
+
+# Outcomes that came from the call itself rather than the transcript
+CALL_OUTCOME_STATUSES = ("busy", "no-answer", "voicemail")
+NOT_RECLASSIFIED = ("call_failed",)
+
+
+def iter_results(path: str) -> Iterator[Dict]:
+    """
+    Stream call result records from a results log or a legacy run file
+
+    Args:
+        path: ``.jsonl`` results log (streamed line by line) or legacy
+            ``inventory_results.json`` (``{"results": [...]}``)
+
+    Yields:
+        Result record dicts
+    """
+    with open(path, "r") as f:
+        if not path.endswith(".jsonl"):
+            yield from json.load(f).get("results", [])
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def needs_reclassification(record: Dict) -> bool:
+    """Only transcript-derived statuses are re-scored"""
+    if record.get("status") in NOT_RECLASSIFIED:
+        return False
+    raw = record.get("raw_response") or {}
+    if isinstance(raw, dict) and raw.get("status") in CALL_OUTCOME_STATUSES:
+        return False
+    return bool(record.get("transcript") or record.get("summary"))
+
+
+def hydrate(batch: List[Dict], blob_store: Optional[BlobStore]) -> List[Dict]:
+    """
+    Records with their offloaded transcript and raw_response filled back in
+
+    Only used for classifying; the records written out keep their blob keys.
+    """
+    keys = [record["blob_key"] for record in batch if record.get("blob_key")]
+    if not keys or blob_store is None:
+        return batch
+    blobs = blob_store.get_many(keys)
+    return [{**record, **blobs.get(record.get("blob_key"), {})} for record in batch]
+
+
+def classify_text(item: Tuple[str, str]) -> str:
+    """Worker: InventoryStatus value for one (transcript, summary) pair"""
+    transcript, summary = item
+    return get_status_matcher().classify(f"{transcript or ''} {summary or ''}".lower())[0]
+
+
+def _batches(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Reclassifier:
+    """Tallies old → new status transitions and collects changed records"""
+
+    def __init__(self, max_changes: int = 1000):
+        self.max_changes = max_changes
+        self.total = 0
+        self.reclassified = 0
+        self.transitions: Dict[str, Dict[str, int]] = {}
+        self.changed_count = 0
+        self.changed: List[Dict] = []
+
+    def apply(self, record: Dict, new_status: Optional[str]) -> Dict:
+        """Record one result's new status; returns the rewritten record"""
+        self.total += 1
+        old_status = record.get("status")
+        if new_status is None:
+            return record
+
+        self.reclassified += 1
+        row = self.transitions.setdefault(old_status, {})
+        row[new_status] = row.get(new_status, 0) + 1
+
+        if new_status == old_status:
+            return record
+        self.changed_count += 1
+        if len(self.changed) < self.max_changes:
+            self.changed.append({
+                "run_id": record.get("run_id", ""),
+                "retailer_name": record.get("retailer_name", ""),
+                "retailer_phone": record.get("retailer_phone", ""),
+                "watch_reference": record.get("watch_reference", ""),
+                "timestamp": record.get("timestamp", ""),
+                "call_id": record.get("call_id", ""),
+                "old_status": old_status,
+                "new_status": new_status,
+            })
+        updated = dict(record)
+        updated["previous_status"] = old_status
+        updated["status"] = new_status
+        return updated
+
+    def report(self, source: str) -> Dict:
+        return {
+            "source": source,
+            "generated_at": datetime.now().isoformat(),
+            "total_records": self.total,
+            "reclassified": self.reclassified,
+            "changed": self.changed_count,
+            "transitions": self.transitions,
+            "changed_records": self.changed,
+            "changed_records_truncated": self.changed_count > len(self.changed),
+        }
+
+
+def reclassify(
+    source: str,
+    output_path: str,
+    report_path: str,
+    workers: Optional[int] = None,
+    batch_size: int = 5000,
+    blob_store: Optional[BlobStore] = None
+) -> Dict:
+    """
+    Re-score every result in a log and write the new statuses plus a diff report
+
+    Args:
+        source: Results log (.jsonl) or legacy run file (.json)
+        output_path: JSONL file for the rewritten records (the source is never modified)
+        report_path: JSON file for the diff report
+        workers: Worker processes (defaults to the CPU count; 1 runs inline)
+        batch_size: Records read, classified and written per batch
+        blob_store: Where offloaded transcripts are read from (defaults to
+            BLOB_STORE_CONFIG, opened only if a record has a blob key)
+
+    Returns:
+        The diff report dict
+    """
+    workers = workers or os.cpu_count() or 1
+    tally = Reclassifier()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    chunksize = max(1, batch_size // (workers * 4))
+
+    try:
+        with open(output_path, "w") as out:
+            for batch in _batches(iter_results(source), batch_size):
+                if blob_store is None and any(record.get("blob_key") for record in batch):
+                    blob_store = create_blob_store()
+                full = hydrate(batch, blob_store)
+                targets = [i for i, record in enumerate(full) if needs_reclassification(record)]
+                texts = [(full[i].get("transcript"), full[i].get("summary")) for i in targets]
+                if pool:
+                    statuses = pool.map(classify_text, texts, chunksize=chunksize)
+                else:
+                    statuses = [classify_text(text) for text in texts]
+
+                new_statuses: Dict[int, str] = dict(zip(targets, statuses))
+                for i, record in enumerate(batch):
+                    out.write(json.dumps(tally.apply(record, new_statuses.get(i))) + "\n")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    report = tally.report(source)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_report(report: Dict):
+    print(f"\nRecords: {report['total_records']}  re-scored: {report['reclassified']}  "
+          f"changed: {report['changed']}")
+    for old, row in sorted(report["transitions"].items()):
+        for new, count in sorted(row.items()):
+            if old != new:
+                print(f"  {old:>14} → {new:<14} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-classify historical call results with the current phrase lists")
+    parser.add_argument("source", nargs="?", default=OUTPUT_CONFIG["results_log"],
+                        help="Results log (.jsonl) or legacy inventory_results.json")
+    parser.add_argument("--output", "-o", help="Rewritten records (default: <source>.reclassified.jsonl)")
+    parser.add_argument("--report", "-r", help="Diff report (default: <source>.reclassify_report.json)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records per batch")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"ERROR: {args.source} not found")
+        sys.exit(1)
+
+    base = os.path.splitext(args.source)[0]
+    output_path = args.output or f"{base}.reclassified.jsonl"
+    report_path = args.report or f"{base}.reclassify_report.json"
+
+    start = datetime.now()
+    report = reclassify(args.source, output_path, report_path, args.workers, args.batch_size)
+    elapsed = (datetime.now() - start).total_seconds()
+
+    print_report(report)
+    print(f"\nWrote {output_path} and {report_path} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Append-only Call Results Log
+Writes each call result to a JSONL file as soon as the call completes,
+with a small sidecar index so summaries never re-read full payloads
+"""
+
+import os
+import json
+import bisect
+import threading
+from typing import List, Dict, Optional, Iterator, Tuple
+from dataclasses import dataclass, asdict
+
+
+@dataclass
+class IndexEntry:
+    """Index record pointing at one line of the results log"""
+    offset: int
+    length: int
+    run_id: str
+    retailer_name: str
+    retailer_phone: str
+    watch_reference: str
+    status: str
+    timestamp: str
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ResultsLog:
+    """
+    Append-only JSONL log of call results plus a sidecar index.
+
+    The log (``inventory_results.jsonl``) holds one full record per line.
+    The index (``inventory_results.jsonl.idx``) holds one small entry per
+    record: byte offset, length, retailer, reference, status and timestamp.
+    Queries run against the index only; full records are read with a single
+    seek when actually needed.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a results log
+
+        Args:
+            path: Path of the JSONL log file; the index lives next to it
+        """
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self._lock = threading.Lock()
+        self._entries: Optional[List[IndexEntry]] = None
+        self._by_retailer: Dict[str, List[int]] = {}
+        self._by_reference: Dict[str, List[int]] = {}
+        self._by_time: List[Tuple[str, int]] = []
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._recover_index()
+
+    # ── Writing ──
+
+    def append(self, record: Dict, watch_reference: str, run_id: str) -> IndexEntry:
+        """
+        Append one call result to the log and index it
+
+        Args:
+            record: Serialized CallResult (``CallResult.to_dict()``)
+            watch_reference: Reference of the watch that was asked about
+            run_id: Identifier of the run this call belongs to
+
+        Returns:
+            The IndexEntry written for the record
+        """
+        line = dict(record)
+        line["watch_reference"] = watch_reference
+        line["run_id"] = run_id
+        data = (json.dumps(line) + "\n").encode("utf-8")
+
+        with self._lock:
+            # Log first, index second: a crash in between leaves a record
+            # without an index entry, which _recover_index() repairs
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = self._make_entry(line, offset, len(data))
+            with open(self.index_path, "a") as f:
+                f.write(json.dumps(entry.to_dict()) + "\n")
+
+            if self._entries is not None:
+                self._add_to_memory(entry)
+
+        return entry
+
+    # ── Reading ──
+
+    def query(
+        self,
+        retailer_name: Optional[str] = None,
+        watch_reference: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        run_id: Optional[str] = None
+    ) -> List[IndexEntry]:
+        """
+        Find index entries matching the given filters (reads only the index)
+
+        Args:
+            retailer_name: Only entries for this retailer
+            watch_reference: Only entries for this watch reference
+            since: ISO timestamp lower bound (inclusive)
+            until: ISO timestamp upper bound (exclusive)
+            run_id: Only entries from this run
+
+        Returns:
+            Matching IndexEntry objects in log order
+        """
+        with self._lock:
+            entries = self._load_entries()
+
+            if retailer_name is not None:
+                positions = self._by_retailer.get(retailer_name, [])
+            elif watch_reference is not None:
+                positions = self._by_reference.get(watch_reference, [])
+            elif since is not None:
+                start = bisect.bisect_left(self._by_time, (since, -1))
+                positions = sorted(pos for _, pos in self._by_time[start:])
+            else:
+                positions = range(len(entries))
+
+            results = []
+            for pos in positions:
+                entry = entries[pos]
+                if watch_reference is not None and entry.watch_reference != watch_reference:
+                    continue
+                if since is not None and entry.timestamp < since:
+                    continue
+                if until is not None and entry.timestamp >= until:
+                    continue
+                if run_id is not None and entry.run_id != run_id:
+                    continue
+                results.append(entry)
+            return results
+
+    def read(self, entry: IndexEntry) -> Dict:
+        """Read the full record an index entry points at"""
+        with open(self.path, "rb") as f:
+            f.seek(entry.offset)
+            return json.loads(f.read(entry.length).decode("utf-8"))
+
+    def iter_records(self, entries: Optional[List[IndexEntry]] = None) -> Iterator[Dict]:
+        """
+        Stream full records, either all of them or the given entries
+
+        Args:
+            entries: Index entries to read (None streams the whole log)
+
+        Yields:
+            Full record dicts
+        """
+        if entries is None:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            return
+
+        with open(self.path, "rb") as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                yield json.loads(f.read(entry.length).decode("utf-8"))
+
+    # ── Index maintenance ──
+
+    def _make_entry(self, record: Dict, offset: int, length: int) -> IndexEntry:
+        status = record.get("status")
+        if not isinstance(status, str):
+            status = getattr(status, "value", str(status))
+        return IndexEntry(
+            offset=offset,
+            length=length,
+            run_id=record.get("run_id", ""),
+            retailer_name=record.get("retailer_name", ""),
+            retailer_phone=record.get("retailer_phone", ""),
+            watch_reference=record.get("watch_reference", ""),
+            status=status,
+            timestamp=record.get("timestamp", "")
+        )
+
+    def _load_entries(self) -> List[IndexEntry]:
+        """Load the index into memory on first use"""
+        if self._entries is None:
+            self._entries = []
+            self._by_retailer = {}
+            self._by_reference = {}
+            self._by_time = []
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            self._add_to_memory(IndexEntry(**json.loads(line)))
+        return self._entries
+
+    def _add_to_memory(self, entry: IndexEntry):
+        pos = len(self._entries)
+        self._entries.append(entry)
+        self._by_retailer.setdefault(entry.retailer_name, []).append(pos)
+        self._by_reference.setdefault(entry.watch_reference, []).append(pos)
+        # Concurrent calls can finish out of start-time order, so keep
+        # the time index sorted explicitly
+        bisect.insort(self._by_time, (entry.timestamp, pos))
+
+    def _truncate_torn_record(self, chunk_size: int = 64 * 1024):
+        """Drop a torn final log line (a crash mid-write) so the next record starts on a fresh line"""
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan back from the end for the last complete line
+            pos = end
+            keep = 0
+            while pos > 0:
+                start = max(0, pos - chunk_size)
+                f.seek(start)
+                newline = f.read(pos - start).rfind(b"\n")
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                pos = start
+            print(f"[RESULTS LOG] Dropping {end - keep} bytes of a torn record at the end of {self.path}")
+            f.truncate(keep)
+
+    def _recover_index(self):
+        """Index any log records written after the last index entry (crash recovery)"""
+        if not os.path.exists(self.path):
+            return
+        self._truncate_torn_record()
+
+        indexed_end = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb+") as f:
+                data = f.read()
+                # Drop a torn final index line so new entries start on a fresh line
+                if data and not data.endswith(b"\n"):
+                    data = data[:data.rfind(b"\n") + 1]
+                    f.seek(0)
+                    f.truncate(len(data))
+            for line in data.decode("utf-8").splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    indexed_end = max(indexed_end, entry["offset"] + entry["length"])
+
+        if indexed_end >= os.path.getsize(self.path):
+            return
+
+        print(f"[RESULTS LOG] Re-indexing {self.path} from byte {indexed_end}")
+        recovered = []
+        with open(self.path, "rb") as f:
+            f.seek(indexed_end)
+            offset = indexed_end
+            for raw in f:
+                if raw.endswith(b"\n") and raw.strip():
+                    try:
+                        record = json.loads(raw.decode("utf-8"))
+                        recovered.append(self._make_entry(record, offset, len(raw)))
+                    except ValueError:
+                        pass
+                offset += len(raw)
+
+        with open(self.index_path, "a") as f:
+            for entry in recovered:
+                f.write(json.dumps(entry.to_dict()) + "\n")
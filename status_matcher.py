@@ -0,0 +1,209 @@
+"""
+Status Matcher
+Phrase lists used to classify a call transcript, compiled once into
+single-pass patterns that keep the classifier's priority order
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# IVR / hold messages - we didn't actually talk to anyone
+AUTOMATED_PHRASES = [
+    "press zero", "press 0", "press one", "press 1",
+    "press two", "press 2", "all our associates",
+    "all of our associates", "currently assisting",
+    "please hold", "your call is important",
+    "leave a message", "after the beep", "after the tone",
+    "office hours", "business hours", "currently closed",
+    "call back", "try again later", "menu options",
+    "for sales press", "for service press",
+    "thanks, goodbye", "thanks goodbye",  # Agent hung up without info
+    "ended call"  # Agent ended without getting info
+]
+
+NO_ANSWER_PHRASES = [
+    "no answer", "voicemail", "didn't pick up",
+    "couldn't reach", "busy signal", "not available",
+    "leave a message", "after the tone", "mailbox"
+]
+
+# Checked before the positive phrases so "not in stock" never counts as "in stock"
+OUT_OF_STOCK_PHRASES = [
+    "not in stock", "out of stock", "don't have", "do not have",
+    "don't carry", "do not carry", "sold out", "not available",
+    "currently out", "wasn't in stock", "was not in stock",
+    "weren't in stock", "were not in stock", "isn't in stock",
+    "is not in stock", "aren't in stock", "are not in stock",
+    "doesn't have", "does not have", "didn't have", "did not have",
+    "unavailable", "no longer", "discontinued", "can't get",
+    "cannot get", "unable to", "don't currently have",
+    "do not currently have", "not currently in stock",
+    "currently not in stock", "currently unavailable",
+    # From Claude summaries
+    "did not have the tudor", "did not have the watch",
+    "do not have the tudor", "do not have the watch"
+]
+
+# Regular expressions; only consulted once the watch is out of stock
+OUT_OF_STOCK_WAITLIST_PATTERNS = [
+    "waitlist", "waiting list", "wait list", "interest list",
+    "put you on a list", "add you to a list", "notify you",
+    "call you when", "contact you when", "let you know when",
+    "call them when", "contact them when",  # Third person from summaries
+    "register.*interest", "take your information",
+    "client book", "client list", "come into the store",
+    "stop by", "visit.*store", "in-store visit", "in store visit",
+    "happy to add you", "add you if you",
+    # From Claude summaries
+    "offered to add", "add the customer", "add the caller",
+    "add their name", "waitlist is available",
+    "visit the store in person", "register their interest",
+    "reach out to add", "get added to",
+    "for a callback", "callback when", "call back when",
+    "take.*information", "caller's information",
+    "when the watch becomes available", "when it becomes available",
+    "when available", "becomes available"
+]
+
+OUT_OF_STOCK_ORDER_PATTERNS = [
+    "can order", "could order", "special order", "order it for you",
+    "order one for you", "place an order", "get it in",
+    "expect.*shipment", "expecting.*shipment", "more coming"
+]
+
+# Must be specific enough not to match the agent's own questions
+# (avoid phrases like "have that", which appears in "Do you have that in stock?")
+IN_STOCK_PHRASES = [
+    "we have it", "we do have", "yes we have", "have it in stock",
+    "have one in stock", "have them in stock",
+    "it's available", "it is available", "is available",
+    "watch is available", "that is available", "that's available",
+    "they're available", "they are available",
+    "yes we do", "we do have that", "we have that one",
+    "we currently have", "do have it", "in stock now",
+    "available now", "ready for pickup", "can come in today",
+    "come pick it up", "have it here", "we have one",
+    "got one here", "got it here", "have that model",
+    "have the ranger", "have that watch",
+    "confirmed that the watch is available",  # From Bland summary
+    "watch is in stock", "model is available",
+    "dial in stock",  # From Claude summary (works for any dial color)
+    "they had the", "had the tudor", "had it in stock",
+    "have the tudor", "has the tudor"
+]
+
+# Waitlist / order mentions without an explicit out of stock
+WAITLIST_PHRASES = ["waitlist", "waiting list", "wait list", "interest list"]
+ORDER_PHRASES = ["can order", "special order"]
+
+_REGEX_CHARS = set(".^$*+?{}[]()|\\")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex for a set of literals that shares common prefixes, like an Aho-Corasick trie"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends_here else body
+
+    return build(trie)
+
+
+def compile_phrases(literals: Iterable[str] = (), patterns: Iterable[str] = ()) -> re.Pattern:
+    """
+    Compile phrases into one pattern that matches if any of them occurs
+
+    Args:
+        literals: Plain substrings
+        patterns: Regular expressions (phrases without regex syntax are
+            treated as literals)
+
+    Returns:
+        Compiled pattern
+    """
+    words = set(literals)
+    regexes = []
+    for pattern in patterns:
+        if _REGEX_CHARS.intersection(pattern):
+            regexes.append(pattern)
+        else:
+            words.add(pattern)
+    alternatives = ([_trie_pattern(words)] if words else []) + regexes
+    return re.compile("|".join(alternatives) if alternatives else "(?!)")
+
+
+class StatusMatcher:
+    """
+    Priority-ordered transcript classifier over precompiled phrase tiers.
+
+    Each tier is searched once, and the first tier that matches decides
+    the status. Results are InventoryStatus values ("in_stock", "waitlist", ...).
+    """
+
+    def __init__(self):
+        self.automated = compile_phrases(AUTOMATED_PHRASES)
+        self.no_answer = compile_phrases(NO_ANSWER_PHRASES)
+        self.out_of_stock = compile_phrases(OUT_OF_STOCK_PHRASES)
+        self.out_of_stock_waitlist = compile_phrases(patterns=OUT_OF_STOCK_WAITLIST_PATTERNS)
+        self.out_of_stock_order = compile_phrases(patterns=OUT_OF_STOCK_ORDER_PATTERNS)
+        self.in_stock = compile_phrases(IN_STOCK_PHRASES)
+        self.waitlist = compile_phrases(WAITLIST_PHRASES)
+        self.order = compile_phrases(ORDER_PHRASES)
+
+    def classify(self, text: str) -> Tuple[str, Optional[str]]:
+        """
+        Classify lowercased transcript + summary text
+
+        Args:
+            text: Lowercased text to classify
+
+        Returns:
+            Tuple of (InventoryStatus value, matched text or None)
+        """
+        tiers: List[Tuple[re.Pattern, str]] = [
+            (self.automated, "unknown"),
+            (self.no_answer, "no_answer"),
+        ]
+        for pattern, status in tiers:
+            match = pattern.search(text)
+            if match:
+                return status, match.group(0)
+
+        if self.out_of_stock.search(text):
+            for pattern, status in ((self.out_of_stock_waitlist, "waitlist"),
+                                    (self.out_of_stock_order, "can_order")):
+                match = pattern.search(text)
+                if match:
+                    return status, match.group(0)
+            return "out_of_stock", None
+
+        for pattern, status in ((self.in_stock, "in_stock"),
+                                (self.waitlist, "waitlist"),
+                                (self.order, "can_order")):
+            match = pattern.search(text)
+            if match:
+                return status, match.group(0)
+
+        return "unknown", None
+
+
+_matcher: Optional[StatusMatcher] = None
+
+
+def get_status_matcher() -> StatusMatcher:
+    """Module-wide matcher, compiled on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = StatusMatcher()
+    return _matcher
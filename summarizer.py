@@ -4,21 +4,92 @@ Generates concise, human-readable summaries of phone call transcripts
 """
 
 import os
-from typing import Optional
+import time
+import asyncio
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
 import anthropic
 
+from config import SUMMARIZER_CONFIG
+from call_retry import RetryPolicy
+from summary_cache import SummaryCache, get_summary_cache, summary_key
+
+
+DEFAULT_WATCH_NAME = "Tudor Ranger 36mm with beige dial"
+FAILED_SUMMARY = "Call completed but summary generation failed."
+
+
+def build_prompt(transcript: str, retailer_name: str, watch_name: str) -> str:
+    """Claude prompt asking for a 1-3 sentence summary of one call"""
+    return f"""Summarize this phone call transcript in 1-3 sentences. The caller was asking {retailer_name} about the availability of a {watch_name}.
+
+Focus on:
+- Whether the watch is in stock or not
+- Any waitlist, special order, or callback options mentioned
+- Any other relevant details (e.g., if they reached an automated system, if the store was busy, etc.)
+
+Keep the summary concise and factual. Write from a third-person perspective (e.g., "The store confirmed..." not "I confirmed...").
+
+Transcript:
+{transcript}
+
+Summary:"""
+
+
+def retry_kind(error: Exception) -> Optional[str]:
+    """Which retryable failure an Anthropic error is (None if retrying won't help)"""
+    if isinstance(error, anthropic.APIStatusError):
+        if error.status_code == 429:
+            return "rate_limited"
+        if error.status_code == 529:
+            return "overloaded"
+        if error.status_code >= 500:
+            return "server_error"
+        return None
+    if isinstance(error, anthropic.APIConnectionError):
+        return "connection_error"
+    return None
+
+
+def retry_after_seconds(error: Exception) -> float:
+    """Wait the API asked for in a retry-after header (0 if none)"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after", 0)) if response is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
 
 class TranscriptSummarizer:
-    """Summarizes phone call transcripts using Claude"""
+    """
+    Summarizes phone call transcripts using Claude.
 
-    def __init__(self, api_key: Optional[str] = None):
+    Holds one sync client (and one async client per event loop) for its
+    lifetime; use get_summarizer() for the process-wide instance. At most
+    ``max_concurrent_requests`` summaries are in flight from threads, and as
+    many from each event loop. Rate limits, overload and transient errors
+    are retried with exponential backoff and jitter (SUMMARIZER_CONFIG['retry']),
+    honouring the API's retry-after. With a cache, a transcript already
+    summarized for the same retailer, watch and model is answered from it
+    without a request; failed summaries are never cached.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, config: Optional[Dict] = None,
+                 retry_policy: Optional[RetryPolicy] = None, cache: Optional[SummaryCache] = None):
         self.api_key = api_key or os.environ.get('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError("Anthropic API key is required. Set ANTHROPIC_API_KEY environment variable.")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.config = config or SUMMARIZER_CONFIG
+        self.retry_policy = retry_policy or RetryPolicy(self.config["retry"])
+        self.cache = cache
+        # Retries are ours (with jitter and a shared cap), not the SDK's
+        self.client = anthropic.Anthropic(api_key=self.api_key, max_retries=0, timeout=self.config["request_timeout"])
+        self._slots = threading.BoundedSemaphore(self.config["max_concurrent_requests"])
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple]" = weakref.WeakKeyDictionary()
 
-    def summarize(self, transcript: str, retailer_name: str, watch_name: str = "Tudor Ranger 36mm with beige dial") -> str:
+    def summarize(self, transcript: str, retailer_name: str, watch_name: str = DEFAULT_WATCH_NAME) -> str:
         """
         Summarize a phone call transcript into 1-3 sentences.
 
@@ -33,48 +104,130 @@ class TranscriptSummarizer:
         if not transcript or not transcript.strip():
             return "No transcript available."
 
-        prompt = f"""Summarize this phone call transcript in 1-3 sentences. The caller was asking {retailer_name} about the availability of a {watch_name}.
+        key, cached = self._cached(transcript, retailer_name, watch_name)
+        if cached is not None:
+            return cached
 
-Focus on:
-- Whether the watch is in stock or not
-- Any waitlist, special order, or callback options mentioned
-- Any other relevant details (e.g., if they reached an automated system, if the store was busy, etc.)
+        request = self._request(build_prompt(transcript, retailer_name, watch_name))
+        attempt = 1
+        while True:
+            try:
+                with self._slots:
+                    message = self.client.messages.create(**request)
+                return self._store(key, message.content[0].text.strip())
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, retailer_name)
+                if delay is None:
+                    return FAILED_SUMMARY
+                time.sleep(delay)
+                attempt += 1
 
-Keep the summary concise and factual. Write from a third-person perspective (e.g., "The store confirmed..." not "I confirmed...").
+    async def summarize_async(self, transcript: str, retailer_name: str,
+                              watch_name: str = DEFAULT_WATCH_NAME) -> str:
+        """summarize() on the running event loop, with that loop's client and request cap"""
+        if not transcript or not transcript.strip():
+            return "No transcript available."
 
-Transcript:
-{transcript}
+        key, cached = self._cached(transcript, retailer_name, watch_name)
+        if cached is not None:
+            return cached
 
-Summary:"""
+        client, slots = self._async_client()
+        request = self._request(build_prompt(transcript, retailer_name, watch_name))
+        attempt = 1
+        while True:
+            try:
+                async with slots:
+                    message = await client.messages.create(**request)
+                return self._store(key, message.content[0].text.strip())
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, retailer_name)
+                if delay is None:
+                    return FAILED_SUMMARY
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def summarize_many(self, items: Iterable[Tuple[str, str, str]]) -> List[str]:
+        """
+        Summarize several calls concurrently (bounded by max_concurrent_requests)
 
+        Args:
+            items: (transcript, retailer_name, watch_name) tuples
+
+        Returns:
+            Summaries in the same order
+        """
+        return await asyncio.gather(*(self.summarize_async(*item) for item in items))
+
+    def _cached(self, transcript: str, retailer_name: str, watch_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """(cache key, cached summary or None on a miss); (None, None) without a cache"""
+        if not self.cache:
+            return None, None
+        key = summary_key(transcript, retailer_name, watch_name, self.config["model"])
         try:
-            message = self.client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=150,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            return key, self.cache.get(key)
+        except Exception as e:
+            print(f"Error reading summary cache: {e}")
+            return key, None
+
+    def _store(self, key: Optional[str], summary: str) -> str:
+        if key and summary:
+            try:
+                self.cache.put(key, summary)
+            except Exception as e:
+                print(f"Error writing summary cache: {e}")
+        return summary
+
+    def _request(self, prompt: str) -> Dict:
+        return {
+            "model": self.config["model"],
+            "max_tokens": self.config["max_tokens"],
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _async_client(self) -> Tuple["anthropic.AsyncAnthropic", asyncio.Semaphore]:
+        """Async client and request cap for the running event loop"""
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            entry = (
+                anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0, timeout=self.config["request_timeout"]),
+                asyncio.Semaphore(self.config["max_concurrent_requests"])
             )
+            self._async_clients[loop] = entry
+        return entry
 
-            summary = message.content[0].text.strip()
-            return summary
+    def _retry_delay(self, error: Exception, attempt: int, retailer_name: str) -> Optional[float]:
+        """Seconds to wait before retrying a failed request, or None to give up"""
+        kind = retry_kind(error)
+        if kind is None or not self.retry_policy.should_retry(kind, attempt):
+            print(f"Error summarizing transcript: {error}")
+            return None
+        delay = max(self.retry_policy.delay(attempt), retry_after_seconds(error))
+        print(f"Summary for {retailer_name}: {kind}, retrying in {delay:.1f}s "
+              f"(attempt {attempt + 1} of {self.retry_policy.max_attempts})")
+        return delay
+
+
+_summarizer: Optional[TranscriptSummarizer] = None
+_summarizer_lock = threading.Lock()
 
-        except Exception as e:
-            print(f"Error summarizing transcript: {e}")
-            return f"Call completed but summary generation failed."
+
+def get_summarizer() -> TranscriptSummarizer:
+    """Process-wide summarizer with the shared summary cache (rebuilt only if ANTHROPIC_API_KEY changes)"""
+    global _summarizer
+    api_key = os.environ.get('ANTHROPIC_API_KEY')
+    with _summarizer_lock:
+        if _summarizer is None or _summarizer.api_key != api_key:
+            _summarizer = TranscriptSummarizer(api_key, cache=get_summary_cache())
+        return _summarizer
 
 
 # Convenience function
 def summarize_transcript(transcript: str, retailer_name: str, watch_name: str = None) -> str:
-    """Quick function to summarize a transcript"""
+    """Quick function to summarize a transcript with the shared summarizer"""
     try:
-        # Debug: check if env var is set
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        print(f"  ANTHROPIC_API_KEY present: {bool(api_key)}")
-        if api_key:
-            print(f"  Key starts with: {api_key[:10]}...")
-
-        summarizer = TranscriptSummarizer()
+        summarizer = get_summarizer()
         # Use provided watch_name or default
         if watch_name:
             return summarizer.summarize(transcript, retailer_name, watch_name)
@@ -88,6 +241,18 @@ def summarize_transcript(transcript: str, retailer_name: str, watch_name: str =
         return f"Summary generation failed: {str(e)}"
 
 
+async def summarize_transcript_async(transcript: str, retailer_name: str, watch_name: str = None) -> str:
+    """summarize_transcript() for async callers"""
+    try:
+        return await get_summarizer().summarize_async(transcript, retailer_name, watch_name or DEFAULT_WATCH_NAME)
+    except ValueError as e:
+        print(f"  ValueError: {e}")
+        return "Summary not available (API key not configured)."
+    except Exception as e:
+        print(f"  Exception: {e}")
+        return f"Summary generation failed: {str(e)}"
+
+
 if __name__ == "__main__":
     # Test with a sample transcript
     test_transcript = """
@@ -0,0 +1,166 @@
+"""
+Transcript Summary Cache
+Claude summaries keyed by a hash of the normalized transcript, retailer,
+watch and model, so a re-run, re-analysed or replayed call is not sent to
+Claude again
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from config import SUMMARY_CACHE_CONFIG
+
+
+# Bump when the prompt changes, so old summaries stop matching
+KEY_VERSION = 1
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Transcript with whitespace collapsed, so reformatted copies share a key"""
+    return " ".join(transcript.split())
+
+
+def summary_key(transcript: str, retailer_name: str, watch_name: str, model: str) -> str:
+    """Content address of one summary request"""
+    parts = [KEY_VERSION, model, retailer_name.strip(), watch_name.strip(), normalize_transcript(transcript)]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    SQLite table of summaries with least-recently-used eviction.
+
+    Bounded by ``max_entries`` and ``max_bytes`` (of summary text); every
+    put() evicts the least recently read or written summaries past either
+    limit. Shared by API worker processes and the CLI (WAL mode, one
+    connection per thread). Hit and miss counts are per process.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS summaries (
+        cache_key TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries (last_used);
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 5000, max_bytes: int = 5 * 1024 * 1024):
+        """
+        Args:
+            db_path: SQLite file (created if missing)
+            max_entries: Most summaries kept
+            max_bytes: Most summary text kept, in UTF-8 bytes
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread, opened in autocommit mode"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, stat: str, n: int = 1):
+        with self._lock:
+            self._stats[stat] += n
+
+    def get(self, key: str) -> Optional[str]:
+        """The summary stored under ``key`` (None on a miss); a hit counts as a use"""
+        conn = self._conn()
+        row = conn.execute("SELECT summary FROM summaries WHERE cache_key = ?", (key,)).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+        conn.execute("UPDATE summaries SET last_used = ? WHERE cache_key = ?", (time.time(), key))
+        self._count("hits")
+        return row[0]
+
+    def put(self, key: str, summary: str):
+        """Store a summary, then evict the least recently used ones past the limits"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO summaries (cache_key, summary, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, summary, len(summary.encode("utf-8")), now, now)
+        )
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries").fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+        doomed = []
+        oldest_first = conn.execute("SELECT cache_key, size FROM summaries ORDER BY last_used")
+        for key, size in oldest_first:
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append(key)
+            entries -= 1
+            total -= size
+        oldest_first.close()
+        conn.executemany("DELETE FROM summaries WHERE cache_key = ?", [(key,) for key in doomed])
+        self._count("evictions", len(doomed))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM summaries")
+
+    def stats(self) -> Dict:
+        """Size, limits and this process's hit rate, for /api/metrics"""
+        entries, total = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries"
+        ).fetchone()
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(
+            lookups=lookups,
+            hit_rate=round(stats["hits"] / lookups, 3) if lookups else None,
+            entries=entries,
+            bytes=total,
+            max_entries=self.max_entries,
+            max_bytes=self.max_bytes
+        )
+        return stats
+
+
+def create_summary_cache(config: Optional[Dict] = None) -> SummaryCache:
+    """Build the summary cache described by SUMMARY_CACHE_CONFIG"""
+    config = config or SUMMARY_CACHE_CONFIG
+    return SummaryCache(config["db_path"], max_entries=config["max_entries"], max_bytes=config["max_bytes"])
+
+
+_cache_lock = threading.Lock()
+_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Process-wide summary cache (None if SUMMARY_CACHE_CONFIG disables it)"""
+    global _cache
+    if not SUMMARY_CACHE_CONFIG["enabled"]:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = create_summary_cache()
+        return _cache
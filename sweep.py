@@ -0,0 +1,91 @@
+"""
+Sweep Strategies
+When a sweep of nearby retailers has found what it was looking for, so the
+calls still pending can be cancelled
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from config import SWEEP_CONFIG
+
+
+ALL = "all"  # Call every listed store
+FIRST_HIT = "first_hit"  # Stop at the first store with the watch in stock
+FIRST_N = "first_n"  # Stop once ``hits`` stores have it in stock
+RADIUS_BAND = "radius_band"  # Finish the distance band of the nearest hit, skip farther bands
+
+STRATEGIES = (ALL, FIRST_HIT, FIRST_N, RADIUS_BAND)
+
+
+@dataclass
+class SweepStrategy:
+    """How far a sweep goes once stock turns up"""
+    mode: str = ALL
+    hits: int = 1  # In-stock stores wanted (first_n)
+    band_miles: float = SWEEP_CONFIG["band_miles"]  # Band width (radius_band)
+
+    def __post_init__(self):
+        if self.mode not in STRATEGIES:
+            raise ValueError(f"Unknown sweep strategy '{self.mode}' (use one of: {', '.join(STRATEGIES)})")
+        if self.mode == FIRST_HIT:
+            self.hits = 1
+        if self.hits < 1:
+            raise ValueError("A sweep needs at least one hit to stop at")
+        if self.band_miles <= 0:
+            raise ValueError("band_miles must be positive")
+
+    @classmethod
+    def from_options(cls, mode: Optional[str] = None, hits: Optional[int] = None,
+                     band_miles: Optional[float] = None) -> "SweepStrategy":
+        """Strategy from request/CLI options, defaulting to SWEEP_CONFIG"""
+        return cls(
+            mode=mode or SWEEP_CONFIG["strategy"],
+            hits=hits or SWEEP_CONFIG["hits"],
+            band_miles=band_miles or SWEEP_CONFIG["band_miles"]
+        )
+
+    def to_dict(self) -> Dict:
+        return {"mode": self.mode, "hits": self.hits, "band_miles": self.band_miles}
+
+    def band(self, distance: Optional[float]) -> float:
+        return math.floor(distance / self.band_miles) if distance is not None else math.inf
+
+
+class SweepTracker:
+    """
+    Counts the in-stock stores a sweep has found and decides which pending
+    calls are still worth making. Thread-safe.
+    """
+
+    def __init__(self, strategy: SweepStrategy):
+        self.strategy = strategy
+        self.stores_in_stock: Dict[str, float] = {}  # Store key -> distance
+        self._lock = threading.Lock()
+
+    def observe(self, store: str, in_stock: bool, distance: Optional[float] = None):
+        """Record one finished call (a store counts once, however many references it has)"""
+        if in_stock:
+            with self._lock:
+                self.stores_in_stock.setdefault(store, distance if distance is not None else math.inf)
+
+    @property
+    def done(self) -> bool:
+        """True once no more calls should be started"""
+        with self._lock:
+            found = len(self.stores_in_stock)
+        return self.strategy.mode in (FIRST_HIT, FIRST_N) and found >= self.strategy.hits
+
+    def wanted(self, distance: Optional[float]) -> bool:
+        """Whether a call not yet started, to a store this far away, should still be made"""
+        if self.strategy.mode == ALL:
+            return True
+        if self.strategy.mode == RADIUS_BAND:
+            with self._lock:
+                if not self.stores_in_stock:
+                    return True
+                nearest = min(self.stores_in_stock.values())
+            return self.strategy.band(distance) <= self.strategy.band(nearest)
+        return not self.done
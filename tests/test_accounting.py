@@ -0,0 +1,132 @@
+"""Tests for accounting.py — call charges, spend rollups, burn rate and budgets"""
+
+import pytest
+import threading
+from datetime import datetime, timezone
+
+from accounting import CallLedger, key_id
+from config import ACCOUNTING_CONFIG
+
+
+# Wednesday 2026-01-14 12:00 UTC
+NOON = datetime(2026, 1, 14, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def now():
+    return [NOON]
+
+
+def ledger_for(tmp_path, now, **overrides):
+    config = {**ACCOUNTING_CONFIG, "cost_per_minute": 0.10, "estimated_minutes_per_call": 2.0, **overrides}
+    return CallLedger(str(tmp_path / "ledger.db"), config=config, clock=lambda: now[0])
+
+
+class TestCallLedger:
+    def test_records_each_call_once(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now)
+        assert ledger.record("bland-1", "key-a", 90, job_id="call_1")
+        assert not ledger.record("bland-1", "key-a", 90, job_id="call_1")  # Duplicate webhook
+        assert not ledger.record("", "key-a", 30)  # Never connected
+
+        spend = ledger.spend("key-a")
+        assert spend["daily"] == {"period": "2026-01-14", "calls": 1, "minutes": 1.5, "cost": 0.15}
+        assert spend["monthly"]["period"] == "2026-01"
+        assert ledger.job_spend("call_1") == {"calls": 1, "minutes": 1.5, "cost": 0.15}
+
+    def test_rollups_by_key_day_and_month(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now)
+        ledger.record("c1", "key-a", 60)
+        now[0] -= 24 * 3600  # Yesterday
+        ledger.record("c2", "key-a", 120)
+        ledger.record("c3", "key-b", 60)
+        now[0] = NOON
+
+        assert ledger.spend("key-a")["daily"]["calls"] == 1
+        assert ledger.spend("key-a")["monthly"]["calls"] == 2
+        assert ledger.spend()["monthly"]["cost"] == 0.4
+        assert key_id("key-a") != key_id("key-b") and "key-a" not in key_id("key-a")
+
+    def test_burn_rate_covers_the_window(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now, burn_rate_window_seconds=1800)
+        now[0] -= 3600
+        ledger.record("old", "key", 600)
+        now[0] = NOON - 60
+        ledger.record("recent", "key", 120)
+        now[0] = NOON
+
+        assert ledger.burn_rate() == {
+            "window_seconds": 1800, "calls_per_hour": 2.0, "minutes_per_hour": 4.0, "cost_per_hour": 0.4
+        }
+
+
+class TestAdmission:
+    def test_under_budget_admits_everything(self, tmp_path, now):
+        admission = ledger_for(tmp_path, now).admit("key", 5)
+        assert admission.ok and admission.allowed == 5 and admission.warnings == []
+
+    def test_hard_budget_cuts_calls(self, tmp_path, now):
+        # Each call is estimated at 2 min x $0.10 = $0.20
+        ledger = ledger_for(tmp_path, now, budgets={"daily": {"soft": None, "hard": 1.0}})
+        ledger.record("c1", "key", 300)  # $0.50 spent
+
+        admission = ledger.admit("key", 5)
+        assert not admission.ok
+        assert admission.allowed == 2
+        assert "daily budget" in admission.reason
+        assert ledger.admit("other-key", 5).ok  # Budgets are per key
+
+    def test_soft_budget_only_warns(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now, budgets={"monthly": {"soft": 0.5, "hard": None}})
+        ledger.record("c1", "key", 120)
+
+        admission = ledger.admit("key", 2)
+        assert admission.ok
+        assert len(admission.warnings) == 1 and "monthly" in admission.warnings[0]
+
+
+class TestReservations:
+    def test_concurrent_admissions_cannot_share_the_headroom(self, tmp_path, now):
+        # $1.00 covers five $0.20 calls; twelve are admitted at once and none has been recorded yet
+        ledger = ledger_for(tmp_path, now, budgets={"daily": {"soft": None, "hard": 1.0}})
+        start = threading.Barrier(12)
+        admitted = []
+
+        def admit(i):
+            start.wait()
+            admitted.append(ledger.admit("key", reservations=[f"call_{i}"]).ok)
+
+        threads = [threading.Thread(target=admit, args=(i,)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(admitted) == [False] * 7 + [True] * 5
+        assert ledger.reserved("key") == {"calls": 5, "cost": 1.0}
+        assert "$1.00 reserved" in ledger.admit("key").reason
+
+    def test_record_settles_and_release_frees(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now, budgets={"daily": {"soft": None, "hard": 0.4}})
+        assert ledger.admit("key", 2, reservations=["call_1", "call_2"]).ok
+        assert ledger.admit("key").allowed == 0
+
+        ledger.record("bland-1", "key", 60, job_id="call_1")  # $0.10 charged instead of $0.20 held
+        ledger.release("call_2")  # Cancelled before it rang
+
+        assert ledger.reserved("key") == {"calls": 0, "cost": 0}
+        assert ledger.admit("key", 2).allowed == 1
+
+    def test_retry_replaces_its_own_reservation(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now, budgets={"daily": {"soft": None, "hard": 0.2}})
+        assert ledger.admit("key", reservations=["call_1"]).ok
+        assert ledger.admit("key", reservations=["call_1"]).ok
+        assert not ledger.admit("key", reservations=["call_2"]).ok
+
+    def test_stale_reservations_stop_counting(self, tmp_path, now):
+        ledger = ledger_for(tmp_path, now, budgets={"daily": {"soft": None, "hard": 0.2}},
+                            reservation_ttl_seconds=3600)
+        ledger.admit("key", reservations=["lost"])
+        now[0] += 3601
+
+        assert ledger.admit("key", reservations=["call_1"]).ok
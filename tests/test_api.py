@@ -0,0 +1,703 @@
+"""Tests for api.py — retailer cache, readiness, call event streams, webhooks and batch calls"""
+
+import json
+import asyncio
+import time
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+from fastapi.testclient import TestClient
+
+import api
+from api import RetailerCache, build_retailer_snapshot
+from job_store import MemoryJobStore
+from call_cache import CallResultCache
+from call_scheduler import CallScheduler
+from config import ACCOUNTING_CONFIG, CALL_SCHEDULE_CONFIG, RETRY_CONFIG
+from call_retry import RetryPolicy
+from accounting import CallLedger
+from blob_store import BlobStore
+from summary_cache import SummaryCache
+from phone_caller import CallResult, InventoryStatus, BlandAICaller
+from call_poller import CallStatusPoller
+from tests.test_call_poller import FAST_CONFIG
+from tests.test_tiered_sweep import FakeWebsites
+from website_scraper import WebsiteStockStatus
+from history import StockHistory
+from bland_webhooks import build_completion_payload, callback_url, sign_body
+from scraper import Retailer
+from filter import ZipCodeGeocoder, ZipCodeLocation
+from datetime import datetime, timezone
+
+
+# Wednesday 12:00 in New York / 16:00 UTC: every US store is open
+OPEN_HOURS = datetime(2026, 1, 14, 16, 0, tzinfo=timezone.utc)
+# Wednesday 23:00 in New York: every US store is closed
+AFTER_HOURS = datetime(2026, 1, 15, 4, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def scheduler_at():
+    """Patch api.call_scheduler with one whose clock is fixed at the given time"""
+    schedulers = []
+
+    def install(now):
+        scheduler = CallScheduler(clock=lambda: now)
+        schedulers.append(scheduler)
+        return patch.object(api, "call_scheduler", scheduler)
+
+    yield install
+    for scheduler in schedulers:
+        scheduler.stop()
+
+
+def make_retailer(name="Test Store", phone="+12125551234", lat=40.75, lon=-73.99):
+    return Retailer(
+        name=name, address="123 Main St", city="New York", state="NY", zip_code="10001",
+        country="United States", phone=phone, website=None, latitude=lat, longitude=lon,
+        detail_url="", retailer_type="Official Retailer",
+    )
+
+
+class TestRetailerCache:
+    def test_publish_assigns_increasing_generations(self):
+        cache = RetailerCache()
+        first = cache.set_retailers([make_retailer("A")])
+        second = cache.set_retailers([make_retailer("B")])
+
+        assert (first.generation, second.generation) == (1, 2)
+        assert cache.snapshot() is second
+        assert [r.name for r in cache.get_retailers()] == ["B"]
+
+    def test_old_snapshot_unaffected_by_swap(self):
+        """In-flight readers keep their generation after a reload"""
+        cache = RetailerCache()
+        held = cache.set_retailers([make_retailer("A")])
+        cache.set_retailers([make_retailer("B"), make_retailer("C", phone="+13105550000")])
+
+        assert [r.name for r in held.retailers] == ["A"]
+        assert held.spatial_index.size == 1
+
+    def test_stale_derived_generation_is_discarded(self):
+        cache = RetailerCache()
+        base = cache.set_retailers([make_retailer("A")])
+        cache.set_retailers([make_retailer("Reloaded")])
+
+        derived = build_retailer_snapshot([make_retailer("Geocoded")])
+        assert cache.publish(derived, expected_generation=base.generation) is None
+        assert [r.name for r in cache.get_retailers()] == ["Reloaded"]
+
+    def test_snapshot_phone_lookup_is_normalized(self):
+        snapshot = build_retailer_snapshot([make_retailer("A", phone="(212) 555-1234")])
+        assert snapshot.by_phone["+12125551234"].name == "A"
+        assert snapshot.with_phone_count == 1
+
+
+class TestReloadRetailers:
+    def test_failed_reload_keeps_current_generation(self):
+        cache = RetailerCache()
+        cache.set_retailers([make_retailer("A")])
+        with patch.object(api, "retailer_cache", cache), \
+             patch.object(api, "load_retailers_sync", side_effect=ValueError("bad json")):
+            assert api.reload_retailers() is None
+        assert cache.generation == 1
+
+    def test_reload_publishes_new_generation(self):
+        cache = RetailerCache()
+        cache.set_retailers([make_retailer("A")])
+        with patch.object(api, "retailer_cache", cache), \
+             patch.object(api, "load_retailers_sync", return_value=[make_retailer("B")]):
+            snapshot = api.reload_retailers()
+        assert snapshot.generation == 2
+        assert cache.snapshot() is snapshot
+
+    def test_missing_coordinates_are_geocoded_into_the_new_generation(self):
+        cache = RetailerCache()
+        nyc = ZipCodeLocation(zip_code="10001", latitude=40.75, longitude=-73.99, city="New York", state="NY")
+        unlocated = [make_retailer("A", lat=None, lon=None), make_retailer("B", lat=None, lon=None)]
+        with patch.object(api, "retailer_cache", cache), \
+             patch.object(api, "zip_geocoder", ZipCodeGeocoder()), \
+             patch.object(api, "load_retailers_sync", return_value=unlocated), \
+             patch.object(ZipCodeGeocoder, "geocode", return_value=nyc) as geocode:
+            snapshot = api.reload_retailers()
+
+        assert geocode.call_count == 1  # One lookup per distinct zip code
+        assert snapshot.spatial_index.size == 2
+        assert [r.name for r, _ in snapshot.spatial_index.query(40.75, -73.99, 5)] == ["A", "B"]
+        assert unlocated[0].latitude is None
+
+
+class TestRetailerReadiness:
+    def test_waiters_wake_when_another_thread_publishes(self):
+        cache = RetailerCache()
+
+        async def scenario():
+            waiter = asyncio.ensure_future(cache.wait_until_loaded(timeout=5))
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            threading.Timer(0.05, cache.set_retailers, args=([make_retailer("A")],)).start()
+            return await waiter
+
+        snapshot = asyncio.run(scenario())
+        assert [r.name for r in snapshot.retailers] == ["A"]
+
+    def test_wait_times_out_without_cancelling_readiness(self):
+        cache = RetailerCache()
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(cache.wait_until_loaded(timeout=0.01))
+
+        cache.set_retailers([make_retailer("A")])
+        assert asyncio.run(cache.wait_until_loaded(timeout=0.01)).generation == 1
+
+    def test_load_failure_wakes_waiters_with_error(self):
+        cache = RetailerCache()
+
+        async def scenario():
+            waiter = asyncio.ensure_future(cache.wait_until_loaded(timeout=5))
+            await asyncio.sleep(0.01)
+            cache.fail_loading(ValueError("bad json"))
+            return await waiter
+
+        with pytest.raises(ValueError):
+            asyncio.run(scenario())
+
+    def test_search_returns_fast_503_with_retry_after(self):
+        cache = RetailerCache()
+        cache.start_loading()  # another request is mid-load
+        client = TestClient(api.app)
+        with patch.object(api, "retailer_cache", cache), \
+             patch.dict(api.RETAILER_CONFIG, {"ready_timeout_seconds": 0.05, "retry_after_seconds": 7}):
+            response = client.get("/api/search?zip_code=10001&radius=10")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+
+
+class TestCallEventStream:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = MemoryJobStore()
+        with patch.object(api, "job_store", store), \
+             patch.object(api, "call_cache", CallResultCache(str(tmp_path / "call_cache.db"))):
+            yield store
+
+    def read_events(self, response):
+        events = []
+        for block in response.text.split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+            if "event" in lines:
+                events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def test_completed_call_streams_status_then_end(self, store):
+        store.create("call_1", {
+            "status": "completed", "retailer_name": "A", "phone": "+12125551234",
+            "started_at": "2026-01-01T10:00:00",
+            "result": {"inventory_status": "in_stock", "summary": "Two in stock"},
+        })
+        with TestClient(api.app).stream("GET", "/api/call/call_1/events") as response:
+            response.read()
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self.read_events(response)
+        assert [name for name, _ in events] == ["status", "end"]
+        assert events[0][1]["inventory_status"] == "in_stock"
+        assert events[0][1]["summary"] == "Two in stock"
+
+    def test_stream_follows_updates_until_terminal(self, store):
+        store.create("call_1", {"status": "in_progress", "retailer_name": "A", "phone": "+1"})
+        threading.Timer(0.1, store.update, args=("call_1",), kwargs={
+            "status": "completed", "result": {"inventory_status": "waitlist", "summary": "Waitlist"},
+        }).start()
+
+        with TestClient(api.app).stream("GET", "/api/call/call_1/events") as response:
+            response.read()
+
+        statuses = [data["status"] for name, data in self.read_events(response) if name == "status"]
+        assert statuses == ["in_progress", "completed"]
+
+    def test_unknown_call_is_404(self, store):
+        response = TestClient(api.app).get("/api/call/missing/events")
+        assert response.status_code == 404
+
+
+class TestBlandWebhook:
+    SECRET = "test-secret"
+
+    @pytest.fixture
+    def store(self, tmp_path, scheduler_at):
+        store = MemoryJobStore()
+        self.placed = []
+
+        def place_call(url, **kwargs):
+            self.placed.append(kwargs["json"])
+            return MagicMock(status_code=200, text='{"call_id": "bland-1"}', json=lambda: {"call_id": "bland-1"})
+
+        bland = MagicMock(post=place_call)
+        env = {
+            "BLAND_API_KEY": "test-key-not-real",
+            "PUBLIC_BASE_URL": "http://testserver",
+            "BLAND_WEBHOOK_SECRET": self.SECRET,
+        }
+        with patch.object(api, "job_store", store), \
+             patch.object(api, "call_cache", CallResultCache(str(tmp_path / "call_cache.db"))), \
+             patch.object(api, "stock_history", StockHistory(str(tmp_path / "history.db"))), \
+             patch.object(api, "call_ledger", CallLedger(str(tmp_path / "ledger.db"))), \
+             patch.object(api, "call_blobs", BlobStore(str(tmp_path / "blobs.db"))), \
+             patch.object(api, "summarize_transcript", side_effect=RuntimeError("no Claude in tests")), \
+             scheduler_at(OPEN_HOURS), \
+             patch.dict("os.environ", env), \
+             patch("phone_caller.shared_session", return_value=bland):
+            yield store
+
+    def start_call(self, client):
+        """Request a call and wait for the scheduler to place it"""
+        response = client.post("/api/call", json={"retailer_name": "Store A", "phone": "2125551234"})
+        job_id = response.json()["call_id"]
+        deadline = time.monotonic() + 3
+        while not api.job_store.get(job_id).get("bland_call_id") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return job_id
+
+    def deliver(self, client, job_id, payload, signature=None):
+        url = urlparse(callback_url(job_id))
+        body = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json"}
+        headers["X-Webhook-Signature"] = signature or sign_body(self.SECRET, body)
+        return client.post(f"{url.path}?{url.query}", content=body, headers=headers)
+
+    def test_call_is_placed_without_waiting(self, store):
+        client = TestClient(api.app)
+        job_id = self.start_call(client)
+
+        job = store.get(job_id)
+        assert job["status"] == "in_progress"
+        assert job["bland_call_id"] == "bland-1"
+        assert job["completion"] == "webhook"
+
+    def test_single_calls_share_the_global_call_budget(self, store):
+        gate = threading.Event()
+        with patch.dict(api.call_scheduler.config, {"max_concurrent_calls": 1}):
+            api.call_scheduler.submit("other call", gate.wait)
+            time.sleep(0.05)
+            body = TestClient(api.app).post("/api/call", json={"retailer_name": "Store A", "phone": "2125551234"}).json()
+            time.sleep(0.1)
+            assert store.get(body["call_id"])["status"] == "queued"
+            assert self.placed == []
+
+            gate.set()
+            deadline = time.monotonic() + 3
+            while not self.placed and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert len(self.placed) == 1
+
+    def test_webhook_completes_job_once(self, store):
+        client = TestClient(api.app)
+        job_id = self.start_call(client)
+        payload = build_completion_payload("bland-1", transcript="Sorry, we don't have it. We can add you to our waitlist.")
+
+        assert self.deliver(client, job_id, payload).json() == {"status": "accepted"}
+        job = store.get(job_id)
+        assert job["status"] == "completed"
+        assert job["result"]["inventory_status"] == "waitlist"
+
+        assert self.deliver(client, job_id, payload).json() == {"status": "duplicate"}
+
+    def test_completed_call_is_charged_once(self, store):
+        client = TestClient(api.app)
+        job_id = self.start_call(client)
+        payload = build_completion_payload("bland-1", transcript="Yes we have it in stock.", call_length=2.0)
+        self.deliver(client, job_id, payload)
+        self.deliver(client, job_id, payload)
+
+        assert api.call_ledger.job_spend(job_id)["minutes"] == 2.0
+        accounting = client.get("/api/metrics").json()["accounting"]
+        assert accounting["spend"]["daily"]["calls"] == 1
+        assert accounting["reserved"]["calls"] == 0  # Settled by the charge
+
+    def test_call_past_the_hard_budget_is_refused(self, store):
+        config = {**ACCOUNTING_CONFIG, "budgets": {"daily": {"soft": None, "hard": 0.0}}}
+        with patch.object(api.call_ledger, "config", config):
+            response = TestClient(api.app).post("/api/call", json={"retailer_name": "Store A", "phone": "2125551234"})
+
+        assert response.status_code == 402
+        assert self.placed == []
+        assert {record["status"] for _, record in store._jobs.values()} == {"failed"}
+
+    def test_rejects_bad_signature_and_mismatched_call(self, store):
+        client = TestClient(api.app)
+        job_id = self.start_call(client)
+
+        payload = build_completion_payload("bland-1")
+        assert self.deliver(client, job_id, payload, signature="0" * 64).status_code == 401
+        assert self.deliver(client, job_id, build_completion_payload("bland-other")).status_code == 409
+        assert store.get(job_id)["status"] == "in_progress"
+
+    def test_same_store_and_watch_share_one_call(self, store):
+        client = TestClient(api.app)
+        leader = self.start_call(client)
+        joined = client.post("/api/call", json={"retailer_name": "Store A", "phone": "(212) 555-1234"}).json()
+
+        assert joined["status"] == "joined"
+        assert joined["joined_call_id"] == leader
+        assert len(self.placed) == 1
+
+        payload = build_completion_payload("bland-1", transcript="Yes we have it in stock.")
+        self.deliver(client, leader, payload)
+        assert store.get(joined["call_id"])["status"] == "completed"
+        assert store.get(joined["call_id"])["result"]["inventory_status"] == "in_stock"
+
+    def test_fresh_outcome_is_returned_from_cache(self, store):
+        client = TestClient(api.app)
+        leader = self.start_call(client)
+        self.deliver(client, leader, build_completion_payload("bland-1", transcript="Yes we have it in stock."))
+
+        cached = client.post("/api/call", json={"retailer_name": "Store A", "phone": "212-555-1234"}).json()
+
+        assert cached["status"] == "completed"
+        assert cached["cached"] is True
+        assert cached["inventory_status"] == "in_stock"
+        assert "transcript" not in json.dumps(cached)
+        assert len(self.placed) == 1
+        assert client.get(f"/api/call/{cached['call_id']}").json()["cached"] is True
+
+    def test_transcript_is_kept_out_of_the_job_and_loaded_on_demand(self, store):
+        client = TestClient(api.app)
+        job_id = self.start_call(client)
+        assert client.get(f"/api/call/{job_id}/transcript").status_code == 409
+
+        self.deliver(client, job_id, build_completion_payload("bland-1", transcript="Yes we have it in stock."))
+
+        result = store.get(job_id)["result"]
+        assert "transcript" not in result
+        assert result["blob_key"] == "bland-1"
+        loaded = client.get(f"/api/call/{job_id}/transcript").json()
+        assert loaded["transcript"] == "Yes we have it in stock."
+        assert loaded["raw_response"]["call_id"] == "bland-1"
+
+    def lose_webhook(self, fetched):
+        """Shorten the webhook deadline and answer the fallback poll with ``fetched``"""
+        poller = CallStatusPoller(dict(FAST_CONFIG))
+        return poller, patch.dict(api.WEBHOOK_CONFIG, {"completion_deadline_seconds": 0.05,
+                                                      "fallback_max_wait_seconds": 0.3}), \
+            patch.object(api, "get_call_poller", return_value=poller), \
+            patch.object(BlandAICaller, "fetch_call_status", return_value=fetched)
+
+    def wait_for_status(self, store, job_id, statuses, timeout=3):
+        deadline = time.monotonic() + timeout
+        while store.get(job_id)["status"] not in statuses and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return store.get(job_id)
+
+    def test_lost_webhook_falls_back_to_polling(self, store):
+        payload = build_completion_payload("bland-1", transcript="Yes we have it in stock.")
+        poller, deadline, use_poller, fetch = self.lose_webhook(payload)
+        with deadline, use_poller, fetch:
+            job_id = self.start_call(TestClient(api.app))
+            job = self.wait_for_status(store, job_id, {"completed", "failed"})
+        poller.stop()
+
+        assert job["status"] == "completed"
+        assert job["result"]["inventory_status"] == "in_stock"
+
+    def test_unresolved_call_fails_after_the_fallback(self, store):
+        poller, deadline, use_poller, fetch = self.lose_webhook({"call_id": "bland-1", "status": "in-progress"})
+        with deadline, use_poller, fetch:
+            client = TestClient(api.app)
+            job_id = self.start_call(client)
+            joined = client.post("/api/call", json={"retailer_name": "Store A", "phone": "212-555-1234"}).json()
+            job = self.wait_for_status(store, job_id, {"completed", "failed"})
+        poller.stop()
+
+        assert job["status"] == "failed"
+        assert store.get(joined["call_id"])["status"] == "failed"
+        assert self.start_call(client) not in (job_id, joined["call_id"])
+        assert len(self.placed) == 2  # The cache key was freed for a new call
+
+    def test_unanswered_call_is_queued_for_retry_with_followers_attached(self, store):
+        client = TestClient(api.app)
+        leader = self.start_call(client)
+        joined = client.post("/api/call", json={"retailer_name": "Store A", "phone": "212-555-1234"}).json()
+
+        self.deliver(client, leader, build_completion_payload("bland-1", status="no-answer"))
+
+        status = client.get(f"/api/call/{leader}").json()
+        assert status["status"] == "queued"
+        assert status["retry_at"]
+        assert [(a["attempt"], a["status"], a["call_id"]) for a in status["attempts"]] == [(1, "no_answer", "bland-1")]
+        assert store.get(joined["call_id"])["status"] == "in_progress"
+
+    def test_retry_keeps_the_callers_api_key(self, store):
+        job_id = self.start_call(TestClient(api.app))
+        with patch.object(api, "schedule_call") as schedule:
+            assert api.requeue_for_retry(job_id, "no_answer", "", "bland-1", {}, "caller-key")
+
+        assert schedule.call_args.args[2] == "caller-key"
+
+    def test_last_attempt_completes_job_and_followers(self, store):
+        client = TestClient(api.app)
+        leader = self.start_call(client)
+        joined = client.post("/api/call", json={"retailer_name": "Store A", "phone": "212-555-1234"}).json()
+        with patch.object(api, "retry_policy", RetryPolicy({**RETRY_CONFIG, "max_attempts": 1})):
+            self.deliver(client, leader, build_completion_payload("bland-1", status="no-answer"))
+
+        job = store.get(leader)
+        assert job["status"] == "completed"
+        assert job["result"]["inventory_status"] == "no_answer"
+        assert [a["attempt"] for a in job["attempts"]] == [1]
+        assert store.get(joined["call_id"])["result"]["inventory_status"] == "no_answer"
+
+
+class TestBatchCalls:
+    NYC = ZipCodeLocation(zip_code="10001", latitude=40.75, longitude=-73.99, city="New York", state="NY")
+
+    @pytest.fixture
+    def store(self, tmp_path, scheduler_at):
+        store = MemoryJobStore()
+        cache = RetailerCache()
+        cache.set_retailers([
+            make_retailer("Near", phone="+12125550001", lat=40.75, lon=-73.99),
+            make_retailer("Near duplicate", phone="(212) 555-0001", lat=40.76, lon=-73.99),
+            make_retailer("Middle", phone="+12125550002", lat=40.85, lon=-73.99),
+            make_retailer("No phone", phone=None, lat=40.75, lon=-73.98),
+            make_retailer("Far", phone="+12125550003", lat=41.20, lon=-73.99),
+        ])
+        with patch.object(api, "job_store", store), \
+             patch.object(api, "call_cache", CallResultCache(str(tmp_path / "call_cache.db"))), \
+             patch.object(api, "retailer_cache", cache), \
+             patch.object(api, "call_ledger", CallLedger(str(tmp_path / "ledger.db"))), \
+             patch.object(api, "stock_history", StockHistory(str(tmp_path / "history.db"))), \
+             scheduler_at(OPEN_HOURS), \
+             patch("filter.ZipCodeGeocoder.geocode", return_value=self.NYC), \
+             patch.dict("os.environ", {"BLAND_API_KEY": "test-key-not-real"}):
+            yield store
+
+    @staticmethod
+    def fake_call(job_id, retailer_name, phone, api_key, watch_config=None):
+        api.job_store.update(job_id, status="completed", result={
+            "inventory_status": "in_stock" if retailer_name == "Near" else "out_of_stock", "summary": "",
+        })
+
+    def test_picks_nearest_unique_phones(self, store):
+        snapshot = api.retailer_cache.snapshot()
+        picked = api.nearest_callable_retailers(snapshot, "10001", 100, 5, exclude_phones=["212-555-0002"])
+        assert [r.name for r, _ in picked] == ["Near", "Far"]
+        assert len(api.nearest_callable_retailers(snapshot, "10001", 100, 1)) == 1
+
+    def test_batch_runs_on_server_and_aggregates_progress(self, store):
+        client = TestClient(api.app)
+        with patch.object(api, "run_single_call_background", side_effect=self.fake_call), \
+             patch.object(api, "start_batch", side_effect=api.run_batch):
+            response = client.post("/api/call/batch", json={"zip_code": "10001", "radius_miles": 100, "max_calls": 2})
+
+        assert response.status_code == 202
+        body = response.json()
+        assert [call["retailer_name"] for call in body["calls"]] == ["Near", "Middle"]
+
+        status = client.get(f"/api/call/batch/{body['batch_id']}").json()
+        assert status["status"] == "completed"
+        assert status["progress"]["completed"] == 2
+        assert status["progress"]["inventory"] == {"in_stock": 1, "out_of_stock": 1}
+        assert {call["status"] for call in status["calls"]} == {"completed"}
+
+    def test_first_hit_batch_cancels_the_calls_still_queued(self, store):
+        placed = []
+
+        def call(job_id, retailer_name, *args, **kwargs):
+            placed.append(retailer_name)
+            self.fake_call(job_id, retailer_name, *args, **kwargs)
+
+        client = TestClient(api.app)
+        with patch.object(api, "run_single_call_background", side_effect=call), \
+             patch.dict(api.BATCH_CONFIG, {"max_concurrency": 1}), \
+             patch.object(api, "start_batch", side_effect=api.run_batch):
+            body = client.post("/api/call/batch", json={
+                "zip_code": "10001", "radius_miles": 100, "max_calls": 3, "strategy": "first_hit"
+            }).json()
+
+        assert placed == ["Near"]
+        assert body["strategy"]["mode"] == "first_hit"
+        status = client.get(f"/api/call/batch/{body['batch_id']}").json()
+        assert status["status"] == "completed"
+        assert status["progress"]["cancelled"] == 2
+        assert [call["status"] for call in status["calls"]] == ["completed", "cancelled", "cancelled"]
+
+    def test_unknown_strategy_is_rejected(self, store):
+        response = TestClient(api.app).post("/api/call/batch", json={"zip_code": "10001", "strategy": "most"})
+        assert response.status_code == 400
+
+    def test_batch_calls_the_stores_that_usually_have_stock(self, store):
+        for _ in range(3):
+            api.stock_history.record("Far", "M79930-0007", "phone", "in_stock", retailer_phone="+12125550003")
+            api.stock_history.record("Near", "M79930-0007", "phone", "out_of_stock", retailer_phone="+12125550001")
+
+        with patch.object(api, "start_batch"):
+            body = TestClient(api.app).post("/api/call/batch", json={
+                "zip_code": "10001", "radius_miles": 100, "max_calls": 2, "watch_reference": "M79930-0007"
+            }).json()
+
+        assert [call["retailer_name"] for call in body["calls"]] == ["Far", "Middle"]
+        assert body["calls"][0]["hit_rate"] > body["calls"][1]["hit_rate"]
+
+    def test_website_first_batch_only_calls_stores_without_a_website_answer(self, store):
+        websites = FakeWebsites({"Middle": WebsiteStockStatus.OUT_OF_STOCK, "Far": WebsiteStockStatus.UNKNOWN})
+        client = TestClient(api.app)
+        with patch.object(api, "website_stock_checker", websites), \
+             patch.object(api, "run_single_call_background", side_effect=self.fake_call), \
+             patch.object(api, "start_batch", side_effect=api.run_batch):
+            body = client.post("/api/call/batch", json={
+                "zip_code": "10001", "radius_miles": 100, "max_calls": 2, "website_first": True
+            }).json()
+
+        assert [entry["retailer_name"] for entry in body["website"]] == ["Middle"]
+        assert [call["retailer_name"] for call in body["calls"]] == ["Near", "Far"]
+        status = client.get(f"/api/call/batch/{body['batch_id']}").json()
+        assert {(r["retailer_name"], r["source"], r["status"]) for r in status["retailers"]} == {
+            ("Middle", "website", "out_of_stock"), ("Near", "phone", "in_stock"), ("Far", "phone", "out_of_stock")
+        }
+
+    def test_website_hit_ends_a_first_hit_batch_without_calls(self, store):
+        websites = FakeWebsites({"Far": WebsiteStockStatus.IN_STOCK})
+        with patch.object(api, "website_stock_checker", websites), \
+             patch.object(api, "start_batch") as start:
+            body = TestClient(api.app).post("/api/call/batch", json={
+                "zip_code": "10001", "radius_miles": 100, "max_calls": 2, "website_first": True, "strategy": "first_hit"
+            }).json()
+
+        start.assert_not_called()
+        assert body["status"] == "completed"
+        assert body["calls"] == []
+        assert body["website"][0]["status"] == "in_stock"
+
+    def test_concurrency_is_bounded(self, store):
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def slow_call(job_id, *args):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            store.update(job_id, status="completed", result={"inventory_status": "unknown", "summary": ""})
+
+        call_ids = []
+        for i in range(6):
+            store.create(f"call_{i}", {"status": "queued", "retailer_name": f"R{i}", "phone": f"+1212555000{i}"})
+            call_ids.append(f"call_{i}")
+        store.create("batch_1", {"type": "batch", "status": "running", "call_ids": call_ids})
+
+        with patch.object(api, "run_single_call_background", side_effect=slow_call), \
+             patch.dict(api.BATCH_CONFIG, {"max_concurrency": 2}):
+            api.run_batch("batch_1", "key", {})
+
+        assert peak[0] == 2
+        assert store.get("batch_1")["status"] == "completed"
+
+    def test_unanswered_batch_call_is_retried_through_the_scheduler(self, store):
+        outcomes = {"Near": [InventoryStatus.NO_ANSWER, InventoryStatus.IN_STOCK], "Middle": [InventoryStatus.OUT_OF_STOCK]}
+        placed = []
+
+        def call_and_finish(job_id, retailer_name, phone, api_key, watch_config=None):
+            placed.append(retailer_name)
+            status = outcomes[retailer_name].pop(0)
+            result = CallResult(retailer_name, phone, f"bland-{len(placed)}", status, "", "", 30, "", None)
+            api.finish_call_job(job_id, result, BlandAICaller("test-key-not-real"), api.WATCH_CONFIG)
+
+        client = TestClient(api.app)
+        with patch.object(api, "run_single_call_background", side_effect=call_and_finish), \
+             patch.object(api, "summarize_transcript", side_effect=RuntimeError("no Claude in tests")), \
+             patch.object(api, "retry_policy", RetryPolicy({**RETRY_CONFIG, "base_delay_seconds": 0, "jitter": 0})), \
+             patch.object(api, "start_batch", side_effect=api.run_batch):
+            body = client.post("/api/call/batch", json={"zip_code": "10001", "radius_miles": 100, "max_calls": 2}).json()
+
+        assert placed == ["Near", "Middle", "Near"]
+        status = client.get(f"/api/call/batch/{body['batch_id']}").json()
+        assert status["status"] == "completed"
+        assert status["progress"]["inventory"] == {"in_stock": 1, "out_of_stock": 1}
+        near = next(call for call in status["calls"] if call["retailer_name"] == "Near")
+        assert [a["status"] for a in near["attempts"]] == ["no_answer", "in_stock"]
+
+    def test_resume_restarts_running_batches(self, store):
+        store.create("call_1", {"status": "queued", "retailer_name": "R", "phone": "+1"})
+        store.create("batch_own", {"type": "batch", "status": "running", "call_ids": ["call_1"],
+                                   "watch_reference": "M79930-0007", "uses_server_key": True})
+        store.create("call_2", {"status": "queued", "retailer_name": "R", "phone": "+1"})
+        store.create("batch_client_key", {"type": "batch", "status": "running", "call_ids": ["call_2"],
+                                          "watch_reference": "M79930-0007", "uses_server_key": False})
+
+        with patch.object(api, "start_batch") as start:
+            api.resume_batches()
+
+        assert [c.args[0] for c in start.call_args_list] == ["batch_own"]
+        assert store.get("call_2")["status"] == "failed"
+        assert store.get("batch_client_key")["status"] == "completed"
+
+    def test_unknown_batch_is_404(self, store):
+        assert TestClient(api.app).get("/api/call/batch/missing").status_code == 404
+
+
+class TestScheduledCalls:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = MemoryJobStore()
+        cache = RetailerCache()
+        cache.set_retailers([make_retailer("Store A", phone="+12125551234")])
+        self.now = AFTER_HOURS
+        self.scheduler = CallScheduler(
+            config={**CALL_SCHEDULE_CONFIG, "max_sleep_seconds": 0.02}, clock=lambda: self.now
+        )
+        with patch.object(api, "job_store", store), \
+             patch.object(api, "call_cache", CallResultCache(str(tmp_path / "call_cache.db"))), \
+             patch.object(api, "retailer_cache", cache), \
+             patch.object(api, "call_scheduler", self.scheduler), \
+             patch.dict("os.environ", {"BLAND_API_KEY": "test-key-not-real"}):
+            yield store
+        self.scheduler.stop()
+
+    def test_after_hours_call_is_queued_until_the_store_opens(self, store):
+        placed = threading.Event()
+
+        def fake_call(job_id, *args):
+            store.update(job_id, status="completed", result={"inventory_status": "in_stock", "summary": ""})
+            placed.set()
+
+        client = TestClient(api.app)
+        with patch.object(api, "run_single_call_background", side_effect=fake_call):
+            body = client.post("/api/call", json={"retailer_name": "Store A", "phone": "2125551234"}).json()
+
+            assert body["status"] == "queued"
+            assert body["scheduled_for"] == "2026-01-15T10:30:00-05:00"
+            status = client.get(f"/api/call/{body['call_id']}").json()
+            assert status["status"] == "queued"
+            assert status["scheduled_for"] == body["scheduled_for"]
+            assert not placed.wait(0.1)
+
+            self.now = OPEN_HOURS.replace(day=15)
+            assert placed.wait(2)
+
+    def test_resume_requeues_scheduled_single_calls(self, store):
+        store.create("call_1", {"status": "queued", "retailer_name": "Store A", "phone": "+12125551234",
+                                "scheduled_for": "2026-01-15T10:30:00-05:00"})
+        store.create("call_2", {"status": "queued", "retailer_name": "Store A", "phone": "+12125551234",
+                                "batch_id": "batch_1", "scheduled_for": "2026-01-15T10:30:00-05:00"})
+
+        with patch.object(api, "schedule_call") as schedule:
+            api.resume_scheduled_calls()
+
+        assert [c.args[0] for c in schedule.call_args_list] == ["call_1"]
+
+    def test_metrics_report_the_call_queue(self, store):
+        scheduler = TestClient(api.app).get("/api/metrics").json()["scheduler"]
+        assert scheduler["queued"] == 0
+        assert scheduler["max_concurrent_calls"] == self.scheduler.config["max_concurrent_calls"]
+
+    def test_metrics_report_the_summary_cache_hit_rate(self, tmp_path):
+        cache = SummaryCache(str(tmp_path / "summaries.db"))
+        cache.put("key", "In stock.")
+        cache.get("key")
+        cache.get("other")
+        with patch.object(api, "get_summary_cache", return_value=cache):
+            summaries = TestClient(api.app).get("/api/metrics").json()["summary_cache"]
+        assert (summaries["hits"], summaries["misses"], summaries["hit_rate"]) == (1, 1, 0.5)
@@ -0,0 +1,66 @@
+"""Tests for bland_simulator.py — the local Bland AI stand-in used by the load test"""
+
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from bland_simulator import BlandSimulator, create_app
+from config import BLAND_SIMULATOR_CONFIG
+from phone_caller import AsyncBlandAICaller, InventoryStatus, bland_base_url
+
+
+def simulator(now, **overrides):
+    config = {**BLAND_SIMULATOR_CONFIG, "latency_ms": 0, "latency_jitter_ms": 0, **overrides}
+    return BlandSimulator(config, clock=lambda: now[0], seed=1)
+
+
+class TestBlandSimulator:
+    def test_call_goes_through_queued_in_progress_completed(self):
+        now = [0.0]
+        sim = simulator(now, outcomes={"in_stock": 1.0}, ring_seconds=10, duration_median_seconds=60, duration_sigma=0)
+        client = TestClient(create_app(sim))
+
+        call_id = client.post("/v1/calls", json={"phone_number": "+12125551234"}).json()["call_id"]
+        assert client.get(f"/v1/calls/{call_id}").json()["status"] == "queued"
+        now[0] = 30
+        assert client.get(f"/v1/calls/{call_id}").json()["status"] == "in-progress"
+        now[0] = 71
+        done = client.get(f"/v1/calls/{call_id}").json()
+        assert done["status"] == "completed"
+        assert done["call_length"] == 1.0  # Minutes, like Bland
+        assert done["concatenated_transcript"]
+
+    def test_unanswered_outcomes_end_at_once_with_their_status(self):
+        now = [0.0]
+        sim = simulator(now, outcomes={"no-answer": 1.0}, ring_seconds=5)
+        call = sim.place({"phone_number": "+1"})
+        now[0] = 5
+        assert sim.status(call.call_id)["status"] == "no-answer"
+
+    def test_time_scale_shortens_calls(self):
+        now = [0.0]
+        sim = simulator(now, ring_seconds=10, duration_median_seconds=60, duration_sigma=0, time_scale=0.01,
+                        outcomes={"waitlist": 1.0})
+        call = sim.place({})
+        assert call.ends_at == pytest.approx(0.7)
+        now[0] = 1
+        assert sim.status(call.call_id)["call_length"] == pytest.approx(1.0)
+
+    def test_start_errors_and_unknown_calls(self):
+        client = TestClient(create_app(simulator([0.0], start_error_rate=1.0)))
+        assert client.post("/v1/calls", json={}).status_code == 500
+        assert client.get("/v1/calls/missing").status_code == 404
+
+    def test_real_caller_completes_against_the_simulator(self):
+        now = [0.0]
+        sim = simulator(now, outcomes={"waitlist": 1.0}, ring_seconds=0, duration_median_seconds=0)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(sim)))
+        with patch.dict("os.environ", {"BLAND_BASE_URL": "http://simulator/v1/"}):
+            assert bland_base_url() == "http://simulator/v1"
+            caller = AsyncBlandAICaller(api_key="test-key-not-real", client=client, poll_interval=0.001)
+            result = asyncio.run(caller.make_call("212-555-1234", "Store A"))
+
+        assert result.status == InventoryStatus.WAITLIST
+        assert sim.stats["calls_placed"] == 1
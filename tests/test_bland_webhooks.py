@@ -0,0 +1,55 @@
+"""Tests for bland_webhooks.py — callback URL signing and delivery verification"""
+
+import json
+from urllib.parse import urlparse, parse_qs
+from unittest.mock import patch
+
+from bland_webhooks import (
+    callback_url, callback_token, sign_body, verify_delivery, build_completion_payload, webhooks_enabled
+)
+
+
+SECRET = "test-secret"
+
+
+class TestCallbackUrl:
+    def test_url_carries_job_and_token(self):
+        url = callback_url("call_1", base_url="https://finder.example.com/", secret=SECRET)
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+
+        assert parsed.path == "/api/webhooks/bland"
+        assert query["job_id"] == ["call_1"]
+        assert query["token"] == [callback_token(SECRET, "call_1")]
+
+    def test_no_url_without_public_base_or_secret(self):
+        assert callback_url("call_1", base_url="", secret=SECRET) is None
+        assert callback_url("call_1", base_url="https://finder.example.com", secret="") is None
+
+    def test_enabled_from_environment(self):
+        with patch.dict("os.environ", {"PUBLIC_BASE_URL": "https://x", "BLAND_WEBHOOK_SECRET": SECRET}):
+            assert webhooks_enabled()
+        with patch.dict("os.environ", {"PUBLIC_BASE_URL": "", "BLAND_WEBHOOK_SECRET": ""}):
+            assert not webhooks_enabled()
+
+
+class TestVerifyDelivery:
+    def setup_method(self):
+        self.body = json.dumps(build_completion_payload("bland-1", transcript="hi")).encode()
+        self.token = callback_token(SECRET, "call_1")
+
+    def test_valid_token_and_signature(self):
+        assert verify_delivery(SECRET, "call_1", self.token, self.body, sign_body(SECRET, self.body))
+
+    def test_signature_is_optional(self):
+        assert verify_delivery(SECRET, "call_1", self.token, self.body)
+
+    def test_token_for_another_job_is_rejected(self):
+        assert not verify_delivery(SECRET, "call_2", self.token, self.body)
+
+    def test_tampered_body_is_rejected(self):
+        signature = sign_body(SECRET, self.body)
+        assert not verify_delivery(SECRET, "call_1", self.token, self.body + b" ", signature)
+
+    def test_no_secret_rejects_everything(self):
+        assert not verify_delivery("", "call_1", self.token, self.body)
@@ -0,0 +1,36 @@
+"""Tests for blob_store.py — compressed transcript and payload storage"""
+
+import pytest
+
+from blob_store import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / "blobs.db"))
+
+
+class TestBlobStore:
+    def test_round_trips_documents(self, store):
+        document = {"transcript": "Store: Yes, we have it. " * 200, "raw_response": {"call_id": "abc", "call_length": 1.5}}
+        assert store.put("abc", document) == "abc"
+        assert store.get("abc") == document
+
+    def test_documents_are_stored_compressed(self, store):
+        store.put("abc", {"transcript": "Store: Yes, we have it. " * 200})
+        stats = store.stats()
+        assert stats["blobs"] == 1
+        assert stats["stored_bytes"] < stats["raw_bytes"] / 10
+
+    def test_missing_keys(self, store):
+        assert store.get("missing") is None
+        assert store.get(None) is None
+        assert store.delete("missing") is False
+
+    def test_get_many_and_replace(self, store):
+        store.put("a", {"n": 1})
+        store.put("b", {"n": 2})
+        store.put("a", {"n": 3})
+        assert store.get_many(["a", "b", "c", None]) == {"a": {"n": 3}, "b": {"n": 2}}
+        assert store.delete("a") is True
+        assert store.get("a") is None
@@ -0,0 +1,132 @@
+"""Tests for call_cache.py — cached call outcomes and in-flight call sharing"""
+
+import time
+import threading
+import pytest
+
+from call_cache import CallResultCache, CACHED, CLAIMED, JOINED
+
+
+PHONE = "+12125551234"
+REF = "M79930-0007"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CallResultCache(str(tmp_path / "call_cache.db"), ttl_seconds=60, in_flight_timeout_seconds=60)
+
+
+def result(status="in_stock"):
+    return {"inventory_status": status, "summary": "Two in the case"}
+
+
+class TestClaim:
+    def test_first_claim_owns_the_call(self, cache):
+        assert cache.claim(PHONE, REF, "call_1").decision == CLAIMED
+
+    def test_second_claim_joins_in_flight_call(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        claim = cache.claim(PHONE, REF, "call_2")
+        assert claim.decision == JOINED
+        assert claim.job_id == "call_1"
+
+    def test_keys_are_per_phone_and_reference(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        assert cache.claim(PHONE, "M79950-0001", "call_2").decision == CLAIMED
+        assert cache.claim("+12125559999", REF, "call_3").decision == CLAIMED
+
+    def test_fresh_result_is_served_from_cache(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        cache.complete("call_1", result())
+        claim = cache.claim(PHONE, REF, "call_2")
+        assert claim.decision == CACHED
+        assert claim.job_id == "call_1"
+        assert claim.result == result()
+
+    def test_lookup_reads_fresh_result_without_claiming(self, cache):
+        assert cache.lookup(PHONE, REF) is None
+        cache.claim(PHONE, REF, "call_1")
+        assert cache.lookup(PHONE, REF) is None  # In flight, not yet an outcome
+        cache.complete("call_1", result())
+        assert cache.lookup(PHONE, REF).result == result()
+        assert cache.claim(PHONE, REF, "call_2").decision == CACHED
+
+    def test_expired_result_is_called_again(self, tmp_path):
+        cache = CallResultCache(str(tmp_path / "c.db"), ttl_seconds=0.05)
+        cache.claim(PHONE, REF, "call_1")
+        cache.complete("call_1", result())
+        time.sleep(0.1)
+        assert cache.claim(PHONE, REF, "call_2").decision == CLAIMED
+        assert cache.evict_expired() == 0  # call_2 is in flight, not a stale result
+
+    def test_stale_in_flight_call_stops_blocking(self, tmp_path):
+        cache = CallResultCache(str(tmp_path / "c.db"), in_flight_timeout_seconds=0.05)
+        cache.claim(PHONE, REF, "call_1")
+        time.sleep(0.1)
+        assert cache.claim(PHONE, REF, "call_2").decision == CLAIMED
+
+    def test_retry_of_the_leader_keeps_its_followers(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        cache.claim(PHONE, REF, "call_2")
+        cache.hold("call_1", 30)
+        assert cache.claim(PHONE, REF, "call_1").decision == CLAIMED
+        assert cache.complete("call_1", result()).followers == ["call_2"]
+
+    def test_new_call_takes_over_a_stale_calls_followers(self, tmp_path):
+        cache = CallResultCache(str(tmp_path / "c.db"), in_flight_timeout_seconds=0.05)
+        cache.claim(PHONE, REF, "call_1")
+        cache.claim(PHONE, REF, "call_2")
+        time.sleep(0.1)
+        assert cache.claim(PHONE, REF, "call_3").decision == CLAIMED
+        assert cache.complete("call_3", result()).followers == ["call_2"]
+
+    def test_concurrent_claims_place_one_call(self, cache):
+        decisions = []
+        lock = threading.Lock()
+
+        def claim(i):
+            decision = cache.claim(PHONE, REF, f"call_{i}").decision
+            with lock:
+                decisions.append(decision)
+
+        threads = [threading.Thread(target=claim, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert decisions.count(CLAIMED) == 1
+        assert decisions.count(JOINED) == 7
+
+
+class TestSettle:
+    def test_complete_returns_followers(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        cache.claim(PHONE, REF, "call_2")
+        cache.claim(PHONE, REF, "call_3")
+        assert cache.complete("call_1", result()).followers == ["call_2", "call_3"]
+
+    def test_uncacheable_outcome_frees_the_key(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        cache.claim(PHONE, REF, "call_2")
+        assert cache.complete("call_1", result("no_answer")).followers == ["call_2"]
+        assert cache.claim(PHONE, REF, "call_3").decision == CLAIMED
+
+    def test_release_frees_the_key(self, cache):
+        cache.claim(PHONE, REF, "call_1")
+        cache.claim(PHONE, REF, "call_2")
+        assert cache.release("call_1").followers == ["call_2"]
+        assert cache.claim(PHONE, REF, "call_3").decision == CLAIMED
+
+    def test_settling_an_unknown_job_is_a_no_op(self, cache):
+        assert cache.complete("missing", result()).followers == []
+        assert cache.release("missing").followers == []
+
+    def test_new_calls_periodically_evict_expired_outcomes(self, tmp_path):
+        cache = CallResultCache(str(tmp_path / "c.db"), ttl_seconds=0.05)
+        cache.EVICT_EVERY = 3
+        cache.claim(PHONE, REF, "call_1")
+        cache.complete("call_1", result())
+        time.sleep(0.1)
+        cache.claim("+12125550001", REF, "call_2")
+        cache.claim("+12125550002", REF, "call_3")
+        assert cache.evict_expired() == 0  # The third claim already removed call_1's outcome
@@ -0,0 +1,198 @@
+"""Tests for call_poller.py — adaptive scheduling, shared futures and poll accounting"""
+
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+
+import call_poller
+from call_poller import CallStatusPoller, DurationModel, TrackedCall
+from phone_caller import BlandAICaller, InventoryStatus, call_duration_seconds
+from results_log import ResultsLog
+
+
+FAST_CONFIG = {
+    "ringing_interval_seconds": 0.05,
+    "min_interval_seconds": 0.01,
+    "max_interval_seconds": 0.05,
+    "default_duration_seconds": 0.1,
+    "max_wait_seconds": 2,
+    "fetch_workers": 2,
+    "baseline_interval_seconds": 0.01,
+}
+
+
+class ScriptedFetch:
+    """Returns each status in turn, repeating the last one"""
+
+    def __init__(self, statuses, **final):
+        self.statuses = list(statuses)
+        self.final = final  # Extra fields of the last payload (e.g. call_length)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, call_id):
+        with self.lock:
+            index = min(self.calls, len(self.statuses) - 1)
+            self.calls += 1
+        data = {"call_id": call_id, "status": self.statuses[index], "concatenated_transcript": "We have it in stock."}
+        if index == len(self.statuses) - 1:
+            data.update(self.final)
+        return data
+
+
+@pytest.fixture
+def poller():
+    poller = CallStatusPoller(FAST_CONFIG)
+    yield poller
+    poller.stop()
+
+
+def caller_answering(poller, payload):
+    """BlandAICaller whose status requests all return ``payload``"""
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.json.return_value = payload
+    return BlandAICaller(api_key="test", session=session, poller=poller)
+
+
+class TestDurationModel:
+    def test_default_until_observed(self):
+        assert DurationModel(90).expected() == 90
+
+    def test_median_of_observations(self):
+        model = DurationModel(90)
+        model.seed([30, 60, 600])
+        assert model.expected() == 60
+
+    def test_ignores_missing_and_non_positive(self):
+        model = DurationModel(90)
+        model.seed([0, -5, None])
+        assert model.expected() == 90
+
+
+class TestNextInterval:
+    @pytest.fixture
+    def slow_poller(self):
+        config = dict(FAST_CONFIG, ringing_interval_seconds=15, min_interval_seconds=2,
+                      max_interval_seconds=30, default_duration_seconds=90)
+        poller = CallStatusPoller(config)
+        yield poller
+        poller.stop()
+
+    @pytest.fixture
+    def call(self):
+        return TrackedCall(call_id="c1", fetch=None, started_at=0, deadline=300)
+
+    def test_sparse_while_ringing(self, slow_poller, call):
+        call.last_status = "ringing"
+        assert slow_poller._next_interval(call, 1) == 15
+
+    def test_halves_toward_expected_end(self, slow_poller, call):
+        call.last_status, call.answered_at = "in-progress", 0
+        assert slow_poller._next_interval(call, 10) == 30  # 80s left, capped
+        assert slow_poller._next_interval(call, 70) == 10  # 20s left
+
+    def test_counts_from_the_answer_not_the_dial(self, slow_poller, call):
+        # Rang for 60s: the 90s call is only 10s in, not 70s
+        call.last_status, call.answered_at = "in-progress", 60
+        assert slow_poller._next_interval(call, 70) == 30
+
+    def test_dense_past_expected_end(self, slow_poller, call):
+        call.last_status, call.answered_at = "in-progress", 0
+        assert slow_poller._next_interval(call, 120) == 2
+
+
+class TestCallStatusPoller:
+    def test_resolves_with_final_payload(self, poller):
+        fetch = ScriptedFetch(["queued", "in-progress", "completed"])
+        data = poller.track("c1", fetch).result(timeout=5)
+
+        assert data["status"] == "completed"
+        assert fetch.calls == 3
+        stats = poller.stats()
+        assert stats["completed"] == 1
+        assert stats["polls"] == 3
+        assert stats["in_flight"] == 0
+
+    def test_waiters_share_one_poll_loop(self, poller):
+        fetch = ScriptedFetch(["ringing", "completed"])
+        first = poller.track("c1", fetch)
+        second = poller.track("c1", fetch)
+
+        assert first is second
+        first.result(timeout=5)
+        assert poller.stats()["tracked"] == 1
+        assert fetch.calls == 2
+
+    def test_times_out_with_none(self, poller):
+        data = poller.track("c1", ScriptedFetch(["in-progress"]), max_wait=0.1).result(timeout=5)
+
+        assert data is None
+        assert poller.stats()["timed_out"] == 1
+
+    def test_fetch_errors_keep_polling(self, poller):
+        responses = iter([RuntimeError("boom"), None, {"status": "completed"}])
+
+        def fetch(call_id):
+            item = next(responses)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        assert poller.track("c1", fetch).result(timeout=5)["status"] == "completed"
+
+    def test_reports_polls_saved(self):
+        poller = CallStatusPoller(dict(FAST_CONFIG, baseline_interval_seconds=0.001))
+        try:
+            poller.track("c1", ScriptedFetch(["ringing", "completed"])).result(timeout=5)
+            stats = poller.stats()
+        finally:
+            poller.stop()
+
+        assert stats["polls"] == 2
+        assert stats["baseline_polls"] > stats["polls"]
+        assert stats["polls_saved"] == stats["baseline_polls"] - stats["polls"]
+
+    def test_learns_call_lengths_not_polling_time(self, poller):
+        poller.track("c1", ScriptedFetch(["ringing", "completed"], call_length=2.5)).result(timeout=5)
+        assert poller.stats()["expected_duration_seconds"] == 150
+
+    def test_call_without_a_length_teaches_nothing(self, poller):
+        poller.track("c1", ScriptedFetch(["completed"])).result(timeout=5)
+        assert poller.stats()["expected_duration_seconds"] == FAST_CONFIG["default_duration_seconds"]
+
+
+class TestHistoricalDurations:
+    def test_logged_durations_are_seconds(self, tmp_path):
+        # A 2.5 minute call as Bland reports it, parsed the way results are logged
+        seconds = call_duration_seconds({"call_length": 2.5})
+        assert seconds == 150
+
+        path = str(tmp_path / "results.jsonl")
+        ResultsLog(path).append({"retailer_name": "A", "status": "in_stock", "call_duration": seconds},
+                                "M79930-0007", "run1")
+        with patch.dict(call_poller.OUTPUT_CONFIG, {"results_log": path}):
+            durations = call_poller._historical_durations()
+
+        assert durations == [150]
+        model = DurationModel(90)
+        model.seed(durations)
+        assert model.expected() == 150
+
+
+class TestCallerUsesPoller:
+    def test_wait_goes_through_poller(self, poller):
+        caller = caller_answering(poller, {
+            "status": "completed",
+            "concatenated_transcript": "Yes, we have the Ranger 36 in stock.",
+        })
+        result = caller._wait_for_call_completion("c1")
+
+        assert result.status == InventoryStatus.IN_STOCK
+        assert poller.stats()["completed"] == 1
+
+    def test_poller_timeout_maps_to_failed_result(self, poller):
+        caller = caller_answering(poller, {"status": "in-progress"})
+        result = caller._wait_for_call_completion("c1", max_wait=0.1)
+
+        assert result.status == InventoryStatus.CALL_FAILED
@@ -0,0 +1,175 @@
+"""Tests for call_scheduler.py — store time zones, calling hours and the priority queue"""
+
+import time
+import threading
+import pytest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from call_scheduler import CallScheduler, next_call_time, retailer_timezone
+from config import CALL_SCHEDULE_CONFIG
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+LOS_ANGELES = ZoneInfo("America/Los_Angeles")
+# Wednesday 12:00 in New York, 09:00 in Los Angeles
+WEDNESDAY_NOON_ET = datetime(2026, 1, 14, 17, 0, tzinfo=timezone.utc)
+
+
+def scheduler(now=WEDNESDAY_NOON_ET, **overrides):
+    config = {**CALL_SCHEDULE_CONFIG, "max_sleep_seconds": 0.02, **overrides}
+    return CallScheduler(config=config, clock=lambda: now)
+
+
+class TestRetailerTimezone:
+    @pytest.mark.parametrize("state, lat, lon, zone", [
+        ("NY", 40.75, -73.99, "America/New_York"),
+        ("CA", 34.05, -118.24, "America/Los_Angeles"),
+        ("AZ", 33.45, -112.07, "America/Phoenix"),
+        ("HI", 21.31, -157.86, "Pacific/Honolulu"),
+        ("FL", 30.44, -84.28, "America/New_York"),  # Tallahassee
+        ("FL", 30.42, -87.22, "America/Chicago"),  # Pensacola
+        ("TX", 31.76, -106.49, "America/Denver"),  # El Paso
+        ("TN", 35.96, -83.92, "America/New_York"),  # Knoxville
+        ("TN", 36.16, -86.78, "America/Chicago"),  # Nashville
+        ("ID", 47.68, -116.78, "America/Los_Angeles"),  # Coeur d'Alene
+        ("ID", 43.62, -116.20, "America/Boise"),
+    ])
+    def test_state_and_coordinates(self, state, lat, lon, zone):
+        assert retailer_timezone(state, lat, lon) == ZoneInfo(zone)
+
+    def test_state_alone_uses_main_zone(self):
+        assert retailer_timezone("fl") == ZoneInfo("America/New_York")
+
+    def test_unknown_state_has_no_zone(self):
+        assert retailer_timezone("") is None
+        assert retailer_timezone("ON") is None
+
+
+class TestNextCallTime:
+    def test_open_store_can_be_called_now(self):
+        assert next_call_time(NEW_YORK, WEDNESDAY_NOON_ET) is None
+
+    def test_before_opening_waits_for_the_margin(self):
+        # 09:00 in Los Angeles; opens 10:00, calls from 10:30
+        opens = next_call_time(LOS_ANGELES, WEDNESDAY_NOON_ET)
+        assert opens == datetime(2026, 1, 14, 10, 30, tzinfo=LOS_ANGELES)
+
+    def test_after_closing_waits_for_next_day(self):
+        evening = datetime(2026, 1, 14, 17, 45, tzinfo=NEW_YORK)
+        assert next_call_time(NEW_YORK, evening) == datetime(2026, 1, 15, 10, 30, tzinfo=NEW_YORK)
+
+    def test_saturday_night_waits_for_sunday_hours(self):
+        saturday_night = datetime(2026, 1, 17, 20, 0, tzinfo=NEW_YORK)
+        assert next_call_time(NEW_YORK, saturday_night) == datetime(2026, 1, 18, 12, 30, tzinfo=NEW_YORK)
+
+    def test_closed_days_are_skipped(self):
+        hours = {**CALL_SCHEDULE_CONFIG["hours"], "sun": None}
+        config = {**CALL_SCHEDULE_CONFIG, "hours": hours}
+        saturday_night = datetime(2026, 1, 17, 20, 0, tzinfo=NEW_YORK)
+        assert next_call_time(NEW_YORK, saturday_night, config) == datetime(2026, 1, 19, 10, 30, tzinfo=NEW_YORK)
+
+    def test_unknown_zone_is_always_callable(self):
+        assert next_call_time(None, WEDNESDAY_NOON_ET) is None
+
+
+class TestCallScheduler:
+    def test_priority_orders_by_distance_band_then_type(self):
+        s = scheduler()
+        boutique_4mi = s.priority(4.0, "Tudor Boutique Edition")
+        official_1mi = s.priority(1.0, "Official Retailer")
+        official_6mi = s.priority(6.0, "Official Retailer")
+        assert sorted([official_6mi, official_1mi, boutique_4mi]) == [boutique_4mi, official_1mi, official_6mi]
+        assert s.priority(None, None) > official_6mi
+        # Within a band, a learned score outranks retailer type
+        assert s.priority(3.0, "Official Retailer", score=0.3) < boutique_4mi
+        assert s.priority(6.0, "Official Retailer", score=0.9) > boutique_4mi
+
+    def test_runs_in_priority_order(self):
+        s = scheduler(max_concurrent_calls=1)
+        order, gate = [], threading.Event()
+        s.submit("blocker", gate.wait)
+        futures = [
+            s.submit(name, lambda name=name: order.append(name), distance=distance, retailer_type=kind).future
+            for name, distance, kind in [
+                ("far", 20, "Official Retailer"),
+                ("near", 2, "Official Retailer"),
+                ("boutique", 3, "Tudor Boutique Edition"),
+            ]
+        ]
+        time.sleep(0.05)
+        gate.set()
+        for future in futures:
+            future.result(timeout=2)
+        s.stop()
+        assert order == ["boutique", "near", "far"]
+
+    def test_closed_store_waits_while_open_store_runs(self):
+        s = scheduler()
+        ran = []
+        closed = s.submit("la", lambda: ran.append("la"), tz=LOS_ANGELES, distance=1)
+        opened = s.submit("ny", lambda: ran.append("ny"), tz=NEW_YORK, distance=50)
+
+        opened.future.result(timeout=2)
+        time.sleep(0.05)
+        assert ran == ["ny"]
+        assert not closed.future.done()
+        assert s.stats() == {"queued": 1, "waiting_for_hours": 1, "waiting_to_retry": 0, "in_flight": 0,
+                             "max_concurrent_calls": s.config["max_concurrent_calls"]}
+        s.stop()
+
+    def test_queued_call_runs_once_the_store_opens(self):
+        now = [datetime(2026, 1, 14, 8, 0, tzinfo=NEW_YORK)]
+        s = CallScheduler(config={**CALL_SCHEDULE_CONFIG, "max_sleep_seconds": 0.02}, clock=lambda: now[0])
+        call = s.submit("ny", lambda: None, tz=NEW_YORK)
+        time.sleep(0.05)
+        assert not call.future.done()
+
+        now[0] = datetime(2026, 1, 14, 10, 30, tzinfo=NEW_YORK)
+        call.future.result(timeout=2)
+        s.stop()
+
+    @pytest.mark.parametrize("global_limit, group_limit, expected", [(2, None, 2), (5, 3, 3)])
+    def test_concurrency_budgets(self, global_limit, group_limit, expected):
+        s = scheduler(max_concurrent_calls=global_limit)
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def call():
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.03)
+            with lock:
+                in_flight[0] -= 1
+
+        futures = [s.submit(f"c{i}", call, group="batch", group_limit=group_limit).future for i in range(8)]
+        for future in futures:
+            future.result(timeout=5)
+        s.stop()
+        assert peak[0] == expected
+
+    def test_failing_call_resolves_its_future(self):
+        s = scheduler()
+
+        def boom():
+            raise RuntimeError("line busy")
+
+        with pytest.raises(RuntimeError):
+            s.submit("c", boom).future.result(timeout=2)
+        assert s.submit("next", lambda: None).future.result(timeout=2) is True
+        s.stop()
+
+    def test_cancelled_calls_never_run(self):
+        s = scheduler(max_concurrent_calls=1)
+        gate, ran = threading.Event(), []
+        s.submit("busy", gate.wait)
+        time.sleep(0.05)
+        queued = [s.submit(key, lambda key=key: ran.append(key), distance=i) for i, key in enumerate("ab")]
+
+        assert s.cancel(["a", "missing"]) == 1
+        gate.set()
+        assert queued[1].future.result(timeout=2) is True
+        assert queued[0].future.result(timeout=2) is False
+        assert ran == ["b"]
+        s.stop()
+
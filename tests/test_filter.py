@@ -4,7 +4,7 @@ import math
 import pytest
 from unittest.mock import patch, MagicMock
 
-from filter import DistanceCalculator, RetailerFilter, ZipCodeGeocoder, ZipCodeLocation
+from filter import DistanceCalculator, RetailerFilter, RetailerGridIndex, ZipCodeGeocoder, ZipCodeLocation
 from scraper import Retailer
 
 
@@ -122,3 +122,71 @@ class TestRetailerFilter:
 
         assert len(results) == 1
         assert results[0][0].name == "Nearby"
+
+
+# ── RetailerGridIndex ─────────────────────────────────────────────────
+
+
+class TestRetailerGridIndex:
+    def test_query_matches_linear_scan(self):
+        retailers = [
+            make_retailer("Close", lat=40.7500, lon=-73.9900),
+            make_retailer("Medium", lat=40.8000, lon=-74.0000),
+            make_retailer("Across Cell", lat=41.0500, lon=-72.9000),
+            make_retailer("Far", lat=34.0522, lon=-118.2437),
+        ]
+        index = RetailerGridIndex(retailers)
+        rf = RetailerFilter()
+
+        for radius in (5, 60, 3000):
+            expected = rf.filter_by_coordinates(retailers, 40.7484, -73.9967, radius_miles=radius)
+            assert index.query(40.7484, -73.9967, radius) == expected
+
+    def test_unlocated_retailers_kept_aside(self):
+        located = make_retailer("Located", lat=40.75, lon=-73.99)
+        unlocated = make_retailer("Unlocated", lat=None, lon=None)
+        index = RetailerGridIndex([located, unlocated])
+
+        assert index.size == 1
+        assert index.unlocated == (unlocated,)
+
+    @patch.object(ZipCodeGeocoder, "geocode")
+    def test_search_with_index_only_geocodes_the_search_zip(self, mock_geocode):
+        mock_geocode.return_value = ZipCodeLocation(
+            zip_code="10001", latitude=40.7484, longitude=-73.9967, city="New York", state="NY"
+        )
+        located = make_retailer("Located", lat=40.75, lon=-73.99)
+        unlocated = make_retailer("Unlocated", lat=None, lon=None, zip_code="10002")
+        index = RetailerGridIndex([located, unlocated])
+
+        rf = RetailerFilter()
+        for _ in range(2):
+            results = rf.filter_by_zip_code([located, unlocated], "10001", radius_miles=10, index=index)
+
+        assert [r.name for r, _ in results] == ["Located"]
+        assert [c.args[0] for c in mock_geocode.call_args_list] == ["10001", "10001"]
+
+
+# ── ZipCodeGeocoder.locate ────────────────────────────────────────────
+
+
+class TestLocate:
+    @patch.object(ZipCodeGeocoder, "geocode")
+    def test_geocodes_each_zip_once_without_mutating(self, mock_geocode):
+        nyc = ZipCodeLocation(zip_code="10001", latitude=40.7484, longitude=-73.9967, city="New York", state="NY")
+        mock_geocode.side_effect = lambda zip_code: nyc if zip_code == "10001" else None
+        retailers = [
+            make_retailer("A", zip_code="10001"),
+            make_retailer("B", zip_code="10001"),
+            make_retailer("Unknown zip", zip_code="99999"),
+            make_retailer("Located", lat=34.05, lon=-118.24, zip_code="90001"),
+        ]
+
+        located = ZipCodeGeocoder().locate(retailers, workers=2)
+
+        assert sorted(c.args[0] for c in mock_geocode.call_args_list) == ["10001", "99999"]
+        assert [(r.name, r.latitude) for r in located] == [
+            ("A", 40.7484), ("B", 40.7484), ("Unknown zip", None), ("Located", 34.05)
+        ]
+        assert retailers[0].latitude is None
+        assert located[2] is retailers[2]
@@ -0,0 +1,82 @@
+"""Tests for history.py — stock status time series and daily rollups"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from history import StockHistory
+from phone_caller import CallResult, InventoryStatus
+from website_scraper import WebsiteStockResult, WebsiteStockStatus
+
+
+@pytest.fixture
+def history(tmp_path):
+    return StockHistory(str(tmp_path / "history.db"))
+
+
+def days_ago(n):
+    return (datetime.now() - timedelta(days=n)).isoformat()
+
+
+class TestStockHistory:
+    def test_latest_returns_newest_per_retailer_and_source(self, history):
+        history.record("Store A", "M79930-0007", "phone", "out_of_stock", observed_at=days_ago(3), retailer_phone="+1")
+        history.record("Store A", "M79930-0007", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+1")
+        history.record("Store A", "M79930-0007", "website", "unknown", observed_at=days_ago(2))
+
+        latest = history.latest("M79930-0007")
+        by_source = {obs["source"]: obs["status"] for obs in latest}
+        assert by_source == {"phone": "in_stock", "website": "unknown"}
+
+    def test_latest_filters_by_reference_phone_and_age(self, history):
+        history.record("Store A", "M79930-0007", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+1")
+        history.record("Store B", "M79930-0007", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+2")
+        history.record("Store C", "M79930-0007", "phone", "in_stock", observed_at=days_ago(90), retailer_phone="+3")
+        history.record("Store A", "M79950-0001", "phone", "waitlist", observed_at=days_ago(1), retailer_phone="+1")
+
+        latest = history.latest("M79930-0007", "phone", retailer_phones=["+1", "+3"], max_age_days=30)
+        assert [obs["retailer_name"] for obs in latest] == ["Store A"]
+        assert history.latest("M79930-0007", retailer_phones=[]) == []
+
+    def test_zero_max_age_returns_nothing(self, history):
+        history.record("Store A", "M79930-0007", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+1")
+        assert history.latest("M79930-0007", max_age_days=0) == []
+        assert len(history.latest("M79930-0007")) == 1
+
+    def test_outcomes_of_several_references(self, history):
+        history.record("Store A", "M79930-0007", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+1")
+        history.record("Store A", "M79930-0001", "phone", "out_of_stock", observed_at=days_ago(2), retailer_phone="+1")
+        history.record("Store A", "M79930-0001", "website", "out_of_stock", observed_at=days_ago(2))
+        history.record("Store B", "M79950-0001", "phone", "in_stock", observed_at=days_ago(1), retailer_phone="+2")
+        history.record("Store B", "M79930-0007", "phone", "in_stock", observed_at=days_ago(400), retailer_phone="+2")
+
+        outcomes = history.outcomes(["M79930-0007", "M79930-0001"], source="phone", max_age_days=365)
+        assert sorted((o["retailer_phone"], o["reference"], o["status"]) for o in outcomes) == [
+            ("+1", "M79930-0001", "out_of_stock"), ("+1", "M79930-0007", "in_stock")
+        ]
+        assert history.outcomes([]) == []
+        assert history.outcomes(["M79930-0007"], max_age_days=0) == []
+
+    def test_rollups_count_by_day_and_state(self, history):
+        today = datetime.now().isoformat()
+        history.record("A", "ref", "phone", "out_of_stock", observed_at=today, state="CA")
+        history.record("B", "ref", "phone", "out_of_stock", observed_at=today, state="CA")
+        history.record("C", "ref", "phone", "in_stock", observed_at=today, state="NY")
+
+        rollups = history.rollups("ref", states=["CA"])
+        assert len(rollups) == 1
+        assert rollups[0]["count"] == 2
+        assert rollups[0]["status"] == "out_of_stock"
+
+    def test_record_call_and_website_results(self, history):
+        call = CallResult(
+            retailer_name="Store A", retailer_phone="+12125551234", call_id="c1",
+            status=InventoryStatus.WAITLIST, transcript="t", summary="Join the waitlist",
+            call_duration=60, timestamp=datetime.now().isoformat(), raw_response=None,
+        )
+        history.record_call_result(call, "M79930-0007", state="NY")
+        web = WebsiteStockResult(retailer_name="Tourneau", status=WebsiteStockStatus.OUT_OF_STOCK)
+        history.record_website_result(web, "M79930-0007", retailer_name="Tourneau - NYC")
+
+        latest = {obs["retailer_name"]: obs for obs in history.latest("M79930-0007")}
+        assert latest["Store A"]["detail"]["summary"] == "Join the waitlist"
+        assert latest["Tourneau - NYC"]["status"] == "out_of_stock"
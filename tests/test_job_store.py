@@ -0,0 +1,133 @@
+"""Tests for job_store.py — persistent, bounded call job storage"""
+
+import asyncio
+import threading
+import pytest
+
+from job_store import MemoryJobStore, SQLiteJobStore, create_job_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStore(ttl_seconds=3600, max_jobs=100)
+    return SQLiteJobStore(str(tmp_path / "jobs.db"), ttl_seconds=3600, max_jobs=100)
+
+
+class TestJobStore:
+    def test_create_get_update(self, store):
+        store.create("job1", {"status": "starting", "result": None})
+        updated = store.update("job1", status="completed", result={"inventory_status": "in_stock"})
+
+        assert updated["status"] == "completed"
+        assert store.get("job1")["result"] == {"inventory_status": "in_stock"}
+
+    def test_missing_job(self, store):
+        assert store.get("nope") is None
+        assert store.update("nope", status="failed") is None
+
+    def test_get_returns_a_copy(self, store):
+        store.create("job1", {"status": "starting"})
+        store.get("job1")["status"] = "mutated"
+        assert store.get("job1")["status"] == "starting"
+
+    def test_expired_jobs_are_hidden_and_evicted(self, store):
+        store.ttl_seconds = -1
+        store.create("old", {"status": "completed"})
+        assert store.get("old") is None
+        store.evict_expired()
+        assert store.count() == 0
+
+    def test_late_update_does_not_revive_expired_job(self, store):
+        store.ttl_seconds = -1
+        store.create("old", {"status": "in_progress"})
+        store.ttl_seconds = 3600
+        assert store.update("old", status="completed") is None
+        assert store.transition("old", {"in_progress"}, status="failed") is None
+        assert store.get("old") is None
+
+    def test_size_bound_evicts_least_recently_updated(self, store):
+        store.max_jobs = 3
+        for i in range(3):
+            store.create(f"job{i}", {"n": i})
+        store.update("job0", n=0)
+        store.create("job3", {"n": 3})
+        store.evict_expired()
+
+        assert store.count() == 3
+        assert store.get("job1") is None
+        assert store.get("job0") is not None
+
+    def test_transition_only_from_expected_status(self, store):
+        store.create("job1", {"status": "in_progress"})
+
+        assert store.transition("job1", {"in_progress"}, status="finishing")["status"] == "finishing"
+        assert store.transition("job1", {"in_progress"}, status="finishing") is None
+        assert store.transition("nope", {"in_progress"}, status="finishing") is None
+
+    def test_list_jobs_by_status_follows_updates(self, store):
+        store.create("job1", {"status": "running"})
+        store.create("job2", {"status": "running"})
+        store.update("job1", status="completed")
+
+        assert store.list_jobs_by_status({"running"}) == ["job2"]
+        assert store.list_jobs_by_status({"running", "completed"}) == ["job1", "job2"]
+
+    def test_list_session_jobs(self, store):
+        store.create("job1", {"session_id": "s1", "started_at": "2026-01-01T10:00:00"})
+        store.create("job2", {"session_id": "s2", "started_at": "2026-01-01T10:00:01"})
+        store.create("job3", {"session_id": "s1", "started_at": "2026-01-01T10:00:02"})
+
+        assert store.list_session_jobs("s1") == ["job1", "job3"]
+        assert store.list_session_jobs("unknown") == []
+
+
+class TestJobUpdateNotifier:
+    def test_update_from_another_thread_wakes_listener(self):
+        store = MemoryJobStore()
+        store.create("job1", {"status": "starting"})
+
+        async def scenario():
+            event = store.notifier.subscribe()
+            threading.Timer(0.05, store.update, args=("job1",), kwargs={"status": "completed"}).start()
+            await asyncio.wait_for(event.wait(), timeout=5)
+            store.notifier.unsubscribe(event)
+
+        asyncio.run(scenario())
+        assert store.get("job1")["status"] == "completed"
+
+
+class TestSQLiteJobStoreSharing:
+    def test_jobs_visible_across_store_instances(self, tmp_path):
+        """Two instances on one file stand in for two worker processes"""
+        path = str(tmp_path / "jobs.db")
+        worker_a = SQLiteJobStore(path)
+        worker_b = SQLiteJobStore(path)
+
+        worker_a.create("job1", {"status": "starting"})
+        worker_a.update("job1", status="in_progress")
+        assert worker_b.get("job1")["status"] == "in_progress"
+
+    def test_concurrent_updates_do_not_lose_fields(self, tmp_path):
+        path = str(tmp_path / "jobs.db")
+        SQLiteJobStore(path).create("job1", {})
+
+        def writer(n):
+            store = SQLiteJobStore(path)
+            for i in range(20):
+                store.update("job1", **{f"w{n}_{i}": i})
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(SQLiteJobStore(path).get("job1")) == 80
+
+
+def test_create_job_store_backends(tmp_path):
+    config = {"backend": "memory", "ttl_seconds": 60, "max_jobs": 10}
+    assert isinstance(create_job_store(config), MemoryJobStore)
+    config = {"backend": "sqlite", "db_path": str(tmp_path / "j.db"), "ttl_seconds": 60, "max_jobs": 10}
+    assert isinstance(create_job_store(config), SQLiteJobStore)
@@ -0,0 +1,70 @@
+"""Tests for multi_reference.py — multi-reference call tasks and transcript splitting"""
+
+import pytest
+
+from config import WATCHES
+from multi_reference import build_multi_reference_task, reference_keywords, split_by_reference
+
+
+REFS = ["M79930-0007", "M79930-0001", "M79950-0001"]
+
+TRANSCRIPT = """assistant: Hi, I'm calling to check if you have a specific Tudor watch in stock.
+user: Sure, what are you looking for?
+assistant: First, the Ranger 36 millimeter with the beige dial, reference M79930-0007?
+user: Let me check. Yes, we have it in the case.
+assistant: What about the black dial 36mm, M79930-0001?
+user: That one is sold out. We can add you to our waitlist.
+assistant: And the 39mm black, M79950-0001?
+user: Not in stock, no.
+assistant: Thank you so much."""
+
+
+@pytest.fixture
+def watches():
+    return [WATCHES[ref] for ref in REFS]
+
+
+class TestTask:
+    def test_lists_every_reference(self, watches):
+        task = build_multi_reference_task(watches)
+        for ref in REFS:
+            assert ref in task
+        assert "beige domed dial" in task
+
+
+class TestReferenceKeywords:
+    def test_reference_numbers_always_identify(self, watches):
+        keywords = reference_keywords(watches)
+        assert "m79930-0007" in keywords["M79930-0007"]
+        assert "79930 0007" in keywords["M79930-0007"]
+
+    def test_shared_words_do_not_identify(self, watches):
+        keywords = reference_keywords(watches)
+        assert "beige" in keywords["M79930-0007"]  # only the 0007 is beige
+        assert "black" not in keywords["M79930-0001"]  # both 0001s are black
+        assert "0001" not in keywords["M79930-0001"]  # suffix shared with M79950-0001
+        assert "39mm" in keywords["M79950-0001"]
+
+
+class TestSplitByReference:
+    def test_answers_follow_the_reference_asked_about(self, watches):
+        parts = split_by_reference(TRANSCRIPT, watches)
+        assert "we have it in the case" in parts["M79930-0007"]
+        assert "sold out" not in parts["M79930-0007"]
+        assert "waitlist" in parts["M79930-0001"]
+        assert "Not in stock, no." in parts["M79950-0001"]
+        assert "waitlist" not in parts["M79950-0001"]
+
+    def test_opening_text_is_shared(self, watches):
+        parts = split_by_reference(TRANSCRIPT, watches)
+        for ref in REFS:
+            assert "what are you looking for" in parts[ref]
+
+    def test_statements_about_all_of_them(self, watches):
+        text = "user: We don't have any of them right now."
+        parts = split_by_reference("assistant: Do you have the M79930-0007? " + text, watches)
+        assert all("any of them" in parts[ref] for ref in REFS)
+
+    def test_undiscussed_reference_is_empty(self, watches):
+        parts = split_by_reference("assistant: Do you have the M79930-0007? user: Yes we do.", watches)
+        assert parts["M79950-0001"] == ""
@@ -1,7 +1,26 @@
-"""Tests for phone_caller.py — inventory status analysis and phone number cleaning"""
+"""Tests for phone_caller.py — status analysis, phone cleaning, call placement and concurrent checking"""
 
 import pytest
-from phone_caller import BlandAICaller, InventoryStatus
+import json
+import time
+import asyncio
+import threading
+import httpx
+from unittest.mock import MagicMock, patch
+
+from phone_caller import (
+    AsyncBlandAICaller, BlandAICaller, CallResult, InventoryChecker, InventoryStatus, PolitenessLocks, chain_key
+)
+from scraper import Retailer
+from call_retry import RetryPolicy
+from accounting import CallLedger
+from blob_store import BlobStore
+from sweep import SweepStrategy
+from config import ACCOUNTING_CONFIG, RETRY_CONFIG
+
+
+# Retries without real backoff
+FAST_RETRY = {**RETRY_CONFIG, "base_delay_seconds": 0.02, "jitter": 0}
 
 
 class TestInventoryStatusAnalysis:
@@ -98,3 +117,418 @@ class TestPhoneNumberCleaning:
 
     def test_with_parens(self, caller):
         assert caller._clean_phone_number("(212) 555-1234") == "+12125551234"
+
+
+class TestStartCall:
+    @pytest.fixture
+    def caller(self):
+        import os
+        os.environ["BLAND_API_KEY"] = "test-key-not-real"
+        return BlandAICaller(api_key="test-key-not-real", session=MagicMock())
+
+    def test_places_call_with_webhook_and_returns_id(self, caller):
+        response = MagicMock(status_code=200, text='{"call_id": "abc"}')
+        response.json.return_value = {"call_id": "abc"}
+        caller.session.post.return_value = response
+        call_id, failure = caller.start_call("(212) 555-1234", "Store A", webhook_url="https://x/hook")
+
+        assert (call_id, failure) == ("abc", None)
+        payload = caller.session.post.call_args.kwargs["json"]
+        assert payload["webhook"] == "https://x/hook"
+        assert payload["phone_number"] == "+12125551234"
+
+    def test_api_error_returns_failed_result(self, caller):
+        caller.session.post.return_value = MagicMock(status_code=500, text="boom")
+        call_id, failure = caller.start_call("2125551234", "Store A")
+
+        assert call_id is None
+        assert failure.status == InventoryStatus.CALL_FAILED
+        assert failure.retailer_name == "Store A"
+
+    def test_callers_share_one_session(self):
+        assert BlandAICaller(api_key="k").session is BlandAICaller(api_key="k").session
+
+    def test_result_from_payload(self, caller):
+        data = {"call_id": "abc", "status": "completed", "concatenated_transcript": "Sorry, it's sold out."}
+        result = caller.result_from_payload(data, "Store A", "2125551234", "2026-01-01T10:00:00")
+
+        assert result.call_id == "abc"
+        assert result.status == InventoryStatus.OUT_OF_STOCK
+        assert result.retailer_phone == "+12125551234"
+        assert result.timestamp == "2026-01-01T10:00:00"
+
+
+class TestMultiReferenceCall:
+    REFS = ["M79930-0007", "M79930-0001", "M79950-0001"]
+
+    @pytest.fixture
+    def caller(self):
+        from config import WATCHES
+        return BlandAICaller(api_key="test-key-not-real", session=MagicMock(),
+                             watch_configs=[WATCHES[ref] for ref in self.REFS])
+
+    def call_result(self, status=InventoryStatus.UNKNOWN, transcript=""):
+        return CallResult("Store A", "+12125551234", "abc", status, transcript, "", 60, "2026-01-01T10:00:00", None)
+
+    def test_one_task_lists_every_reference(self, caller):
+        payload = caller._build_call_payload("+12125551234", "Store A", "2026-01-01T10:00:00")
+        assert all(ref in payload["task"] for ref in self.REFS)
+        assert payload["metadata"]["watch_references"] == self.REFS
+
+    def test_one_result_per_reference(self, caller):
+        transcript = (
+            "assistant: Do you have the beige dial, M79930-0007?\n"
+            "user: Yes, we have it in the case.\n"
+            "assistant: And the M79930-0001?\n"
+            "user: That one is sold out, but we can add you to our waitlist.\n"
+            "assistant: And the 39mm, M79950-0001?\n"
+            "user: Sorry, not in stock."
+        )
+        results = caller.results_by_reference(self.call_result(transcript=transcript))
+
+        assert [r.watch_reference for r in results] == self.REFS
+        assert [r.status for r in results] == [
+            InventoryStatus.IN_STOCK, InventoryStatus.WAITLIST, InventoryStatus.OUT_OF_STOCK
+        ]
+        assert {r.call_id for r in results} == {"abc"}
+
+    def test_each_reference_keeps_only_its_part_of_the_transcript(self, caller):
+        from reclassify import classify_text
+        transcript = (
+            "assistant: Do you have the beige dial, M79930-0007?\n"
+            "user: Yes, we have it in the case.\n"
+            "assistant: And the 39mm, M79950-0001?\n"
+            "user: Sorry, not in stock."
+        )
+        results = caller.results_by_reference(self.call_result(transcript=transcript))
+
+        assert "in the case" in results[0].transcript and "not in stock" not in results[0].transcript
+        assert results[1].transcript == ""
+        assert "not in stock" in results[2].transcript and "in the case" not in results[2].transcript
+        # Re-scoring a stored result sees the same text it was classified from
+        assert [classify_text((r.transcript, r.summary)) for r in (results[0], results[2])] == [
+            InventoryStatus.IN_STOCK.value, InventoryStatus.OUT_OF_STOCK.value
+        ]
+
+    def test_call_level_outcome_applies_to_every_reference(self, caller):
+        results = caller.results_by_reference(self.call_result(InventoryStatus.NO_ANSWER))
+        assert [r.status for r in results] == [InventoryStatus.NO_ANSWER] * 3
+
+    def test_checker_records_one_result_per_reference(self, caller):
+        checker = InventoryChecker(api_key="test-key-not-real", watch_configs=caller.watch_configs)
+        transcript = "assistant: Do you have M79930-0007? user: Yes we do."
+        with patch.object(checker.caller, "make_call", return_value=self.call_result(transcript=transcript)):
+            results = list(checker.iter_check_retailers([(make_retailer("Store A", "+12125551234"), 1.0)], 1))
+
+        assert [r.watch_reference for r in results] == self.REFS
+        assert results[0].status == InventoryStatus.IN_STOCK
+        assert results[2].summary == "Not discussed on the call"
+
+
+def make_retailer(name, phone, address="1 Main St"):
+    return Retailer(
+        name=name, address=address, city="New York", state="NY", zip_code="10001",
+        country="United States", phone=phone, website=None, latitude=40.75, longitude=-73.99,
+        detail_url="", retailer_type="Official Retailer",
+    )
+
+
+class TestPolitenessLocks:
+    def test_chain_key(self):
+        assert chain_key("Tudor Boutique Mayors Orlando") == "mayors"
+        assert chain_key("BEN BRIDGE JEWELER RANCHO CUCAMONGA") == "ben bridge"
+        assert chain_key("Hamra Jewelers") == "hamra jewelers"
+
+    def test_skips_busy_chain_and_phone(self):
+        locks = PolitenessLocks(max_per_chain=1)
+        pending = [
+            (make_retailer("Mayors Jewelers", "+13055550001"), 1.0),
+            (make_retailer("Tudor Boutique Mayors", "+13055550002"), 2.0),
+            (make_retailer("Other Store", "+13055550001", address="9 Elm St"), 3.0),
+            (make_retailer("Hamra Jewelers", "+13055550004"), 4.0),
+        ]
+        first = locks.acquire_next(pending)
+        second = locks.acquire_next(pending)
+
+        assert first[0].name == "Mayors Jewelers"
+        assert second[0].name == "Hamra Jewelers"  # same chain and same phone are both skipped
+
+        locks.release(first[0])
+        assert locks.acquire_next(pending)[0].name == "Tudor Boutique Mayors"
+
+    def test_chain_gap_delays_next_call(self):
+        locks = PolitenessLocks(max_per_chain=2, chain_gap_seconds=0.1)
+        pending = [
+            (make_retailer("Reeds Jewelers A", "+19105550001"), 1.0),
+            (make_retailer("Reeds Jewelers B", "+19105550002"), 2.0),
+        ]
+        locks.acquire_next(pending)
+        started = time.monotonic()
+        locks.acquire_next(pending)
+        assert time.monotonic() - started >= 0.09
+
+
+class TestConcurrentChecking:
+    @pytest.fixture
+    def checker(self):
+        import os
+        os.environ["BLAND_API_KEY"] = "test-key-not-real"
+        return InventoryChecker(api_key="test-key-not-real", retry_policy=RetryPolicy(FAST_RETRY))
+
+    def test_results_stream_in_completion_order_with_bounded_concurrency(self, checker):
+        durations = {"Slow": 0.3, "Medium": 0.15, "Fast": 0.05, "Faster": 0.01}
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def fake_call(phone, name):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(durations[name])
+            with lock:
+                in_flight[0] -= 1
+            return CallResult(name, phone, "c", InventoryStatus.OUT_OF_STOCK, "", "", 1, "", None)
+
+        retailers = [(make_retailer(name, f"+1212555000{i}"), i) for i, name in enumerate(durations)]
+        with patch.object(checker.caller, "make_call", side_effect=fake_call):
+            started = time.monotonic()
+            names = [r.retailer_name for r in checker.iter_check_retailers(retailers, concurrency=2)]
+            elapsed = time.monotonic() - started
+
+        assert names == ["Medium", "Fast", "Faster", "Slow"]
+        assert peak[0] == 2
+        assert elapsed < sum(durations.values())
+        assert len(checker.results) == 4
+
+    def test_failed_call_still_yields_a_result(self, checker):
+        retailers = [(make_retailer("Store A", "+12125550001"), 1.0)]
+        with patch.object(checker.caller, "make_call", side_effect=RuntimeError("boom")):
+            results = list(checker.iter_check_retailers(retailers, concurrency=3))
+
+        assert len(results) == 1
+        assert results[0].status == InventoryStatus.CALL_FAILED
+        assert results[0].attempts == RETRY_CONFIG["max_attempts"]
+
+
+class TestRetries:
+    @pytest.fixture
+    def checker(self):
+        import os
+        os.environ["BLAND_API_KEY"] = "test-key-not-real"
+        return InventoryChecker(api_key="test-key-not-real", retry_policy=RetryPolicy(FAST_RETRY))
+
+    @staticmethod
+    def result(name, phone, status):
+        return CallResult(name, phone, "c", status, "", "", 1, "", None)
+
+    def test_backoff_delay_grows_and_caps(self):
+        policy = RetryPolicy({**RETRY_CONFIG, "base_delay_seconds": 10, "max_delay_seconds": 30, "jitter": 0})
+        assert [policy.delay(n) for n in (1, 2, 3)] == [10, 20, 30]
+        jittered = RetryPolicy({**RETRY_CONFIG, "base_delay_seconds": 10, "jitter": 0.5})
+        assert all(5 <= jittered.delay(1) <= 10 for _ in range(50))
+
+    def test_only_unreached_calls_are_retried(self):
+        policy = RetryPolicy()
+        assert policy.should_retry("no_answer", 1)
+        assert policy.should_retry("call_failed", RETRY_CONFIG["max_attempts"] - 1)
+        assert not policy.should_retry("no_answer", RETRY_CONFIG["max_attempts"])
+        assert not policy.should_retry("unknown", 1)
+
+    def test_retry_waits_its_backoff_among_fresh_calls(self):
+        locks = PolitenessLocks()
+        pending = [(make_retailer("B", "+12125550002"), 2.0), (make_retailer("C", "+12125550003"), 3.0)]
+        locks.requeue(pending, make_retailer("A", "+12125550001"), 1.0, 0.05)
+
+        assert locks.acquire_next(pending)[0].name == "B"  # A is not due yet
+        time.sleep(0.06)
+        assert locks.acquire_next(pending)[0].name == "A"  # Due, and nearer than C
+        assert locks.acquire_next(pending)[0].name == "C"
+
+    def test_unanswered_store_is_called_again_until_it_answers(self, checker):
+        calls = []
+
+        def fake_call(phone, name):
+            calls.append(name)
+            answered = name != "A" or calls.count("A") == 2
+            return self.result(name, phone, InventoryStatus.IN_STOCK if answered else InventoryStatus.NO_ANSWER)
+
+        retailers = [(make_retailer("A", "+12125550001"), 1.0), (make_retailer("B", "+12125550002"), 2.0)]
+        with patch.object(checker.caller, "make_call", side_effect=fake_call):
+            results = checker.check_retailers(retailers, delay_between_calls=0)
+
+        assert calls == ["A", "B", "A"]
+        assert [(r.retailer_name, r.status, r.attempts) for r in results] == [
+            ("B", InventoryStatus.IN_STOCK, 1), ("A", InventoryStatus.IN_STOCK, 2)
+        ]
+
+    def test_gives_up_after_max_attempts(self, checker):
+        with patch.object(checker.caller, "make_call",
+                          side_effect=lambda phone, name: self.result(name, phone, InventoryStatus.NO_ANSWER)) as call:
+            results = checker.check_retailers([(make_retailer("A", "+12125550001"), 1.0)], delay_between_calls=0)
+
+        assert call.call_count == RETRY_CONFIG["max_attempts"]
+        assert [(r.status, r.attempts) for r in results] == [(InventoryStatus.NO_ANSWER, RETRY_CONFIG["max_attempts"])]
+
+    def test_exception_releases_the_store_for_its_retry(self, checker):
+        outcomes = [RuntimeError("boom"), None]
+
+        def fake_call(phone, name):
+            error = outcomes.pop(0)
+            if error:
+                raise error
+            return self.result(name, phone, InventoryStatus.OUT_OF_STOCK)
+
+        with patch.object(checker.caller, "make_call", side_effect=fake_call):
+            results = checker.check_retailers([(make_retailer("A", "+12125550001"), 1.0)], delay_between_calls=0)
+
+        assert [(r.status, r.attempts) for r in results] == [(InventoryStatus.OUT_OF_STOCK, 2)]
+
+
+class TestBudgets:
+    def test_calls_are_charged_and_capped_by_the_hard_budget(self, tmp_path):
+        # Each call is estimated at $0.20; $0.50 leaves room for two
+        config = {**ACCOUNTING_CONFIG, "cost_per_minute": 0.10, "estimated_minutes_per_call": 2.0,
+                  "budgets": {"daily": {"soft": None, "hard": 0.5}}}
+        ledger = CallLedger(str(tmp_path / "ledger.db"), config=config)
+        checker = InventoryChecker(api_key="test-key-not-real", ledger=ledger)
+        retailers = [(make_retailer(name, f"+1212555000{i}"), float(i)) for i, name in enumerate("ABC")]
+
+        with patch.object(checker.caller, "make_call", side_effect=lambda phone, name: CallResult(
+                name, phone, f"bland-{name}", InventoryStatus.OUT_OF_STOCK, "", "", 60, "", None)):
+            results = checker.check_retailers(retailers, delay_between_calls=0)
+
+        assert [r.retailer_name for r in results] == ["A", "B"]
+        assert ledger.job_spend(checker.run_id) == {"calls": 2, "minutes": 2.0, "cost": 0.2}
+        assert ledger.reserved()["calls"] == 0
+
+
+
+class TestSweepStrategies:
+    @pytest.fixture
+    def checker(self):
+        return InventoryChecker(api_key="test-key-not-real", retry_policy=RetryPolicy(FAST_RETRY))
+
+    @staticmethod
+    def fake_call(in_stock):
+        def call(phone, name):
+            time.sleep(0.02)
+            status = InventoryStatus.IN_STOCK if name in in_stock else InventoryStatus.OUT_OF_STOCK
+            return CallResult(name, phone, f"bland-{name}", status, "", "", 60, "", None)
+        return call
+
+    @pytest.mark.parametrize("concurrency", [1, 2])
+    def test_first_hit_cancels_the_remaining_calls(self, checker, concurrency):
+        retailers = [(make_retailer(name, f"+1212555000{i}"), float(i)) for i, name in enumerate("ABCDEF")]
+        with patch.object(checker.caller, "make_call", side_effect=self.fake_call({"B"})) as call:
+            results = checker.check_retailers(retailers, delay_between_calls=0, concurrency=concurrency,
+                                              strategy=SweepStrategy("first_hit"))
+
+        # With two lines, C may already be ringing when B answers
+        assert call.call_count <= 1 + concurrency
+        assert InventoryStatus.IN_STOCK in [r.status for r in results]
+        assert checker.cancelled_calls == len(retailers) - call.call_count
+
+    def test_radius_band_finishes_the_nearest_band(self, checker):
+        distances = {"A": 1.0, "B": 2.0, "C": 4.0, "D": 6.0, "E": 12.0}
+        retailers = [(make_retailer(name, f"+1212555000{i}"), d) for i, (name, d) in enumerate(distances.items())]
+        with patch.object(checker.caller, "make_call", side_effect=self.fake_call({"A"})):
+            results = checker.check_retailers(retailers, delay_between_calls=0,
+                                              strategy=SweepStrategy("radius_band", band_miles=5))
+
+        assert [r.retailer_name for r in results] == ["A", "B", "C"]
+        assert checker.cancelled_calls == 2
+
+
+class TestBlobOffload:
+    def test_recorded_results_keep_only_a_blob_key(self, tmp_path):
+        blobs = BlobStore(str(tmp_path / "blobs.db"))
+        checker = InventoryChecker(api_key="test-key-not-real", blob_store=blobs)
+        payload = {"call_id": "bland-A", "transcript": "Store: Yes, we have it."}
+
+        with patch.object(checker.caller, "make_call", side_effect=lambda phone, name: CallResult(
+                name, phone, "bland-A", InventoryStatus.IN_STOCK, payload["transcript"], "", 60, "", payload)):
+            result, = checker.check_retailers([(make_retailer("A", "+12125550001"), 1.0)], delay_between_calls=0)
+
+        assert (result.transcript, result.raw_response, result.blob_key) == (None, None, "bland-A")
+        assert result.load_blob(blobs) == {"transcript": "Store: Yes, we have it.", "raw_response": payload}
+
+    def test_split_results_get_one_blob_each(self, tmp_path):
+        blobs = BlobStore(str(tmp_path / "blobs.db"))
+        results = [
+            CallResult("A", "+1", "bland-A", InventoryStatus.IN_STOCK, f"about {ref}", "", 60, "", None, watch_reference=ref)
+            for ref in ("M1", "M2")
+        ]
+        assert [r.offload(blobs) for r in results] == ["bland-A#M1", "bland-A#M2"]
+        assert [r.load_blob(blobs)["transcript"] for r in results] == ["about M1", "about M2"]
+
+    def test_calls_that_never_started_are_not_offloaded(self, tmp_path):
+        blobs = BlobStore(str(tmp_path / "blobs.db"))
+        failed = CallResult("A", "+1", "", InventoryStatus.CALL_FAILED, None, "Failed", None, "", {"error": "x"})
+        assert failed.offload(blobs) is None
+        assert failed.raw_response == {"error": "x"}
+
+
+class FakeBland:
+    """In-memory Bland API for httpx.MockTransport: each call completes after N polls"""
+
+    def __init__(self, polls_until_done):
+        self.polls_until_done = polls_until_done  # phone -> polls
+        self.calls = {}
+        self.requests = 0
+
+    def __call__(self, request):
+        self.requests += 1
+        if request.method == "POST":
+            body = json.loads(request.content)
+            call_id = f"call-{len(self.calls)}"
+            self.calls[call_id] = {"phone": body["phone_number"], "polls": 0}
+            return httpx.Response(200, json={"call_id": call_id})
+
+        call_id = request.url.path.rsplit("/", 1)[-1]
+        call = self.calls[call_id]
+        call["polls"] += 1
+        if call["polls"] < self.polls_until_done[call["phone"]]:
+            return httpx.Response(200, json={"call_id": call_id, "status": "in-progress"})
+        return httpx.Response(200, json={
+            "call_id": call_id, "status": "completed",
+            "concatenated_transcript": "Yes, we have it in stock.", "call_length": 1.5,
+        })
+
+
+class TestAsyncBlandAICaller:
+    def make_caller(self, fake):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+        return AsyncBlandAICaller(api_key="test-key-not-real", client=client, poll_interval=0.001)
+
+    def test_make_call_polls_until_complete(self):
+        fake = FakeBland({"+12125550001": 3})
+        result = asyncio.run(self.make_caller(fake).make_call("212-555-0001", "Store A"))
+
+        assert result.status == InventoryStatus.IN_STOCK
+        assert result.retailer_name == "Store A"
+        assert result.retailer_phone == "+12125550001"
+        assert fake.requests == 4  # one POST, three polls
+
+    def test_start_call_failure_returns_call_failed(self):
+        caller = self.make_caller(lambda request: httpx.Response(402, text="no credits"))
+        call_id, failure = asyncio.run(caller.start_call("2125550001", "Store A"))
+
+        assert call_id is None
+        assert failure.status == InventoryStatus.CALL_FAILED
+        assert "402" in failure.summary
+
+    def test_many_calls_from_one_loop_in_completion_order(self):
+        phones = {f"+1212555{i:04d}": 1 + (i % 5) for i in range(200)}
+        fake = FakeBland(phones)
+        caller = self.make_caller(fake)
+
+        async def scenario():
+            targets = [(phone, f"Store {phone}") for phone in phones]
+            return [r async for r in caller.make_calls(targets, max_in_flight=200)]
+
+        threads_before = threading.active_count()
+        results = asyncio.run(scenario())
+
+        assert len(results) == 200
+        assert threading.active_count() <= threads_before + 1
+        polls = [phones[r.retailer_phone] for r in results]
+        assert polls[:40] == [1] * 40  # quickest calls come back first
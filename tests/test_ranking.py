@@ -0,0 +1,72 @@
+"""Tests for ranking.py — call order learned from past stock outcomes"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from config import RANKING_CONFIG
+from history import StockHistory
+from ranking import RetailerRanker, model_family
+from scraper import Retailer
+
+NOW = datetime(2026, 3, 1, 12, 0)
+RANGER = "M79930-0007"
+OTHER_RANGER = "M79930-0001"  # Same model family
+BLACK_BAY = "M79030B-0001"
+
+
+def make_retailer(name, phone, retailer_type="Official Retailer"):
+    return Retailer(
+        name=name, address="1 Main St", city="New York", state="NY", zip_code="10001",
+        country="United States", phone=phone, website=None, latitude=40.75, longitude=-73.99,
+        detail_url="", retailer_type=retailer_type,
+    )
+
+
+@pytest.fixture
+def history(tmp_path):
+    return StockHistory(str(tmp_path / "history.db"))
+
+
+def record(history, phone, reference, status, days_ago=1):
+    observed_at = (NOW - timedelta(days=days_ago)).isoformat()
+    history.record("Store", reference, "phone", status, observed_at=observed_at, retailer_phone=phone)
+
+
+class TestRetailerRanker:
+    def test_without_history_boutiques_and_nearer_stores_go_first(self):
+        retailers = [
+            (make_retailer("Far", "+12125550001"), 30.0),
+            (make_retailer("Near", "+12125550002"), 2.0),
+            (make_retailer("Boutique", "+12125550003", "Tudor Boutique Edition"), 10.0),
+        ]
+        ranked = RetailerRanker(now=NOW).rank(retailers, RANGER)
+        assert [r.retailer.name for r in ranked] == ["Boutique", "Near", "Far"]
+        assert ranked[1].hit_rate == RANKING_CONFIG["type_prior_hit_rates"]["Official Retailer"]
+        assert ranked[1].evidence == 0
+
+    def test_stores_that_often_have_stock_move_ahead_of_nearer_ones(self, history):
+        for _ in range(4):
+            record(history, "+12125550001", RANGER, "in_stock")
+            record(history, "+12125550002", RANGER, "out_of_stock")
+        retailers = [(make_retailer("Near", "(212) 555-0002"), 1.0), (make_retailer("Often", "212-555-0001"), 8.0)]
+
+        ranked = RetailerRanker(history, now=NOW).rank(retailers, RANGER)
+        assert [r.retailer.name for r in ranked] == ["Often", "Near"]
+        assert ranked[0].hit_rate > 0.5 > ranked[1].hit_rate
+
+    def test_family_outcomes_count_less_and_old_outcomes_fade(self, history):
+        record(history, "+12125550001", RANGER, "in_stock")
+        record(history, "+12125550002", OTHER_RANGER, "in_stock")
+        record(history, "+12125550003", RANGER, "in_stock", days_ago=120)
+        record(history, "+12125550004", BLACK_BAY, "in_stock")  # Another model: ignored
+        record(history, "+12125550005", RANGER, "no_answer")  # Says nothing about stock
+        tallies = RetailerRanker(history, now=NOW).evidence([RANGER])
+
+        exact, family, old = tallies["+12125550001"], tallies["+12125550002"], tallies["+12125550003"]
+        assert family[1] == pytest.approx(exact[1] * RANKING_CONFIG["family_weight"])
+        assert old[1] < exact[1] / 8
+        assert "+12125550004" not in tallies and "+12125550005" not in tallies
+
+    def test_model_family(self):
+        assert model_family(RANGER) == model_family(OTHER_RANGER) != model_family(BLACK_BAY)
+        assert model_family("unknown-ref") == "unknown-ref"
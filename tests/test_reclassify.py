@@ -0,0 +1,97 @@
+"""Tests for reclassify.py — bulk re-scoring of historical call results"""
+
+import json
+import pytest
+
+from blob_store import BlobStore
+from reclassify import iter_results, needs_reclassification, reclassify
+
+
+def record(status, transcript, summary="", raw_status="completed", name="Store"):
+    return {
+        "retailer_name": name,
+        "retailer_phone": "+12125551234",
+        "call_id": f"call-{name}",
+        "status": status,
+        "transcript": transcript,
+        "summary": summary,
+        "timestamp": "2026-01-01T10:00:00",
+        "raw_response": {"status": raw_status},
+        "watch_reference": "M79930-0007",
+        "run_id": "run1",
+    }
+
+
+@pytest.fixture
+def results_log(tmp_path):
+    path = tmp_path / "results.jsonl"
+    rows = [
+        record("unknown", "Store: Yes we have it in the case.", name="A"),
+        record("out_of_stock", "Store: Sorry, sold out.", name="B"),
+        record("out_of_stock", "Store: Not in stock but we can special order it.", name="C"),
+        record("no_answer", "", "Call ended with status: voicemail", raw_status="voicemail", name="D"),
+        record("call_failed", None, "Failed to initiate call", name="E"),
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return path
+
+
+class TestIterResults:
+    def test_streams_jsonl(self, results_log):
+        assert [r["retailer_name"] for r in iter_results(str(results_log))] == ["A", "B", "C", "D", "E"]
+
+    def test_reads_legacy_run_file(self, tmp_path):
+        path = tmp_path / "inventory_results.json"
+        path.write_text(json.dumps({"watch": {}, "results": [record("unknown", "hi")]}))
+        assert len(list(iter_results(str(path)))) == 1
+
+
+class TestNeedsReclassification:
+    def test_skips_call_outcomes(self):
+        assert not needs_reclassification(record("no_answer", "", "x", raw_status="busy"))
+        assert not needs_reclassification(record("call_failed", "text"))
+
+    def test_transcript_results_are_rescored(self):
+        assert needs_reclassification(record("unknown", "Store: hello"))
+
+
+class TestReclassify:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_writes_statuses_and_report(self, results_log, tmp_path, workers):
+        output = tmp_path / "out.jsonl"
+        report_path = tmp_path / "report.json"
+
+        report = reclassify(str(results_log), str(output), str(report_path), workers=workers, batch_size=2)
+
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [r["status"] for r in rows] == ["in_stock", "out_of_stock", "can_order", "no_answer", "call_failed"]
+        assert rows[0]["previous_status"] == "unknown"
+        assert "previous_status" not in rows[1]
+
+        assert report["total_records"] == 5
+        assert report["reclassified"] == 3
+        assert report["changed"] == 2
+        assert report["transitions"]["out_of_stock"] == {"out_of_stock": 1, "can_order": 1}
+        assert {c["retailer_name"] for c in report["changed_records"]} == {"A", "C"}
+        assert json.loads(report_path.read_text())["changed"] == 2
+
+    def test_source_is_not_modified(self, results_log, tmp_path):
+        before = results_log.read_text()
+        reclassify(str(results_log), str(tmp_path / "o.jsonl"), str(tmp_path / "r.json"), workers=1)
+        assert results_log.read_text() == before
+
+    def test_offloaded_transcripts_are_loaded_from_the_blob_store(self, tmp_path):
+        blobs = BlobStore(str(tmp_path / "blobs.db"))
+        offloaded = record("unknown", None, name="A")
+        blobs.put("call-A", {"transcript": "Store: Yes we have it in the case.", "raw_response": offloaded.pop("raw_response")})
+        offloaded["blob_key"] = "call-A"
+        source = tmp_path / "results.jsonl"
+        source.write_text(json.dumps(offloaded) + "\n")
+        output = tmp_path / "out.jsonl"
+
+        report = reclassify(str(source), str(output), str(tmp_path / "r.json"), workers=1, blob_store=blobs)
+
+        row = json.loads(output.read_text())
+        assert report["reclassified"] == 1
+        assert row["status"] == "in_stock"
+        assert row["transcript"] is None and row["blob_key"] == "call-A"
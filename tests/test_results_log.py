@@ -0,0 +1,131 @@
+"""Tests for results_log.py — append-only results log and sidecar index"""
+
+import os
+import pytest
+
+from results_log import ResultsLog
+from phone_caller import CallResult, InventoryChecker, InventoryStatus
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────
+
+
+def make_result(name="Test Store", status=InventoryStatus.OUT_OF_STOCK, timestamp="2026-01-01T10:00:00"):
+    """Helper to create a CallResult with sensible defaults"""
+    return CallResult(
+        retailer_name=name,
+        retailer_phone="+12125551234",
+        call_id=f"call-{name}",
+        status=status,
+        transcript="transcript",
+        summary="summary",
+        call_duration=42,
+        timestamp=timestamp,
+        raw_response={"status": "completed", "transcript": "transcript"},
+    )
+
+
+@pytest.fixture
+def log(tmp_path):
+    return ResultsLog(str(tmp_path / "results.jsonl"))
+
+
+# ── ResultsLog ────────────────────────────────────────────────────────
+
+
+class TestResultsLog:
+    def test_append_and_read_back(self, log):
+        entry = log.append(make_result().to_dict(), "M79930-0007", "run1")
+        record = log.read(entry)
+
+        assert record["retailer_name"] == "Test Store"
+        assert record["status"] == "out_of_stock"
+        assert record["watch_reference"] == "M79930-0007"
+        assert record["raw_response"]["status"] == "completed"
+
+    def test_query_by_retailer_and_reference(self, log):
+        log.append(make_result("A").to_dict(), "M79930-0007", "run1")
+        log.append(make_result("B").to_dict(), "M79930-0007", "run1")
+        log.append(make_result("A").to_dict(), "M79950-0001", "run1")
+
+        assert len(log.query(retailer_name="A")) == 2
+        assert len(log.query(watch_reference="M79930-0007")) == 2
+        assert len(log.query(retailer_name="A", watch_reference="M79950-0001")) == 1
+
+    def test_query_by_time_range(self, log):
+        log.append(make_result("A", timestamp="2026-01-01T10:00:00").to_dict(), "ref", "run1")
+        log.append(make_result("B", timestamp="2026-01-03T10:00:00").to_dict(), "ref", "run1")
+        log.append(make_result("C", timestamp="2026-01-02T10:00:00").to_dict(), "ref", "run1")
+
+        names = [e.retailer_name for e in log.query(since="2026-01-02")]
+        assert names == ["B", "C"]
+        names = [e.retailer_name for e in log.query(until="2026-01-02")]
+        assert names == ["A"]
+
+    def test_index_survives_reopen(self, log):
+        log.append(make_result("A").to_dict(), "ref", "run1")
+        reopened = ResultsLog(log.path)
+        assert [e.retailer_name for e in reopened.query()] == ["A"]
+
+    def test_recovers_records_missing_from_index(self, log):
+        """A crash between the log write and the index write is repaired on open"""
+        log.append(make_result("A").to_dict(), "ref", "run1")
+        log.append(make_result("B").to_dict(), "ref", "run1")
+
+        with open(log.index_path) as f:
+            first_line = f.readline()
+        with open(log.index_path, "w") as f:
+            f.write(first_line + '{"offset": 1')  # second entry lost, torn write
+
+        reopened = ResultsLog(log.path)
+        entries = reopened.query()
+        assert [e.retailer_name for e in entries] == ["A", "B"]
+        assert reopened.read(entries[1])["retailer_name"] == "B"
+
+    def test_torn_final_record_is_dropped_before_the_next_append(self, log):
+        """A crash mid-write must not glue the next record onto the partial line"""
+        log.append(make_result("A").to_dict(), "ref", "run1")
+        with open(log.path, "ab") as f:
+            f.write(b'{"retailer_name": "B", "sta')
+
+        reopened = ResultsLog(log.path)
+        reopened.append(make_result("C").to_dict(), "ref", "run1")
+
+        assert [r["retailer_name"] for r in reopened.iter_records()] == ["A", "C"]
+        assert [e.retailer_name for e in ResultsLog(log.path).query()] == ["A", "C"]
+
+
+# ── InventoryChecker integration ──────────────────────────────────────
+
+
+class TestInventoryCheckerLogging:
+    @pytest.fixture
+    def checker(self, log):
+        os.environ["BLAND_API_KEY"] = "test-key-not-real"
+        return InventoryChecker(api_key="test-key-not-real", results_log=log)
+
+    def test_results_logged_as_recorded(self, checker, log):
+        checker._record_result(make_result("A", InventoryStatus.IN_STOCK))
+        checker._record_result(make_result("B"))
+
+        assert len(log.query(run_id=checker.run_id)) == 2
+
+    def test_summary_reads_index(self, checker, log):
+        checker._record_result(make_result("A", InventoryStatus.IN_STOCK))
+        checker._record_result(make_result("B"))
+
+        summary = checker._generate_summary()
+        assert summary["total_calls"] == 2
+        assert summary["status_breakdown"] == {"in_stock": 1, "out_of_stock": 1}
+        assert summary["in_stock_retailers"] == [{"name": "A", "phone": "+12125551234"}]
+
+    def test_save_results_appends_unlogged(self, tmp_path):
+        os.environ["BLAND_API_KEY"] = "test-key-not-real"
+        checker = InventoryChecker(api_key="test-key-not-real")
+        checker._record_result(make_result("A"))
+
+        path = str(tmp_path / "out.jsonl")
+        checker.save_results(path)
+        checker.save_results(path)  # nothing new, nothing rewritten
+
+        assert len(ResultsLog(path).query()) == 1
@@ -0,0 +1,76 @@
+"""Tests for status_matcher.py — compiled phrase tiers and parity with the legacy classifier"""
+
+import pytest
+
+from status_matcher import StatusMatcher, compile_phrases
+from benchmarks.bench_status_matcher import load_corpus, synthetic_corpus
+from benchmarks.legacy_status import legacy_analyze_inventory_status
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return StatusMatcher()
+
+
+def parity_mismatches(matcher, corpus):
+    """(transcript start, summary start, matcher status, legacy status) for every disagreement"""
+    mismatches = []
+    for item in corpus:
+        text = f"{item['transcript']} {item['summary']}".lower()
+        expected = legacy_analyze_inventory_status(item["transcript"], item["summary"]).value
+        status = matcher.classify(text)[0]
+        if status != expected:
+            mismatches.append((item["transcript"][:60], item["summary"][:40], status, expected))
+    return mismatches
+
+
+class TestCompilePhrases:
+    def test_matches_any_literal(self):
+        pattern = compile_phrases(["we do have", "we do have that", "yes we do"])
+        assert pattern.search("oh yes we do")
+        assert pattern.search("we do have it")
+        assert not pattern.search("we do not")
+
+    def test_literals_are_escaped(self):
+        pattern = compile_phrases(["press 1.", "(c)"])
+        assert pattern.search("to continue press 1.")
+        assert not pattern.search("press 12")
+
+    def test_regex_phrases_stay_regexes(self):
+        pattern = compile_phrases(patterns=["visit.*store", "in-store visit"])
+        assert pattern.search("visit our downtown store")
+        assert pattern.search("book an in-store visit")
+
+    def test_empty_never_matches(self):
+        assert not compile_phrases().search("anything")
+
+
+class TestStatusMatcher:
+    @pytest.mark.parametrize("text, expected", [
+        ("please hold, we do have it", "unknown"),
+        ("reached voicemail", "no_answer"),
+        ("not in stock but we can add you to the waitlist", "waitlist"),
+        ("sold out, we are expecting a shipment", "can_order"),
+        ("sorry, sold out", "out_of_stock"),
+        ("yes we have it in the case", "in_stock"),
+        ("there is a wait list", "waitlist"),
+        ("we can special order it", "can_order"),
+        ("let me ask my manager", "unknown"),
+    ])
+    def test_priority_order(self, matcher, text, expected):
+        assert matcher.classify(text)[0] == expected
+
+    def test_negative_beats_positive(self, matcher):
+        status, _ = matcher.classify("we have it? no, it is not in stock")
+        assert status == "out_of_stock"
+
+    def test_reports_matched_text(self, matcher):
+        assert matcher.classify("yes we do!") == ("in_stock", "yes we do")
+
+
+class TestLegacyParity:
+    def test_labeled_corpus(self, matcher):
+        assert parity_mismatches(matcher, load_corpus()) == []
+
+    def test_synthetic_corpus(self, matcher):
+        assert parity_mismatches(matcher, synthetic_corpus(2000, seed=7)) == []
@@ -1,8 +1,14 @@
-"""Tests for summarizer.py — transcript summarization"""
+"""Tests for summarizer.py — transcript summarization, retries and the shared client"""
 
+import asyncio
+import httpx
+import anthropic
 import pytest
 from unittest.mock import patch, MagicMock
-from summarizer import TranscriptSummarizer, summarize_transcript
+
+from config import SUMMARIZER_CONFIG
+from summary_cache import SummaryCache
+from summarizer import FAILED_SUMMARY, TranscriptSummarizer, get_summarizer, summarize_transcript
 
 
 class TestTranscriptSummarizer:
@@ -44,3 +50,120 @@ class TestSummarizeTranscriptConvenience:
     def test_no_api_key_returns_fallback(self):
         result = summarize_transcript("transcript", "Store")
         assert "not available" in result.lower() or "failed" in result.lower()
+
+
+def api_error(cls, status, headers=None):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    return cls("error", response=httpx.Response(status, request=request, headers=headers or {}), body=None)
+
+
+def message(text):
+    return MagicMock(content=[MagicMock(text=text)])
+
+
+class TestRetriesAndConcurrency:
+    @pytest.fixture
+    def config(self):
+        return {**SUMMARIZER_CONFIG, "max_concurrent_requests": 2,
+                "retry": {**SUMMARIZER_CONFIG["retry"], "base_delay_seconds": 0.5, "jitter": 0}}
+
+    @patch("summarizer.time.sleep")
+    @patch("summarizer.anthropic.Anthropic")
+    def test_rate_limits_are_retried_with_backoff(self, mock_anthropic_cls, sleep, config):
+        client = mock_anthropic_cls.return_value
+        client.messages.create.side_effect = [
+            api_error(anthropic.RateLimitError, 429),
+            api_error(anthropic.RateLimitError, 429, {"retry-after": "3"}),
+            message("In stock."),
+        ]
+
+        summarizer = TranscriptSummarizer(api_key="test-key", config=config)
+        assert summarizer.summarize("Some transcript", "Store") == "In stock."
+        assert [c.args[0] for c in sleep.call_args_list] == [0.5, 3.0]
+        assert mock_anthropic_cls.call_args.kwargs["max_retries"] == 0
+
+    @patch("summarizer.time.sleep")
+    @patch("summarizer.anthropic.Anthropic")
+    def test_gives_up_after_max_attempts_or_on_client_errors(self, mock_anthropic_cls, sleep, config):
+        client = mock_anthropic_cls.return_value
+        client.messages.create.side_effect = api_error(anthropic.InternalServerError, 503)
+        summarizer = TranscriptSummarizer(api_key="test-key", config=config)
+        assert summarizer.summarize("Some transcript", "Store") == FAILED_SUMMARY
+        assert client.messages.create.call_count == config["retry"]["max_attempts"]
+
+        client.messages.create.reset_mock()
+        client.messages.create.side_effect = api_error(anthropic.BadRequestError, 400)
+        assert summarizer.summarize("Some transcript", "Store") == FAILED_SUMMARY
+        assert client.messages.create.call_count == 1
+
+    @patch("summarizer.anthropic.AsyncAnthropic")
+    @patch("summarizer.anthropic.Anthropic")
+    def test_summarize_many_runs_concurrently_within_the_cap(self, mock_anthropic_cls, mock_async_cls, config):
+        in_flight, peak = [0], [0]
+        failed_once = set()
+
+        async def create(**request):
+            prompt = request["messages"][0]["content"]
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            if "Store 3" in prompt and not failed_once:
+                failed_once.add(prompt)
+                raise api_error(anthropic.RateLimitError, 429)
+            return message(prompt.split(" asking ")[1].split(" about")[0])
+
+        mock_async_cls.return_value.messages.create = create
+        config["retry"]["base_delay_seconds"] = 0
+        summarizer = TranscriptSummarizer(api_key="test-key", config=config)
+        items = [("transcript", f"Store {i}", "Ranger") for i in range(6)]
+        summaries = asyncio.run(summarizer.summarize_many(items))
+
+        assert summaries == [f"Store {i}" for i in range(6)]
+        assert peak[0] == 2
+        assert mock_async_cls.call_count == 1
+
+
+class TestSharedSummarizer:
+    @patch("summarizer.anthropic.Anthropic")
+    def test_one_client_per_process(self, mock_anthropic_cls, tmp_path):
+        mock_anthropic_cls.return_value.messages.create.return_value = message("Out of stock.")
+        with patch("summarizer._summarizer", None), \
+             patch("summarizer.get_summary_cache", return_value=SummaryCache(str(tmp_path / "summaries.db"))), \
+             patch.dict("summarizer.os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
+            assert summarize_transcript("transcript", "Store A") == "Out of stock."
+            assert summarize_transcript("transcript", "Store B") == "Out of stock."
+            assert get_summarizer() is get_summarizer()
+
+        assert mock_anthropic_cls.call_count == 1
+
+
+class TestSummaryCaching:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SummaryCache(str(tmp_path / "summaries.db"))
+
+    @patch("summarizer.anthropic.Anthropic")
+    def test_repeated_transcript_is_served_from_the_cache(self, mock_anthropic_cls, cache):
+        client = mock_anthropic_cls.return_value
+        client.messages.create.return_value = message("They have two in stock.")
+        summarizer = TranscriptSummarizer(api_key="test-key", cache=cache)
+
+        assert summarizer.summarize("Store: we have two.", "Store", "Ranger") == "They have two in stock."
+        # Replayed with different line breaks: same content, no second request
+        assert summarizer.summarize("Store:  we have\ntwo. ", "Store", "Ranger") == "They have two in stock."
+        assert asyncio.run(summarizer.summarize_async("Store: we have two.", "Store", "Ranger")) == "They have two in stock."
+        assert client.messages.create.call_count == 1
+
+        summarizer.summarize("Store: we have two.", "Other store", "Ranger")
+        assert client.messages.create.call_count == 2
+        assert cache.stats()["hits"] == 2
+
+    @patch("summarizer.anthropic.Anthropic")
+    def test_failed_summaries_are_not_cached(self, mock_anthropic_cls, cache):
+        client = mock_anthropic_cls.return_value
+        client.messages.create.side_effect = [Exception("API error"), message("Out of stock.")]
+        summarizer = TranscriptSummarizer(api_key="test-key", cache=cache)
+
+        assert summarizer.summarize("transcript", "Store") == FAILED_SUMMARY
+        assert summarizer.summarize("transcript", "Store") == "Out of stock."
@@ -0,0 +1,54 @@
+"""Tests for summary_cache.py — content-addressed summaries with LRU limits"""
+
+import pytest
+
+from summary_cache import SummaryCache, summary_key
+
+MODEL = "claude-3-haiku-20240307"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SummaryCache(str(tmp_path / "summaries.db"), max_entries=3, max_bytes=1000)
+
+
+class TestSummaryKey:
+    def test_whitespace_does_not_change_the_key(self):
+        assert summary_key("Store: yes,\n  we have it ", "A", "Ranger", MODEL) == \
+            summary_key("Store: yes, we have it", "A", "Ranger", MODEL)
+
+    def test_retailer_watch_and_model_are_part_of_the_key(self):
+        base = summary_key("transcript", "A", "Ranger", MODEL)
+        assert base != summary_key("transcript", "B", "Ranger", MODEL)
+        assert base != summary_key("transcript", "A", "Black Bay", MODEL)
+        assert base != summary_key("transcript", "A", "Ranger", "claude-3-5-haiku-20241022")
+
+
+class TestSummaryCache:
+    def test_round_trip_and_hit_rate(self, cache):
+        assert cache.get("k1") is None
+        cache.put("k1", "In stock.")
+        assert cache.get("k1") == "In stock."
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["entries"] == 1 and stats["bytes"] == len("In stock.")
+
+    def test_least_recently_used_entry_is_evicted(self, cache):
+        for i in range(3):
+            cache.put(f"k{i}", f"summary {i}")
+        cache.get("k0")  # k1 is now the least recently used
+        cache.put("k3", "summary 3")
+
+        assert cache.get("k1") is None
+        assert [cache.get(k) for k in ("k0", "k2", "k3")] == ["summary 0", "summary 2", "summary 3"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_size_limit_evicts_oldest_first(self, cache):
+        cache.put("small", "x" * 100)
+        cache.put("big", "y" * 800)
+        cache.put("bigger", "z" * 400)
+
+        assert cache.get("small") is None and cache.get("big") is None
+        assert cache.get("bigger") == "z" * 400
+        assert cache.stats()["bytes"] <= 1000
@@ -0,0 +1,39 @@
+"""Tests for sweep.py — when a sweep of nearby stores stops calling"""
+
+import pytest
+
+from sweep import SweepStrategy, SweepTracker
+
+
+class TestSweepStrategy:
+    def test_defaults_and_validation(self):
+        assert SweepStrategy.from_options().mode == "all"
+        assert SweepStrategy("first_hit", hits=3).hits == 1
+        with pytest.raises(ValueError):
+            SweepStrategy("most")
+        with pytest.raises(ValueError):
+            SweepStrategy("first_n", hits=0)
+
+
+class TestSweepTracker:
+    def test_all_wants_every_call(self):
+        tracker = SweepTracker(SweepStrategy("all"))
+        tracker.observe("+1", True, 1.0)
+        assert tracker.wanted(40.0) and not tracker.done
+
+    def test_first_n_stops_after_n_stores_in_stock(self):
+        tracker = SweepTracker(SweepStrategy("first_n", hits=2))
+        tracker.observe("+1", True, 1.0)
+        tracker.observe("+1", True, 1.0)  # Same store, another reference
+        tracker.observe("+2", False, 2.0)
+        assert tracker.wanted(3.0)
+        tracker.observe("+3", True, 3.0)
+        assert tracker.done and not tracker.wanted(0.5)
+
+    def test_radius_band_finishes_the_band_of_the_nearest_hit(self):
+        tracker = SweepTracker(SweepStrategy("radius_band", band_miles=5))
+        assert tracker.wanted(30.0)
+        tracker.observe("+1", True, 7.0)
+        assert tracker.wanted(2.0) and tracker.wanted(9.9)
+        assert not tracker.wanted(10.0)
+        assert not tracker.done
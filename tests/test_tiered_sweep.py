@@ -0,0 +1,126 @@
+"""Tests for tiered_sweep.py — website checks first, phone calls for the rest, one merged status per retailer"""
+
+import time
+import pytest
+from unittest.mock import patch
+
+from history import StockHistory
+from phone_caller import CallResult, InventoryChecker, InventoryStatus
+from scraper import Retailer
+from sweep import SweepStrategy
+from tiered_sweep import NOT_CHECKED, PHONE, WEBSITE, RetailerStock, TieredSweep
+from website_scraper import WebsiteStockResult, WebsiteStockStatus
+
+RANGER = "M79930-0007"
+OTHER_RANGER = "M79930-0001"
+
+
+def make_retailer(name, phone):
+    return Retailer(
+        name=name, address="1 Main St", city="New York", state="NY", zip_code="10001",
+        country="United States", phone=phone, website=None, latitude=40.75, longitude=-73.99,
+        detail_url="", retailer_type="Official Retailer",
+    )
+
+
+class FakeWebsites:
+    """Scrapers for some retailer names, answering from a fixed table (slowly, to show concurrency)"""
+
+    def __init__(self, answers):
+        self.answers = answers  # (name, reference) or name -> WebsiteStockStatus
+        self.checked = []
+
+    def has_scraper(self, name):
+        return any(key == name or (isinstance(key, tuple) and key[0] == name) for key in self.answers)
+
+    def check_stock(self, name, reference):
+        time.sleep(0.05)
+        self.checked.append((name, reference))
+        status = self.answers.get((name, reference), self.answers.get(name))
+        return WebsiteStockResult(retailer_name=name, status=status, message=f"{name} website")
+
+
+def fake_call(in_stock):
+    def call(phone, name):
+        status = InventoryStatus.IN_STOCK if name in in_stock else InventoryStatus.OUT_OF_STOCK
+        return CallResult(name, phone, f"bland-{name}", status, "", "", 60, "", None)
+    return call
+
+
+@pytest.fixture
+def retailers():
+    return [(make_retailer(name, f"+1212555000{i}"), float(i)) for i, name in enumerate(["Online", "Vague", "Plain", "Broken"])]
+
+
+@pytest.fixture
+def websites():
+    return FakeWebsites({
+        "Online": WebsiteStockStatus.OUT_OF_STOCK,
+        "Vague": WebsiteStockStatus.CALL_FOR_AVAILABILITY,
+        "Broken": WebsiteStockStatus.SCRAPER_ERROR,
+    })
+
+
+@pytest.fixture
+def checker():
+    return InventoryChecker(api_key="test-key-not-real")
+
+
+class TestTieredSweep:
+    def test_only_retailers_without_a_clear_website_answer_are_called(self, retailers, websites, checker, tmp_path):
+        history = StockHistory(str(tmp_path / "history.db"))
+        sweep = TieredSweep(websites, history)
+        with patch.object(checker.caller, "make_call", side_effect=fake_call({"Plain"})) as call:
+            stocks = sweep.run(retailers, checker, delay_between_calls=0, concurrency=1)
+
+        assert [c.args[1] for c in call.call_args_list] == ["Vague", "Plain", "Broken"]
+        assert [(s.retailer.name, s.source, s.status) for s in stocks] == [
+            ("Online", WEBSITE, "out_of_stock"),
+            ("Vague", PHONE, "out_of_stock"),
+            ("Plain", PHONE, "in_stock"),
+            ("Broken", PHONE, "out_of_stock"),
+        ]
+        assert stocks[1].website[RANGER].status == WebsiteStockStatus.CALL_FOR_AVAILABILITY
+        website_obs = history.latest(RANGER, StockHistory.SOURCE_WEBSITE)
+        assert {o["retailer_name"] for o in website_obs} == {"Online", "Vague", "Broken"}
+
+    def test_website_checks_run_concurrently(self, retailers, websites):
+        started = time.monotonic()
+        TieredSweep(websites).website_tier(retailers, RANGER)
+        assert len(websites.checked) == 3
+        assert time.monotonic() - started < 0.14
+
+    def test_first_hit_found_online_places_no_calls(self, retailers, checker):
+        websites = FakeWebsites({"Plain": WebsiteStockStatus.IN_STOCK})
+        with patch.object(checker.caller, "make_call") as call:
+            stocks = TieredSweep(websites).run(retailers, checker, strategy=SweepStrategy("first_hit"))
+
+        call.assert_not_called()
+        assert [s.status for s in stocks] == [NOT_CHECKED, NOT_CHECKED, "in_stock", NOT_CHECKED]
+
+    def test_website_hits_count_toward_first_n(self, retailers, checker):
+        websites = FakeWebsites({"Online": WebsiteStockStatus.IN_STOCK})
+        with patch.object(checker.caller, "make_call", side_effect=fake_call({"Vague", "Plain"})) as call:
+            TieredSweep(websites).run(retailers, checker, strategy=SweepStrategy("first_n", hits=2),
+                                      delay_between_calls=0, concurrency=1)
+
+        assert [c.args[1] for c in call.call_args_list] == ["Vague"]
+
+    def test_every_reference_needs_a_clear_answer(self, retailers):
+        websites = FakeWebsites({
+            ("Online", RANGER): WebsiteStockStatus.IN_STOCK,
+            ("Online", OTHER_RANGER): WebsiteStockStatus.UNKNOWN,
+            ("Plain", RANGER): WebsiteStockStatus.OUT_OF_STOCK,
+            ("Plain", OTHER_RANGER): WebsiteStockStatus.IN_STOCK,
+        })
+        stocks, unsettled = TieredSweep(websites).website_tier(retailers, [RANGER, OTHER_RANGER])
+
+        assert [r.name for r, _ in unsettled] == ["Online", "Vague", "Broken"]
+        assert stocks[2].statuses == {RANGER: "out_of_stock", OTHER_RANGER: "in_stock"}
+        assert stocks[2].status == "in_stock"
+
+    def test_merged_status_prefers_the_most_useful_answer(self):
+        stock = RetailerStock(make_retailer("A", "+12125550000"), 1.0,
+                              statuses={RANGER: "no_answer", OTHER_RANGER: "waitlist"})
+        assert stock.status == "waitlist"
+        assert RetailerStock(make_retailer("B", None), 2.0).to_dict()["status"] == NOT_CHECKED
@@ -0,0 +1,265 @@
+"""
+Tiered Stock Sweep
+Checks retailer websites first (fast and free), then phones only the
+retailers whose website gave no clear answer, and merges both into one
+stock status per retailer
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import TIERED_SWEEP_CONFIG, WATCH_CONFIG
+from scraper import Retailer
+from history import StockHistory
+from phone_caller import CallResult, InventoryChecker, InventoryStatus, normalize_phone
+from sweep import ALL, SweepStrategy, SweepTracker
+from website_scraper import WebsiteStockChecker, WebsiteStockResult, WebsiteStockStatus
+
+
+WEBSITE = "website"
+PHONE = "phone"
+NOT_CHECKED = "not_checked"
+
+# Most to least useful, for the overall status of a store asked about several references
+STATUS_ORDER = [
+    InventoryStatus.IN_STOCK.value,
+    InventoryStatus.CAN_ORDER.value,
+    InventoryStatus.WAITLIST.value,
+    InventoryStatus.OUT_OF_STOCK.value,
+    InventoryStatus.UNKNOWN.value,
+    InventoryStatus.NO_ANSWER.value,
+    InventoryStatus.CALL_FAILED.value,
+    NOT_CHECKED,
+]
+
+
+@dataclass
+class RetailerStock:
+    """One retailer's stock status, from its website or a phone call"""
+    retailer: Retailer
+    distance: float
+    source: Optional[str] = None  # "website", "phone", or None if neither answered
+    statuses: Dict[str, str] = field(default_factory=dict)  # Reference -> InventoryStatus value
+    website: Dict[str, WebsiteStockResult] = field(default_factory=dict)  # Reference -> website result
+    calls: List[CallResult] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        """Best status across the references asked about (not_checked if none)"""
+        if not self.statuses:
+            return NOT_CHECKED
+        return min(self.statuses.values(), key=lambda s: STATUS_ORDER.index(s) if s in STATUS_ORDER else len(STATUS_ORDER))
+
+    @property
+    def in_stock(self) -> bool:
+        return self.status == InventoryStatus.IN_STOCK.value
+
+    @property
+    def store_key(self) -> str:
+        """Key a sweep tracker counts this store under (as InventoryChecker does)"""
+        return normalize_phone(self.retailer.phone) if self.retailer.phone else self.retailer.name
+
+    def to_dict(self) -> Dict:
+        website = next(iter(self.website.values()), None)
+        return {
+            "retailer_name": self.retailer.name,
+            "phone": self.retailer.phone,
+            "distance": round(self.distance, 1),
+            "source": self.source,
+            "status": self.status,
+            "statuses": dict(self.statuses),
+            "message": website.message if website else None,
+            "product_url": website.product_url if website else None,
+            "price": website.price if website else None,
+            "call_ids": sorted({c.call_id for c in self.calls if c.call_id})
+        }
+
+
+class TieredSweep:
+    """
+    Website-first, phone-second stock sweep.
+
+    Every selected retailer with a website scraper is checked concurrently
+    (one request per retailer name and reference). A retailer whose website
+    clearly says in or out of stock for every reference is settled; the rest
+    are left for the phone tier. Website hits count toward the sweep
+    strategy, so a "first_hit" sweep answered online places no calls.
+    """
+
+    def __init__(self, website_checker: Optional[WebsiteStockChecker] = None,
+                 history: Optional[StockHistory] = None, config: Optional[Dict] = None):
+        """
+        Args:
+            website_checker: Scrapers to use (a new WebsiteStockChecker by default)
+            history: Stock history that website answers are recorded in (optional)
+            config: Tiered sweep settings (defaults to TIERED_SWEEP_CONFIG)
+        """
+        self.website_checker = website_checker or WebsiteStockChecker()
+        self.history = history
+        self.config = config or TIERED_SWEEP_CONFIG
+
+    def check_websites(self, retailers: Iterable[Tuple[Retailer, float]],
+                       references: List[str]) -> Dict[Tuple[str, str], WebsiteStockResult]:
+        """
+        Check every retailer website a scraper exists for, concurrently
+
+        Returns:
+            (retailer name, reference) -> WebsiteStockResult
+        """
+        names = sorted({r.name for r, _ in retailers if self.website_checker.has_scraper(r.name)})
+        keys = [(name, ref) for name in names for ref in references]
+        if not keys:
+            return {}
+
+        def check(key: Tuple[str, str]) -> WebsiteStockResult:
+            try:
+                return self.website_checker.check_stock(*key)
+            except Exception as e:
+                return WebsiteStockResult(retailer_name=key[0], status=WebsiteStockStatus.SCRAPER_ERROR,
+                                          message=f"Error: {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=min(self.config["website_workers"], len(keys))) as pool:
+            return dict(zip(keys, pool.map(check, keys)))
+
+    def is_clear(self, result: Optional[WebsiteStockResult]) -> bool:
+        """Whether a website answer settles a retailer without a call"""
+        return result is not None and result.status.value in self.config["clear_website_statuses"]
+
+    def website_tier(self, retailers: List[Tuple[Retailer, float]],
+                     references) -> Tuple[List[RetailerStock], List[Tuple[Retailer, float]]]:
+        """
+        Run the website tier and split the retailers by whether it settled them
+
+        Args:
+            retailers: (Retailer, distance) tuples, in calling order
+            references: Watch reference, or list of references asked about
+
+        Returns:
+            (one RetailerStock per retailer, in the given order;
+             the (Retailer, distance) tuples still to be phoned, in the given order)
+        """
+        references = [references] if isinstance(references, str) else list(references)
+        found = self.check_websites(retailers, references)
+
+        stocks, unsettled = [], []
+        for retailer, distance in retailers:
+            stock = RetailerStock(retailer, distance)
+            stock.website = {ref: found[(retailer.name, ref)] for ref in references if (retailer.name, ref) in found}
+            for ref, result in stock.website.items():
+                self._record(result, ref, retailer)
+            if stock.website and all(self.is_clear(stock.website.get(ref)) for ref in references):
+                stock.source = WEBSITE
+                stock.statuses = {ref: result.status.value for ref, result in stock.website.items()}
+            else:
+                unsettled.append((retailer, distance))
+            stocks.append(stock)
+
+        settled = sum(1 for s in stocks if s.source == WEBSITE)
+        print(f"Website tier: {len({name for name, _ in found})} websites checked, "
+              f"{settled} of {len(stocks)} retailers answered online")
+        return stocks, unsettled
+
+    @staticmethod
+    def tracker(strategy: Optional[SweepStrategy], stocks: Iterable[RetailerStock]) -> Optional[SweepTracker]:
+        """A sweep tracker already counting the stores found in stock online (None for "all")"""
+        if not strategy or strategy.mode == ALL:
+            return None
+        tracker = SweepTracker(strategy)
+        for stock in stocks:
+            if stock.source == WEBSITE:
+                tracker.observe(stock.store_key, stock.in_stock, stock.distance)
+        return tracker
+
+    def plan(
+        self,
+        retailers: List[Tuple[Retailer, float]],
+        references,
+        strategy: Optional[SweepStrategy] = None,
+        max_calls: Optional[int] = None
+    ) -> Tuple[List[RetailerStock], List[Tuple[Retailer, float]], Optional[SweepTracker]]:
+        """
+        Run the website tier and pick the retailers the phone tier should call
+
+        Args:
+            retailers: (Retailer, distance) tuples, in calling order
+            references: Watch reference, or list of references asked about
+            strategy: When to stop calling once stock is found (online or by phone)
+            max_calls: Maximum number of calls to make
+
+        Returns:
+            (one RetailerStock per retailer; the retailers to call, empty if the
+             sweep's goal was met online; the sweep tracker for the calls, if any)
+        """
+        stocks, unsettled = self.website_tier(retailers, references)
+        tracker = self.tracker(strategy, stocks)
+        if tracker and tracker.done:
+            print("Sweep goal met online: no calls needed")
+            return stocks, [], tracker
+
+        to_call = [(r, d) for r, d in unsettled if r.phone and (tracker is None or tracker.wanted(d))]
+        return stocks, to_call[:max_calls] if max_calls else to_call, tracker
+
+    def run(
+        self,
+        retailers: List[Tuple[Retailer, float]],
+        checker: Optional[InventoryChecker] = None,
+        references=None,
+        strategy: Optional[SweepStrategy] = None,
+        max_calls: Optional[int] = None,
+        **call_options
+    ) -> List[RetailerStock]:
+        """
+        Website tier, then phone calls for the retailers it left open
+
+        Args:
+            retailers: (Retailer, distance) tuples, in calling order
+            checker: Places the calls (None: website tier only)
+            references: References to ask about (default: the checker's, else WATCH_CONFIG's)
+            strategy: When to stop calling once stock is found (online or by phone)
+            max_calls: Maximum number of calls to make
+            **call_options: Passed to InventoryChecker.check_retailers
+
+        Returns:
+            One RetailerStock per retailer, in the given order
+        """
+        references = references or (checker.caller.references if checker else [WATCH_CONFIG["reference"]])
+        references = [references] if isinstance(references, str) else list(references)
+        stocks, to_call, tracker = self.plan(retailers, references, strategy, max_calls)
+        if not checker or not to_call:
+            return stocks
+        results = checker.check_retailers(to_call, tracker=tracker, **call_options)
+        return self.merge(stocks, results, references)
+
+    @staticmethod
+    def merge(stocks: List[RetailerStock], results: Iterable[CallResult], references: List[str]) -> List[RetailerStock]:
+        """Fold phone results into the retailers they were for (a call's answer replaces the website's)"""
+        by_phone: Dict[str, List[CallResult]] = {}
+        for result in results:
+            by_phone.setdefault(normalize_phone(result.retailer_phone), []).append(result)
+        for stock in stocks:
+            calls = by_phone.get(normalize_phone(stock.retailer.phone or "")) if stock.retailer.phone else None
+            if not calls:
+                continue
+            stock.calls = calls
+            stock.source = PHONE
+            stock.statuses = {(c.watch_reference or references[0]): c.status.value for c in calls}
+        return stocks
+
+    def _record(self, result: WebsiteStockResult, reference: str, retailer: Retailer):
+        if not self.history or result.status == WebsiteStockStatus.NO_SCRAPER:
+            return
+        try:
+            self.history.record_website_result(result, reference, state=retailer.state or "",
+                                               retailer_name=retailer.name)
+        except Exception as e:
+            print(f"  Error recording history: {e}")
+
+
+def print_statuses(stocks: List[RetailerStock]):
+    """Merged per-retailer table for the CLI"""
+    print("\nStock by retailer (website first, then phone):")
+    print("-" * 60)
+    for stock in stocks:
+        source = f" ({stock.source})" if stock.source else ""
+        print(f"  {stock.status:<14} {stock.retailer.name}, {stock.distance:.1f} mi{source}")